@@ -0,0 +1,83 @@
+import argparse
+import resource
+import time
+import multiprocessing
+import numpy as np
+
+# Peak memory of sparse AdjacencyPower versus the previous dense implementation for increasing graph size.
+# Each run is done in a fresh process to measure its peak resident memory.
+parser = argparse.ArgumentParser(description='Benchmark memory of AdjacencyPower.')
+parser.add_argument("--num_nodes", required=False, help="Comma separated graph sizes.", default="100,500,1000,2000")
+parser.add_argument("--batch_size", required=False, help="Number of graphs in batch.", default=32, type=int)
+parser.add_argument("--degree", required=False, help="Average number of neighbours.", default=4, type=int)
+parser.add_argument("--power", required=False, help="Power of adjacency matrix.", default=2, type=int)
+args = vars(parser.parse_known_args()[0])
+
+
+def make_batch(num_nodes: int, batch_size: int, degree: int, seed: int = 0):
+    import tensorflow as tf
+    rng = np.random.default_rng(seed)
+    nodes, edges, indices = [], [], []
+    for _ in range(batch_size):
+        # Chain-like graphs with random local neighbours, similar to proteins.
+        src = np.repeat(np.arange(num_nodes), degree)
+        dst = np.clip(src + rng.integers(-degree, degree + 1, size=len(src)), 0, num_nodes - 1)
+        idx = np.unique(np.stack([src, dst], axis=-1), axis=0)
+        idx = idx[idx[:, 0] != idx[:, 1]]
+        nodes.append(np.ones((num_nodes, 1), dtype="float32"))
+        indices.append(idx)
+        edges.append(np.full((len(idx), 1), 1.0 / degree, dtype="float32"))
+    return [tf.RaggedTensor.from_row_lengths(np.concatenate(x, axis=0), [len(y) for y in x])
+            for x in [nodes, edges, indices]]
+
+
+def dense_adjacency_power(inputs, n):
+    """Previous implementation of AdjacencyPower with dense (batch, N, N) adjacency matrix."""
+    import tensorflow as tf
+    node_len = inputs[0].row_lengths()
+    edge = inputs[1].values
+    edge_index, edge_len = inputs[2].values, inputs[2].row_lengths()
+    ind_batch = tf.expand_dims(tf.repeat(tf.range(tf.shape(edge_len, out_type="int64")[0]), edge_len), axis=-1)
+    ind_all = tf.concat([ind_batch, tf.cast(edge_index, "int64")], axis=-1)
+    max_index = tf.reduce_max(node_len)
+    dense_shape = tf.stack([tf.shape(node_len, out_type="int64")[0], max_index, max_index])
+    adj = tf.scatter_nd(ind_all, edge[:, 0], dense_shape)
+    out = adj
+    for _ in range(n - 1):
+        out = tf.linalg.matmul(out, adj)
+    mask = out > tf.keras.backend.epsilon()
+    return out[mask], tf.where(mask)
+
+
+def run(method: str, num_nodes: int, queue):
+    import tensorflow as tf
+    from kgcnn.layers.pool.topk import AdjacencyPower
+    inputs = make_batch(num_nodes, args["batch_size"], args["degree"])
+    layer = AdjacencyPower(n=args["power"])
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if method == "sparse":
+        out = layer(inputs)
+        num_entries = int(tf.shape(out[0].values)[0])
+    else:
+        out = dense_adjacency_power(inputs, args["power"])
+        num_entries = int(tf.shape(out[0])[0])
+    duration = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((num_entries, (rss_after - rss_before) / 1024, duration))
+
+
+if __name__ == "__main__":
+    context = multiprocessing.get_context("spawn")
+    print("%10s %10s %12s %16s %10s" % ("method", "nodes", "entries", "peak_mem (MB)", "time (s)"))
+    for num_nodes in [int(x) for x in args["num_nodes"].split(",")]:
+        for method in ["sparse", "dense"]:
+            queue = context.Queue()
+            process = context.Process(target=run, args=(method, num_nodes, queue))
+            process.start()
+            process.join()
+            if process.exitcode != 0:
+                print("%10s %10s %12s" % (method, num_nodes, "failed"))
+                continue
+            entries, memory, duration = queue.get()
+            print("%10s %10s %12s %16.1f %10.3f" % (method, num_nodes, entries, memory, duration))
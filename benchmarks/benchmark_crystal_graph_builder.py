@@ -0,0 +1,52 @@
+import argparse
+import time
+import numpy as np
+from pymatgen.core.structure import Structure, Lattice
+from kgcnn.graph.base import GraphDict
+from kgcnn.crystal.preprocessor import RadiusUnitCell, KNNUnitCell, ArrayRadiusUnitCell, ArrayKNNUnitCell
+
+# Time to build graphs of random crystal structures with the networkx preprocessors and conversion to `GraphDict`
+# versus the array-based preprocessors of `kgcnn.crystal.array_graph_builder`.
+parser = argparse.ArgumentParser(description='Benchmark crystal graph builders.')
+parser.add_argument("--num_structures", required=False, help="Number of structures.", default=200, type=int)
+parser.add_argument("--num_atoms", required=False, help="Maximum number of atoms per unit cell.", default=32, type=int)
+parser.add_argument("--radius", required=False, help="Radius for RadiusUnitCell.", default=5.0, type=float)
+parser.add_argument("--k", required=False, help="Number of neighbours for KNNUnitCell.", default=12, type=int)
+args = vars(parser.parse_args())
+
+
+def make_structures(num_structures: int, max_atoms: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    structures = []
+    for _ in range(num_structures):
+        n = int(rng.integers(1, max_atoms + 1))
+        length = (n * 12.0) ** (1 / 3)
+        lattice = Lattice(np.diag(rng.uniform(0.8, 1.2, 3) * length) + rng.normal(size=(3, 3)) * 0.3)
+        structures.append(Structure(lattice, rng.integers(1, 84, n).tolist(), rng.uniform(0.0, 1.0, (n, 3))))
+    return structures
+
+
+def build_networkx(pre_processor, structures):
+    return [GraphDict().from_networkx(pre_processor(s), node_attributes=pre_processor.node_attributes,
+                                      edge_attributes=pre_processor.edge_attributes) for s in structures]
+
+
+def build_arrays(pre_processor, structures):
+    return [pre_processor(s) for s in structures]
+
+
+if __name__ == "__main__":
+    structures = make_structures(args["num_structures"], args["num_atoms"])
+    print("%16s %16s %16s" % ("preprocessor", "networkx (s)", "arrays (s)"))
+    for name, ref, new in [("RadiusUnitCell", RadiusUnitCell(args["radius"]), ArrayRadiusUnitCell(args["radius"])),
+                           ("KNNUnitCell", KNNUnitCell(args["k"]), ArrayKNNUnitCell(args["k"]))]:
+        start = time.perf_counter()
+        graphs_ref = build_networkx(ref, structures)
+        time_ref = time.perf_counter() - start
+        start = time.perf_counter()
+        graphs_new = build_arrays(new, structures)
+        time_new = time.perf_counter() - start
+        for g, h in zip(graphs_ref, graphs_new):
+            assert np.array_equal(g["edge_indices"], h["edge_indices"])
+            assert np.allclose(g["distance"], h["distance"])
+        print("%16s %16.3f %16.3f" % (name, time_ref, time_new))
@@ -0,0 +1,75 @@
+import argparse
+import time
+import numpy as np
+import tensorflow as tf
+from kgcnn.literature.Schnet import make_model as make_schnet
+from kgcnn.literature.GIN import make_model as make_gin
+
+# Training step time of models that use ragged tensors in each layer versus models that cast the batch once into the
+# disjoint representation at input. For small molecules the index bookkeeping is a large part of a training step.
+parser = argparse.ArgumentParser(description='Benchmark disjoint representation of graph batches.')
+parser.add_argument("--num_nodes", required=False, help="Maximum number of nodes per graph.", default=18, type=int)
+parser.add_argument("--batch_size", required=False, help="Batch size.", default=32, type=int)
+parser.add_argument("--units", required=False, help="Number of hidden units.", default=32, type=int)
+parser.add_argument("--steps", required=False, help="Number of timed training steps.", default=200, type=int)
+args = vars(parser.parse_args())
+
+
+def make_batch(batch_size: int, max_nodes: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    nodes, coordinates, indices = [], [], []
+    for _ in range(batch_size):
+        n = int(rng.integers(max_nodes // 2, max_nodes + 1))
+        xyz = rng.normal(size=(n, 3)) * 1.5
+        dist = np.linalg.norm(xyz[:, None, :] - xyz[None, :, :], axis=-1)
+        nodes.append(rng.integers(1, 10, size=n).astype("float32"))
+        coordinates.append(xyz.astype("float32"))
+        indices.append(np.argwhere(np.logical_and(dist < 4.0, dist > 0.0)))
+    inputs = [tf.RaggedTensor.from_row_lengths(np.concatenate(x, axis=0), [len(y) for y in x])
+              for x in [nodes, coordinates, indices]]
+    return inputs, rng.normal(size=(batch_size, 1)).astype("float32")
+
+
+def time_training_step(model, x, y, steps: int):
+    optimizer = tf.keras.optimizers.Adam()
+
+    @tf.function
+    def train_step(inputs, targets):
+        with tf.GradientTape() as tape:
+            loss = tf.reduce_mean(tf.square(model(inputs, training=True) - targets))
+        grads = tape.gradient(loss, model.trainable_variables)
+        optimizer.apply_gradients(zip(grads, model.trainable_variables))
+        return loss
+
+    train_step(x, y)  # Tracing.
+    start = time.perf_counter()
+    for _ in range(steps):
+        train_step(x, y)
+    return (time.perf_counter() - start) / steps * 1000
+
+
+if __name__ == "__main__":
+    x, y = make_batch(args["batch_size"], args["num_nodes"])
+    units = args["units"]
+    models = {
+        "Schnet": (lambda use_disjoint: make_schnet(
+            interaction_args={"units": units, "use_bias": True, "activation": "kgcnn>shifted_softplus",
+                              "cfconv_pool": "sum"},
+            use_disjoint=use_disjoint, verbose=0), x),
+        "GIN": (lambda use_disjoint: make_gin(
+            gin_mlp={"units": [units, units], "use_bias": True, "activation": ["relu", "linear"],
+                     "use_normalization": True, "normalization_technique": "graph_batch"},
+            output_mlp={"use_bias": True, "units": 1, "activation": "linear"},
+            use_disjoint=use_disjoint, verbose=0), [x[0], x[2]])
+    }
+    print("%10s %12s %16s" % ("model", "use_disjoint", "time/step (ms)"))
+    for name, (make, inputs) in models.items():
+        reference = None
+        for use_disjoint in [False, True]:
+            model = make(use_disjoint)
+            if reference is None:
+                reference = model
+            else:
+                model.set_weights(reference.get_weights())
+                assert np.allclose(model.predict(inputs, verbose=0), reference.predict(inputs, verbose=0), atol=1e-4)
+            print("%10s %12s %16.3f" % (name, use_disjoint, time_training_step(model, inputs, y, args["steps"])))
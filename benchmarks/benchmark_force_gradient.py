@@ -0,0 +1,61 @@
+import argparse
+import time
+import numpy as np
+import tensorflow as tf
+from kgcnn.model.force import EnergyForceModel
+
+# Training step time of energy and force models with the gradient of the summed energy with respect to the flat
+# coordinates versus `batch_jacobian` on padded coordinates. Molecules of MD17-like size are generated randomly.
+parser = argparse.ArgumentParser(description='Benchmark force computation of EnergyForceModel.')
+parser.add_argument("--num_nodes", required=False, help="Maximum number of atoms per molecule.", default=21, type=int)
+parser.add_argument("--batch_size", required=False, help="Batch size.", default=32, type=int)
+parser.add_argument("--steps", required=False, help="Number of timed training steps.", default=50, type=int)
+args = vars(parser.parse_args())
+
+
+def make_batch(batch_size: int, max_nodes: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    nodes, coordinates, indices = [], [], []
+    for _ in range(batch_size):
+        n = int(rng.integers(max_nodes // 2, max_nodes + 1))
+        nodes.append(rng.integers(1, 10, size=n).astype("float32"))
+        coordinates.append((rng.normal(size=(n, 3)) * 1.5).astype("float32"))
+        indices.append(np.array([[i, j] for i in range(n) for j in range(n) if i != j], dtype="int64"))
+    inputs = [tf.RaggedTensor.from_row_lengths(np.concatenate(x, axis=0), [len(y) for y in x])
+              for x in [nodes, coordinates, indices]]
+    return inputs, rng.normal(size=(batch_size, 1)).astype("float32")
+
+
+def time_training_step(model, x, y, steps: int):
+    optimizer = tf.keras.optimizers.Adam()
+
+    @tf.function
+    def train_step(inputs, targets):
+        with tf.GradientTape() as tape:
+            eng, grad = model(inputs, training=True)
+            loss = tf.reduce_mean(tf.square(eng - targets)) + tf.reduce_mean(tf.square(grad))
+        grads = tape.gradient(loss, model.trainable_variables)
+        optimizer.apply_gradients(zip(grads, model.trainable_variables))
+        return loss
+
+    train_step(x, y)  # Tracing.
+    start = time.perf_counter()
+    for _ in range(steps):
+        train_step(x, y)
+    return (time.perf_counter() - start) / steps * 1000
+
+
+if __name__ == "__main__":
+    x, y = make_batch(args["batch_size"], args["num_nodes"])
+    config = {"name": "Schnet", "output_embedding": "graph", "verbose": 0}
+    models = {}
+    for use_batch_jacobian in [True, False]:
+        models[use_batch_jacobian] = EnergyForceModel(
+            module_name="kgcnn.literature.Schnet", class_name="make_model", config=config, coordinate_input=1,
+            output_to_tensor=True, output_squeeze_states=True, use_batch_jacobian=use_batch_jacobian)
+        models[use_batch_jacobian](x)
+    models[False].set_weights(models[True].get_weights())
+    assert np.allclose(models[True](x)[1].numpy(), models[False](x)[1].numpy(), atol=1e-4)
+    print("%20s %16s" % ("use_batch_jacobian", "time/step (ms)"))
+    for use_batch_jacobian, model in models.items():
+        print("%20s %16.3f" % (use_batch_jacobian, time_training_step(model, x, y, args["steps"])))
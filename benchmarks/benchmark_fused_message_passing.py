@@ -0,0 +1,82 @@
+import argparse
+import time
+import numpy as np
+import tensorflow as tf
+from kgcnn.literature.Schnet import make_model
+from kgcnn.layers.message import GatherMessagePooling
+from kgcnn.layers.gather import GatherNodesOutgoing
+from kgcnn.layers.pooling import PoolingLocalEdges
+
+# Time of the message passing step alone and of training Schnet with and without fused gather-message-pooling
+# for small molecule-like graphs.
+parser = argparse.ArgumentParser(description='Benchmark fused message passing of Schnet.')
+parser.add_argument("--num_graphs", required=False, help="Number of graphs.", default=2048, type=int)
+parser.add_argument("--num_nodes", required=False, help="Maximum number of nodes per graph.", default=29, type=int)
+parser.add_argument("--batch_size", required=False, help="Batch size.", default=32, type=int)
+parser.add_argument("--epochs", required=False, help="Number of timed epochs.", default=3, type=int)
+args = vars(parser.parse_args())
+
+
+def make_data(num_graphs: int, max_nodes: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    nodes, coordinates, indices = [], [], []
+    for _ in range(num_graphs):
+        n = int(rng.integers(max_nodes // 2, max_nodes + 1))
+        xyz = rng.normal(size=(n, 3)) * 1.5
+        dist = np.linalg.norm(xyz[:, None, :] - xyz[None, :, :], axis=-1)
+        nodes.append(rng.integers(1, 10, size=n).astype("float32"))
+        coordinates.append(xyz.astype("float32"))
+        indices.append(np.argwhere(np.logical_and(dist < 4.0, dist > 0.0)))
+    inputs = [tf.RaggedTensor.from_row_lengths(np.concatenate(x, axis=0), [len(y) for y in x])
+              for x in [nodes, coordinates, indices]]
+    targets = rng.normal(size=(num_graphs, 1)).astype("float32")
+    return inputs, targets
+
+
+def time_message_passing(inputs, units: int = 128, repeat: int = 100):
+    nodes = tf.RaggedTensor.from_row_splits(tf.random.normal((tf.shape(inputs[0].values)[0], units)),
+                                            inputs[0].row_splits)
+    edges = tf.RaggedTensor.from_row_splits(tf.random.normal((tf.shape(inputs[2].values)[0], units)),
+                                            inputs[2].row_splits)
+    edge_index = inputs[2]
+    gather, pool, fused = GatherNodesOutgoing(), PoolingLocalEdges(pooling_method="sum"), GatherMessagePooling()
+
+    def unfused_step(n, e, ei):
+        return pool([n, gather([n, ei]) * e, ei])
+
+    def fused_step(n, e, ei):
+        return fused([n, e, ei])
+
+    for name, step in [("unfused", unfused_step), ("fused", fused_step)]:
+        @tf.function
+        def train_step(n, e, ei):
+            with tf.GradientTape() as tape:
+                tape.watch(n.values)
+                loss = tf.reduce_sum(step(n, e, ei).values)
+            return tape.gradient(loss, n.values)
+        train_step(nodes, edges, edge_index)  # Tracing.
+        start = time.perf_counter()
+        for _ in range(repeat):
+            train_step(nodes, edges, edge_index)
+        print("%10s %16.3f" % (name, (time.perf_counter() - start) / repeat * 1000))
+
+
+if __name__ == "__main__":
+    x, y = make_data(args["num_graphs"], args["num_nodes"])
+    print("%10s %16s" % ("layer", "forward+backward per batch (ms)"))
+    time_message_passing(make_data(args["batch_size"], args["num_nodes"])[0])
+    interaction_args = {"units": 128, "use_bias": True, "activation": "kgcnn>shifted_softplus", "cfconv_pool": "sum"}
+    reference = None
+    print("%10s %16s" % ("use_fused", "time/epoch (s)"))
+    for use_fused in [False, True]:
+        model = make_model(interaction_args=dict(interaction_args, use_fused=use_fused), verbose=0)
+        if reference is None:
+            reference = model
+        else:
+            model.set_weights(reference.get_weights())
+            assert np.allclose(model.predict(x, verbose=0), reference.predict(x, verbose=0), atol=1e-4)
+        model.compile(loss="mean_squared_error", optimizer="adam")
+        model.fit(x, y, batch_size=args["batch_size"], epochs=1, verbose=0)  # Tracing.
+        start = time.perf_counter()
+        model.fit(x, y, batch_size=args["batch_size"], epochs=args["epochs"], verbose=0)
+        print("%10s %16.3f" % (use_fused, (time.perf_counter() - start) / args["epochs"]))
@@ -0,0 +1,58 @@
+import argparse
+import os
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+from rdkit import RDLogger
+from kgcnn.data.moleculenet import MoleculeNetDataset, map_molecule_callbacks
+
+RDLogger.DisableLog('rdApp.*')
+
+# Compare serial and parallel featurization of molecules with the default callbacks of MoleculeNetDataset.
+parser = argparse.ArgumentParser(description='Benchmark parallel map_molecule_callbacks.')
+parser.add_argument("--num_molecules", required=False, help="Number of molecules.", default=2000, type=int)
+parser.add_argument("--num_workers", required=False, help="Number of worker processes.", default=os.cpu_count(),
+                    type=int)
+parser.add_argument("--chunk_size", required=False, help="Molecules per worker task.", default=None, type=int)
+args = vars(parser.parse_args())
+print("Input of argparse:", args)
+
+smiles = ["CC(C)NCC(O)COc1cccc2ccccc12", "C(=O)(OC(C)(C)C)CCCc1ccc(cc1)N(CCCl)CCCl",
+          "c12c3c(N4CCN(C)CC4)c(F)cc1c(c(C(O)=O)cn2C(C)CO3)=O", "C1CCN(CC1)Cc1cccc(c1)OCCCNC(=O)C", "C1CCX"]
+num_molecules = args["num_molecules"]
+
+with tempfile.TemporaryDirectory() as temp_path:
+    pd.DataFrame({
+        "smiles": [smiles[i % len(smiles)] for i in range(num_molecules)],
+        "label": np.arange(num_molecules)
+    }).to_csv(os.path.join(temp_path, "data.csv"), index=False)
+    dataset = MoleculeNetDataset(data_directory=temp_path, file_name="data.csv", dataset_name="benchmark")
+    dataset.prepare_data(smiles_column_name="smiles", overwrite=True)
+    mol_list = dataset.get_mol_blocks_from_sdf_file()
+    data = dataset.read_in_table_file().data_frame
+
+callbacks = {
+    "node_number": lambda mg, ds: mg.node_number,
+    "edge_indices": lambda mg, ds: mg.edge_number[0],
+    "graph_labels": lambda mg, ds: ds["label"],
+    "node_attributes": lambda mg, ds: np.array(
+        mg.node_attributes(dataset._default_node_attributes, dataset._default_node_encoders), dtype="float32"),
+    "edge_attributes": lambda mg, ds: np.array(
+        mg.edge_attributes(dataset._default_edge_attributes, dataset._default_edge_encoders)[1], dtype="float32"),
+}
+kwargs = {"callbacks": callbacks, "mol_interface_class": dataset._mol_graph_interface}
+
+start = time.perf_counter()
+serial = map_molecule_callbacks(mol_list, data, **kwargs)
+time_serial = time.perf_counter() - start
+
+start = time.perf_counter()
+parallel = map_molecule_callbacks(mol_list, data, num_workers=args["num_workers"], chunk_size=args["chunk_size"],
+                                  **kwargs)
+time_parallel = time.perf_counter() - start
+
+for key in callbacks.keys():
+    assert all([(x is None and y is None) or np.array_equal(x, y) for x, y in zip(serial[key], parallel[key])]), key
+print("Molecules: %s, workers: %s" % (num_molecules, args["num_workers"]))
+print("Serial: %.2f s, parallel: %.2f s, speed-up: %.2fx" % (time_serial, time_parallel, time_serial / time_parallel))
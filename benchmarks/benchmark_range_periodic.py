@@ -0,0 +1,41 @@
+import argparse
+import time
+import numpy as np
+from kgcnn.graph.geom import range_neighbour_lattice
+
+# Time of periodic range connections with distances from each node to all supercell nodes versus a KD-tree of the
+# image nodes near the unit cell. Unit cells of a given number of atoms are generated with a density of crystals.
+parser = argparse.ArgumentParser(description='Benchmark range connections for periodic lattices.')
+parser.add_argument("--num_nodes", required=False, help="Number of atoms per unit cell.", default="8,32,128,512",
+                    type=str)
+parser.add_argument("--max_distance", required=False, help="Cutoff radius.", default=5.0, type=float)
+parser.add_argument("--max_neighbours", required=False, help="Number of neighbours.", default=24, type=int)
+parser.add_argument("--repeat", required=False, help="Number of repetitions.", default=3, type=int)
+args = vars(parser.parse_args())
+
+
+def make_unit_cell(num_nodes: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    length = (num_nodes * 12.0) ** (1 / 3)
+    lattice = np.diag(rng.uniform(0.8, 1.2, 3) * length) + rng.normal(size=(3, 3)) * 0.1 * length
+    return rng.uniform(0.0, 1.0, (num_nodes, 3)) @ lattice, lattice
+
+
+def time_method(coordinates, lattice, method: str, repeat: int, **kwargs):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = range_neighbour_lattice(coordinates, lattice, method=method, **kwargs)
+    return out, (time.perf_counter() - start) / repeat * 1000
+
+
+if __name__ == "__main__":
+    settings = {"max_distance": {"max_distance": args["max_distance"], "max_neighbours": None},
+                "max_neighbours": {"max_distance": None, "max_neighbours": args["max_neighbours"]}}
+    print("%10s %16s %14s %14s" % ("num_nodes", "setting", "dense (ms)", "kdtree (ms)"))
+    for num_nodes in [int(x) for x in args["num_nodes"].split(",")]:
+        coordinates, lattice = make_unit_cell(num_nodes)
+        for name, kwargs in settings.items():
+            dense, time_dense = time_method(coordinates, lattice, "dense", args["repeat"], **kwargs)
+            kdtree, time_kdtree = time_method(coordinates, lattice, "kdtree", args["repeat"], **kwargs)
+            assert len(dense[0]) == len(kdtree[0]) and np.allclose(np.sort(dense[2]), np.sort(kdtree[2]))
+            print("%10i %16s %14.2f %14.2f" % (num_nodes, name, time_dense, time_kdtree))
@@ -0,0 +1,40 @@
+import argparse
+import time
+import numpy as np
+from rdkit import RDLogger
+from kgcnn.mol.encoder import OneHotEncoder
+from kgcnn.mol.graph_rdkit import MolecularGraphRDKit
+from kgcnn.data.moleculenet import MoleculeNetDataset
+
+RDLogger.DisableLog('rdApp.*')
+
+# Compare atom and bond featurization with the default attributes of MoleculeNetDataset by python lists via
+# `node_attributes` and `edge_attributes` against the precompiled `AttributeTable`.
+parser = argparse.ArgumentParser(description='Benchmark featurization of MolecularGraphRDKit.')
+parser.add_argument("--num_molecules", required=False, help="Number of molecules.", default=2000, type=int)
+args = vars(parser.parse_args())
+print("Input of argparse:", args)
+
+smiles = ["CC(C)NCC(O)COc1cccc2ccccc12", "C(=O)(OC(C)(C)C)CCCc1ccc(cc1)N(CCCl)CCCl",
+          "c12c3c(N4CCN(C)CC4)c(F)cc1c(c(C(O)=O)cn2C(C)CO3)=O", "C1CCN(CC1)Cc1cccc(c1)OCCCNC(=O)C"]
+graphs = [MolecularGraphRDKit().from_smiles(smiles[i % len(smiles)]).add_hs() for i in range(args["num_molecules"])]
+nodes, edges = MoleculeNetDataset._default_node_attributes, MoleculeNetDataset._default_edge_attributes
+encoder_nodes = {key: OneHotEncoder(**value.get_config())
+                 for key, value in MoleculeNetDataset._default_node_encoders.items()}
+encoder_edges = {key: OneHotEncoder(**value.get_config())
+                 for key, value in MoleculeNetDataset._default_edge_encoders.items()}
+
+start = time.perf_counter()
+lists = [(np.array(mg.node_attributes(nodes, encoder_nodes), dtype="float32"),
+          np.array(mg.edge_attributes(edges, encoder_edges)[1], dtype="float32")) for mg in graphs]
+time_lists = time.perf_counter() - start
+
+start = time.perf_counter()
+node_table = MolecularGraphRDKit.node_attribute_table(nodes, encoder_nodes)
+edge_table = MolecularGraphRDKit.edge_attribute_table(edges, encoder_edges)
+tables = [(mg.node_attributes_array(node_table), mg.edge_attributes_array(edge_table)[1]) for mg in graphs]
+time_tables = time.perf_counter() - start
+
+assert all([np.array_equal(x[0], y[0]) and np.array_equal(x[1], y[1]) for x, y in zip(lists, tables)])
+print("Molecules: %s" % args["num_molecules"])
+print("Lists: %.2f s, table: %.2f s, speed-up: %.2fx" % (time_lists, time_tables, time_lists / time_tables))
@@ -0,0 +1,130 @@
+import argparse
+import time
+import numpy as np
+from kgcnn.io.loader import tf_dataset_from_graph_list, tf_padded_dataset_from_graph_list
+from kgcnn.literature.Schnet import make_model as make_schnet
+from kgcnn.literature.PAiNN import make_model as make_painn
+from kgcnn.literature.DimeNetPP import make_model as make_dimenet
+from kgcnn.graph.adj import get_angle_indices
+
+# Training time per epoch of models with ragged input versus padded input of a few fixed bucket shapes, which are
+# compiled with XLA once per bucket. Molecules are generated with QM9-like sizes of up to 29 atoms and a range cutoff.
+# The fraction of padded entries is printed as well, since padded input only pays off if the saved overhead of ragged
+# operations and dynamic shapes is larger than the cost of computing the padding.
+parser = argparse.ArgumentParser(description='Benchmark ragged against padded input with XLA compilation.')
+parser.add_argument("--num_molecules", required=False, help="Number of molecules.", default=2048, type=int)
+parser.add_argument("--batch_size", required=False, help="Batch size.", default=32, type=int)
+parser.add_argument("--units", required=False, help="Number of hidden units.", default=64, type=int)
+parser.add_argument("--cutoff", required=False, help="Range cutoff for edges.", default=4.0, type=float)
+parser.add_argument("--epochs", required=False, help="Number of timed epochs.", default=3, type=int)
+parser.add_argument("--quantiles", required=False, help="Quantiles of the number of angles for buckets.",
+                    default="0.5,0.8,1.0", type=str)
+parser.add_argument("--models", required=False, help="Models to compare.", default="Schnet,PAiNN,DimeNetPP", type=str)
+args = vars(parser.parse_args())
+
+
+def make_molecules(num_molecules: int, cutoff: float, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    data = []
+    for _ in range(num_molecules):
+        n = int(rng.integers(9, 30))
+        xyz = rng.normal(size=(n, 3)) * n ** (1 / 3) * 0.8
+        dist = np.linalg.norm(xyz[:, None, :] - xyz[None, :, :], axis=-1)
+        edge_indices = np.argwhere(np.logical_and(dist < cutoff, dist > 0.0))
+        data.append({"node_number": rng.integers(1, 10, size=n),
+                     "node_coordinates": xyz.astype("float32"),
+                     "edge_indices": edge_indices,
+                     "angle_indices": get_angle_indices(edge_indices)[2],
+                     "graph_labels": rng.normal(size=(1,)).astype("float32")})
+    return data
+
+
+ragged_inputs = [{"shape": (None,), "name": "node_number", "dtype": "float32", "ragged": True},
+                 {"shape": (None, 3), "name": "node_coordinates", "dtype": "float32", "ragged": True},
+                 {"shape": (None, 2), "name": "edge_indices", "dtype": "int64", "ragged": True},
+                 {"shape": (None, 2), "name": "angle_indices", "dtype": "int64", "ragged": True}]
+padded_inputs = [{"shape": (None,), "name": "node_number", "dtype": "float32"},
+                 {"shape": (None, 3), "name": "node_coordinates", "dtype": "float32"},
+                 {"shape": (None, 2), "name": "edge_indices", "dtype": "int64"},
+                 {"shape": (None, 2), "name": "angle_indices", "dtype": "int64"},
+                 {"shape": (), "name": "total_nodes", "dtype": "int64"},
+                 {"shape": (), "name": "total_edges", "dtype": "int64"},
+                 {"shape": (), "name": "total_angles", "dtype": "int64"}]
+padded_counts = {"total_nodes": "node_number", "total_edges": "edge_indices", "total_angles": "angle_indices"}
+# Schnet and PAiNN take nodes, coordinates, edges and the counts of nodes and edges, DimeNetPP takes all inputs.
+model_inputs = {"Schnet": [0, 1, 2, 4, 5], "PAiNN": [0, 1, 2, 4, 5], "DimeNetPP": [0, 1, 2, 3, 4, 5, 6]}
+
+
+def time_epoch(model, ds, epochs: int, jit_compile: bool):
+    model.compile(loss="mean_absolute_error", optimizer="adam", jit_compile=jit_compile)
+    model.fit(ds, epochs=1, verbose=0)  # Tracing and compilation for all buckets.
+    start = time.perf_counter()
+    model.fit(ds, epochs=epochs, verbose=0)
+    return (time.perf_counter() - start) / epochs
+
+
+def padded_fraction(ds, counts: dict):
+    names = [x["name"] for x in padded_inputs]
+    num_real, num_padded = {x: 0 for x in counts}, {x: 0 for x in counts}
+    for x, _, _ in ds:
+        for name, size_name in counts.items():
+            num_real[name] += int(np.sum(x[names.index(name)]))
+            num_padded[name] += int(np.prod(x[names.index(size_name)].shape[:2]))
+    return {counts[x]: round(1.0 - num_real[x] / num_padded[x], 3) for x in counts}
+
+
+if __name__ == "__main__":
+    data = make_molecules(args["num_molecules"], args["cutoff"])
+    units = args["units"]
+    num_nodes = np.array([len(x["node_number"]) for x in data])
+    num_edges = np.array([len(x["edge_indices"]) for x in data])
+    num_angles = np.array([len(x["angle_indices"]) for x in data])
+    # Buckets of (max_nodes, max_edges, max_angles) from quantiles of the number of angles.
+    angle_sizes = [int(np.quantile(num_angles, float(q))) for q in args["quantiles"].split(",")]
+    padded_sizes = [{"node_number": int(np.amax(num_nodes[num_angles <= x])),
+                     "edge_indices": int(np.amax(num_edges[num_angles <= x])), "angle_indices": x}
+                    for x in angle_sizes]
+    print("Buckets of padded sizes:", padded_sizes)
+
+    ds_ragged = tf_dataset_from_graph_list(data, ragged_inputs, {"name": "graph_labels"},
+                                           batch_size=args["batch_size"], shuffle=True, seed=1)
+    ds_padded = tf_padded_dataset_from_graph_list(
+        data, padded_inputs, {"name": "graph_labels"}, padded_sizes=padded_sizes, padded_counts=padded_counts,
+        batch_size=args["batch_size"], shuffle=True, seed=1)
+    print("Fraction of padded entries:", padded_fraction(ds_padded, padded_counts))
+
+    models = {
+        "Schnet": lambda **kwargs: make_schnet(
+            interaction_args={"units": units, "use_bias": True, "activation": "kgcnn>shifted_softplus",
+                              "cfconv_pool": "sum"},
+            last_mlp={"use_bias": [True, True], "units": [units, units],
+                      "activation": ["kgcnn>shifted_softplus", "kgcnn>shifted_softplus"]},
+            verbose=0, **kwargs),
+        "PAiNN": lambda **kwargs: make_painn(
+            input_embedding={"node": {"input_dim": 95, "output_dim": units}},
+            conv_args={"units": units, "cutoff": None, "conv_pool": "sum"}, update_args={"units": units},
+            output_mlp={"use_bias": [True, True], "units": [units, 1], "activation": ["swish", "linear"]},
+            verbose=0, **kwargs),
+        "DimeNetPP": lambda **kwargs: make_dimenet(
+            input_embedding={"node": {"input_dim": 95, "output_dim": units}}, emb_size=units, out_emb_size=units,
+            int_emb_size=units // 2, basis_emb_size=8, num_blocks=2, cutoff=args["cutoff"],
+            output_mlp={"use_bias": [True, False], "units": [units, 1], "activation": ["swish", "linear"]},
+            verbose=0, **kwargs)
+    }
+    x_check = next(iter(tf_padded_dataset_from_graph_list(
+        data[:8], padded_inputs, padded_counts=padded_counts, batch_size=8)))
+    x_check_ragged = next(iter(tf_dataset_from_graph_list(data[:8], ragged_inputs, batch_size=8)))
+    print("%10s %14s %16s" % ("model", "mode", "time/epoch (s)"))
+    for name in args["models"].split(","):
+        make, index = models[name], model_inputs[name]
+        index_ragged = [i for i in index if i < len(ragged_inputs)]
+        model_ragged = make(inputs=[ragged_inputs[i] for i in index_ragged])
+        model_padded = make(inputs=[padded_inputs[i] for i in index], input_tensor_type="padded")
+        model_padded.set_weights(model_ragged.get_weights())
+        assert np.allclose(model_ragged.predict(tuple([x_check_ragged[i] for i in index_ragged]), verbose=0),
+                           model_padded.predict(tuple([x_check[i] for i in index]), verbose=0), rtol=1e-3, atol=1e-4)
+        ds_model_ragged = ds_ragged.map(lambda x, y: (tuple([x[i] for i in index_ragged]), y))
+        ds_model_padded = ds_padded.map(lambda x, y, w: (tuple([x[i] for i in index]), y, w))
+        print("%10s %14s %16.3f" % (name, "ragged", time_epoch(model_ragged, ds_model_ragged, args["epochs"], False)))
+        print("%10s %14s %16.3f" % (name, "padded+XLA", time_epoch(model_padded, ds_model_padded, args["epochs"],
+                                                                     True)))
@@ -0,0 +1,157 @@
+import numpy as np
+from pymatgen.core.structure import Structure
+from pymatgen.optimization.neighbors import find_points_in_spheres
+from kgcnn.graph.base import GraphDict
+from kgcnn.crystal.base import module_logger
+from typing import Tuple
+
+
+def structure_to_arrays(structure: Structure) -> dict:
+    r"""Get node information and lattice of a structure as numpy arrays, like :obj:`structure_to_empty_graph` in
+    :obj:`kgcnn.crystal.graph_builder` without symmetrization.
+
+    Args:
+        structure (Structure): Pymatgen structure.
+
+    Returns:
+        dict: Arrays 'atomic_number', 'frac_coords', 'coords' and 'lattice_matrix'.
+    """
+    frac_coords = np.array(structure.frac_coords, dtype="float")
+    return {
+        "atomic_number": np.array([site.specie.number for site in structure.sites]),
+        "frac_coords": _to_unit_cell(frac_coords),
+        "coords": np.array(structure.cart_coords, dtype="float"),
+        "lattice_matrix": np.array(structure.lattice.matrix, dtype="float"),
+    }
+
+
+def _find_neighbours(frac_coords: np.ndarray, lattice: np.ndarray, radius: float) -> tuple:
+    coords = frac_coords @ lattice
+    index1, index2, offset_vectors, distances = find_points_in_spheres(
+        coords, coords, r=radius, pbc=np.array([True] * 3, dtype=int), lattice=lattice, tol=1e-8)
+    # Remove self_loops:
+    no_self_loops = ~np.isclose(distances, 0)
+    return (index1[no_self_loops], index2[no_self_loops], offset_vectors[no_self_loops],
+            distances[no_self_loops])
+
+
+def _networkx_edge_order(source: np.ndarray, target: np.ndarray, num_nodes: int) -> np.ndarray:
+    # Edges of a `MultiDiGraph` are iterated by source node, then by target in the order of the first edge from source
+    # to target and then by order of insertion. Sorting by these keys keeps graphs identical to `from_networkx`.
+    pair = source.astype("int64") * num_nodes + target.astype("int64")
+    _, first_index, inverse = np.unique(pair, return_index=True, return_inverse=True)
+    return np.lexsort((np.arange(len(pair)), first_index[inverse.reshape(-1)], source))
+
+
+def radius_edges(frac_coords: np.ndarray, lattice: np.ndarray, radius: float = 5.) -> Tuple[np.ndarray, ...]:
+    r"""Get all edges within a radius with periodic boundary conditions, like :obj:`add_radius_bonds` in
+    :obj:`kgcnn.crystal.graph_builder` but as numpy arrays.
+
+    Args:
+        frac_coords (np.ndarray): Fractional coordinates of shape `(N, 3)`.
+        lattice (np.ndarray): Lattice matrix of shape `(3, 3)`.
+        radius (float): Cutoff radius. Default is 5.0.
+
+    Returns:
+        tuple: Edge indices of shape `(M, 2)` as (source, target), cell translation of the source of shape `(M, 3)`
+        and distances of shape `(M, )`.
+    """
+    index1, index2, offset_vectors, distances = _find_neighbours(frac_coords, lattice, radius)
+    if len(index1) == 0:
+        module_logger.warning("No edges added to the graph, consider increasing the radius and check your graph "
+                              "input instance.")
+    order = _networkx_edge_order(index2, index1, len(frac_coords))
+    edge_indices = np.stack([index2, index1], axis=-1)[order]
+    return edge_indices, offset_vectors[order], distances[order]
+
+
+def knn_edges(frac_coords: np.ndarray, lattice: np.ndarray, k: int = 12,
+              max_radius: float = 10.) -> Tuple[np.ndarray, ...]:
+    r"""Get edges to the k-nearest neighbours of each node with periodic boundary conditions, like
+    :obj:`add_knn_bonds` in :obj:`kgcnn.crystal.graph_builder` but as numpy arrays.
+
+    Neighbours of all nodes are found with one search within :obj:`max_radius`, which is repeated with doubled radius
+    if a node has less than k neighbours. The neighbours of each node are then sorted by distance with the same
+    :obj:`np.argsort` as :obj:`add_knn_bonds`, so that ties at the k-th distance select the same periodic images and
+    edges have the same order. Note that :obj:`add_knn_bonds` keeps the edges of nodes that were added before
+    repeating the search with a larger radius, whereas here every node has exactly k edges.
+
+    Args:
+        frac_coords (np.ndarray): Fractional coordinates of shape `(N, 3)`.
+        lattice (np.ndarray): Lattice matrix of shape `(3, 3)`.
+        k (int): Number of neighbours. Default is 12.
+        max_radius (float): Initial radius of the neighbour search. Default is 10.0.
+
+    Returns:
+        tuple: Edge indices of shape `(N*k, 2)` as (source, target), cell translation of the source of shape
+        `(N*k, 3)` and distances of shape `(N*k, )`.
+    """
+    num_nodes = len(frac_coords)
+    if num_nodes == 0 or k <= 0:
+        return np.zeros((0, 2), dtype="int64"), np.zeros((0, 3)), np.zeros((0, ))
+    while True:
+        index1, index2, offset_vectors, distances = _find_neighbours(frac_coords, lattice, max_radius)
+        counts = np.bincount(index1, minlength=num_nodes)
+        if np.amin(counts) >= k:
+            break
+        max_radius = max_radius * 2
+
+    # Neighbours of each target node in the order of the neighbour search, as `np.argwhere(index1 == i)`.
+    groups = np.split(np.argsort(index1, kind="stable"), np.cumsum(counts)[:-1])
+    selected = np.concatenate([group[np.argsort(distances[group])[:k]] for group in groups])
+
+    index1, index2 = index1[selected], index2[selected]
+    order = _networkx_edge_order(index2, index1, num_nodes)
+    edge_indices = np.stack([index2, index1], axis=-1)[order]
+    return edge_indices, offset_vectors[selected][order], distances[selected][order]
+
+
+def edge_offsets(frac_coords: np.ndarray, lattice: np.ndarray, edge_indices: np.ndarray,
+                 cell_translation: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    r"""Get the offset vectors and distances of edges, like :obj:`add_edge_information` in
+    :obj:`kgcnn.crystal.graph_builder`.
+
+    Args:
+        frac_coords (np.ndarray): Fractional coordinates of shape `(N, 3)`.
+        lattice (np.ndarray): Lattice matrix of shape `(3, 3)`.
+        edge_indices (np.ndarray): Edge indices of shape `(M, 2)` as (source, target).
+        cell_translation (np.ndarray): Cell translation of the source of shape `(M, 3)`.
+
+    Returns:
+        tuple: Offset vectors of shape `(M, 3)` and distances of shape `(M, )`.
+    """
+    frac_offset = frac_coords[edge_indices[:, 1]] - (frac_coords[edge_indices[:, 0]] + cell_translation)
+    offset = frac_offset @ lattice
+    return offset, np.linalg.norm(offset, axis=-1)
+
+
+def arrays_to_graph_dict(nodes: dict, edge_indices: np.ndarray, cell_translation: np.ndarray) -> GraphDict:
+    r"""Make a :obj:`GraphDict` from node arrays and edges with the same property names as
+    :obj:`GraphDict.from_networkx` for the unit cell preprocessors in :obj:`kgcnn.crystal.preprocessor`.
+
+    Args:
+        nodes (dict): Node arrays and lattice from :obj:`structure_to_arrays`.
+        edge_indices (np.ndarray): Edge indices of shape `(M, 2)` as (source, target).
+        cell_translation (np.ndarray): Cell translation of the source of shape `(M, 3)`.
+
+    Returns:
+        GraphDict: Graph with 'node_number' as node IDs, 'edge_indices', node attributes 'atomic_number',
+        'frac_coords', 'coords', edge attributes 'cell_translation', 'distance', 'offset' and graph attribute
+        'lattice_matrix'.
+    """
+    offset, distance = edge_offsets(nodes["frac_coords"], nodes["lattice_matrix"], edge_indices, cell_translation)
+    return GraphDict({
+        "node_number": np.arange(len(nodes["atomic_number"])),
+        "edge_indices": edge_indices,
+        "atomic_number": nodes["atomic_number"],
+        "frac_coords": nodes["frac_coords"],
+        "coords": nodes["coords"],
+        "cell_translation": cell_translation,
+        "distance": distance,
+        "offset": offset,
+        "lattice_matrix": nodes["lattice_matrix"],
+    })
+
+
+def _to_unit_cell(frac_coords):
+    return frac_coords % 1. % 1.
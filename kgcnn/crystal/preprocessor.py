@@ -7,6 +7,8 @@ from . import graph_builder
 from pymatgen.core.structure import Structure
 from kgcnn.crystal.base import CrystalPreprocessor
 from . import graph_builder
+from . import array_graph_builder
+from kgcnn.graph.base import GraphDict
 from networkx import MultiDiGraph
 
 
@@ -40,6 +42,40 @@ class KNNUnitCell(CrystalPreprocessor):
         return g
 
 
+class ArrayRadiusUnitCell(CrystalPreprocessor):
+    r"""Same graph as :obj:`RadiusUnitCell` but built with numpy arrays of :obj:`array_graph_builder` and returned as
+    :obj:`GraphDict` instead of a networkx graph."""
+    node_attributes = ['atomic_number', 'frac_coords', 'coords']
+    edge_attributes = ['cell_translation', 'distance', 'offset']
+    graph_attributes = ['lattice_matrix']
+
+    def __init__(self, radius=3.0):
+        self.radius = radius
+
+    def __call__(self, structure: Structure) -> GraphDict:
+        nodes = array_graph_builder.structure_to_arrays(structure)
+        edge_indices, cell_translation, _ = array_graph_builder.radius_edges(
+            nodes["frac_coords"], nodes["lattice_matrix"], radius=self.radius)
+        return array_graph_builder.arrays_to_graph_dict(nodes, edge_indices, cell_translation)
+
+
+class ArrayKNNUnitCell(CrystalPreprocessor):
+    r"""Same graph as :obj:`KNNUnitCell` but built with numpy arrays of :obj:`array_graph_builder` and returned as
+    :obj:`GraphDict` instead of a networkx graph."""
+    node_attributes = ['atomic_number', 'frac_coords', 'coords']
+    edge_attributes = ['cell_translation', 'distance', 'offset']
+    graph_attributes = ['lattice_matrix']
+
+    def __init__(self, k=12):
+        self.k = k
+
+    def __call__(self, structure: Structure) -> GraphDict:
+        nodes = array_graph_builder.structure_to_arrays(structure)
+        edge_indices, cell_translation, _ = array_graph_builder.knn_edges(
+            nodes["frac_coords"], nodes["lattice_matrix"], k=self.k)
+        return array_graph_builder.arrays_to_graph_dict(nodes, edge_indices, cell_translation)
+
+
 class VoronoiUnitCell(CrystalPreprocessor):
     node_attributes = ['atomic_number', 'frac_coords', 'coords']
     edge_attributes = ['cell_translation', 'distance', 'offset']
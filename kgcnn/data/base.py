@@ -3,16 +3,44 @@ import numpy as np
 import tensorflow as tf
 import pandas as pd
 import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from typing import Union, List, Callable
 from collections.abc import MutableMapping
 from kgcnn.data.utils import save_pickle_file, load_pickle_file, ragged_tensor_from_nested_numpy
-from kgcnn.graph.base import GraphDict
+from kgcnn.data.columnar import save_columnar_graph_list, load_columnar_graph_list
+from kgcnn.data.cache import GraphPropertyCache
+from kgcnn.graph.base import GraphDict, GraphPreProcessorBase
+from kgcnn.graph.serial import get_preprocessor
 
 logging.basicConfig()  # Module logger
 module_logger = logging.getLogger(__name__)
 module_logger.setLevel(logging.INFO)
 
 
+def _map_method_on_graph_chunk(method: Callable, graphs: List[dict], kwargs: dict):
+    """Apply a preprocessor or callable on a chunk of graphs in a worker process.
+
+    Returns:
+        tuple: List of changed or new properties for each graph, or `None` on error, and list of
+        (index, message, traceback) of errors.
+    """
+    results, errors = [], []
+    for i, g in enumerate(graphs):
+        graph = GraphDict(g)
+        try:
+            if isinstance(method, GraphPreProcessorBase):
+                out = method(graph)
+            else:
+                method(graph, **kwargs)
+                out = graph
+            results.append(dict(out))
+        except Exception as e:
+            results.append(None)
+            errors.append((i, repr(e), traceback.format_exc()))
+    return results, errors
+
+
 class MemoryGraphList(MutableMapping):
     r"""Class to store a list of graph dictionaries in memory.
 
@@ -204,7 +232,7 @@ class MemoryGraphList(MutableMapping):
         else:
             raise TypeError("Wrong type, expected e.g. [{'name': 'edge_indices', 'ragged': True}, {...}, ...]")
 
-    def map_list(self, method: Union[str, Callable], **kwargs):
+    def map_list(self, method: Union[str, Callable], num_workers: int = None, chunk_size: int = None, **kwargs):
         r"""Map a method over this list and apply on each :obj:`GraphDict`.
         For :obj:`method` being string, either a class-method or a preprocessor is chosen for backward compatibility.
 
@@ -213,31 +241,89 @@ class MemoryGraphList(MutableMapping):
             for i, x in enumerate(self):
                 method(x, **kwargs)
 
+        With :obj:`num_workers` larger than one, preprocessors of :obj:`kgcnn.graph.preprocessor` and picklable
+        callables are applied in a process pool on chunks of the list. The results are written back in order.
+        Callables must change the graph in place and can only add or replace properties in that case.
+        Class methods of :obj:`GraphDict` are always applied serially.
+
+        .. code-block:: python
+
+            data.map_list("set_range", max_distance=4.0, num_workers=8, chunk_size=1000)
+
         Args:
             method (str): Name of the :obj:`GraphDict` method.
+            num_workers (int): Number of worker processes. Default is None, which maps serially.
+            chunk_size (int): Number of graphs sent to a worker per task. Default is None, which splits
+                the list into four chunks per worker.
             kwargs: Kwargs for `method`.
 
         Returns:
             self
         """
-        # Can add progress info here.
         # Method by name.
         if isinstance(method, str):
-            for i, x in enumerate(self._list):
+            if len(self._list) > 0 and hasattr(self._list[0], method):
                 # If this is a class method.
-                if hasattr(x, method):
+                if num_workers is not None and num_workers > 1:
+                    self.logger.warning("Can not map class method '%s' in parallel." % method)
+                for i, x in enumerate(self._list):
                     getattr(x, method)(**kwargs)
-                else:
-                    # For compatibility names can refer to preprocessors.
-                    x.apply_preprocessor(name=method, **kwargs)
+                return self
+            # For compatibility names can refer to preprocessors.
+            method = get_preprocessor(method, **kwargs)
+            kwargs = {}
         elif isinstance(method, dict):
             raise NotImplementedError("Serialization for method in `map_list` is not yet supported")
+
+        if num_workers is not None and num_workers > 1 and len(self._list) > 0:
+            return self._map_list_parallel(method, num_workers=num_workers, chunk_size=chunk_size, **kwargs)
+
+        if isinstance(method, GraphPreProcessorBase):
+            for i, x in enumerate(self._list):
+                x.apply_preprocessor(method)
         else:
             # For any callable method to map.
             for i, x in enumerate(self._list):
                 method(x, **kwargs)
         return self
 
+    def _map_list_parallel(self, method: Callable, num_workers: int, chunk_size: int = None, **kwargs):
+        """Map a preprocessor or picklable callable over this list in a process pool. See :obj:`map_list`."""
+        num_graphs = len(self._list)
+        if chunk_size is None:
+            chunk_size = int(np.ceil(num_graphs / (4 * num_workers)))
+        chunk_size = max(int(chunk_size), 1)
+        chunk_starts = list(range(0, num_graphs, chunk_size))
+        num_chunks = len(chunk_starts)
+        name = type(method).__name__ if isinstance(method, GraphPreProcessorBase) else getattr(
+            method, "__name__", str(method))
+        self.logger.info("Map '%s' on %s graphs with %s workers in %s chunks." % (
+            name, num_graphs, num_workers, num_chunks))
+
+        errors = []
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            futures = [
+                executor.submit(_map_method_on_graph_chunk, method, [
+                    x.to_dict() for x in self._list[start:start + chunk_size]], kwargs) for start in chunk_starts]
+            # Futures are collected in order of submission to write back results in order.
+            for n, (start, future) in enumerate(zip(chunk_starts, futures)):
+                results, chunk_errors = future.result()
+                for i, out in enumerate(results):
+                    if out is not None:
+                        # Values are already arrays. Dict update does not copy them again.
+                        self._list[start + i].update(out)
+                for i, msg, trace in chunk_errors:
+                    if len(errors) == 0:
+                        msg = msg + "\n" + trace
+                    self.logger.error("Failed to map '%s' on graph %s: %s" % (name, start + i, msg))
+                    errors.append(start + i)
+                if (n + 1) % max(num_chunks // 10, 1) == 0 or n + 1 == num_chunks:
+                    self.logger.info(" ... mapped chunk {0} from {1}".format(n + 1, num_chunks))
+        if len(errors) > 0:
+            raise RuntimeError("Mapping '%s' failed on %s graphs, first failed graph is %s." % (
+                name, len(errors), errors[0]))
+        return self
+
     def clean(self, inputs: Union[list, str]):
         r"""Given a list of property names, this method removes all elements from the internal list of
         `GraphDict` items, which do not define at least one of those properties. Meaning, only those graphs remain in
@@ -288,6 +374,29 @@ class MemoryGraphList(MutableMapping):
             self._list.pop(int(i))
         return invalid_graphs
 
+    def has_sorted_indices(self, key: str = "edge_indices", index: int = 0) -> bool:
+        r"""Check whether the index lists of all graphs are sorted in ascending order for one of the index columns.
+        This is the case after e.g. :obj:`kgcnn.graph.preprocessor.SortEdgeIndices` has been applied. Since the
+        tensor output of :obj:`tensor` keeps the order of indices in each graph, pooling layers of a model can then
+        be set to `is_sorted=True` to skip sorting of indices.
+
+        Args:
+            key (str): Name of the index property. Default is "edge_indices".
+            index (int): Column of the index list that must be sorted. Default is 0.
+
+        Returns:
+            bool: Whether indices are sorted for all graphs that define the property.
+        """
+        props = self.obtain_property(key)
+        if props is None:
+            return False
+        for x in props:
+            if x is None or len(x) == 0:
+                continue
+            if np.any(np.diff(np.asarray(x)[:, index]) < 0):
+                return False
+        return True
+
     # Alias of internal assign and obtain property.
     set = assign_property
     get = obtain_property
@@ -383,33 +492,60 @@ class MemoryGraphDataset(MemoryGraphList):
         """Pass error to class' logger instance."""
         self.logger.error(*args, **kwargs)
 
-    def save(self, filepath: str = None):
+    def save(self, filepath: str = None, file_format: str = "pickle"):
         r"""Save all graph properties to python dictionary as pickled file. By default, saves a file named
         :obj:`dataset_name.kgcnn.pickle` in :obj:`data_directory`.
 
+        With `file_format='columnar'` each property is stored as one concatenated array plus row splits in a
+        directory named :obj:`dataset_name.kgcnn.columns`, which can be memory-mapped on :obj:`load`.
+        See :obj:`kgcnn.data.columnar.save_columnar_graph_list` for details.
+
         Args:
-            filepath (str): Full path of output file. Default is None.
+            filepath (str): Full path of output file or directory. Default is None.
+            file_format (str): Storage format, either 'pickle' or 'columnar'. Default is 'pickle'.
         """
         if filepath is None:
-            filepath = os.path.join(self.data_directory, self.dataset_name + ".kgcnn.pickle")
-        self.info("Pickle dataset...")
-        save_pickle_file([x.to_dict() for x in self._list], filepath)
+            filepath = self._default_save_path(file_format)
+        if file_format == "pickle":
+            self.info("Pickle dataset...")
+            save_pickle_file([x.to_dict() for x in self._list], filepath)
+        elif file_format == "columnar":
+            self.info("Save dataset in columns...")
+            save_columnar_graph_list(self._list, filepath)
+        else:
+            raise ValueError("Unsupported file format '%s' for dataset." % file_format)
         return self
 
-    def load(self, filepath: str = None):
+    def load(self, filepath: str = None, file_format: str = "pickle", mmap_mode: str = "r"):
         r"""Load graph properties from a pickled file. By default, loads a file named
         :obj:`dataset_name.kgcnn.pickle` in :obj:`data_directory`.
 
+        With `file_format='columnar'` the property arrays are memory-mapped from :obj:`dataset_name.kgcnn.columns`
+        and the items of each :obj:`GraphDict` are lazy views into them.
+
         Args:
-            filepath (str): Full path of input file.
+            filepath (str): Full path of input file or directory.
+            file_format (str): Storage format, either 'pickle' or 'columnar'. Default is 'pickle'.
+            mmap_mode (str): Memory-map mode for 'columnar' format. Default is 'r'.
         """
         if filepath is None:
-            filepath = os.path.join(self.data_directory, self.dataset_name + ".kgcnn.pickle")
-        self.info("Load pickled dataset...")
-        in_list = load_pickle_file(filepath)
-        self._list = [GraphDict(x) for x in in_list]
+            filepath = self._default_save_path(file_format)
+        if file_format == "pickle":
+            self.info("Load pickled dataset...")
+            in_list = load_pickle_file(filepath)
+            self._list = [GraphDict(x) for x in in_list]
+        elif file_format == "columnar":
+            self.info("Load dataset from columns...")
+            self._list = load_columnar_graph_list(filepath, mmap_mode=mmap_mode)
+        else:
+            raise ValueError("Unsupported file format '%s' for dataset." % file_format)
         return self
 
+    def _default_save_path(self, file_format: str = "pickle"):
+        if file_format == "columnar":
+            return os.path.join(self.data_directory, self.dataset_name + ".kgcnn.columns")
+        return os.path.join(self.data_directory, self.dataset_name + ".kgcnn.pickle")
+
     def read_in_table_file(self, file_path: str = None, **kwargs):
         r"""Read a data frame in :obj:`data_frame` from file path. By default, uses :obj:`file_name` and pandas.
         Checks for a '.csv' file and then for Excel file endings. Meaning the file extension of file_path is ignored
@@ -566,7 +702,7 @@ class MemoryGraphDataset(MemoryGraphList):
 
         return out_list
 
-    def set_methods(self, method_list: List[dict]) -> None:
+    def set_methods(self, method_list: List[dict], cache: Union[dict, GraphPropertyCache] = None) -> None:
         r"""Apply a list of serialized class-methods on the dataset.
 
         This can extend the config-serialization scheme in :obj:`kgcnn.utils.serial`.
@@ -578,19 +714,80 @@ class MemoryGraphDataset(MemoryGraphList):
                     if hasattr(self, method):
                         getattr(self, method)(**kwargs)
 
+        Preprocessing via :obj:`map_list` can be run in parallel by adding `num_workers` and `chunk_size` to its
+        kwargs, e.g. `{"map_list": {"method": "set_range", "max_distance": 4, "num_workers": 8}}`.
+
+        With :obj:`cache`, the graph properties computed by :obj:`map_list` with preprocessors are stored in a
+        :obj:`GraphPropertyCache`. The key of each step is the hash of the dataset source and content, all previous
+        methods and the config of the preprocessor. If the key is found, the properties are loaded into memory instead
+        of recomputed.
+
         Args:
             method_list (list): A list of dictionaries that specify class methods. The `dict` key denotes the method
                 and the value must contain `kwargs` for the method
+            cache (dict, GraphPropertyCache): Cache or kwargs of :obj:`GraphPropertyCache`, like
+                `{"directory": "cache", "max_size": 1e10}`. Default is None.
 
         Returns:
             None.
         """
+        if isinstance(cache, dict):
+            cache = GraphPropertyCache(**cache)
+        applied_methods = []
+        source_fingerprint = self._source_fingerprint() if cache is not None else None
         for method_item in method_list:
             for method, kwargs in method_item.items():
-                if hasattr(self, method):
+                if not hasattr(self, method):
+                    self.error("Class does not have method '%s'." % method)
+                    continue
+                method_config = self._map_list_config(**kwargs) if method == "map_list" else None
+                if cache is None or method_config is None:
                     getattr(self, method)(**kwargs)
                 else:
-                    self.error("Class does not have method '%s'." % method)
+                    self._map_list_cached(cache, cache.hash_key(
+                        source_fingerprint, applied_methods, method_config), **kwargs)
+                applied_methods.append({method: method_config if method_config is not None else kwargs})
+
+    def _source_fingerprint(self) -> dict:
+        """Information to identify the source of the dataset for caching, including a hash of all graph properties."""
+        fingerprint = {"class_name": type(self).__name__, "dataset_name": self.dataset_name,
+                       "data_directory": self.data_directory, "file_name": self.file_name,
+                       "file_directory": self.file_directory, "length": len(self),
+                       "content": GraphPropertyCache.hash_graphs(self._list)}
+        if self.data_directory is not None and self.file_name is not None:
+            file_path = os.path.join(self.data_directory, self.file_name)
+            if os.path.exists(file_path):
+                fingerprint.update({"file_size": os.path.getsize(file_path),
+                                    "file_modified": os.path.getmtime(file_path)})
+        return fingerprint
+
+    @staticmethod
+    def _map_list_config(method: Union[str, Callable], num_workers: int = None, chunk_size: int = None, **kwargs):
+        """Config of the method of :obj:`map_list` for caching or `None`, if method can not be serialized."""
+        if isinstance(method, str):
+            if hasattr(GraphDict, method):
+                return {"method": method, "kwargs": kwargs}
+            method = get_preprocessor(method, **kwargs)
+        if isinstance(method, GraphPreProcessorBase):
+            return {"class_name": type(method).__name__, "config": method.get_config()}
+        return None
+
+    def _map_list_cached(self, cache: GraphPropertyCache, key: str, **kwargs):
+        """Apply :obj:`map_list` or load the properties that it computes from cache."""
+        # Load into memory, since memory-mapped arrays of the cache are read-only.
+        cached = cache.load(key, mmap_mode=None)
+        if cached is not None and len(cached) == len(self._list):
+            self.info("Load properties of 'map_list' with %s from cache." % kwargs["method"])
+            for g, cached_properties in zip(self._list, cached):
+                g.update(cached_properties)
+            return self
+        # Keep references to previous values to find new or changed properties.
+        previous = [g.to_dict() for g in self._list]
+        self.map_list(**kwargs)
+        changed = [{k: v for k, v in g.items() if k not in p or p[k] is not v} for g, p in zip(self._list, previous)]
+        self.info("Store properties of 'map_list' with %s in cache." % kwargs["method"])
+        cache.save(key, changed)
+        return self
 
     def get_split_indices(self, name: str = "kfold", return_as_train_test: bool = True,
                           shuffle: bool = True, seed: int = None):
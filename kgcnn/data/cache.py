@@ -0,0 +1,183 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import numpy as np
+from typing import Union, List
+from kgcnn.data.columnar import save_columnar_graph_list, load_columnar_graph_list
+from kgcnn.graph.base import GraphDict
+
+logging.basicConfig()  # Module logger
+module_logger = logging.getLogger(__name__)
+module_logger.setLevel(logging.INFO)
+
+
+class GraphPropertyCache:
+    r"""Content-addressed cache on disk for graph properties computed by preprocessors.
+
+    Each entry is a directory named by a hash key, which holds the properties of a list of graphs in the columnar
+    format of :obj:`kgcnn.data.columnar`. Keys are built from any json-serializable information with :obj:`hash_key`,
+    typically the source of the dataset and the configs of all preprocessors that were applied on it.
+    If :obj:`max_size` is set, the least recently used entries are removed when the size of the cache exceeds it.
+
+    .. code-block:: python
+
+        from kgcnn.data.cache import GraphPropertyCache
+        cache = GraphPropertyCache("cache_directory", max_size=10 * 1024**3)
+        key = cache.hash_key({"dataset": "QM9Dataset"}, SetRange(max_distance=4.0).get_config())
+        properties = cache.load(key)
+        if properties is None:
+            properties = ...  # Compute list of dictionaries of new graph properties.
+            cache.save(key, properties)
+
+    """
+
+    _access_file_name = "last_access"
+
+    def __init__(self, directory: str, max_size: Union[int, float] = None):
+        r"""Initialize cache with directory.
+
+        Args:
+            directory (str): Path to the directory of the cache. Is created if it does not exist.
+            max_size (int): Maximum size of the cache in bytes. Default is None.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def hash_key(*args) -> str:
+        r"""Make a hash key from json-serializable arguments like configs of preprocessors.
+
+        Args:
+            args: Objects that can be serialized by json. Not serializable objects are cast to string.
+
+        Returns:
+            str: Hexadecimal sha256 hash.
+        """
+        serialized = json.dumps(args, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def hash_graphs(graphs: list) -> str:
+        r"""Make a hash of the content of a list of graphs, i.e. the names, dtypes, shapes and values of all properties.
+
+        Args:
+            graphs (list): List of dictionaries of graph properties.
+
+        Returns:
+            str: Hexadecimal sha256 hash.
+        """
+        content_hash = hashlib.sha256()
+        for g in graphs:
+            for name in sorted(g.keys()):
+                value = g[name]
+                content_hash.update(name.encode("utf-8"))
+                if isinstance(value, np.ndarray) and value.dtype != object:
+                    content_hash.update(("%s%s" % (value.dtype.str, value.shape)).encode("utf-8"))
+                    content_hash.update(np.ascontiguousarray(value).view(np.uint8).reshape(-1))
+                else:
+                    content_hash.update(repr(value).encode("utf-8"))
+            content_hash.update(b";")
+        return content_hash.hexdigest()
+
+    def _entry_path(self, key: str):
+        return os.path.join(self.directory, key)
+
+    def _touch(self, key: str):
+        with open(os.path.join(self._entry_path(key), self._access_file_name), "w") as f:
+            f.write(str(time.time()))
+
+    def _last_access(self, key: str) -> float:
+        access_path = os.path.join(self._entry_path(key), self._access_file_name)
+        if not os.path.exists(access_path):
+            return 0.0
+        return os.path.getmtime(access_path)
+
+    def has_key(self, key: str) -> bool:
+        """Whether the cache has a complete entry for key."""
+        return os.path.exists(os.path.join(self._entry_path(key), self._access_file_name))
+
+    def load(self, key: str, mmap_mode: str = "r") -> Union[List[GraphDict], None]:
+        r"""Load the list of graph properties for key, or `None` if there is no entry.
+
+        Args:
+            key (str): Hash key of the entry.
+            mmap_mode (str): Memory-map mode for the property arrays. Default is 'r'.
+
+        Returns:
+            list: List of :obj:`GraphDict` or None.
+        """
+        if not self.has_key(key):
+            return None
+        graphs = load_columnar_graph_list(self._entry_path(key), mmap_mode=mmap_mode)
+        self._touch(key)
+        return graphs
+
+    def save(self, key: str, graphs: list):
+        r"""Save a list of graph properties for key and evict old entries if the cache is too large.
+
+        Args:
+            key (str): Hash key of the entry.
+            graphs (list): List of dictionaries of graph properties.
+
+        Returns:
+            None.
+        """
+        # Write into temporary directory first, so that incomplete entries are never found.
+        temp_path = self._entry_path(key) + ".tmp%s" % os.getpid()
+        if os.path.exists(temp_path):
+            shutil.rmtree(temp_path)
+        save_columnar_graph_list(graphs, temp_path)
+        if os.path.exists(self._entry_path(key)):
+            shutil.rmtree(self._entry_path(key))
+        os.rename(temp_path, self._entry_path(key))
+        self._touch(key)
+        self.evict()
+
+    def keys(self) -> list:
+        """List of keys of complete entries in the cache."""
+        return [x for x in os.listdir(self.directory) if self.has_key(x)]
+
+    def _entry_size(self, key: str) -> int:
+        size = 0
+        for root, _, files in os.walk(self._entry_path(key)):
+            size += sum([os.path.getsize(os.path.join(root, x)) for x in files])
+        return size
+
+    def size(self) -> int:
+        """Total size of all entries in bytes."""
+        return sum([self._entry_size(x) for x in self.keys()])
+
+    def evict(self, max_size: Union[int, float] = None):
+        r"""Remove least recently used entries until the size of the cache is below :obj:`max_size`.
+
+        Args:
+            max_size (int): Maximum size in bytes. Defaults to :obj:`max_size` of the cache.
+
+        Returns:
+            list: Keys of removed entries.
+        """
+        max_size = max_size if max_size is not None else self.max_size
+        if max_size is None:
+            return []
+        keys = sorted(self.keys(), key=self._last_access)
+        sizes = {x: self._entry_size(x) for x in keys}
+        total_size = sum(sizes.values())
+        removed = []
+        # Always keep the most recent entry.
+        for key in keys[:-1]:
+            if total_size <= max_size:
+                break
+            module_logger.info("Remove cache entry '%s' of %s bytes." % (key, sizes[key]))
+            shutil.rmtree(self._entry_path(key))
+            total_size -= sizes[key]
+            removed.append(key)
+        return removed
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        for key in self.keys():
+            shutil.rmtree(self._entry_path(key))
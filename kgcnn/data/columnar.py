@@ -0,0 +1,154 @@
+import os
+import logging
+import numpy as np
+from typing import List
+from kgcnn.data.utils import save_json_file, load_json_file, save_pickle_file, load_pickle_file
+from kgcnn.graph.base import GraphDict
+
+logging.basicConfig()  # Module logger
+module_logger = logging.getLogger(__name__)
+module_logger.setLevel(logging.INFO)
+
+# Name of the json-file that describes the stored columns in the columnar directory.
+_COLUMNAR_INFO_FILE = "columns.json"
+
+
+def graph_property_to_columns(values: list):
+    r"""Pack a list of per-graph arrays of one property into a columnar representation.
+
+    Arrays that have at least one dimension are concatenated along the first axis and indexed with `row_splits`,
+    i.e. the property of graph `i` is `values[row_splits[i]:row_splits[i+1]]`. Scalar arrays are stacked, so that the
+    property of graph `i` is `values[i]`. Graphs that do not define the property are marked in `mask`.
+    Arrays of object type or with mismatching trailing shapes can not be packed and `None` is returned.
+
+    .. code-block:: python
+
+        import numpy as np
+        from kgcnn.data.columnar import graph_property_to_columns
+        columns = graph_property_to_columns([np.array([[0, 1], [1, 0]]), None, np.array([[0, 0]])])
+        print(columns["values"], columns["row_splits"], columns["mask"])
+        # [[0 1] [1 0] [0 0]] [0 2 2 3] [ True False  True]
+
+    Args:
+        values (list): List of numpy arrays of a graph property. Items can be `None`.
+
+    Returns:
+        dict: Dictionary with 'kind', 'values', 'row_splits' and 'mask' or `None` if property can not be packed.
+    """
+    mask = np.array([x is not None for x in values], dtype="bool")
+    arrays = [np.asarray(x) for x in values if x is not None]
+    if len(arrays) == 0:
+        return None
+    if any([x.dtype == object for x in arrays]):
+        return None
+    if all([len(x.shape) == 0 for x in arrays]):
+        dtype = np.result_type(*arrays)
+        stacked = np.zeros(len(values), dtype=dtype)
+        stacked[mask] = np.array(arrays, dtype=dtype)
+        return {"kind": "scalar", "values": stacked, "row_splits": None, "mask": mask}
+    if any([len(x.shape) == 0 for x in arrays]):
+        return None
+    if len(set([x.shape[1:] for x in arrays])) > 1:
+        return None
+    row_lengths = np.zeros(len(values), dtype="int64")
+    row_lengths[mask] = [len(x) for x in arrays]
+    row_splits = np.concatenate([np.array([0], dtype="int64"), np.cumsum(row_lengths)])
+    return {"kind": "ragged", "values": np.concatenate(arrays, axis=0), "row_splits": row_splits, "mask": mask}
+
+
+def save_columnar_graph_list(graph_list: list, directory: str):
+    r"""Save a list of graph dictionaries in a columnar format to a directory.
+
+    Each property is stored as a single '.npy' file of concatenated values plus its row splits, which can be
+    memory-mapped by :obj:`load_columnar_graph_list`. Properties that can not be packed into an array, like object
+    arrays or tensors with different trailing shapes, are pickled into a separate file.
+
+    .. code-block:: console
+
+        ├── directory
+            ├── columns.json
+            ├── edge_indices.values.npy
+            ├── edge_indices.row_splits.npy
+            ├── edge_indices.mask.npy
+            ├── ...
+            └── objects.pickle
+
+    Args:
+        graph_list (list, MemoryGraphList): List of graph dictionaries.
+        directory (str): Path of the output directory. Is created if it does not exist.
+
+    Returns:
+        None.
+    """
+    os.makedirs(directory, exist_ok=True)
+    graph_list = [x for x in graph_list]
+    property_names = []
+    for g in graph_list:
+        for key in g.keys():
+            if key not in property_names:
+                property_names.append(key)
+
+    info = {"num_graphs": len(graph_list), "columns": {}, "objects": []}
+    objects = {}
+    for key in property_names:
+        values = [g[key] if key in g else None for g in graph_list]
+        columns = graph_property_to_columns(values)
+        if columns is None:
+            module_logger.warning("Can not store property '%s' in columns, falling back to pickle." % key)
+            info["objects"].append(key)
+            objects[key] = values
+            continue
+        info["columns"][key] = {"kind": columns["kind"], "has_mask": not bool(np.all(columns["mask"]))}
+        np.save(os.path.join(directory, key + ".values.npy"), columns["values"], allow_pickle=False)
+        if columns["row_splits"] is not None:
+            np.save(os.path.join(directory, key + ".row_splits.npy"), columns["row_splits"], allow_pickle=False)
+        if info["columns"][key]["has_mask"]:
+            np.save(os.path.join(directory, key + ".mask.npy"), columns["mask"], allow_pickle=False)
+    if len(objects) > 0:
+        save_pickle_file(objects, os.path.join(directory, "objects.pickle"))
+    save_json_file(info, os.path.join(directory, _COLUMNAR_INFO_FILE))
+
+
+def load_columnar_graph_list(directory: str, mmap_mode: str = "r") -> List[GraphDict]:
+    r"""Load a list of :obj:`GraphDict` from a directory written by :obj:`save_columnar_graph_list`.
+
+    The column arrays are memory-mapped and the items of the graph dictionaries are views into them. No data is
+    copied or read from disk until it is accessed, and several processes can share the same pages. With the default
+    `mmap_mode='r'` the arrays are read-only. Assigning new properties to the graphs is not affected by this.
+
+    Args:
+        directory (str): Path of the directory of the columnar dataset.
+        mmap_mode (str): Memory-map mode for :obj:`np.load`. Use `None` to load arrays into memory. Default is 'r'.
+
+    Returns:
+        list: List of :obj:`GraphDict` with views into the columns.
+    """
+    info = load_json_file(os.path.join(directory, _COLUMNAR_INFO_FILE))
+    num_graphs = info["num_graphs"]
+    graph_list = [GraphDict() for _ in range(num_graphs)]
+
+    def _load_npy(name):
+        return np.load(os.path.join(directory, name), mmap_mode=mmap_mode, allow_pickle=False)
+
+    for key, column_info in info["columns"].items():
+        # Plain array view on the memory-map, since slicing `np.memmap` itself is considerably slower.
+        values = _load_npy(key + ".values.npy").view(np.ndarray)
+        if column_info["kind"] == "scalar":
+            items = [values[i:i + 1].reshape(()) for i in range(num_graphs)]
+        else:
+            row_splits = np.array(_load_npy(key + ".row_splits.npy")).tolist()
+            items = [values[start:end] for start, end in zip(row_splits[:-1], row_splits[1:])]
+        if column_info["has_mask"]:
+            mask = np.array(_load_npy(key + ".mask.npy")).tolist()
+            items = [x if m else None for x, m in zip(items, mask)]
+        for g, x in zip(graph_list, items):
+            # Use dict update to not cast views into new arrays.
+            if x is not None:
+                g.update({key: x})
+
+    if len(info["objects"]) > 0:
+        objects = load_pickle_file(os.path.join(directory, "objects.pickle"))
+        for key, values in objects.items():
+            for g, x in zip(graph_list, values):
+                g.assign_property(key, x)
+    return graph_list
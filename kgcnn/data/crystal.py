@@ -1,7 +1,10 @@
 import os
+import traceback
+import multiprocessing
 import numpy as np
 from collections import defaultdict
 from typing import Dict, Callable, List, Union
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import pymatgen
 import pymatgen.io.cif
@@ -9,11 +12,56 @@ import pymatgen.core.structure
 import pymatgen.symmetry.structure
 
 from kgcnn.data.base import MemoryGraphDataset
+from kgcnn.data.cache import GraphPropertyCache
+from kgcnn.data.table import TableColumns
 from kgcnn.data.utils import save_json_file, load_json_file
 from kgcnn.crystal.base import CrystalPreprocessor
 from kgcnn.graph.base import GraphDict
 
 
+def _crystal_graph_to_properties(graph, pre_processor: CrystalPreprocessor, property_names: dict) -> dict:
+    """Convert the output of a crystal preprocessor into a dictionary of arrays with kgcnn property names."""
+    if isinstance(graph, GraphDict):
+        graph_dict = graph
+    else:
+        graph_dict = GraphDict().from_networkx(graph, node_attributes=pre_processor.node_attributes,
+                                               edge_attributes=pre_processor.edge_attributes)
+    # Edges of preprocessors point from the sending node in the periodic image to the receiving node.
+    out = {"edge_indices": np.array(graph_dict["edge_indices"], dtype="int64").reshape(-1, 2)[:, ::-1].copy()}
+    for level, names in [("node", pre_processor.node_attributes), ("edge", pre_processor.edge_attributes),
+                         ("graph", pre_processor.graph_attributes)]:
+        for name in names:
+            value = graph_dict[name] if name in graph_dict else getattr(graph, name)
+            out[property_names.get(name, level + "_" + name)] = np.array(value)
+    image_name, distance_name = property_names["cell_translation"], property_names["distance"]
+    if image_name in out:
+        out[image_name] = np.round(out[image_name]).astype("int64").reshape(-1, 3)
+    if distance_name in out:
+        # Need one feature dimension like range attributes.
+        out[distance_name] = out[distance_name].reshape(-1, 1)
+    return out
+
+
+# Arguments of set_representation that are set once in each worker process by the pool initializer.
+_worker_representation_kwargs = {}
+
+
+def _init_representation_worker(kwargs: dict):
+    _worker_representation_kwargs.clear()
+    _worker_representation_kwargs.update(kwargs)
+
+
+def _representation_worker(start: int, stop: int):
+    """Preprocess one chunk of structures in a worker. Returns list of properties and error message."""
+    try:
+        pre_processor = _worker_representation_kwargs["pre_processor"]
+        property_names = _worker_representation_kwargs["property_names"]
+        return [_crystal_graph_to_properties(pre_processor(s), pre_processor, property_names)
+                for s in _worker_representation_kwargs["structs"][start:stop]], None
+    except Exception as e:
+        return None, repr(e) + "\n" + traceback.format_exc()
+
+
 class CrystalDataset(MemoryGraphDataset):
     r"""Class for making graph dataset from periodic structures such as crystals.
 
@@ -53,6 +101,12 @@ class CrystalDataset(MemoryGraphDataset):
 
     _default_loop_update_info = 5000
 
+    # Property names in the dataset for attributes of crystal preprocessors.
+    _default_representation_names = {
+        "atomic_number": "node_number", "frac_coords": "node_frac_coordinates", "coords": "node_coordinates",
+        "cell_translation": "edge_image", "distance": "edge_distance", "offset": "edge_offset",
+        "lattice_matrix": "graph_lattice"}
+
     def __init__(self,
                  data_directory: str = None,
                  dataset_name: str = None,
@@ -123,6 +177,8 @@ class CrystalDataset(MemoryGraphDataset):
         dicts = self._pymatgen_serialize_structs(structs)
         self.info("Saving structures as .json ...")
         save_json_file(dicts, file_path)
+        if file_path == self.pymatgen_json_file_path:
+            self._structs = None
 
     @staticmethod
     def _pymatgen_parse_file_to_structure(cif_file: str):
@@ -176,36 +232,51 @@ class CrystalDataset(MemoryGraphDataset):
         self.info("Reading structures from .json ...")
         return self._pymatgen_deserialize_dicts(load_json_file(file_path))
 
-    def _map_callbacks(self, structs: list, data: pd.Series,
+    def _map_callbacks(self, structs: list, data: Union[pd.Series, pd.DataFrame],
                        callbacks: Dict[
-                           str, Callable[[pymatgen.core.structure.Structure, pd.Series], Union[np.ndarray, None]]],
+                           str, Union[Callable[[pymatgen.core.structure.Structure, pd.Series], Union[np.ndarray, None]],
+                                      str, list]],
                        assign_to_self: bool = True) -> dict:
         """Map callbacks on a data series object plus structure list.
 
+        The table is converted into numpy arrays by :obj:`TableColumns` once and callbacks receive a :obj:`TableRow`
+        of the structure, which maps column names to values like a pandas series. A callback can also be the name of
+        a column or a list of column names, of which the values are taken for all structures at once.
+
         Args:
             structs (list): List of pymatgen structures.
-            data (pd.Series, pd.DataFrame): Data Frame matching the structure list.
-            callbacks (dict): Dictionary of callbacks that take a data object plus pymatgen structure as argument.
+            data (pd.Series, pd.DataFrame): Data Frame matching the structure list by position.
+            callbacks (dict): Dictionary of callbacks that take a data object plus pymatgen structure as argument, or
+                names of columns of the table.
             assign_to_self (bool): Whether to already assign the output of callbacks to this class.
 
         Returns:
             dict: Values of callbacks.
         """
+        table = TableColumns(data) if data is not None else None
+        column_callbacks = {name: key for name, key in callbacks.items() if isinstance(key, (str, list, tuple))}
+        callbacks = {name: callback for name, callback in callbacks.items() if name not in column_callbacks}
 
         # The dictionaries values are lists, one for each attribute defines in "callbacks" and each value in those
         # lists corresponds to one structure in the dataset.
         value_lists = defaultdict(list)
         for index, st in enumerate(structs):
+            data_dict = table[index] if table is not None and st is not None else None
             for name, callback in callbacks.items():
                 if st is None:
                     value_lists[name].append(None)
                 else:
-                    data_dict = data.loc[index]
                     value = callback(st, data_dict)
                     value_lists[name].append(value)
             if index % self._default_loop_update_info == 0:
                 self.info(" ... read structures {0} from {1}".format(index, len(structs)))
 
+        for name, key in column_callbacks.items():
+            if table is None:
+                raise ValueError("Can not take column '%s' for '%s' without data." % (key, name))
+            values = table.get_values(key)[:len(structs)]
+            value_lists[name] = [x if st is not None else None for x, st in zip(values, structs)]
+
         # The string key names of the original "callbacks" dict are also used as the names of the properties which are
         # assigned
         if assign_to_self:
@@ -231,7 +302,7 @@ class CrystalDataset(MemoryGraphDataset):
             additional_callbacks = {}
 
         self.info("Making node features from structure...")
-        callbacks = {"graph_labels": lambda st, ds: ds[label_column_name] if label_column_name is not None else None,
+        callbacks = {"graph_labels": label_column_name if label_column_name is not None else lambda st, ds: None,
                      "node_coordinates": lambda st, ds: np.array(st.cart_coords, dtype="float"),
                      "node_frac_coordinates": lambda st, ds: np.array(st.frac_coords, dtype="float"),
                      "graph_lattice": lambda st, ds: np.ascontiguousarray(np.array(st.lattice.matrix), dtype="float"),
@@ -242,31 +313,126 @@ class CrystalDataset(MemoryGraphDataset):
                      **additional_callbacks
                      }
 
-        self._map_callbacks(structs=self.get_structures_from_json_file(),
+        self._map_callbacks(structs=self.get_structures(),
                             data=self.read_in_table_file(file_path=self.file_path).data_frame,
                             callbacks=callbacks)
 
         return self
 
-    def set_representation(self, pre_processor: CrystalPreprocessor, reset_graphs: bool = False):
-        # TODO: Add documentation
-        if reset_graphs:
-            self.clear()
-        # Read pymatgen JSON file from file.
-        structs = self.get_structures_from_json_file()
-        if reset_graphs:
-            self.empty(len(structs))
+    def get_structures(self, reload: bool = False) -> List:
+        """Get pymatgen structures of the json-file, which are deserialized only once and kept in memory.
 
-        for index, s in enumerate(structs):
-            g = pre_processor(s)
-            graph_dict = GraphDict()
-            graph_dict.from_networkx(g, node_attributes=pre_processor.node_attributes,
-                                     edge_attributes=pre_processor.edge_attributes)
-            # TODO: Add graph attributes (label, lattice_matrix, etc.)
-            # TODO: Rename node and edge properties to match kgcnn conventions
-            # TODO: Add GraphDict to dataset
+        Args:
+            reload (bool): Whether to read the json-file again. Default is False.
 
-            if index % self._default_loop_update_info == 0:
-                self.info(" ... preprocess structures {0} from {1}".format(index, len(structs)))
+        Returns:
+            list: List of pymatgen structures.
+        """
+        if self._structs is None or reload:
+            self._structs = self.get_structures_from_json_file()
+        return self._structs
+
+    def _representation_cache_key(self, cache: GraphPropertyCache, pre_processor: CrystalPreprocessor,
+                                  property_names: dict) -> str:
+        """Hash key of a representation from the pymatgen json-file and the preprocessor."""
+        file_path = self.pymatgen_json_file_path
+        source = {"class_name": type(self).__name__, "dataset_name": self.dataset_name, "file_path": file_path,
+                  "file_size": os.path.getsize(file_path), "file_modified": os.path.getmtime(file_path)}
+        return cache.hash_key(source, pre_processor.hash(), property_names)
+
+    def set_representation(self, pre_processor: CrystalPreprocessor, reset_graphs: bool = False,
+                           num_workers: int = None, chunk_size: int = None,
+                           cache: Union[dict, GraphPropertyCache] = None, property_names: dict = None):
+        r"""Set the graph representation of the structures by a :obj:`CrystalPreprocessor` like
+        :obj:`RadiusUnitCell`, :obj:`KNNUnitCell` or :obj:`VoronoiUnitCell` of :obj:`kgcnn.crystal.preprocessor`.
+
+        The attributes of the preprocessor are stored in the dataset with kgcnn property names, e.g. 'node_number',
+        'node_coordinates', 'edge_image' and 'graph_lattice', see :obj:`_default_representation_names`. Attributes
+        without default name are prefixed by 'node', 'edge' or 'graph'. The 'edge_indices' are flipped to have the
+        receiving node first and the sending node in the periodic image of 'edge_image' second.
+
+        With :obj:`num_workers` larger than one, structures are processed in a process pool. With :obj:`cache`,
+        properties are stored in a :obj:`GraphPropertyCache` with a key from :obj:`CrystalPreprocessor.hash`, so that
+        switching back to a representation only loads it from disk.
+
+        .. code-block:: python
+
+            from kgcnn.crystal.preprocessor import KNNUnitCell
+            dataset.set_representation(KNNUnitCell(k=12), num_workers=8, cache={"directory": "cache"})
+
+        Args:
+            pre_processor (CrystalPreprocessor): Preprocessor to make a graph from a pymatgen structure.
+            reset_graphs (bool): Whether to clear all properties of the dataset before. Default is False.
+            num_workers (int): Number of worker processes. Default is None, which runs serially.
+            chunk_size (int): Number of structures sent to a worker per task. Default is None, which splits
+                the structures into four chunks per worker.
+            cache (dict, GraphPropertyCache): Cache or kwargs of :obj:`GraphPropertyCache`, like
+                `{"directory": "cache", "max_size": 1e10}`. Default is None.
+            property_names (dict): Names of the properties in the dataset for attributes of the preprocessor,
+                which update :obj:`_default_representation_names`. Default is None.
 
+        Returns:
+            self
+        """
+        property_names = {**self._default_representation_names,
+                          **(property_names if property_names is not None else {})}
+        structs = self.get_structures()
+        if reset_graphs:
+            self.clear()
+        if len(self) == 0:
+            self.empty(len(structs))
+        if len(self) != len(structs):
+            raise ValueError("Dataset of length %s does not match %s structures." % (len(self), len(structs)))
+
+        if isinstance(cache, dict):
+            cache = GraphPropertyCache(**cache)
+        key = self._representation_cache_key(cache, pre_processor, property_names) if cache is not None else None
+        # Load into memory, since memory-mapped arrays of the cache are read-only.
+        graphs = cache.load(key, mmap_mode=None) if cache is not None else None
+        is_cached = graphs is not None and len(graphs) == len(structs)
+        if is_cached:
+            self.info("Load representation '%s' from cache." % type(pre_processor).__name__)
+        elif num_workers is not None and num_workers > 1 and len(structs) > 0:
+            graphs = self._set_representation_parallel(
+                structs, pre_processor, property_names, num_workers=num_workers, chunk_size=chunk_size)
+        else:
+            graphs = []
+            for index, s in enumerate(structs):
+                graphs.append(_crystal_graph_to_properties(pre_processor(s), pre_processor, property_names))
+                if index % self._default_loop_update_info == 0:
+                    self.info(" ... preprocess structures {0} from {1}".format(index, len(structs)))
+        if cache is not None and not is_cached:
+            self.info("Store representation '%s' in cache." % type(pre_processor).__name__)
+            cache.save(key, graphs)
+
+        for g, properties in zip(self._list, graphs):
+            g.update(properties)
         return self
+
+    def _set_representation_parallel(self, structs: list, pre_processor: CrystalPreprocessor, property_names: dict,
+                                     num_workers: int, chunk_size: int = None) -> list:
+        """Process pool version of :obj:`set_representation`."""
+        num_structs = len(structs)
+        if chunk_size is None:
+            chunk_size = int(np.ceil(num_structs / (4 * num_workers)))
+        chunk_size = max(int(chunk_size), 1)
+        chunk_starts = list(range(0, num_structs, chunk_size))
+        num_chunks = len(chunk_starts)
+        self.info("Preprocess %s structures with %s workers in %s chunks." % (num_structs, num_workers, num_chunks))
+
+        worker_kwargs = {"structs": structs, "pre_processor": pre_processor, "property_names": property_names}
+        # With fork, structures are inherited by workers and not pickled for each task.
+        mp_context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+        graphs = []
+        with ProcessPoolExecutor(max_workers=num_workers, mp_context=mp_context,
+                                 initializer=_init_representation_worker, initargs=(worker_kwargs,)) as executor:
+            futures = [executor.submit(_representation_worker, start, start + chunk_size) for start in chunk_starts]
+            # Futures are collected in order of submission to keep the order of structures.
+            for n, (start, future) in enumerate(zip(chunk_starts, futures)):
+                values, error = future.result()
+                if error is not None:
+                    raise RuntimeError("Preprocessing structures of chunk starting at %s failed: %s" % (start, error))
+                graphs.extend(values)
+                if (n + 1) % max(num_chunks // 10, 1) == 0 or n + 1 == num_chunks:
+                    self.info(" ... preprocessed chunk {0} from {1}".format(n + 1, num_chunks))
+        return graphs
@@ -1,11 +1,15 @@
 import os
+import traceback
+import multiprocessing
 import numpy as np
 import pandas as pd
 
 from typing import Dict, Callable, Union, List
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from kgcnn.mol.serial import deserialize_encoder
 from kgcnn.data.base import MemoryGraphDataset
+from kgcnn.data.table import TableColumns
 from kgcnn.mol.base import MolGraphInterface
 from kgcnn.mol.encoder import OneHotEncoder
 from kgcnn.mol.io import write_mol_block_list_to_sdf, read_mol_list_from_sdf_file, write_smiles_file
@@ -18,14 +22,16 @@ except ModuleNotFoundError:
 
 
 def map_molecule_callbacks(mol_list: List[str],
-                           data: Union[pd.Series, pd.DataFrame],
-                           callbacks: Dict[str, Callable[[MolGraphInterface, pd.Series], None]],
+                           data: Union[pd.Series, pd.DataFrame, TableColumns],
+                           callbacks: Dict[str, Union[Callable[[MolGraphInterface, pd.Series], None], str, list]],
                            custom_transform: Callable[[MolGraphInterface], MolGraphInterface] = None,
                            add_hydrogen: bool = False,
                            make_directed: bool = False,
                            mol_interface_class=None,
                            logger=None,
-                           loop_update_info: int = 5000
+                           loop_update_info: int = 5000,
+                           num_workers: int = None,
+                           chunk_size: int = None
                            ) -> dict:
     r"""This method receive the list of molecules, as well as the data from a pandas data series.
     It then iterates over all the molecules / data rows and invokes the callbacks for each.
@@ -35,7 +41,12 @@ def map_molecule_callbacks(mol_list: List[str],
     derive that data. Those callback functions get two parameters:
 
         - mg: The :obj:`MolGraphInterface` instance for the current molecule
-        - ds: A pandas data series that match data in the CSV file for the specific molecule.
+        - ds: A :obj:`TableRow` that maps column names to the data in the CSV file for the specific molecule, like
+          a pandas data series of the row.
+
+    The table is converted into numpy arrays by :obj:`TableColumns` once, so that rows are not located by pandas for
+    each molecule. Instead of a function, a callback can also be the name of a column or a list of column names,
+    of which the values are taken for all molecules at once.
 
     The string keys of the "callbacks" directory are also the string names which are later used to assign the
     properties of the underlying :obj:`GraphList`. This means that each element of the dataset will then have a
@@ -46,6 +57,12 @@ def map_molecule_callbacks(mol_list: List[str],
         If a molecule cannot be properly loaded by :obj:`MolGraphInterface`, then for all attributes
         "None" is added without invoking the callback!
 
+    With :obj:`num_workers` larger than one, :obj:`mol_list` and the matching rows of :obj:`data` are split into
+    chunks of :obj:`chunk_size`, which are processed in a pool of worker processes. Results are returned in the
+    original order. Callbacks are handed to the workers on start-up, which allows lambda functions if processes can be
+    forked. Otherwise, callbacks and transform must be picklable. Note that stateful callbacks, like encoders that
+    collect found values, only change their copies in the worker processes.
+
     Example:
 
     .. code-block:: python
@@ -58,7 +75,7 @@ def map_molecule_callbacks(mol_list: List[str],
             mol_net.read_in_table_file().data_frame,
             callbacks={
                 'graph_size': lambda mg, dd: len(mg.node_number),
-                'index': lambda mg, dd: dd['index']
+                'index': 'index'
             }
         )
 
@@ -71,9 +88,11 @@ def map_molecule_callbacks(mol_list: List[str],
 
 
     Args:
-        mol_list (list): List of mol strings.
-        data (pd.DataFrame): Pandas data frame or series matching list of mol-strings.
-        callbacks (dict): Dictionary of callbacks to perform on MolecularGraph object and table entries.
+        mol_list (list): List of mol strings. Can also be a :obj:`IndexedMolFile` to read mol strings on access.
+        data (pd.DataFrame): Pandas data frame or series matching list of mol-strings by position. Can also be
+            :obj:`TableColumns` of the data frame.
+        callbacks (dict): Dictionary of callbacks to perform on MolecularGraph object and table entries, or names of
+            columns of the table.
         add_hydrogen (bool): Whether to add hydrogen when making a :obj:`MolecularGraphRDKit` instance.
         make_directed (bool): Whether to have directed or undirected bonds. Default is False.
         custom_transform (Callable): Custom transformation function to modify the generated
@@ -82,39 +101,127 @@ def map_molecule_callbacks(mol_list: List[str],
         mol_interface_class: Interface for molecular graphs. Must be a :obj:`MolGraphInterface`.
         logger: Logger to report error and progress.
         loop_update_info (int): Updates for processed molecules.
+        num_workers (int): Number of worker processes. Default is None, which runs serially.
+        chunk_size (int): Number of molecules per task for parallel execution. Default is None, which makes about
+            four chunks per worker.
 
     Returns:
         dict: Values of callbacks.
     """
-    # Dictionaries values are lists, one for each attribute defines in "callbacks" and each value in those
-    # lists corresponds to one molecule in the dataset.
     if data is None:
         if logger is not None:
             logger.error("Received no pandas data.")
     if mol_list is None:
         raise ValueError("Expected list of mol-string. But got '%s'" % mol_list)
-
+    if data is not None and not isinstance(data, TableColumns):
+        data = TableColumns(data)
+
+    if num_workers is not None and num_workers > 1 and len(mol_list) > 0:
+        return _map_molecule_callbacks_parallel(
+            mol_list, data, callbacks=callbacks, custom_transform=custom_transform, add_hydrogen=add_hydrogen,
+            make_directed=make_directed, mol_interface_class=mol_interface_class, logger=logger,
+            num_workers=num_workers, chunk_size=chunk_size)
+
+    return _map_molecule_callbacks_chunk(
+        mol_list, data, callbacks=callbacks, custom_transform=custom_transform, add_hydrogen=add_hydrogen,
+        make_directed=make_directed, mol_interface_class=mol_interface_class, logger=logger,
+        loop_update_info=loop_update_info)
+
+
+def _map_molecule_callbacks_chunk(mol_list: List[str], data: TableColumns, callbacks: dict, custom_transform=None,
+                                  add_hydrogen: bool = False, make_directed: bool = False, mol_interface_class=None,
+                                  logger=None, loop_update_info: int = 5000, index_offset: int = 0) -> dict:
+    """Serial loop of :obj:`map_molecule_callbacks`. Rows of `data` are located by `index_offset` plus position."""
+    # Callbacks that only pick columns of the table are taken for all valid molecules after the loop.
+    column_callbacks = {name: key for name, key in callbacks.items() if isinstance(key, (str, list, tuple))}
+    callbacks = {name: callback for name, callback in callbacks.items() if name not in column_callbacks}
+    # Dictionaries values are lists, one for each attribute defines in "callbacks" and each value in those
+    # lists corresponds to one molecule in the dataset.
     value_lists = defaultdict(list)
-    for index, sm in enumerate(mol_list):
-
+    is_valid = []
+    for i, sm in enumerate(mol_list):
+        index = index_offset + i
         mg = mol_interface_class(make_directed=make_directed).from_mol_block(sm, keep_hs=add_hydrogen)
 
         if custom_transform is not None:
             mg = custom_transform(mg)
 
+        is_valid.append(mg.mol is not None)
+        data_dict = data[index] if data is not None and mg.mol is not None else None
         for name, callback in callbacks.items():
             if mg.mol is None:
                 value_lists[name].append(None)
             else:
-                if data is not None:
-                    data_dict = data.loc[index]
-                else:
-                    data_dict = None
                 value = callback(mg, data_dict)
                 value_lists[name].append(value)
-        if index % loop_update_info == 0:
-            if logger is not None:
-                logger.info(" ... process molecules {0} from {1}".format(index, len(mol_list)))
+        if logger is not None and index % loop_update_info == 0:
+            logger.info(" ... process molecules {0} from {1}".format(index, len(mol_list)))
+
+    for name, key in column_callbacks.items():
+        if data is None:
+            raise ValueError("Can not take column '%s' for '%s' without data." % (key, name))
+        values = data.get_values(key)[index_offset:index_offset + len(is_valid)]
+        value_lists[name] = [x if valid else None for x, valid in zip(values, is_valid)]
+
+    return value_lists
+
+
+# Arguments of map_molecule_callbacks that are set once in each worker process by the pool initializer.
+_worker_callback_kwargs = {}
+
+
+def _init_molecule_callbacks_worker(kwargs: dict):
+    _worker_callback_kwargs.clear()
+    _worker_callback_kwargs.update(kwargs)
+
+
+def _map_molecule_callbacks_worker(start: int, stop: int):
+    """Process one chunk of molecules in a worker. Returns values and error message."""
+    try:
+        kwargs = {key: value for key, value in _worker_callback_kwargs.items() if key != "mol_list"}
+        values = _map_molecule_callbacks_chunk(
+            _worker_callback_kwargs["mol_list"][start:stop], index_offset=start, **kwargs)
+        return dict(values), None
+    except Exception as e:
+        return None, repr(e) + "\n" + traceback.format_exc()
+
+
+def _map_molecule_callbacks_parallel(mol_list: List[str], data: TableColumns, callbacks: dict, custom_transform=None,
+                                     add_hydrogen: bool = False, make_directed: bool = False,
+                                     mol_interface_class=None, logger=None, num_workers: int = 2,
+                                     chunk_size: int = None) -> dict:
+    """Process pool version of :obj:`map_molecule_callbacks`."""
+    num_mols = len(mol_list)
+    if chunk_size is None:
+        chunk_size = int(np.ceil(num_mols / (4 * num_workers)))
+    chunk_size = max(int(chunk_size), 1)
+    chunk_starts = list(range(0, num_mols, chunk_size))
+    num_chunks = len(chunk_starts)
+    if logger is not None:
+        logger.info("Process %s molecules with %s workers in %s chunks." % (num_mols, num_workers, num_chunks))
+
+    worker_kwargs = {"mol_list": mol_list, "data": data, "callbacks": callbacks, "custom_transform": custom_transform,
+                     "add_hydrogen": add_hydrogen, "make_directed": make_directed,
+                     "mol_interface_class": mol_interface_class}
+    # With fork, initializer arguments are inherited and not pickled, which allows lambda callbacks.
+    # Workers read their chunk of molecules, which can be an `IndexedMolFile` that reads them from disk, and take
+    # the rows of the table by position.
+    mp_context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+
+    value_lists = defaultdict(list)
+    with ProcessPoolExecutor(max_workers=num_workers, mp_context=mp_context,
+                             initializer=_init_molecule_callbacks_worker, initargs=(worker_kwargs,)) as executor:
+        futures = [
+            executor.submit(_map_molecule_callbacks_worker, start, start + chunk_size) for start in chunk_starts]
+        # Futures are collected in order of submission to keep the order of molecules.
+        for n, (start, future) in enumerate(zip(chunk_starts, futures)):
+            values, error = future.result()
+            if error is not None:
+                raise RuntimeError("Processing molecules of chunk starting at %s failed: %s" % (start, error))
+            for name in callbacks.keys():
+                value_lists[name].extend(values[name])
+            if logger is not None and ((n + 1) % max(num_chunks // 10, 1) == 0 or n + 1 == num_chunks):
+                logger.info(" ... processed chunk {0} from {1}".format(n + 1, num_chunks))
 
     return value_lists
 
@@ -201,7 +308,8 @@ class MoleculeNetDataset(MemoryGraphDataset):
     def prepare_data(self, overwrite: bool = False, smiles_column_name: str = "smiles",
                      add_hydrogen: bool = True, sanitize: bool = True,
                      make_conformers: bool = True, optimize_conformer: bool = True,
-                     external_program: dict = None, num_workers: int = None):
+                     external_program: dict = None, num_workers: int = None, parallel_backend: str = "thread",
+                     timeout: float = None):
         r"""Computation of molecular structure information and optionally conformers from smiles.
 
         This function reads smiles from the csv-file given by :obj:`file_name` and creates a single SDF File of
@@ -224,6 +332,10 @@ class MoleculeNetDataset(MemoryGraphDataset):
                 Note that usually the parameters like :obj:`add_hydrogen` are ignored. And you need to control the
                 SDF file generation within `config` of the :obj:`external_program`.
             num_workers (int): Parallel execution for translating smiles.
+            parallel_backend (str): Either 'thread' or 'process' for parallel execution. Conformer generation only runs
+                in parallel with 'process'. Default is 'thread'.
+            timeout (float): Timeout in seconds for translating a single smile. Molecules that exceed the timeout are
+                written as empty mol-block. Requires `parallel_backend='process'`. Default is None.
 
         Returns:
             self
@@ -244,18 +356,28 @@ class MoleculeNetDataset(MemoryGraphDataset):
         conv.smile_to_mol(
             self.file_path_smiles, self.file_path_mol, add_hydrogen=add_hydrogen, sanitize=sanitize,
             make_conformers=make_conformers, optimize_conformer=optimize_conformer,
-            external_program=external_program, num_workers=num_workers,
-            logger=self.logger, batch_size=self._default_loop_update_info
+            external_program=external_program, num_workers=num_workers, parallel_backend=parallel_backend,
+            timeout=timeout,
+            logger=self.logger, batch_size=self._default_loop_update_info, return_mol_list=False
         )
         return self
 
-    def get_mol_blocks_from_sdf_file(self):
+    def get_mol_blocks_from_sdf_file(self, lazy: bool = False):
+        """Get a list of mol-blocks from file.
+
+        Args:
+            lazy (bool): Whether to return an :obj:`IndexedMolFile` that reads mol-blocks on access.
+                Default is False.
+
+        Returns:
+            list: List of mol-strings.
+        """
         if not os.path.exists(self.file_path_mol):
             raise FileNotFoundError("Can not load molecules for dataset %s" % self.dataset_name)
 
         # Loading the molecules and the csv data
         self.info("Read molecules from mol-file.")
-        return read_mol_list_from_sdf_file(self.file_path_mol)
+        return read_mol_list_from_sdf_file(self.file_path_mol, lazy=lazy)
 
     def set_attributes(self,
                        label_column_name: Union[str, list] = None,
@@ -269,7 +391,9 @@ class MoleculeNetDataset(MemoryGraphDataset):
                        make_directed: bool = False,
                        has_conformers: bool = True,
                        additional_callbacks: Dict[str, Callable[[MolGraphInterface, dict], None]] = None,
-                       custom_transform: Callable[[MolGraphInterface], MolGraphInterface] = None):
+                       custom_transform: Callable[[MolGraphInterface], MolGraphInterface] = None,
+                       num_workers: int = None,
+                       chunk_size: int = None):
         """Load list of molecules from cached SDF-file in into memory. File name must be given in :obj:`file_name` and
         path information in the constructor of this class.
 
@@ -337,6 +461,8 @@ class MoleculeNetDataset(MemoryGraphDataset):
             custom_transform (Callable): Custom transformation function to modify the generated
                 :obj:`MolecularGraphRDKit` before callbacks are carried out. The function must take a single
                 :obj:`MolecularGraphRDKit` instance as argument and return a (new) :obj:`MolecularGraphRDKit` instance.
+            num_workers (int): Number of worker processes to featurize molecules. Default is None, which runs serially.
+            chunk_size (int): Number of molecules per worker task. Default is None.
 
         Returns:
             self
@@ -366,12 +492,24 @@ class MoleculeNetDataset(MemoryGraphDataset):
         if has_conformers:
             callbacks.update({'node_coordinates': lambda mg, ds: mg.node_coordinates})
         if label_column_name:
-            callbacks.update({'graph_labels': lambda mg, ds: ds[label_column_name]})
+            callbacks.update({'graph_labels': label_column_name})
 
         # Attributes callbacks.
+        if hasattr(self._mol_graph_interface, "node_attribute_table"):
+            # Properties and encoders are resolved once for all molecules.
+            node_table = self._mol_graph_interface.node_attribute_table(nodes, encoder_nodes)
+            edge_table = self._mol_graph_interface.edge_attribute_table(edges, encoder_edges)
+            callbacks.update({
+                'node_attributes': lambda mg, ds: mg.node_attributes_array(node_table),
+                'edge_attributes': lambda mg, ds: mg.edge_attributes_array(edge_table)[1],
+            })
+        else:
+            callbacks.update({
+                'node_attributes': lambda mg, ds: np.array(mg.node_attributes(nodes, encoder_nodes), dtype='float32'),
+                'edge_attributes': lambda mg, ds: np.array(
+                    mg.edge_attributes(edges, encoder_edges)[1], dtype='float32'),
+            })
         callbacks.update({
-            'node_attributes': lambda mg, ds: np.array(mg.node_attributes(nodes, encoder_nodes), dtype='float32'),
-            'edge_attributes': lambda mg, ds: np.array(mg.edge_attributes(edges, encoder_edges)[1], dtype='float32'),
             'graph_attributes': lambda mg, ds: np.array(mg.graph_attributes(graph, encoder_graph), dtype='float32')
         })
 
@@ -379,7 +517,7 @@ class MoleculeNetDataset(MemoryGraphDataset):
         callbacks.update(additional_callbacks)
 
         value_lists = map_molecule_callbacks(
-            self.get_mol_blocks_from_sdf_file(),
+            self.get_mol_blocks_from_sdf_file(lazy=True),
             self.read_in_table_file().data_frame,
             callbacks=callbacks,
             add_hydrogen=add_hydrogen,
@@ -387,7 +525,9 @@ class MoleculeNetDataset(MemoryGraphDataset):
             make_directed=make_directed,
             mol_interface_class=self._mol_graph_interface,
             logger=self.logger,
-            loop_update_info=self._default_loop_update_info
+            loop_update_info=self._default_loop_update_info,
+            num_workers=num_workers,
+            chunk_size=chunk_size
         )
 
         for name, values in value_lists.items():
@@ -82,24 +82,28 @@ class QMDataset(MemoryGraphDataset):
         """Try to determine a file name for the mol information to store."""
         return os.path.splitext(self.file_path)[0] + ".xyz"
 
-    def get_geom_from_xyz_file(self, file_path: str) -> list:
+    def get_geom_from_xyz_file(self, file_path: str, lazy: bool = False) -> list:
         """Get a list of xyz items from file.
 
         Args:
             file_path (str): File path of XYZ file. Default None uses :obj:`file_path_xyz`.
+            lazy (bool): Whether to return an :obj:`IndexedMolFile` that reads geometries on access.
+                Default is False.
 
         Returns:
             list: List of xyz lists.
         """
         if file_path is None:
             file_path = self.file_path_xyz
-        return read_xyz_file(file_path)
+        return read_xyz_file(file_path, lazy=lazy)
 
-    def get_mol_blocks_from_sdf_file(self, file_path: str = None) -> list:
+    def get_mol_blocks_from_sdf_file(self, file_path: str = None, lazy: bool = False) -> list:
         """Get a list of mol-blocks from file.
 
         Args:
             file_path (str): File path of SDF file. Default None uses :obj:`file_path_mol`.
+            lazy (bool): Whether to return an :obj:`IndexedMolFile` that reads mol-blocks on access.
+                Default is False.
 
         Returns:
             list: List of mol-strings.
@@ -109,7 +113,7 @@ class QMDataset(MemoryGraphDataset):
         if not os.path.exists(file_path):
             raise FileNotFoundError("Can not load SDF for dataset %s" % self.dataset_name)
         # Loading the molecules and the csv data
-        mol_list = read_mol_list_from_sdf_file(file_path)
+        mol_list = read_mol_list_from_sdf_file(file_path, lazy=lazy)
         if mol_list is None:
             self.warning("Failed to load bond information from SDF file.")
         return mol_list
@@ -157,10 +161,12 @@ class QMDataset(MemoryGraphDataset):
         Returns:
             self
         """
-        xyz_list = self.get_geom_from_xyz_file(file_path)
-        symbol = [np.array(x[0]) for x in xyz_list]
-        coord = [np.array(x[1], dtype="float")[:, :3] for x in xyz_list]
-        nodes = [np.array([self._global_proton_dict[x] for x in y[0]], dtype="int") for y in xyz_list]
+        symbol, coord, nodes = [], [], []
+        # Geometries are parsed one by one from file.
+        for x in self.get_geom_from_xyz_file(file_path, lazy=True):
+            symbol.append(np.array(x[0]))
+            coord.append(np.array(x[1], dtype="float")[:, :3])
+            nodes.append(np.array([self._global_proton_dict[y] for y in x[0]], dtype="int"))
         for key, value in {"node_coordinates": coord, "node_symbol": symbol, "node_number": nodes}.items():
             self.assign_property(key, value)
         return self
@@ -219,7 +225,7 @@ class QMDataset(MemoryGraphDataset):
         }
         # Label callback.
         if label_column_name:
-            callbacks.update({'graph_labels': lambda mg, ds: ds[label_column_name]})
+            callbacks.update({'graph_labels': label_column_name})
         # Attributes callback.
         for attrib, name, encoder in zip([nodes, edges, graph],
                                          ["node_attributes", "edge_attributes", "graph_attributes"],
@@ -228,7 +234,7 @@ class QMDataset(MemoryGraphDataset):
                 callbacks.update({name: lambda mg, ds: np.array(getattr(mg, name)(attrib, encoder), dtype='float32')})
 
         value_list = map_molecule_callbacks(
-            self.get_mol_blocks_from_sdf_file(),
+            self.get_mol_blocks_from_sdf_file(lazy=True),
             self.read_in_table_file().data_frame,
             callbacks=callbacks,
             add_hydrogen=add_hydrogen,
@@ -294,7 +300,7 @@ class QMDataset(MemoryGraphDataset):
             self.warning("Failed to load structures SDF file. Reading geometries from XYZ file instead. Please check.")
             self.read_in_table_file()
             if self.data_frame is not None and label_column_name is not None:
-                labels = self.data_frame[label_column_name]
-                self.assign_property("graph_labels", [np.array(x) for _, x in labels.iterrows()])
+                labels = self.data_frame[label_column_name].to_numpy()
+                self.assign_property("graph_labels", [np.array(x) for x in labels])
             self.read_in_memory_xyz()
         return self
@@ -19,6 +19,8 @@ def deserialize(dataset: Union[str, dict]):
 
     Furthermore, `prepare_data`, `read_in_memory` and `map_list` are possible for deserialization if manually
     set in 'methods' key as list. Tries to resolve datasets also without `module_name` key.
+    Results of preprocessing methods are cached on disk, if a 'cache' key with kwargs for
+    :obj:`kgcnn.data.cache.GraphPropertyCache` is given.
 
     Args:
         dataset (str, dict): Dictionary of the dataset serialization.
@@ -55,7 +57,10 @@ def deserialize(dataset: Union[str, dict]):
 
     # Call class methods to load or process data.
     # Order is important here.
-    if "methods" in dataset:
+    if "methods" in dataset and "cache" in dataset and hasattr(ds_instance, "set_methods"):
+        # Preprocessing results are cached on disk with e.g. 'cache': {'directory': 'cache', 'max_size': 1e10}.
+        ds_instance.set_methods(dataset["methods"], cache=dataset["cache"])
+    elif "methods" in dataset:
         method_list = dataset["methods"]
         for method_item in method_list:
             for method, kwargs in method_item.items():
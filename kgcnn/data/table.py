@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+from typing import Union
+from collections.abc import Mapping
+
+
+class TableColumns:
+    r"""Columns of a pandas data frame as numpy arrays, which are converted once for fast access to single rows.
+
+    Rows are located by position, which matches the order of e.g. molecules or structures in a dataset. Indexing
+    with a position returns a :obj:`TableRow` that maps column names to values like a pandas series of the row,
+    without the cost of :obj:`pd.DataFrame.loc`. For a pandas series, the value at the position is returned instead.
+
+    .. code-block:: python
+
+        import pandas as pd
+        from kgcnn.data.table import TableColumns
+        table = TableColumns(pd.DataFrame({"label": [0.5, 1.0], "name": ["a", "b"]}))
+        row = table[1]
+        row["label"]  # 1.0
+        table.get_values(["label", "name"])  # array([[0.5, 'a'], [1.0, 'b']], dtype=object)
+
+    """
+
+    def __init__(self, data: Union[pd.DataFrame, pd.Series]):
+        r"""Initialize :obj:`TableColumns` with a pandas data frame or series.
+
+        Args:
+            data (pd.DataFrame, pd.Series): Table to convert into numpy arrays.
+        """
+        self.is_series = isinstance(data, pd.Series)
+        self.index = data.index.to_numpy()
+        if self.is_series:
+            self.columns = {data.name: data.to_numpy()}
+        else:
+            self.columns = {name: data[name].to_numpy() for name in data.columns}
+        self._multi_columns = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, item: int):
+        if self.is_series:
+            return next(iter(self.columns.values()))[item]
+        return TableRow(self, item)
+
+    def get_values(self, key) -> np.ndarray:
+        r"""Get the values of a column or of a list of columns for all rows.
+
+        Args:
+            key (str, list): Name of a column or list of column names.
+
+        Returns:
+            np.ndarray: Values of shape `(N, )` for a single column or `(N, len(key))` for a list of columns with
+            common dtype like :obj:`pd.DataFrame.to_numpy`.
+        """
+        if isinstance(key, (list, tuple)):
+            key = tuple(key)
+            if key not in self._multi_columns:
+                self._multi_columns[key] = pd.DataFrame(dict(enumerate([self.columns[k] for k in key]))).to_numpy()
+            return self._multi_columns[key]
+        return self.columns[key]
+
+
+class TableRow(Mapping):
+    r"""Lightweight view of a row of :obj:`TableColumns`, which maps column names to values like a pandas series.
+
+    A list of column names gives the values of the row as numpy array.
+    """
+
+    __slots__ = ("_table", "_position")
+
+    def __init__(self, table: TableColumns, position: int):
+        self._table = table
+        self._position = position
+
+    def __getitem__(self, key):
+        return self._table.get_values(key)[self._position]
+
+    def __iter__(self):
+        return iter(self._table.columns)
+
+    def __len__(self):
+        return len(self._table.columns)
+
+    @property
+    def name(self):
+        """Label of the row in the index of the data frame, like :obj:`pd.Series.name`."""
+        return self._table.index[self._position]
+
+    def to_dict(self) -> dict:
+        """Return the row as dictionary of column names and values."""
+        return {key: self[key] for key in self}
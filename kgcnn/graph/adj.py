@@ -301,10 +301,15 @@ def get_angle_indices(idx, check_sorted: bool = True, allow_multi_edges: bool =
                       allow_self_edges: bool = False, allow_reverse_edges: bool = False,
                       edge_pairing: str = "jk"):
     r"""Compute index list for edge-pairs forming an angle. Not for batches, only for single instance.
+    For a list of graphs use :obj:`get_angle_indices_batch`.
+
+    Matching edges are found by sorting the edges once and joining them in segments, which scales with
+    :math:`O(N \log N)` for `N` edges plus the number of angles.
 
     Args:
         idx (np.ndarray): List of edge indices referring to nodes of shape `(N, 2)`
-        check_sorted (bool): Whether to sort for new angle indices. Default is True.
+        check_sorted (bool): Whether to sort for new angle indices. Default is True. The angle indices are always
+            returned sorted, this argument is kept for compatibility.
         allow_self_edges (bool): Whether to allow the exact same edge in an angle pairing. Overrides multi and reverse
             edge checking.
         allow_multi_edges (bool): Whether to keep angle pairs with same node indices,
@@ -325,8 +330,6 @@ def get_angle_indices(idx, check_sorted: bool = True, allow_multi_edges: bool =
         return None, None, None
     if len(idx) == 0:
         return np.array([]), np.array([]), np.array([])
-    # Labeling edges.
-    label_ij = np.expand_dims(np.arange(len(idx)), axis=-1)
     # Find edge pairing indices.
     if "k" not in edge_pairing:
         raise ValueError("Edge pairing must have index 'k'.")
@@ -336,53 +339,93 @@ def get_angle_indices(idx, check_sorted: bool = True, allow_multi_edges: bool =
     pos_fix = 0 if edge_pairing[0] != "k" else 1
     pos_ij = 0 if "i" in edge_pairing else 1
 
-    idx_ijk = []  # index triples that form an angle as (i, j, k)
-    idx_ij_k = []  # New indices that refer to edges to form an angle as ij, `edge_pairing`
-    for n, ij in enumerate(idx):
-        matching_edges = idx
-        matching_labels = label_ij
+    # Join each edge ij with all edges that have matching fixed index. Edges are sorted by the fixed index, so that
+    # the matching edges for each ij are a contiguous segment, which is found by binary search.
+    # Stable sort keeps matching edges in ascending order of their label.
+    order = np.argsort(idx[:, pos_fix], kind="stable")
+    keys_sorted = idx[order, pos_fix]
+    seg_start = np.searchsorted(keys_sorted, idx[:, pos_ij], side="left")
+    seg_end = np.searchsorted(keys_sorted, idx[:, pos_ij], side="right")
+    seg_length = seg_end - seg_start
+
+    # Expand segments into all pairs (n, m) in CSR-style.
+    label_n = np.repeat(np.arange(len(idx)), seg_length)
+    pos_in_segment = np.arange(len(label_n)) - np.repeat(np.cumsum(seg_length) - seg_length, seg_length)
+    label_m = order[np.repeat(seg_start, seg_length) + pos_in_segment]
+
+    edge_n, edge_m = idx[label_n], idx[label_m]
+    mask = np.ones(len(label_n), dtype="bool")
+    if not allow_multi_edges:
+        mask = np.logical_and(mask, np.logical_or(edge_m[:, 0] != edge_n[:, 0], edge_m[:, 1] != edge_n[:, 1]))
+    if not allow_reverse_edges:
+        mask = np.logical_and(mask, np.logical_or(edge_m[:, 0] != edge_n[:, 1], edge_m[:, 1] != edge_n[:, 0]))
+    mask[label_n == label_m] = False
+    label_n, label_m, edge_n, edge_m = label_n[mask], label_m[mask], edge_n[mask], edge_m[mask]
+
+    if allow_self_edges:
+        # Exact same edge is always paired with itself, independent of the fixed index.
+        label_self = np.arange(len(idx))
+        label_n, label_m = np.concatenate([label_n, label_self]), np.concatenate([label_m, label_self])
+        order_pairs = np.lexsort((label_m, label_n))
+        label_n, label_m = label_n[order_pairs], label_m[order_pairs]
+        edge_n, edge_m = idx[label_n], idx[label_m]
+
+    if len(label_n) == 0:
+        return idx, np.empty((0, 3), dtype=idx.dtype), np.empty((0, 2), dtype=idx.dtype)
+
+    # Pairs are ordered by ij and then by matching edge label, which is identical to sorting them.
+    # Argument `check_sorted` is therefore fulfilled by construction.
+    idx_ijk = np.concatenate([edge_n, edge_m[:, pos_k:pos_k + 1]], axis=-1)
+    idx_ij_k = np.stack([label_n, label_m], axis=-1)
+    return idx, idx_ijk, idx_ij_k
 
-        # Condition to find matching xk or kx.
-        mask = matching_edges[:, pos_fix] == ij[pos_ij]
 
-        if not allow_multi_edges:
-            mask = np.logical_and(mask, np.logical_or(matching_edges[:, 0] != ij[0], matching_edges[:, 1] != ij[1]))
+def get_angle_indices_batch(idx_list: list, **kwargs):
+    r"""Compute index list for edge-pairs forming an angle for a list of graphs in one call.
 
-        if not allow_reverse_edges:
-            mask = np.logical_and(mask, np.logical_or(matching_edges[:, 0] != ij[1], matching_edges[:, 1] != ij[0]))
+    The edge indices of all graphs are shifted into a single disjoint graph, for which :obj:`get_angle_indices` is
+    computed once. The results are split and shifted back for each graph. Graphs with `None` edge indices return
+    `None`. Accepts the same kwargs as :obj:`get_angle_indices`.
 
-        if allow_self_edges:
-            mask[n] = True
-        else:
-            mask[n] = False
-
-        matching_edges, matching_labels = matching_edges[mask], matching_labels[mask]  # apply mask
+    Args:
+        idx_list (list): List of edge indices referring to nodes of shape `(N, 2)` for each graph.
+        kwargs: Kwargs for :obj:`get_angle_indices`.
 
-        if len(matching_edges) == 0:
-            idx_ijk.append(np.empty((0, 3), dtype=idx.dtype))
-            idx_ij_k.append(np.empty((0, 2), dtype=idx.dtype))
+    Returns:
+        tuple: idx, idx_ijk, idx_ijk_ij as lists with one item for each graph.
+    """
+    num_graphs = len(idx_list)
+    is_valid = [x is not None and len(x) > 0 for x in idx_list]
+    out_idx, out_ijk, out_ij_k = [], [], []
+    for x in idx_list:
+        out = get_angle_indices(x, **kwargs) if x is None or len(x) == 0 else (x, None, None)
+        out_idx.append(out[0])
+        out_ijk.append(out[1])
+        out_ij_k.append(out[2])
+    valid_graphs = [i for i in range(num_graphs) if is_valid[i]]
+    if len(valid_graphs) == 0:
+        return out_idx, out_ijk, out_ij_k
+
+    edges = [np.asarray(idx_list[i]) for i in valid_graphs]
+    num_edges = np.array([len(x) for x in edges], dtype="int64")
+    num_nodes = np.array([np.amax(x) + 1 for x in edges], dtype="int64")
+    edge_offset = np.cumsum(num_edges) - num_edges
+    node_offset = np.cumsum(num_nodes) - num_nodes
+    disjoint_edges = np.concatenate(edges, axis=0) + np.repeat(node_offset, num_edges)[:, None]
+
+    _, idx_ijk, idx_ij_k = get_angle_indices(disjoint_edges, **kwargs)
+    # Angles are ordered by the label of edge ij, which are ordered by graph.
+    graph_of_angle = np.searchsorted(edge_offset, idx_ij_k[:, 0], side="right") - 1
+    angle_splits = np.searchsorted(graph_of_angle, np.arange(len(edges) + 1), side="left")
+    for n, i in enumerate(valid_graphs):
+        start, end = angle_splits[n], angle_splits[n + 1]
+        dtype = edges[n].dtype
+        if start == end:
+            out_ijk[i], out_ij_k[i] = np.empty((0, 3), dtype=dtype), np.empty((0, 2), dtype=dtype)
             continue
-
-        # All combos for edge ij
-        combos_ik = np.concatenate(
-            [np.repeat([ij], len(matching_edges), axis=0), np.expand_dims(matching_edges[:, pos_k], axis=-1)], axis=-1)
-        combos_label = np.concatenate(
-            [np.repeat([[n]], len(matching_labels), axis=0), matching_labels], axis=-1)
-        idx_ijk.append(combos_ik)
-        idx_ij_k.append(combos_label)
-
-    idx_ijk = np.concatenate(idx_ijk, axis=0)
-    idx_ij_k = np.concatenate(idx_ij_k, axis=0)
-
-    if check_sorted:
-        order1 = np.argsort(idx_ij_k[:, 1], axis=0, kind='mergesort')  # stable!
-        idx_ij_k = idx_ij_k[order1]
-        idx_ijk = idx_ijk[order1]
-        order2 = np.argsort(idx_ij_k[:, 0], axis=0, kind='mergesort')
-        idx_ijk = idx_ijk[order2]
-        idx_ij_k = idx_ij_k[order2]
-
-    return idx, idx_ijk, idx_ij_k
+        out_ijk[i] = (idx_ijk[start:end] - node_offset[n]).astype(dtype)
+        out_ij_k[i] = idx_ij_k[start:end] - edge_offset[n]
+    return out_idx, out_ijk, out_ij_k
 
 
 def get_angle(coord, indices):
@@ -549,16 +592,16 @@ def define_adjacency_from_distance(distance_matrix, max_distance=np.inf, max_nei
     Returns:
         tuple: graph_adjacency, graph_indices
 
-            - graph_adjacency (np.array): Adjacency Matrix of shape `(..., N, N)` of type `np.bool`.
+            - graph_adjacency (np.array): Adjacency Matrix of shape `(..., N, N)` of type `bool`.
             - graph_indices (np.array): Flatten indices from former array that have `True` as entry in the
                 returned adjacency matrix.
     """
     distance_matrix = np.array(distance_matrix)
     num_atoms = distance_matrix.shape[-1]
     if exclusive:
-        graph_adjacency = np.ones_like(distance_matrix, dtype=np.bool)
+        graph_adjacency = np.ones_like(distance_matrix, dtype="bool")
     else:
-        graph_adjacency = np.zeros_like(distance_matrix, dtype=np.bool)
+        graph_adjacency = np.zeros_like(distance_matrix, dtype="bool")
     inddiag = np.arange(num_atoms)
     # Make Indix Matrix
     indarr = np.indices(distance_matrix.shape)
@@ -579,7 +622,7 @@ def define_adjacency_from_distance(distance_matrix, max_distance=np.inf, max_nei
         sorting_index = np.argsort(distance_matrix, axis=-1)
         # SortedDistance = np.take_along_axis(self.distance_matrix, sorting_index, axis=-1)
         ind_sorted_red = sorting_index[..., :max_neighbours + 1]
-        temp = np.zeros_like(distance_matrix, dtype=np.bool)
+        temp = np.zeros_like(distance_matrix, dtype="bool")
         np.put_along_axis(temp, ind_sorted_red, True, axis=-1)
         if exclusive:
             graph_adjacency = np.logical_and(graph_adjacency, temp)
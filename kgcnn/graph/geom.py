@@ -1,5 +1,7 @@
 import numpy as np
 from typing import Union
+from scipy.spatial import cKDTree
+from kgcnn.graph.adj import coordinates_to_distancematrix, define_adjacency_from_distance
 
 
 def coulomb_matrix_to_inverse_distance_proton(coulomb_mat: np.ndarray,
@@ -169,6 +171,91 @@ def coordinates_from_distance_matrix(distance: np.ndarray, use_center: bool = No
     return dist_out
 
 
+def range_neighbour(coordinates: np.ndarray,
+                    max_distance: Union[float, None] = 4.0,
+                    max_neighbours: Union[int, None] = None,
+                    self_loops: bool = False,
+                    exclusive: bool = True,
+                    method: str = "auto",
+                    dense_max_nodes: int = 100) -> list:
+    r"""Generate range connections between nodes within a cutoff radius or to nearest neighbours (non-periodic).
+
+    With `method='dense'` the full distance matrix is computed with :obj:`coordinates_to_distancematrix` and
+    connections are selected with :obj:`define_adjacency_from_distance`, which requires :math:`O(N^2)` memory.
+    With `method='kdtree'` a :obj:`scipy.spatial.cKDTree` is used for radius and k-nearest neighbour queries, so that
+    memory scales with the number of connections. The output is the same for both methods, except for the choice among
+    neighbours of equal distance for :obj:`max_neighbours`. With `method='auto'` the dense path is used for graphs of at
+    most :obj:`dense_max_nodes` nodes, for which it is faster.
+
+    Args:
+        coordinates (np.ndarray): Coordinates of nodes of shape `(N, D)`.
+        max_distance (float, optional): Maximum distance to allow connections, can also be None. Defaults to 4.0.
+        max_neighbours (int, optional): Maximum number of allowed neighbours for each node. Default is None.
+        self_loops (bool, optional): Allow self-loops. Defaults to False.
+        exclusive (bool): Whether both distance and maximum neighbours must be fulfilled. Default is True.
+        method (str): Either 'auto', 'dense' or 'kdtree'. Default is 'auto'.
+        dense_max_nodes (int): Maximum number of nodes to use the dense method for `method='auto'`. Default is 100.
+
+    Returns:
+        list: [indices, dist]
+
+            - indices (np.ndarray): Indices of connections `(i, j)` of shape `(M, 2)` sorted by `i` then `j`.
+            - dist (np.ndarray): Distance of connections of shape `(M, )`.
+    """
+    coordinates = np.asarray(coordinates)
+    num_nodes = len(coordinates)
+    if method == "auto":
+        method = "dense" if num_nodes <= dense_max_nodes else "kdtree"
+    # Connecting all pairs requires the full distance matrix anyway.
+    if method == "kdtree" and max_distance is None and max_neighbours is None:
+        method = "dense"
+
+    if method == "dense":
+        dist = coordinates_to_distancematrix(coordinates)
+        adjacency, indices = define_adjacency_from_distance(
+            dist, max_distance=max_distance, max_neighbours=max_neighbours, exclusive=exclusive,
+            self_loops=self_loops)
+        return [indices, dist[adjacency]]
+    elif method != "kdtree":
+        raise ValueError("Unknown method '%s' for range connections. Use 'auto', 'dense' or 'kdtree'." % method)
+
+    tree = cKDTree(coordinates)
+    self_pairs = np.repeat(np.expand_dims(np.arange(num_nodes), axis=-1), 2, axis=-1)
+    # Pairs are encoded as 'i * N + j' which keeps them sorted by i then j.
+    pairs_radius, pairs_neighbours = None, None
+    if max_distance is not None:
+        pairs = tree.query_pairs(max_distance, output_type="ndarray")
+        pairs = np.concatenate([pairs, np.flip(pairs, axis=-1), self_pairs], axis=0).astype("int64")
+        # Query of the tree includes the cutoff, the dense method does not.
+        in_range = np.sqrt(np.sum(np.square(coordinates[pairs[:, 0]] - coordinates[pairs[:, 1]]), axis=-1))
+        pairs = pairs[in_range < max_distance]
+        pairs_radius = pairs[:, 0] * num_nodes + pairs[:, 1]
+    if max_neighbours is not None:
+        # Matches dense path, which selects the `max_neighbours + 1` nearest nodes including the node itself.
+        num_query = int(min(max_neighbours + 1, num_nodes))
+        query_bound = max_distance if exclusive and max_distance is not None else np.inf
+        _, neighbours = tree.query(coordinates, k=num_query, distance_upper_bound=query_bound)
+        neighbours = np.reshape(neighbours, (num_nodes, num_query))
+        rows = np.repeat(np.expand_dims(np.arange(num_nodes), axis=-1), num_query, axis=-1)
+        valid = neighbours < num_nodes  # Missing neighbours are marked with index N.
+        pairs_neighbours = rows[valid].astype("int64") * num_nodes + neighbours[valid]
+
+    if pairs_radius is None:
+        pairs = np.unique(pairs_neighbours)
+    elif pairs_neighbours is None:
+        pairs = np.unique(pairs_radius)
+    elif exclusive:
+        pairs = np.intersect1d(pairs_radius, pairs_neighbours)
+    else:
+        pairs = np.union1d(pairs_radius, pairs_neighbours)
+    indices = np.stack([pairs // num_nodes, pairs % num_nodes], axis=-1).astype("int")
+    if not self_loops:
+        indices = indices[indices[:, 0] != indices[:, 1]]
+    # Same operations as in 'coordinates_to_distancematrix' to give identical values.
+    dist = np.sqrt(np.sum(np.square(coordinates[indices[:, 0]] - coordinates[indices[:, 1]]), axis=-1))
+    return [indices, dist]
+
+
 def range_neighbour_lattice(coordinates: np.ndarray, lattice: np.ndarray,
                             max_distance: Union[float, None] = 4.0,
                             max_neighbours: Union[int, None] = None,
@@ -178,6 +265,8 @@ def range_neighbour_lattice(coordinates: np.ndarray, lattice: np.ndarray,
                             numerical_tol: float = 1e-8,
                             manual_super_cell_radius: float = None,
                             super_cell_tol_factor: float = 0.25,
+                            method: str = "auto",
+                            dense_max_nodes: int = 8,
                             ) -> list:
     r"""Generate range connections for a primitive unit cell in a periodic lattice (vectorized).
 
@@ -187,6 +276,15 @@ def range_neighbour_lattice(coordinates: np.ndarray, lattice: np.ndarray,
     :obj:`max_neighbours`. If a supercell for radius :obj:`max_distance` should always be generated but limited by
     :obj:`max_neighbours`, you can set :obj:`limit_only_max_neighbours` to `True`.
 
+    With `method='dense'` distances from every central node to every node of the supercell are computed at once,
+    which requires :math:`O(N^2 C)` memory for :math:`C` images of the unit cell. With `method='kdtree'` the image
+    nodes near the unit cell are put into a :obj:`scipy.spatial.cKDTree` and queried for radius and k-nearest
+    neighbours, so that memory scales with :math:`O(N C)` and the number of connections. If the k-nearest neighbours
+    are not within the images of the estimated radius, the radius is doubled. The output is the same for both
+    methods, except for the choice among neighbours of equal distance for :obj:`max_neighbours` and the order of
+    connections of equal distance. With `method='auto'` the dense path is used for unit cells of at most
+    :obj:`dense_max_nodes` nodes.
+
     .. warning::
         All atoms should be projected back into the primitive unit cell before calculating the range connections.
 
@@ -211,6 +309,9 @@ def range_neighbour_lattice(coordinates: np.ndarray, lattice: np.ndarray,
         manual_super_cell_radius (float): Manual radius for supercell. This is otherwise automatically set by either
             :obj:`max_distance` or :obj:`max_neighbours` or both. For manual supercell only. Default is None.
         super_cell_tol_factor (float): Tolerance factor for supercell relative to unit cell size. Default is 0.25.
+        method (str): Either 'auto', 'dense' or 'kdtree'. The supercell arguments above are only used for 'dense'.
+            Default is 'auto'.
+        dense_max_nodes (int): Maximum number of nodes to use the dense method for `method='auto'`. Default is 8.
 
     Returns:
         list: [indices, images, dist]
@@ -219,6 +320,18 @@ def range_neighbour_lattice(coordinates: np.ndarray, lattice: np.ndarray,
     if max_distance is None and max_neighbours is None:
         raise ValueError("Need to specify either `max_distance` or `max_neighbours` or both.")
 
+    if method == "auto":
+        method = "dense" if len(coordinates) <= dense_max_nodes else "kdtree"
+    # Non-exclusive connections with one limit set to None connect all nodes of the supercell.
+    if method == "kdtree" and not exclusive and (max_distance is None or max_neighbours is None):
+        method = "dense"
+    if method == "kdtree":
+        return _range_neighbour_lattice_kdtree(
+            np.asarray(coordinates), np.asarray(lattice), max_distance=max_distance, max_neighbours=max_neighbours,
+            self_loops=self_loops, exclusive=exclusive, numerical_tol=numerical_tol)
+    elif method != "dense":
+        raise ValueError("Unknown method '%s' for range connections. Use 'auto', 'dense' or 'kdtree'." % method)
+
     # Here we set the lattice matrix, with lattice vectors in either columns or rows of the matrix.
     lattice_col = np.transpose(lattice)
     lattice_row = lattice
@@ -364,3 +477,101 @@ def range_neighbour_lattice(coordinates: np.ndarray, lattice: np.ndarray,
     out_indices = dist_indices_sort[mask]
 
     return [out_indices, out_images, out_dist]
+
+
+def _lattice_image_nodes(coordinates: np.ndarray, lattice: np.ndarray, radius: float) -> tuple:
+    """Images of all nodes that can be within radius of a node of the central unit cell, as (indices, images)."""
+    # Bound of fractional coordinates for a sphere of radius, like the bounding box of the dense method.
+    inv_lattice = np.linalg.inv(lattice)
+    bounding_box_unit = np.sum(np.abs(inv_lattice), axis=0)
+    frac_coordinates = np.dot(coordinates, inv_lattice)
+    bound_left = np.amin(frac_coordinates, axis=0) - bounding_box_unit * radius
+    bound_right = np.amax(frac_coordinates, axis=0) + bounding_box_unit * radius
+    image_left = np.floor(bound_left - np.amax(frac_coordinates, axis=0)).astype("int")
+    image_right = np.ceil(bound_right - np.amin(frac_coordinates, axis=0)).astype("int")
+    images = np.array(np.meshgrid(*[np.arange(i, j + 1) for i, j in zip(image_left, image_right)],
+                                  indexing="ij")).reshape(3, -1).T  # Cx3
+    # Keep node images inside the bounds, which are few compared to all nodes times all images for large cells.
+    frac_images = np.expand_dims(frac_coordinates, axis=1) + np.expand_dims(images, axis=0)  # NxCx3
+    inside = np.all(np.logical_and(frac_images >= bound_left, frac_images <= bound_right), axis=-1)
+    node_indices, image_indices = np.nonzero(inside)
+    return node_indices, images[image_indices]
+
+
+def _range_neighbour_lattice_kdtree(coordinates: np.ndarray, lattice: np.ndarray,
+                                    max_distance: Union[float, None] = 4.0,
+                                    max_neighbours: Union[int, None] = None,
+                                    self_loops: bool = False,
+                                    exclusive: bool = True,
+                                    numerical_tol: float = 1e-8) -> list:
+    """KD-tree method of :obj:`range_neighbour_lattice`."""
+    num_nodes = len(coordinates)
+    cutoff = max_distance + abs(numerical_tol) if max_distance is not None else None
+    if max_neighbours is not None:
+        density = num_nodes / np.sum(np.abs(np.cross(lattice[0], lattice[1]) * lattice[2]))
+        estimated_nn_radius = abs(float(np.cbrt((max_neighbours + num_nodes) / density / np.pi * 3 / 4)))
+    # Radius of image nodes. Neighbours beyond the cutoff are not needed for exclusive connections.
+    if max_neighbours is None or (exclusive and cutoff is not None):
+        radius = cutoff
+    else:
+        radius = max(estimated_nn_radius, cutoff if cutoff is not None else 0.0)
+
+    while True:
+        node_indices, images = _lattice_image_nodes(coordinates, lattice, radius)
+        # Same operations as in the dense method to give identical values.
+        coord_images = coordinates[node_indices] + np.dot(images, lattice)
+        tree = cKDTree(coord_images)
+        # Connections are encoded as 'i * P + p' for image node p.
+        num_points = len(coord_images)
+        pairs_radius, pairs_neighbours = None, None
+        if cutoff is not None and (max_neighbours is None or not exclusive):
+            points = tree.query_ball_point(coordinates, r=cutoff, return_sorted=False)
+            lengths = np.array([len(x) for x in points], dtype="int64")
+            pairs_radius = np.repeat(np.arange(num_nodes, dtype="int64"), lengths) * num_points + np.concatenate(
+                [np.array(x, dtype="int64") for x in points] + [np.zeros(0, dtype="int64")])
+        if max_neighbours is not None:
+            # Query one more for the node itself, which is removed without self-loops.
+            num_query = int(min(max_neighbours + 1, num_points))
+            query_bound = np.nextafter(cutoff, np.inf) if exclusive and cutoff is not None else np.inf
+            dist_query, points = tree.query(coordinates, k=num_query, distance_upper_bound=query_bound)
+            dist_query = np.reshape(dist_query, (num_nodes, num_query))
+            points = np.reshape(points, (num_nodes, num_query))
+            if query_bound == np.inf and (num_query < max_neighbours + 1 or np.amax(dist_query[:, -1]) > radius):
+                # Image nodes within radius do not contain all nearest neighbours.
+                radius = 2 * radius
+                continue
+            rows = np.repeat(np.expand_dims(np.arange(num_nodes, dtype="int64"), axis=-1), num_query, axis=-1)
+            valid = points < num_points  # Missing neighbours are marked with index P.
+            if not self_loops:
+                valid = np.logical_and(valid, np.logical_not(_is_center_self(
+                    rows, np.minimum(points, num_points - 1), node_indices, images)))
+            # Keep the first 'max_neighbours' valid neighbours of each node.
+            valid = np.logical_and(valid, np.cumsum(valid, axis=-1) <= max_neighbours)
+            pairs_neighbours = rows[valid] * num_points + points[valid]
+        break
+
+    if pairs_radius is None:
+        pairs = pairs_neighbours
+    elif pairs_neighbours is None:
+        pairs = pairs_radius
+    else:
+        pairs = np.union1d(pairs_radius, pairs_neighbours)
+    rows, points = pairs // num_points, pairs % num_points
+    if not self_loops:
+        not_self = np.logical_not(_is_center_self(rows, points, node_indices, images))
+        rows, points = rows[not_self], points[not_self]
+    dist = np.sqrt(np.sum(np.square(coord_images[points] - coordinates[rows]), axis=-1))
+    if cutoff is not None and (max_neighbours is None or exclusive):
+        # Query of the tree may include numerical boundary cases, the dense method does not.
+        in_range = dist <= cutoff
+        rows, points, dist = rows[in_range], points[in_range], dist[in_range]
+    # Sort by central node and then by distance like the dense method.
+    order = np.lexsort((dist, rows))
+    rows, points, dist = rows[order], points[order], dist[order]
+    indices = np.stack([rows, node_indices[points]], axis=-1).astype("int")
+    return [indices, images[points].astype("float"), dist]
+
+
+def _is_center_self(rows: np.ndarray, points: np.ndarray, node_indices: np.ndarray, images: np.ndarray) -> np.ndarray:
+    """Whether connections are self-loops of a node to itself in the central unit cell."""
+    return np.logical_and(node_indices[points] == rows, np.all(images[points] == 0, axis=-1))
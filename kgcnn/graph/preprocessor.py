@@ -2,11 +2,10 @@ import numpy as np
 import logging
 from typing import Union
 from kgcnn.graph.base import GraphPreProcessorBase
-from kgcnn.graph.adj import get_angle_indices, coordinates_to_distancematrix, invert_distance, \
-    define_adjacency_from_distance, sort_edge_indices, get_angle, add_edges_reverse_indices, \
-    rescale_edge_weights_degree_sym, add_self_loops_to_edge_indices, compute_reverse_edges_index_map, \
-    distance_to_gauss_basis
-from kgcnn.graph.geom import range_neighbour_lattice
+from kgcnn.graph.adj import get_angle_indices, invert_distance, sort_edge_indices, get_angle, \
+    add_edges_reverse_indices, rescale_edge_weights_degree_sym, add_self_loops_to_edge_indices, \
+    compute_reverse_edges_index_map, distance_to_gauss_basis
+from kgcnn.graph.geom import range_neighbour_lattice, range_neighbour
 
 logging.basicConfig()  # Module logger
 module_logger = logging.getLogger(__name__)
@@ -257,6 +256,9 @@ class SetRange(GraphPreProcessorBase):
     determines based on a cutoff radius and a maximum number of neighbours or both.
     Requires :obj:`node_coordinates` to be set. The distance is stored in :obj:`range_attributes`.
 
+    For large graphs like proteins, `method='kdtree'` avoids the full distance matrix, see
+    :obj:`kgcnn.graph.geom.range_neighbour`. With the default `method='auto'` small graphs use the dense path.
+
     Args:
         range_indices (str): Name of range indices to set in dictionary. Default is "range_indices".
         node_coordinates (str): Name of coordinates in dictionary. Default is "node_coordinates".
@@ -266,39 +268,37 @@ class SetRange(GraphPreProcessorBase):
         do_invert_distance (bool): Whether to invert the distance. Default is False.
         self_loops (bool): If also self-interactions with distance 0 should be considered. Default is False.
         exclusive (bool): Whether both max_neighbours and max_distance must be fulfilled. Default is True.
+        method (str): Method for neighbour search. Either 'auto', 'dense' or 'kdtree'. Default is 'auto'.
     """
 
     def __init__(self, *, range_indices: str = "range_indices", node_coordinates: str = "node_coordinates",
                  range_attributes: str = "range_attributes", max_distance: float = 4.0, max_neighbours: int = 15,
-                 do_invert_distance: bool = False, self_loops: bool = False, exclusive: bool = True, name="set_range",
-                 **kwargs):
+                 do_invert_distance: bool = False, self_loops: bool = False, exclusive: bool = True,
+                 method: str = "auto", name="set_range", **kwargs):
         super().__init__(name=name, **kwargs)
         self._to_obtain.update({"node_coordinates": node_coordinates})
         self._call_kwargs = {
             "max_distance": max_distance, "max_neighbours": max_neighbours, "do_invert_distance": do_invert_distance,
-            "self_loops": self_loops, "exclusive": exclusive}
+            "self_loops": self_loops, "exclusive": exclusive, "method": method}
         self._to_assign = [range_indices, range_attributes]
         self._config_kwargs.update({
             "node_coordinates": node_coordinates, "range_indices": range_indices, "range_attributes": range_attributes,
             **self._call_kwargs})
 
     def call(self, *, node_coordinates: np.ndarray, max_distance: float, max_neighbours: int, do_invert_distance: bool,
-             self_loops: bool, exclusive: bool):
+             self_loops: bool, exclusive: bool, method: str):
         if node_coordinates is None:
             return None, None
-        # Compute distance matrix here. May be problematic for too large graphs.
-        dist = coordinates_to_distancematrix(node_coordinates)
-        cons, indices = define_adjacency_from_distance(
-            dist, max_distance=max_distance, max_neighbours=max_neighbours, exclusive=exclusive, self_loops=self_loops)
-        mask = np.array(cons, dtype="bool")
-        dist_masked = dist[mask]
+        indices, dist = range_neighbour(
+            node_coordinates, max_distance=max_distance, max_neighbours=max_neighbours, exclusive=exclusive,
+            self_loops=self_loops, method=method)
         if do_invert_distance:
-            dist_masked = invert_distance(dist_masked)
+            dist = invert_distance(dist)
         # Need one feature dimension.
-        if len(dist_masked.shape) <= 1:
-            dist_masked = np.expand_dims(dist_masked, axis=-1)
+        if len(dist.shape) <= 1:
+            dist = np.expand_dims(dist, axis=-1)
         # Assign attributes to instance.
-        return indices, dist_masked
+        return indices, dist
 
 
 class SetAngle(GraphPreProcessorBase):
@@ -362,6 +362,10 @@ class SetRangePeriodic(GraphPreProcessorBase):
     Requires :obj:`node_coordinates`, :obj:`graph_lattice` to be set.
     The distance is stored in :obj:`range_attributes`.
 
+    For large unit cells, `method='kdtree'` avoids distances to all nodes of the supercell, see
+    :obj:`kgcnn.graph.geom.range_neighbour_lattice`. With the default `method='auto'` small unit cells use the
+    dense path.
+
     Args:
         range_indices (str): Name of range indices to set in dictionary. Default is "range_indices".
         node_coordinates (str): Name of coordinates in dictionary.
@@ -375,25 +379,26 @@ class SetRangePeriodic(GraphPreProcessorBase):
         exclusive (bool): Whether both distance and maximum neighbours must be fulfilled. Default is True.
         do_invert_distance (bool): Whether to invert the distance. Default is False.
         self_loops (bool): If also self-interactions with distance 0 should be considered. Default is False.
+        method (str): Method for neighbour search. Either 'auto', 'dense' or 'kdtree'. Default is 'auto'.
     """
 
     def __init__(self, *, range_indices: str = "range_indices", node_coordinates: str = "node_coordinates",
                  graph_lattice: str = "graph_lattice", range_image: str = "range_image",
                  range_attributes: str = "range_attributes", max_distance: float = 4.0, max_neighbours: int = None,
                  exclusive: bool = True, do_invert_distance: bool = False, self_loops: bool = False,
-                 name="set_range_periodic", **kwargs):
+                 method: str = "auto", name="set_range_periodic", **kwargs):
         super().__init__(name=name, **kwargs)
         self._to_obtain.update({"node_coordinates": node_coordinates, "graph_lattice": graph_lattice})
         self._call_kwargs = {
             "max_distance": max_distance, "max_neighbours": max_neighbours, "exclusive": exclusive,
-            "do_invert_distance": do_invert_distance, "self_loops": self_loops}
+            "do_invert_distance": do_invert_distance, "self_loops": self_loops, "method": method}
         self._to_assign = [range_indices, range_image, range_attributes]
         self._config_kwargs.update({
             "node_coordinates": node_coordinates, "range_indices": range_indices, "graph_lattice": graph_lattice,
             "range_image": range_image, "range_attributes": range_attributes, **self._call_kwargs})
 
     def call(self, *, node_coordinates: np.ndarray, graph_lattice: np.ndarray, max_distance: float, max_neighbours: int,
-             self_loops: bool, exclusive: bool, do_invert_distance: bool):
+             self_loops: bool, exclusive: bool, do_invert_distance: bool, method: str):
         if node_coordinates is None:
             return None, None, None
         if graph_lattice is None:
@@ -401,7 +406,8 @@ class SetRangePeriodic(GraphPreProcessorBase):
 
         indices, images, dist = range_neighbour_lattice(
             node_coordinates, graph_lattice,
-            max_distance=max_distance, max_neighbours=max_neighbours, self_loops=self_loops, exclusive=exclusive)
+            max_distance=max_distance, max_neighbours=max_neighbours, self_loops=self_loops, exclusive=exclusive,
+            method=method)
 
         if do_invert_distance:
             dist = invert_distance(dist)
@@ -4,6 +4,8 @@ import logging
 from typing import Union
 from copy import deepcopy
 from kgcnn.data.utils import load_hyper_file, save_json_file
+from kgcnn.data.base import MemoryGraphList
+from kgcnn.io.loader import GraphBatchLoader
 ks = tf.keras
 
 logging.basicConfig()  # Module logger
@@ -111,6 +113,21 @@ class HyperParameter:
     def __getitem__(self, item):
         return deepcopy(self._hyper[item])
 
+    def set_mixed_precision(self):
+        r"""Set the global policy of :obj:`tf.keras.mixed_precision` from the `training` section of hyperparameter,
+        e.g. `{"training": {"mixed_precision": "mixed_bfloat16"}}`. The policy must be set before the model is created.
+        If no policy is given in hyperparameter, the global policy is not changed.
+
+        Returns:
+            str: Name of the global policy.
+        """
+        if "mixed_precision" in self._hyper["training"]:
+            policy = self._hyper["training"]["mixed_precision"]
+            if policy is not None:
+                module_logger.info("Setting global mixed precision policy '%s'." % policy)
+                ks.mixed_precision.set_global_policy(policy)
+        return ks.mixed_precision.global_policy().name
+
     def compile(self, loss=None, optimizer='rmsprop', metrics: list = None, weighted_metrics: list = None):
         r"""Generate kwargs for :obj:`tf.keras.Model.compile` from hyperparameter and default parameter.
 
@@ -119,6 +136,8 @@ class HyperParameter:
         arguments. Note that otherwise metrics can not be deserialized, since `metrics` can include nested
         lists and a dictionary of model output names. When using deserialization with this function, you must not
         name your model output "class_name" and "config".
+        For a global `mixed_float16` policy, the optimizer is wrapped in a :obj:`LossScaleOptimizer` to prevent
+        underflow of float16 gradients.
 
         Args:
             loss: Default loss for fit. Default is None.
@@ -188,18 +207,34 @@ class HyperParameter:
         loss = loss_deserialize(loss)
         optimizer = optimizer_deserialize(optimizer)
 
+        if ks.mixed_precision.global_policy().name == "mixed_float16":
+            optimizer = ks.optimizers.get(optimizer)
+            if not isinstance(optimizer, ks.mixed_precision.LossScaleOptimizer):
+                module_logger.info("Using dynamic loss scaling for mixed precision policy 'mixed_float16'.")
+                optimizer = ks.mixed_precision.LossScaleOptimizer(optimizer)
+
         return {"loss": loss, "optimizer": optimizer, "metrics": metrics, "weighted_metrics": weighted_metrics,
                 **hyper_compile_additional}
 
-    def fit(self, epochs: int = 1, validation_freq: int = 1, batch_size: int = None, callbacks: list = None):
+    def fit(self, epochs: int = 1, validation_freq: int = 1, batch_size: int = None, callbacks: list = None,
+            x: MemoryGraphList = None, y=None, validation_data: tuple = None):
         """Select fit hyperparameter. Additional default values for the training scripts are given as
         functional kwargs. Functional kwargs are overwritten by hyperparameter.
 
+        If graphs are given in :obj:`x`, the training data is added to the kwargs as well. The graphs are converted
+        into tensors for the model inputs in hyperparameter. If a 'batch_budget' is set in the 'training' section,
+        training and validation data are instead served by a :obj:`GraphBatchLoader` with batches capped by the total
+        size of graph properties, e.g. `{"training": {"batch_budget": {"edge_indices": 8192}, "num_buckets": 8}}`.
+        Then 'batch_size' is the maximum number of graphs per batch.
+
         Args:
             epochs (int): Default number of epochs. Default is 1.
             validation_freq (int): Default validation frequency. Default is 1.
             batch_size (int): Default batch size. Default is None.
             callbacks (list): Default Callbacks. Default is None.
+            x (MemoryGraphList): Graphs for training. Default is None.
+            y (np.ndarray): Labels for the graphs in :obj:`x`. Default is None.
+            validation_data (tuple): Tuple of graphs and labels for validation. Default is None.
 
         Returns:
             dict: de-serialized fit kwargs from hyperparameter.
@@ -226,8 +261,32 @@ class HyperParameter:
 
         out = {"batch_size": batch_size, "epochs": epochs, "validation_freq": validation_freq, "callbacks": callbacks}
         out.update(hyper_fit_additional)
+        if x is not None:
+            out.update(self._fit_data(out, x, y, validation_data))
         return out
 
+    def _fit_data(self, hyper_fit: dict, x: MemoryGraphList, y, validation_data: tuple = None) -> dict:
+        """Make training and validation data for :obj:`fit`, either as tensors or as :obj:`GraphBatchLoader`.
+        Loader arguments 'batch_size' and 'shuffle' are removed from :obj:`hyper_fit`."""
+        inputs = self._hyper["model"]["config"]["inputs"]
+        batch_budget = self._hyper["training"].get("batch_budget")
+        if batch_budget is None:
+            data = {"x": x.tensor(inputs), "y": y}
+            if validation_data is not None:
+                data["validation_data"] = (validation_data[0].tensor(inputs), validation_data[1])
+            return data
+
+        module_logger.info("Using batches with budget %s." % batch_budget)
+        batch_size = hyper_fit.pop("batch_size")
+        shuffle = hyper_fit.pop("shuffle", True)
+        loader_kwargs = {"inputs": inputs, "batch_size": batch_size, "pre_concatenate": True,
+                         "batch_budget": batch_budget, "num_buckets": self._hyper["training"].get("num_buckets")}
+        data = {"x": GraphBatchLoader(x, outputs=y, shuffle=shuffle, **loader_kwargs)}
+        if validation_data is not None:
+            data["validation_data"] = GraphBatchLoader(
+                validation_data[0], outputs=validation_data[1], shuffle=False, **loader_kwargs)
+        return data
+
     def results_file_path(self):
         r"""Make output folder for results based on hyperparameter and return path to that folder.
         The folder is set up as `'results'/dataset/model_name + post_fix`. Where model and dataset name must be set by
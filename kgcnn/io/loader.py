@@ -1,20 +1,143 @@
+import logging
 import numpy as np
 import tensorflow as tf
 from typing import Union, List
 from kgcnn.data.utils import ragged_tensor_from_nested_numpy
 from kgcnn.data.base import MemoryGraphDataset
+from kgcnn.data.columnar import graph_property_to_columns
 ks = tf.keras
 
+logging.basicConfig()  # Module logger
+module_logger = logging.getLogger(__name__)
+module_logger.setLevel(logging.INFO)
+
+
+def _make_property_buffers(data, names: list) -> dict:
+    """Concatenate graph properties of `data` into flat value buffers with row splits, one per name."""
+    buffers = {}
+    for name in names:
+        if name in buffers:
+            continue
+        columns = graph_property_to_columns([data[j][name] for j in range(len(data))])
+        if columns is None:
+            raise ValueError("Can not concatenate property '%s' into a single buffer." % name)
+        if not np.all(columns["mask"]):
+            raise ValueError("Property '%s' is not defined for all graphs. Please run clean()." % name)
+        buffers[name] = columns
+    return buffers
+
+
+def make_budget_batches(graph_sizes: dict,
+                        batch_budget: dict,
+                        batch_size: int = None,
+                        num_buckets: int = None,
+                        shuffle: bool = False,
+                        seed: int = None) -> List[np.ndarray]:
+    r"""Pack graph indices into batches that are capped by a budget on the total size of graph properties,
+    e.g. the total number of nodes or edges, rather than by the number of graphs only.
+
+    Graphs are added to a batch until adding the next graph would exceed any of the budgets in
+    :obj:`batch_budget` or the number of graphs reaches :obj:`batch_size`. A single graph that exceeds the budget
+    on its own is put into a separate batch. With :obj:`num_buckets`, graphs are sorted by the size of the first
+    property in :obj:`batch_budget` and split into buckets, which are packed separately, so that graphs in a batch
+    have similar size. The order of the batches is shuffled if :obj:`shuffle` is set.
+
+    .. code-block:: python
+
+        import numpy as np
+        from kgcnn.io.loader import make_budget_batches
+        batches = make_budget_batches({"node_attributes": np.array([3, 5, 2, 8])}, {"node_attributes": 10})
+        print(batches)
+        # [array([0, 1, 2]), array([3])]
+
+    Args:
+        graph_sizes (dict): Dictionary of property names and arrays of the size of this property for each graph.
+        batch_budget (dict): Dictionary of property names and the maximum total size of this property in a batch.
+            E.g. `{"node_attributes": 2048, "edge_indices": 8192}`.
+        batch_size (int): Optional maximum number of graphs in a batch. Default is None.
+        num_buckets (int): Number of size-sorted buckets. Default is None.
+        shuffle (bool): Whether to shuffle graphs within buckets and the order of batches. Default is False.
+        seed (int): Seed for shuffle. Default is None.
+
+    Returns:
+        list: List of arrays of graph indices for each batch.
+    """
+    names = list(batch_budget.keys())
+    sizes = np.stack([np.asarray(graph_sizes[name], dtype="int64") for name in names], axis=-1)
+    budget = np.array([batch_budget[name] for name in names], dtype="int64")
+    num_graphs = len(sizes)
+    rng = np.random.default_rng(seed)
+
+    if num_buckets is not None and num_buckets > 1:
+        order = np.argsort(sizes[:, 0], kind="stable")
+        buckets = np.array_split(order, num_buckets)
+    else:
+        buckets = [np.arange(num_graphs)]
+
+    batches = []
+    for bucket in buckets:
+        if shuffle:
+            bucket = rng.permutation(bucket)
+        current, current_size = [], np.zeros_like(budget)
+        for i in bucket:
+            exceeds_budget = np.any(current_size + sizes[i] > budget)
+            exceeds_count = batch_size is not None and len(current) >= batch_size
+            if len(current) > 0 and (exceeds_budget or exceeds_count):
+                batches.append(np.array(current, dtype="int64"))
+                current, current_size = [], np.zeros_like(budget)
+            if np.any(sizes[i] > budget):
+                module_logger.warning("Graph %s exceeds batch budget with sizes %s." % (i, sizes[i]))
+            current.append(i)
+            current_size += sizes[i]
+        if len(current) > 0:
+            batches.append(np.array(current, dtype="int64"))
+
+    if shuffle:
+        batches = [batches[i] for i in rng.permutation(len(batches))]
+    return batches
+
+
+def _graph_sizes_from_buffers(buffers: dict, names: list) -> dict:
+    """Get the size of each graph for properties from buffers of :obj:`_make_property_buffers`."""
+    graph_sizes = {}
+    for name in names:
+        row_splits = buffers[name]["row_splits"]
+        if row_splits is None:
+            raise ValueError("Can not use property '%s' without length for batch budget." % name)
+        graph_sizes[name] = row_splits[1:] - row_splits[:-1]
+    return graph_sizes
+
 
 class GraphBatchLoader(ks.utils.Sequence):
-    r"""Example (minimal) implementation of a graph batch loader based on :obj:`ks.utils.Sequence`."""
+    r"""Example (minimal) implementation of a graph batch loader based on :obj:`ks.utils.Sequence`.
+
+    With :obj:`pre_concatenate` the properties of all graphs are concatenated once into flat value buffers with
+    row splits. A batch is then a single slice or gather on these buffers plus the row lengths of the batch,
+    instead of collecting and concatenating a list of arrays for each batch and input.
+
+    With :obj:`batch_budget` the batches are capped by the total number of e.g. nodes or edges instead of the number
+    of graphs, see :obj:`make_budget_batches`. The batches are packed once on initialization, since the number of
+    batches must not change between epochs, and only the order of the batches is shuffled after each epoch.
+
+    .. code-block:: python
+
+        from kgcnn.io.loader import GraphBatchLoader
+        loader = GraphBatchLoader(dataset, inputs=[{"name": "node_attributes", "ragged": True}],
+                                  outputs={"name": "graph_labels", "ragged": False},
+                                  batch_size=32, shuffle=True, pre_concatenate=True)
+        model.fit(loader, epochs=10)
+    """
 
     def __init__(self,
                  data: Union[List[dict], MemoryGraphDataset],
                  inputs: Union[dict, List[dict]],
-                 outputs: Union[dict, List[dict]],
+                 outputs: Union[dict, List[dict], np.ndarray],
                  batch_size: int = 32,
-                 shuffle: bool = False):
+                 shuffle: bool = False,
+                 pre_concatenate: bool = False,
+                 batch_budget: dict = None,
+                 num_buckets: int = None,
+                 seed: int = None):
         """Initialization with data and input information.
 
         Args:
@@ -25,30 +148,58 @@ class GraphBatchLoader(ks.utils.Sequence):
                 Required dict-keys should be 'name' and 'ragged'.
                 Optionally shape information can be included via 'shape'.
                 E.g.: `[{'name': 'edge_indices', 'ragged': True}, {...}, ...]`.
-            outputs (dict, list): List of dictionaries that specify graph properties in list via 'name' key.
-                Required dict-keys should be 'name' and 'ragged'.
+            outputs (dict, list, np.ndarray): List of dictionaries that specify graph properties in list via 'name'
+                key. Required dict-keys should be 'name' and 'ragged'.
                 Optionally shape information can be included via 'shape'.
                 E.g.: `[{'name': 'graph_labels', 'ragged': False}, {...}, ...]`.
-            batch_size (int): Batch size. Default is 32.
+                Can also be an array of labels that matches the length of `data`.
+            batch_size (int): Batch size. Maximum number of graphs if :obj:`batch_budget` is given. Default is 32.
             shuffle (bool): Whether to shuffle data. Default is False.
+            pre_concatenate (bool): Whether to concatenate all graph properties into flat buffers once on
+                initialization and slice batches from them. Default is False.
+            batch_budget (dict): Dictionary of property names and the maximum total size of this property in a
+                batch, e.g. `{"node_attributes": 2048, "edge_indices": 8192}`. Default is None.
+            num_buckets (int): Number of size-sorted buckets for :obj:`batch_budget`. Default is None.
+            seed (int): Seed for packing batches with :obj:`batch_budget`. Default is None.
         """
         self.data = data
         self.inputs = inputs
         self.outputs = outputs
         self.batch_size = batch_size
         self.shuffle = shuffle
+        self.pre_concatenate = pre_concatenate
+        self.batch_budget = batch_budget
+        self.num_buckets = num_buckets
         self.indices = np.arange(len(data))
+        self._buffers = None
+        self._batches = None
+
+        if self.pre_concatenate:
+            self._buffers = self._make_buffers()
+
+        if self.batch_budget is not None:
+            names = list(self.batch_budget.keys())
+            buffers = self._buffers if self._buffers is not None else _make_property_buffers(data, names)
+            self._batches = make_budget_batches(
+                _graph_sizes_from_buffers(buffers, names), self.batch_budget, batch_size=self.batch_size,
+                num_buckets=self.num_buckets, shuffle=self.shuffle, seed=seed)
+            self.indices = np.arange(len(self._batches))
 
         self._shuffle_indices()
 
     def __len__(self):
         """Denotes the number of batches per epoch"""
+        if self._batches is not None:
+            return len(self._batches)
         return int(np.ceil(len(self.data) / float(self.batch_size)))
 
     def __getitem__(self, index):
         """Generate one batch of data"""
         # Generate indexes of the batch
-        batch_indices = self.indices[index * self.batch_size:(index + 1) * self.batch_size]
+        if self._batches is not None:
+            batch_indices = self._batches[self.indices[index]]
+        else:
+            batch_indices = self.indices[index * self.batch_size:(index + 1) * self.batch_size]
 
         # Generate data
         x_model, y_model = self._data_generation(batch_indices)
@@ -57,6 +208,7 @@ class GraphBatchLoader(ks.utils.Sequence):
         return x_model, y_model
 
     def _shuffle_indices(self):
+        # For batch budget, these are the indices of the batches.
         if self.shuffle:
             np.random.shuffle(self.indices)
 
@@ -71,8 +223,41 @@ class GraphBatchLoader(ks.utils.Sequence):
         else:
             return tf.constant(np.array(item))
 
+    def _make_buffers(self) -> dict:
+        """Concatenate all properties requested by inputs and outputs into flat value buffers with row splits."""
+        inputs = self.inputs if not isinstance(self.inputs, dict) else [self.inputs]
+        outputs = self.outputs if not isinstance(self.outputs, (dict, np.ndarray)) else [self.outputs]
+        names = [i["name"] for i in inputs] + [o["name"] for o in outputs if isinstance(o, dict)]
+        if self.batch_budget is not None:
+            names += list(self.batch_budget.keys())
+        return _make_property_buffers(self.data, names)
+
+    def _from_buffer(self, name: str, batch_indices: np.ndarray, is_ragged: bool):
+        """Slice or gather a batch of a property from its pre-concatenated buffer."""
+        values = self._buffers[name]["values"]
+        row_splits = self._buffers[name]["row_splits"]
+        if row_splits is None:
+            # Graph-level scalar properties are stacked, not split.
+            return tf.constant(values[batch_indices])
+        starts = row_splits[batch_indices]
+        row_lengths = row_splits[batch_indices + 1] - starts
+        if len(batch_indices) > 0 and np.all(batch_indices[1:] - batch_indices[:-1] == 1):
+            # Contiguous batch is a simple slice of the buffer.
+            batch_values = values[starts[0]:starts[0] + np.sum(row_lengths)]
+        else:
+            # Offset of each value in the batch, i.e. concatenated ranges of start:start+length.
+            offsets = np.repeat(starts - np.cumsum(row_lengths) + row_lengths, row_lengths)
+            batch_values = values[offsets + np.arange(len(offsets))]
+        if is_ragged:
+            # Row partition is consistent by construction of the buffers, validation can be skipped.
+            batch_row_splits = np.concatenate([np.zeros(1, dtype=row_splits.dtype), np.cumsum(row_lengths)])
+            return tf.RaggedTensor.from_row_splits(batch_values, batch_row_splits, validate=False)
+        return tf.constant(np.reshape(batch_values, [len(batch_indices), -1] + list(values.shape[1:])))
+
     def _data_generation(self, batch_indices: Union[np.ndarray, list]):
         """Generates data containing batch_size samples"""
+        if self._buffers is not None:
+            return self._data_generation_from_buffers(np.asarray(batch_indices, dtype="int64"))
         graphs = [self.data[int(i)] for i in batch_indices]
         # Inputs
         inputs = self.inputs if not isinstance(self.inputs, dict) else [self.inputs]
@@ -83,12 +268,383 @@ class GraphBatchLoader(ks.utils.Sequence):
             x_inputs.append(self._to_tensor(data_list, is_ragged))
         y_outputs = []
         # Outputs
-        outputs = self.outputs if not isinstance(self.outputs, dict) else [self.outputs]
+        outputs = self.outputs if not isinstance(self.outputs, (dict, np.ndarray)) else [self.outputs]
         for i in outputs:
+            if isinstance(i, np.ndarray):
+                y_outputs.append(tf.constant(i[np.asarray(batch_indices, dtype="int64")]))
+                continue
             data_list = [g[i["name"]] for g in graphs]
             is_ragged = i["ragged"] if "ragged" in i else False
             y_outputs.append(self._to_tensor(data_list, is_ragged))
         # Check return type.
         x_inputs = x_inputs if not isinstance(self.inputs, dict) else x_inputs[0]
-        y_outputs = y_outputs if not isinstance(self.outputs, dict) else y_outputs[0]
+        y_outputs = y_outputs if not isinstance(self.outputs, (dict, np.ndarray)) else y_outputs[0]
+        return x_inputs, y_outputs
+
+    def _data_generation_from_buffers(self, batch_indices: np.ndarray):
+        """Generates data containing batch_size samples from pre-concatenated buffers."""
+        inputs = self.inputs if not isinstance(self.inputs, dict) else [self.inputs]
+        outputs = self.outputs if not isinstance(self.outputs, (dict, np.ndarray)) else [self.outputs]
+        x_inputs = [self._from_buffer(i["name"], batch_indices, i["ragged"] if "ragged" in i else False)
+                    for i in inputs]
+        y_outputs = [self._from_buffer(i["name"], batch_indices, i["ragged"] if "ragged" in i else False)
+                     if isinstance(i, dict) else tf.constant(i[batch_indices]) for i in outputs]
+        x_inputs = x_inputs if not isinstance(self.inputs, dict) else x_inputs[0]
+        y_outputs = y_outputs if not isinstance(self.outputs, (dict, np.ndarray)) else y_outputs[0]
         return x_inputs, y_outputs
+
+
+def _buffer_to_tensor(columns: dict, is_ragged: bool, dtype: str = None):
+    """Make a tensor for the full dataset from a property buffer, that can be gathered along first axis."""
+    values, row_splits = columns["values"], columns["row_splits"]
+    if dtype is not None:
+        values = values.astype(dtype)
+    if row_splits is None:
+        return tf.constant(values)
+    if is_ragged:
+        return tf.RaggedTensor.from_row_splits(values, row_splits, validate=False)
+    row_lengths = row_splits[1:] - row_splits[:-1]
+    if len(row_lengths) > 0 and np.any(row_lengths != row_lengths[0]):
+        raise ValueError("Can not stack property with different lengths, please set 'ragged' to `True`.")
+    return tf.constant(np.reshape(values, [len(row_lengths), -1] + list(values.shape[1:])))
+
+
+def tf_dataset_from_graph_list(data: Union[List[dict], MemoryGraphDataset],
+                               inputs: Union[dict, List[dict]],
+                               outputs: Union[dict, List[dict], np.ndarray] = None,
+                               batch_size: int = 32,
+                               shuffle: bool = False,
+                               seed: int = None,
+                               bucket_by: str = None,
+                               bucket_boundaries: list = None,
+                               num_buckets: int = 4,
+                               batch_budget: dict = None,
+                               num_parallel_calls: int = tf.data.AUTOTUNE,
+                               deterministic: bool = True,
+                               prefetch: int = tf.data.AUTOTUNE,
+                               num_shards: int = None) -> tf.data.Dataset:
+    r"""Build a :obj:`tf.data.Dataset` of batched (ragged) graph tensors from a list of graphs.
+
+    The graph properties are concatenated once into flat buffers, which are kept as (ragged) tensors. The dataset
+    iterates over graph indices, which are shuffled and batched, and gathers each batch from the buffers in a
+    parallel map. Optionally, graphs are grouped into buckets by the size of the property :obj:`bucket_by`, like
+    number of nodes or edges, so that each batch contains graphs of similar size. No padding is applied.
+
+    With :obj:`num_shards`, the graph indices (or the batches of :obj:`batch_budget`) are split into strided shards.
+    Each shard is shuffled, batched and gathered in its own dataset and the shards are read in parallel with
+    :obj:`tf.data.Dataset.interleave`. Then a batch only contains graphs of one shard.
+
+    .. code-block:: python
+
+        from kgcnn.io.loader import tf_dataset_from_graph_list
+        ds_train = tf_dataset_from_graph_list(
+            dataset[train_index], inputs=hyper["model"]["config"]["inputs"], outputs=labels[train_index],
+            batch_size=32, shuffle=True, seed=42, bucket_by="edge_indices", num_buckets=4)
+        model.fit(ds_train, epochs=100)
+
+    Args:
+        data (list, MemoryGraphDataset): Any iterable data that implements indexing operator for graph instance.
+            Each graph instance must implement indexing operator for named property.
+        inputs (dict, list): List of dictionaries that specify graph properties in list via 'name' key.
+            The dict-items match the tensor input for :obj:`tf.keras.layers.Input` layers.
+            Required dict-keys should be 'name' and 'ragged'. Optionally 'dtype' is used to cast the tensor.
+            E.g.: `[{'name': 'edge_indices', 'ragged': True}, {...}, ...]`.
+        outputs (dict, list, np.ndarray): List of dictionaries that specify graph properties in list via 'name' key
+            or an array of labels, that must match the length of `data`. If None, only inputs are returned.
+            Default is None.
+        batch_size (int): Maximum number of graphs per batch. Default is 32.
+        shuffle (bool): Whether to shuffle graphs. Reshuffled in each epoch. Default is False.
+        seed (int): Seed for shuffle to make the order deterministic. Default is None.
+        bucket_by (str): Name of the ragged property to define the size of a graph for bucketing,
+            e.g. 'node_attributes' or 'edge_indices'. Default is None, for no bucketing.
+        bucket_boundaries (list): Upper boundaries of the sizes for the buckets. If None, boundaries are determined
+            from quantiles of the graph sizes with :obj:`num_buckets`. Default is None.
+        num_buckets (int): Number of buckets, if :obj:`bucket_boundaries` is not given. Default is 4.
+        batch_budget (dict): Dictionary of property names and the maximum total size of this property in a
+            batch, e.g. `{"node_attributes": 2048, "edge_indices": 8192}`. Batches are packed once with
+            :obj:`make_budget_batches` and only their order is shuffled in each epoch. If :obj:`bucket_by` is set,
+            graphs are packed in :obj:`num_buckets` size-sorted buckets. Default is None.
+        num_parallel_calls (int): Number of parallel calls of the map function to gather batches.
+            Default is :obj:`tf.data.AUTOTUNE`.
+        deterministic (bool): Whether the parallel map has to keep the order of the batches. Default is True.
+        prefetch (int): Number of batches to prefetch. Default is :obj:`tf.data.AUTOTUNE`.
+        num_shards (int): Number of shards that are interleaved with :obj:`num_parallel_calls`. Default is None.
+
+    Returns:
+        tf.data.Dataset: Dataset of batched `(x, y)` tuples, or `x` if :obj:`outputs` is None.
+    """
+    input_list = inputs if not isinstance(inputs, dict) else [inputs]
+    output_list = outputs if isinstance(outputs, (list, tuple)) else [outputs]
+    property_names = [i["name"] for i in input_list] + [o["name"] for o in output_list if isinstance(o, dict)]
+    if bucket_by is not None:
+        property_names.append(bucket_by)
+    if batch_budget is not None:
+        property_names += list(batch_budget.keys())
+    buffers = _make_property_buffers(data, property_names)
+
+    x_tensors = [_buffer_to_tensor(buffers[i["name"]], i["ragged"] if "ragged" in i else False,
+                                   i["dtype"] if "dtype" in i else None) for i in input_list]
+    y_tensors = []
+    if outputs is not None:
+        for o in output_list:
+            if isinstance(o, dict):
+                y_tensors.append(_buffer_to_tensor(buffers[o["name"]], o["ragged"] if "ragged" in o else False))
+            else:
+                if len(o) != len(data):
+                    raise ValueError("Length of labels %s does not match number of graphs %s." % (len(o), len(data)))
+                y_tensors.append(tf.constant(np.asarray(o)))
+
+    def gather_batch(batch_indices):
+        x = [tf.gather(t, batch_indices) for t in x_tensors]
+        x = tuple(x) if not isinstance(inputs, dict) else x[0]
+        if outputs is None:
+            return x
+        y = [tf.gather(t, batch_indices) for t in y_tensors]
+        y = tuple(y) if isinstance(outputs, (list, tuple)) else y[0]
+        return x, y
+
+    if batch_budget is not None:
+        # Pack with the sizes of the bucket property first, which is used for sorting into buckets.
+        names = ([bucket_by] if bucket_by is not None else []) + list(batch_budget.keys())
+        budget = {name: batch_budget[name] if name in batch_budget else np.iinfo("int64").max for name in names}
+        batches = make_budget_batches(
+            _graph_sizes_from_buffers(buffers, names), budget, batch_size=batch_size,
+            num_buckets=num_buckets if bucket_by is not None else None, shuffle=shuffle, seed=seed)
+        # Source of a shard are its batches of graph indices.
+        sources = [batches[k::num_shards] for k in range(num_shards)] if num_shards else [batches]
+        sources = [tf.RaggedTensor.from_row_lengths(
+            np.concatenate(x + [np.zeros(0, dtype="int64")], axis=0).astype("int64"),
+            np.array([len(b) for b in x], dtype="int64")) for x in sources]
+        buffer_size = max([int(x.nrows()) for x in sources] + [1])
+
+        def make_batches(source, shard_seed):
+            ds_batches = tf.data.Dataset.from_tensor_slices(source)
+            if shuffle:
+                ds_batches = ds_batches.shuffle(buffer_size, seed=shard_seed, reshuffle_each_iteration=True)
+            return ds_batches
+    else:
+        if bucket_by is not None:
+            row_splits = buffers[bucket_by]["row_splits"]
+            if row_splits is None:
+                raise ValueError("Can not bucket by property '%s' which has no size." % bucket_by)
+            graph_sizes = row_splits[1:] - row_splits[:-1]
+            if bucket_boundaries is None:
+                bucket_boundaries = np.unique(np.quantile(graph_sizes, np.linspace(0, 1, num_buckets + 1)[1:-1]))
+            bucket_ids = tf.constant(np.searchsorted(np.asarray(bucket_boundaries), graph_sizes, side="right"),
+                                     dtype="int64")
+        # Source of a shard are its graph indices.
+        graph_indices = np.arange(len(data), dtype="int64")
+        sources = [graph_indices[k::num_shards] for k in range(num_shards)] if num_shards else [graph_indices]
+        buffer_size = max([len(x) for x in sources] + [1])
+
+        def make_batches(source, shard_seed):
+            ds_batches = tf.data.Dataset.from_tensor_slices(source)
+            if shuffle:
+                ds_batches = ds_batches.shuffle(buffer_size, seed=shard_seed, reshuffle_each_iteration=True)
+            if bucket_by is None:
+                return ds_batches.batch(batch_size)
+            group_kwargs = {"key_func": lambda i: tf.gather(bucket_ids, i),
+                            "reduce_func": lambda key, window: window.batch(batch_size),
+                            "window_size": batch_size}
+            if hasattr(ds_batches, "group_by_window"):
+                return ds_batches.group_by_window(**group_kwargs)
+            # For older tensorflow versions.
+            return ds_batches.apply(tf.data.experimental.group_by_window(**group_kwargs))
+
+    if not num_shards:
+        ds = make_batches(sources[0], seed)
+        ds = ds.map(gather_batch, num_parallel_calls=num_parallel_calls, deterministic=deterministic)
+    else:
+        if batch_budget is not None:
+            shard_sources = tf.RaggedTensor.from_row_lengths(
+                tf.concat(sources, axis=0), np.array([int(x.nrows()) for x in sources], dtype="int64"))
+        else:
+            shard_sources = tf.RaggedTensor.from_row_lengths(
+                np.concatenate(sources, axis=0), np.array([len(x) for x in sources], dtype="int64"))
+
+        def make_shard(shard, shard_seed=None):
+            return make_batches(shard_sources[shard], shard_seed).map(gather_batch)
+
+        ds = tf.data.Dataset.range(num_shards)
+        if shuffle and seed is not None:
+            # Datasets of shards are made again in each epoch. Seeds for their shuffle are drawn anew in each epoch,
+            # so that shards are reshuffled like without sharding. Without seed, shuffle draws its own seeds.
+            try:
+                shard_seeds = tf.data.Dataset.random(seed=seed, rerandomize_each_iteration=True)
+            except (AttributeError, TypeError):
+                # For older tensorflow versions, seeds are the same in each epoch.
+                module_logger.warning("Shards are shuffled in the same order in each epoch for fixed `seed`.")
+                shard_seeds = tf.data.experimental.RandomDataset(seed=seed)
+            ds = tf.data.Dataset.zip((ds, shard_seeds))
+        ds = ds.interleave(make_shard, cycle_length=num_shards, num_parallel_calls=num_parallel_calls,
+                           deterministic=deterministic)
+
+    if prefetch is not None:
+        ds = ds.prefetch(prefetch)
+    return ds
+
+
+def _pad_property(columns: dict, graph_indices: np.ndarray, size: int) -> np.ndarray:
+    """Pad a ragged property of graphs from its buffer to shape `(len(graph_indices), size, ...)` with zeros."""
+    values, row_splits = columns["values"], columns["row_splits"]
+    starts = row_splits[graph_indices]
+    row_lengths = row_splits[graph_indices + 1] - starts
+    # Position of each value within its graph and in the buffer.
+    within = np.arange(np.sum(row_lengths)) - np.repeat(np.cumsum(row_lengths) - row_lengths, row_lengths)
+    padded = np.zeros([len(graph_indices), size] + list(values.shape[1:]), dtype=values.dtype)
+    padded[np.repeat(np.arange(len(graph_indices)), row_lengths), within] = values[
+        np.repeat(starts, row_lengths) + within]
+    return padded
+
+
+def tf_padded_dataset_from_graph_list(data: Union[List[dict], MemoryGraphDataset],
+                                      inputs: Union[dict, List[dict]],
+                                      outputs: Union[dict, List[dict], np.ndarray] = None,
+                                      padded_sizes: List[dict] = None,
+                                      padded_counts: dict = None,
+                                      batch_size: int = 32,
+                                      shuffle: bool = False,
+                                      seed: int = None,
+                                      prefetch: int = tf.data.AUTOTUNE) -> tf.data.Dataset:
+    r"""Build a :obj:`tf.data.Dataset` of batched, padded graph tensors of static shape from a list of graphs.
+
+    Each graph is put into the first bucket of :obj:`padded_sizes` that fits its size, e.g. its number of nodes
+    and edges, and padded with zeros to the size of this bucket. Batches are drawn from one bucket and are filled
+    up to :obj:`batch_size` with empty graphs, so that there is only one tensor shape per bucket. This allows to
+    compile models with padded input, like :obj:`kgcnn.literature.Schnet` with `input_tensor_type="padded"`, with
+    XLA, i.e. `jit_compile=True`, once for each bucket. The number of nodes or edges of each graph, which masks the
+    padding in the model, is returned for the inputs named in :obj:`padded_counts`. If outputs are given, each batch
+    has sample weights, which are zero for the empty graphs.
+
+    A ragged property is padded to the size of the property in :obj:`padded_sizes` with the same name or with the same
+    number of entries for all graphs, e.g. node coordinates are padded like node attributes. Other properties are
+    stacked.
+
+    .. code-block:: python
+
+        from kgcnn.io.loader import tf_padded_dataset_from_graph_list
+        ds_train = tf_padded_dataset_from_graph_list(
+            dataset[train_index], inputs=hyper["model"]["config"]["inputs"], outputs=labels[train_index],
+            padded_sizes=[{"node_number": 16, "edge_indices": 128}, {"node_number": 32, "edge_indices": 512}],
+            padded_counts={"total_nodes": "node_number", "total_edges": "edge_indices"},
+            batch_size=32, shuffle=True, seed=42)
+        model.compile(loss="mean_absolute_error", optimizer="adam", jit_compile=True)
+        model.fit(ds_train, epochs=100)
+
+    Args:
+        data (list, MemoryGraphDataset): Any iterable data that implements indexing operator for graph instance.
+            Each graph instance must implement indexing operator for named property.
+        inputs (dict, list): List of dictionaries that specify graph properties in list via 'name' key.
+            The dict-items match the tensor input for :obj:`tf.keras.layers.Input` layers.
+            Required dict-key is 'name'. Optionally 'dtype' is used to cast the tensor.
+        outputs (dict, list, np.ndarray): List of dictionaries that specify graph properties in list via 'name' key
+            or an array of labels, that must match the length of `data`. If None, only inputs are returned.
+            Default is None.
+        padded_sizes (list): List of buckets, each a dictionary of property names and the padded size of this
+            property, sorted from small to large, e.g. `[{"node_number": 16, "edge_indices": 128}, ...]`.
+            If None, a single bucket with the maximum size of the properties of :obj:`padded_counts` is used.
+            Default is None.
+        padded_counts (dict): Dictionary of input names and the property names whose number of entries per graph
+            is returned for this input, e.g. `{"total_nodes": "node_number", "total_edges": "edge_indices"}`.
+            Default is None.
+        batch_size (int): Number of graphs per batch. Default is 32.
+        shuffle (bool): Whether to shuffle graphs within buckets and the order of batches. Reshuffled in each epoch.
+            Default is False.
+        seed (int): Seed for shuffle to make the order deterministic. Default is None.
+        prefetch (int): Number of batches to prefetch. Default is :obj:`tf.data.AUTOTUNE`.
+
+    Returns:
+        tf.data.Dataset: Dataset of batched `(x, y, sample_weight)` tuples, or `x` if :obj:`outputs` is None.
+    """
+    input_list = inputs if not isinstance(inputs, dict) else [inputs]
+    output_list = outputs if isinstance(outputs, (list, tuple)) else [outputs]
+    padded_counts = padded_counts if padded_counts is not None else {}
+    if padded_sizes is None:
+        padded_sizes = [{name: None for name in padded_counts.values()}]
+    size_names = list(padded_sizes[0].keys())
+    if any([list(x.keys()) != size_names for x in padded_sizes]):
+        raise ValueError("All buckets of `padded_sizes` must have the same properties %s." % size_names)
+    property_names = [i["name"] for i in input_list if i["name"] not in padded_counts] + list(
+        padded_counts.values()) + [o["name"] for o in output_list if isinstance(o, dict)] + size_names
+    buffers = _make_property_buffers(data, property_names)
+    graph_sizes = _graph_sizes_from_buffers(buffers, size_names + list(padded_counts.values()))
+    padded_sizes = [{name: x[name] if x[name] is not None else int(np.amax(graph_sizes[name], initial=0))
+                     for name in size_names} for x in padded_sizes]
+
+    # First bucket that fits all sizes of a graph.
+    sizes = np.stack([graph_sizes[name] for name in size_names], axis=-1) if size_names else np.zeros((len(data), 0))
+    limits = np.array([[x[name] for name in size_names] for x in padded_sizes], dtype="int64")
+    fits = np.all(np.expand_dims(sizes, axis=1) <= np.expand_dims(limits, axis=0), axis=-1)
+    if not np.all(np.any(fits, axis=-1)):
+        raise ValueError("Graphs %s do not fit in any bucket of `padded_sizes`." % np.nonzero(
+            np.logical_not(np.any(fits, axis=-1)))[0])
+    bucket_ids = np.argmax(fits, axis=-1)
+
+    def size_name_of(name: str):
+        if buffers[name]["row_splits"] is None:
+            return None
+        if name in size_names:
+            return name
+        row_lengths = buffers[name]["row_splits"][1:] - buffers[name]["row_splits"][:-1]
+        for x in size_names:
+            if np.array_equal(row_lengths, graph_sizes[x]):
+                return x
+        return None
+
+    def make_tensor(item, graph_indices: np.ndarray, bucket: dict, dtype: str = None):
+        if isinstance(item, np.ndarray):
+            values = item[graph_indices]
+        elif item["name"] in padded_counts:
+            values = graph_sizes[padded_counts[item["name"]]][graph_indices]
+        elif size_name_of(item["name"]) is not None:
+            values = _pad_property(buffers[item["name"]], graph_indices, bucket[size_name_of(item["name"])])
+        else:
+            values = _buffer_to_tensor(buffers[item["name"]], False).numpy()[graph_indices]
+        # Empty graph at the end to fill up batches.
+        values = np.concatenate([values, np.zeros_like(values[:1])], axis=0)
+        return tf.constant(values if dtype is None else values.astype(dtype))
+
+    datasets, choices = [], []
+    for bucket_id, bucket in enumerate(padded_sizes):
+        graph_indices = np.nonzero(bucket_ids == bucket_id)[0]
+        num_graphs = len(graph_indices)
+        if num_graphs == 0:
+            continue
+        x_tensors = [make_tensor(i, graph_indices, bucket, i["dtype"] if "dtype" in i else None) for i in input_list]
+        y_tensors = []
+        if outputs is not None:
+            for o in output_list:
+                if isinstance(o, np.ndarray) and len(o) != len(data):
+                    raise ValueError("Length of labels %s does not match number of graphs %s." % (len(o), len(data)))
+                y_tensors.append(make_tensor(np.asarray(o) if not isinstance(o, dict) else o, graph_indices, bucket))
+
+        def gather_batch(batch_indices, x_tensors=x_tensors, y_tensors=y_tensors, num_graphs=num_graphs):
+            # Fill up with the empty graph at index `num_graphs` for a static batch dimension.
+            batch_indices = tf.reshape(tf.concat([batch_indices, tf.fill(
+                [batch_size - tf.shape(batch_indices)[0]], tf.constant(num_graphs, dtype=batch_indices.dtype))],
+                axis=0), [batch_size])
+            x = [tf.gather(t, batch_indices) for t in x_tensors]
+            x = tuple(x) if not isinstance(inputs, dict) else x[0]
+            if outputs is None:
+                return x
+            y = [tf.gather(t, batch_indices) for t in y_tensors]
+            y = tuple(y) if isinstance(outputs, (list, tuple)) else y[0]
+            return x, y, tf.cast(batch_indices < num_graphs, dtype="float32")
+
+        ds = tf.data.Dataset.range(num_graphs)
+        if shuffle:
+            ds = ds.shuffle(num_graphs, seed=seed, reshuffle_each_iteration=True)
+        datasets.append(ds.batch(batch_size).map(gather_batch))
+        choices.append(np.full(int(np.ceil(num_graphs / batch_size)), len(datasets) - 1, dtype="int64"))
+
+    choice_ds = tf.data.Dataset.from_tensor_slices(np.concatenate(choices, axis=0))
+    if shuffle:
+        choice_ds = choice_ds.shuffle(len(choice_ds), seed=seed, reshuffle_each_iteration=True)
+    if hasattr(tf.data.Dataset, "choose_from_datasets"):
+        ds = tf.data.Dataset.choose_from_datasets(datasets, choice_ds)
+    else:
+        # For older tensorflow versions.
+        ds = tf.data.experimental.choose_from_datasets(datasets, choice_ds)
+    if prefetch is not None:
+        ds = ds.prefetch(prefetch)
+    return ds
@@ -7,14 +7,31 @@ ks = tf.keras
 
 class GraphBaseLayer(ks.layers.Layer):
     r"""Base layer for graph layers used in :obj:`kgcnn` that holds some additional information about the graph, which
-    could improve performance for some layers, if set differently like e.g. `is_sorted`, but which are not handed down
-    to sub-layers for now.
+    could improve performance for some layers, if set differently like e.g. `is_sorted`. Convolution layers hand down
+    `is_sorted` to their pooling sub-layers that aggregate edges for the first (ingoing) index. The other flags are not
+    handed down to sub-layers for now.
+
+    If the edge indices are sorted for the first index in each graph, e.g. by
+    :obj:`kgcnn.graph.preprocessor.SortEdgeIndices`, setting `is_sorted=True` lets pooling layers skip the argsort
+    and use sorted segment operations directly. With `ragged_validate=True` the sorting is checked on runtime by
+    :obj:`assert_sorted_index`.
+
+    Gather and pooling layers also accept the disjoint representation of a batch of
+    :obj:`kgcnn.layers.casting.CastRaggedToDisjoint`, i.e. flat tensors of nodes and edges and an index tensor that
+    already refers to the nodes of the whole batch, which is checked by :obj:`is_disjoint_index`. Their output is then
+    a flat tensor as well. Layers that only act on the values of ragged tensors accept flat tensors anyway.
+
+    Under a mixed precision policy of :obj:`tf.keras.mixed_precision`, layers that are sensitive to the precision of
+    their inputs, like geometric layers that compute distances from coordinates, set the class attribute
+    `_compute_in_float32` to run in float32 instead of the compute dtype of the policy, unless `dtype` is given.
 
     Moreover, some useful utility functions are methods of this class like e.g. :obj:`assert_ragged_input_rank` that
     can be used in graph layers for convenience.
 
     """
 
+    _compute_in_float32 = False
+
     def __init__(self,
                  node_indexing: str = "sample",
                  ragged_validate: bool = False,
@@ -29,6 +46,10 @@ class GraphBaseLayer(ks.layers.Layer):
             is_sorted (bool): If the edge indices are sorted for first ingoing index. Default is False.
             has_unconnected (bool): If unconnected nodes are allowed. Default is True.
         """
+        if self._compute_in_float32 and kwargs.get("dtype") is None:
+            policy = ks.mixed_precision.global_policy()
+            if policy.compute_dtype != policy.variable_dtype:
+                kwargs["dtype"] = policy.variable_dtype
         super(GraphBaseLayer, self).__init__(**kwargs)
         self.node_indexing = node_indexing
         self.ragged_validate = ragged_validate
@@ -94,6 +115,38 @@ class GraphBaseLayer(ks.layers.Layer):
         # ...
         return inputs
 
+    @staticmethod
+    def is_disjoint_index(index) -> bool:
+        r"""Whether an index tensor is given in disjoint representation of the batch, i.e. it is a flat
+        :obj:`tf.Tensor` of shape `(M, 2)`, whose indices already refer to the nodes of the whole batch, as returned by
+        :obj:`kgcnn.layers.casting.CastRaggedToDisjoint`. Ragged index tensors of shape `(batch, [M], 2)` and padded
+        index tensors of shape `(batch, M, 2)` are not disjoint.
+
+        Args:
+            index: Index tensor.
+
+        Returns:
+            bool: Whether index is disjoint.
+        """
+        return not isinstance(index, tf.RaggedTensor) and index.shape.rank == 2
+
+    def assert_sorted_index(self, index):
+        r"""Assert that a (batch) index tensor is sorted in ascending order, if :obj:`ragged_validate` is set.
+        Otherwise, the index is returned without any check.
+
+        Args:
+            index (tf.Tensor): Index tensor of shape `(M, )`.
+
+        Returns:
+            tf.Tensor: Index tensor of shape `(M, )`.
+        """
+        if not self.ragged_validate:
+            return index
+        check = tf.debugging.assert_greater_equal(
+            index[1:], index[:-1], message="%s has `is_sorted=True` but index is not sorted." % self.name)
+        with tf.control_dependencies([check]):
+            return tf.identity(index)
+
     def call_on_values_tensor_of_ragged(self, fun, inputs, **kwargs):
         r"""This is a helper function that attempts to call :obj:`fun` on the value tensor(s) of :obj:`inputs`.
         For ragged rank of one, the values is a :obj:`tf.Tensor` itself.
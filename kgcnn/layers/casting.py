@@ -252,4 +252,221 @@ class CastEdgeIndicesToDisjointSparseAdjacency(GraphBaseLayer):
     def get_config(self):
         """Update layer config."""
         config = super(CastEdgeIndicesToDisjointSparseAdjacency, self).get_config()
-        return config
\ No newline at end of file
+        return config
+
+@ks.utils.register_keras_serializable(package='kgcnn', name='CastRaggedToDisjoint')
+class CastRaggedToDisjoint(GraphBaseLayer):
+    r"""Layer to cast a batch of graphs given by ragged node embeddings and edge indices into the disjoint
+    representation, in which the batch is one big graph with disconnected sub-graphs.
+
+    The disjoint representation is a list of flat tensors:
+
+        - nodes (tf.Tensor): Node embeddings of the batch of shape `(batch*[N], F)`.
+        - edge_index (tf.Tensor): Edge indices referring to the nodes of the batch of shape `(batch*[M], 2)`.
+        - graph_id_node (tf.Tensor): ID of the graph for each node of shape `(batch*[N], )`.
+        - graph_id_edge (tf.Tensor): ID of the graph for each edge of shape `(batch*[M], )`.
+        - node_count (tf.Tensor): Number of nodes per graph of shape `(batch, )`.
+        - edge_count (tf.Tensor): Number of edges per graph of shape `(batch, )`.
+
+    It is computed once at the input of a model and can be passed through all gather, pooling and embedding layers,
+    which then work on flat tensors without any index shift or ragged partition bookkeeping. Further node- or
+    edge-like ragged tensors can be cast by :obj:`ChangeTensorType` with `output_tensor_type="values"`, which keeps
+    the order of the flat values. The output of a model can be cast back by :obj:`CastDisjointToRagged`.
+
+    .. code-block:: python
+
+        import tensorflow as tf
+        from kgcnn.layers.casting import CastRaggedToDisjoint
+        nodes = tf.ragged.constant([[[0.0], [1.0]], [[2.0], [3.0], [4.0]]], ragged_rank=1)
+        edge_idx = tf.ragged.constant([[[0, 1], [1, 0]], [[0, 2], [1, 2]]], ragged_rank=1)
+        n, idx, graph_id_node, graph_id_edge, node_count, edge_count = CastRaggedToDisjoint()([nodes, edge_idx])
+        print(idx)
+        # tf.Tensor([[0 1] [1 0] [2 4] [3 4]], shape=(4, 2), dtype=int64)
+
+    """
+
+    def __init__(self, **kwargs):
+        """Initialize layer."""
+        super(CastRaggedToDisjoint, self).__init__(**kwargs)
+
+    def build(self, input_shape):
+        """Build layer."""
+        super(CastRaggedToDisjoint, self).build(input_shape)
+
+    def call(self, inputs, **kwargs):
+        r"""Forward pass.
+
+        Args:
+            inputs (list): [nodes, edge_index]
+
+                - nodes (tf.RaggedTensor): Node embeddings of shape `(batch, [N], F)`
+                - edge_index (tf.RaggedTensor): Edge indices referring to nodes of shape `(batch, [M], 2)`
+
+        Returns:
+            list: [nodes, edge_index, graph_id_node, graph_id_edge, node_count, edge_count]
+        """
+        self.assert_ragged_input_rank(inputs)
+        nodes, node_splits = inputs[0].values, inputs[0].row_splits
+        edge_index, edge_count = inputs[1].values, inputs[1].row_lengths()
+        graph_id_node = inputs[0].value_rowids()
+        graph_id_edge = inputs[1].value_rowids()
+        disjoint_index = edge_index + tf.expand_dims(
+            tf.cast(tf.gather(node_splits, graph_id_edge), dtype=edge_index.dtype), axis=-1)
+        return [nodes, disjoint_index, graph_id_node, graph_id_edge, inputs[0].row_lengths(), edge_count]
+
+    def get_config(self):
+        """Update layer config."""
+        config = super(CastRaggedToDisjoint, self).get_config()
+        return config
+
+
+@ks.utils.register_keras_serializable(package='kgcnn', name='CastDisjointToRagged')
+class CastDisjointToRagged(GraphBaseLayer):
+    r"""Layer to cast a flat tensor of the disjoint representation of :obj:`CastRaggedToDisjoint` back to a ragged
+    tensor of the batch.
+
+    .. code-block:: python
+
+        import tensorflow as tf
+        from kgcnn.layers.casting import CastDisjointToRagged
+        print(CastDisjointToRagged()([tf.constant([[0.0], [1.0], [2.0]]), tf.constant([1, 2])]))
+        # <tf.RaggedTensor [[[0.0]], [[1.0], [2.0]]]>
+
+    """
+
+    def __init__(self, **kwargs):
+        """Initialize layer."""
+        super(CastDisjointToRagged, self).__init__(**kwargs)
+
+    def build(self, input_shape):
+        """Build layer."""
+        super(CastDisjointToRagged, self).build(input_shape)
+
+    def call(self, inputs, **kwargs):
+        r"""Forward pass.
+
+        Args:
+            inputs (list): [values, count]
+
+                - values (tf.Tensor): Flat node or edge embeddings of shape `(batch*[N], F)`
+                - count (tf.Tensor): Number of nodes or edges per graph of shape `(batch, )`
+
+        Returns:
+            tf.RaggedTensor: Embeddings of shape `(batch, [N], F)`
+        """
+        return tf.RaggedTensor.from_row_lengths(inputs[0], inputs[1], validate=self.ragged_validate)
+
+    def get_config(self):
+        """Update layer config."""
+        config = super(CastDisjointToRagged, self).get_config()
+        return config
+
+
+@ks.utils.register_keras_serializable(package='kgcnn', name='CastPaddedToDisjoint')
+class CastPaddedToDisjoint(GraphBaseLayer):
+    r"""Layer to cast a batch of graphs given by padded node embeddings and edge indices into the disjoint
+    representation of :obj:`CastRaggedToDisjoint`, in which the batch is one big graph with disconnected sub-graphs.
+
+    Padded tensors have a static shape for a fixed number of nodes and edges per graph, which allows to compile the
+    model with XLA, i.e. `jit_compile=True`, once for each shape. The number of nodes and edges of each graph are
+    given by separate count tensors, which act as masks. All padded nodes are kept in the flat node tensor, so that its
+    shape stays static, and one dummy node is appended at the end. All padded edges are redirected to this dummy node.
+    Hence, padded edges never send messages to real nodes. The graph ID of padded nodes and edges and of the dummy node
+    is -1, which is dropped by the unsorted segment operations of e.g. :obj:`PoolingNodes`.
+
+    The output is a list of flat tensors in the order of :obj:`CastRaggedToDisjoint` and can be passed through all
+    gather, pooling and embedding layers. If nodes is a list of node-like tensors, like node attributes and
+    coordinates, the first output is a list of flat tensors as well.
+
+    Optionally, padded angle indices referring to pairs of edges and the number of angles of each graph can be given,
+    e.g. for :obj:`DimeNetPP`. Then one dummy edge between the dummy node is appended to the edge indices, to which
+    all padded angles are redirected, and the angle indices and their graph ID are appended to the output.
+
+    .. code-block:: python
+
+        import tensorflow as tf
+        from kgcnn.layers.casting import CastPaddedToDisjoint
+        nodes = tf.constant([[[0.0], [1.0], [0.0]], [[2.0], [3.0], [4.0]]])
+        edge_idx = tf.constant([[[0, 1], [1, 0]], [[0, 2], [1, 2]]], dtype="int64")
+        n, idx, graph_id_node, graph_id_edge, node_count, edge_count = CastPaddedToDisjoint()(
+            [nodes, edge_idx, tf.constant([2, 3], dtype="int64"), tf.constant([2, 2], dtype="int64")])
+        print(idx)
+        # tf.Tensor([[0 1] [1 0] [3 5] [4 5]], shape=(4, 2), dtype=int64)
+        print(graph_id_node)
+        # tf.Tensor([ 0  0 -1  1  1  1 -1], shape=(7,), dtype=int64)
+
+    """
+
+    def __init__(self, **kwargs):
+        """Initialize layer."""
+        super(CastPaddedToDisjoint, self).__init__(**kwargs)
+
+    def build(self, input_shape):
+        """Build layer."""
+        super(CastPaddedToDisjoint, self).build(input_shape)
+
+    def call(self, inputs, **kwargs):
+        r"""Forward pass.
+
+        Args:
+            inputs (list): [nodes, edge_index, node_count, edge_count] or
+                [nodes, edge_index, node_count, edge_count, angle_index, angle_count]
+
+                - nodes (tf.Tensor, list): Padded node embeddings of shape `(batch, N, F)` or a list of them
+                - edge_index (tf.Tensor): Padded edge indices referring to nodes of shape `(batch, M, 2)`
+                - node_count (tf.Tensor): Number of nodes per graph of shape `(batch, )`
+                - edge_count (tf.Tensor): Number of edges per graph of shape `(batch, )`
+                - angle_index (tf.Tensor): Padded angle indices referring to edges of shape `(batch, K, 2)`
+                - angle_count (tf.Tensor): Number of angles per graph of shape `(batch, )`
+
+        Returns:
+            list: [nodes, edge_index, graph_id_node, graph_id_edge, node_count, edge_count] or
+            [nodes, edge_index, graph_id_node, graph_id_edge, node_count, edge_count, angle_index, graph_id_angle,
+            angle_count] if angle indices are given.
+        """
+        nodes, edge_index, node_count, edge_count = inputs[:4]
+        node_list = list(nodes) if isinstance(nodes, (list, tuple)) else [nodes]
+        shape_nodes = tf.shape(node_list[0])
+        batch_size, max_nodes = shape_nodes[0], shape_nodes[1]
+        num_nodes = batch_size * max_nodes
+        flat_nodes = []
+        for x in node_list:
+            x = tf.reshape(x, tf.concat([[num_nodes], tf.shape(x)[2:]], axis=0))
+            # Dummy node at index `num_nodes` that receives all padded edges.
+            flat_nodes.append(tf.concat([x, tf.zeros_like(x[:1])], axis=0))
+
+        graph_id = tf.expand_dims(tf.range(batch_size, dtype=edge_index.dtype), axis=-1)
+        node_mask = tf.sequence_mask(node_count, max_nodes)
+        edge_mask = tf.sequence_mask(edge_count, tf.shape(edge_index)[1])
+        no_graph = tf.constant(-1, dtype=edge_index.dtype)
+        graph_id_node = tf.concat([tf.reshape(tf.where(node_mask, graph_id, no_graph), [-1]),
+                                   tf.expand_dims(no_graph, axis=0)], axis=0)
+        graph_id_edge = tf.reshape(tf.where(edge_mask, graph_id, no_graph), [-1])
+        disjoint_index = edge_index + tf.expand_dims(graph_id * tf.cast(max_nodes, dtype=edge_index.dtype), axis=-1)
+        disjoint_index = tf.where(tf.expand_dims(edge_mask, axis=-1), disjoint_index,
+                                  tf.cast(num_nodes, dtype=edge_index.dtype))
+        disjoint_index = tf.reshape(disjoint_index, [-1, 2])
+        nodes = flat_nodes if isinstance(nodes, (list, tuple)) else flat_nodes[0]
+        if len(inputs) <= 4:
+            return [nodes, disjoint_index, graph_id_node, graph_id_edge, node_count, edge_count]
+
+        angle_index, angle_count = inputs[4:]
+        max_edges = tf.shape(edge_index)[1]
+        num_edges = tf.cast(batch_size * max_edges, dtype=angle_index.dtype)
+        # Dummy edge at index `num_edges` between the dummy node, which receives all padded angles.
+        dummy_edge = tf.fill([1, 2], tf.cast(num_nodes, dtype=disjoint_index.dtype))
+        disjoint_index = tf.concat([disjoint_index, dummy_edge], axis=0)
+        graph_id_edge = tf.concat([graph_id_edge, tf.expand_dims(no_graph, axis=0)], axis=0)
+        graph_id = tf.cast(graph_id, dtype=angle_index.dtype)
+        angle_mask = tf.sequence_mask(angle_count, tf.shape(angle_index)[1])
+        graph_id_angle = tf.reshape(tf.where(angle_mask, graph_id, tf.cast(no_graph, dtype=angle_index.dtype)), [-1])
+        disjoint_angle = angle_index + tf.expand_dims(graph_id * tf.cast(max_edges, dtype=angle_index.dtype), axis=-1)
+        disjoint_angle = tf.where(tf.expand_dims(angle_mask, axis=-1), disjoint_angle, num_edges)
+        disjoint_angle = tf.reshape(disjoint_angle, [-1, 2])
+        return [nodes, disjoint_index, graph_id_node, graph_id_edge, node_count, edge_count, disjoint_angle,
+                graph_id_angle, angle_count]
+
+    def get_config(self):
+        """Update layer config."""
+        config = super(CastPaddedToDisjoint, self).get_config()
+        return config
@@ -61,7 +61,7 @@ class AttentiveHeadFP(GraphBaseLayer):
         self.lay_gather_in = GatherNodesIngoing()
         self.lay_gather_out = GatherNodesOutgoing()
         self.lay_concat = LazyConcatenate(axis=-1)
-        self.lay_pool_attention = PoolingLocalEdgesAttention()
+        self.lay_pool_attention = PoolingLocalEdgesAttention(is_sorted=self.is_sorted)
         self.lay_final_activ = ActivationEmbedding(activation=activation_context)
         if use_edge_features:
             self.lay_fc1 = DenseEmbedding(units, activation=activation, use_bias=use_bias, **kernel_args)
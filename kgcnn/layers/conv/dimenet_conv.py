@@ -278,7 +278,7 @@ class DimNetOutputBlock(GraphBaseLayer):
         self.dense_mlp = GraphMLP([out_emb_size] * num_dense, activation=activation,
                                   kernel_initializer=kernel_initializer, use_bias=use_bias, **kernel_args)
         self.dimnet_mult = LazyMultiply()
-        self.pool = PoolingLocalEdges(pooling_method=self.pooling_method)
+        self.pool = PoolingLocalEdges(pooling_method=self.pooling_method, is_sorted=self.is_sorted)
         self.dense_final = DenseEmbedding(num_targets, use_bias=False, kernel_initializer=output_kernel_initializer,
                                           **kernel_args)
 
@@ -388,6 +388,8 @@ class SphericalBasisLayer(GraphBaseLayer):
         envelope_exponent (int): Degree of the envelope to smoothen at cutoff. Default is 5.
     """
 
+    _compute_in_float32 = True
+
     def __init__(self, num_spherical,
                  num_radial,
                  cutoff,
@@ -406,7 +408,7 @@ class SphericalBasisLayer(GraphBaseLayer):
         self.bessel_n_zeros = spherical_bessel_jn_zeros(num_spherical, num_radial)
         self.bessel_norm = spherical_bessel_jn_normalization_prefactor(num_spherical, num_radial)
 
-        self.layer_gather_out = GatherNodesOutgoing()
+        self.layer_gather_out = GatherNodesOutgoing(dtype=self.dtype_policy)
 
     @tf.function
     def envelope(self, inputs):
@@ -427,15 +429,24 @@ class SphericalBasisLayer(GraphBaseLayer):
                 - angles (tf.RaggedTensor): Angle list of shape (batch, [K], 1)
                 - angle_index (tf.RaggedTensor): Angle indices referring to edges of shape (batch, [K], 2)
 
+            or flat tensors of shape (M, 1), (K, 1) and (K, 2) with angle indices referring to the edges of the batch
+            in the disjoint representation.
+
         Returns:
             tf.RaggedTensor: Expanded angle/distance basis. Shape is (batch, [K], #Radial * #Spherical)
         """
-        inputs = self.assert_ragged_input_rank(inputs)
-        edge, edge_part = inputs[0].values, inputs[0].row_splits
-        angles, angle_part = inputs[1].values, inputs[1].row_splits
+        disjoint = self.is_disjoint_index(inputs[2])
+        if not disjoint:
+            inputs = self.assert_ragged_input_rank(inputs)
+            edge, edge_part = inputs[0].values, inputs[0].row_splits
+            angles, angle_part = inputs[1].values, inputs[1].row_splits
+        else:
+            edge, angles = inputs[0], inputs[1]
 
         d = edge
-        d_scaled = d[:, 0] * self.inv_cutoff
+        d_scaled = d[:, 0] * tf.cast(self.inv_cutoff, dtype=d.dtype)
+        # Zero distance, e.g. of padded edges, is set to the cutoff, where the envelope is zero, to avoid NaN.
+        d_scaled = tf.where(d_scaled > 0, d_scaled, tf.ones_like(d_scaled))
         rbf = []
         for n in range(self.num_spherical):
             for k in range(self.num_radial):
@@ -444,8 +455,11 @@ class SphericalBasisLayer(GraphBaseLayer):
 
         d_cutoff = self.envelope(d_scaled)
         rbf_env = d_cutoff[:, None] * rbf
-        ragged_rbf_env = tf.RaggedTensor.from_row_splits(rbf_env, edge_part, validate=self.ragged_validate)
-        rbf_env = self.layer_gather_out([ragged_rbf_env, inputs[2]], **kwargs).values
+        if not disjoint:
+            ragged_rbf_env = tf.RaggedTensor.from_row_splits(rbf_env, edge_part, validate=self.ragged_validate)
+            rbf_env = self.layer_gather_out([ragged_rbf_env, inputs[2]], **kwargs).values
+        else:
+            rbf_env = self.layer_gather_out([rbf_env, inputs[2]], **kwargs)
         # rbf_env = tf.gather(rbf_env, id_expand_kj[:, 1])
 
         cbf = [tf_spherical_harmonics_yl(angles[:, 0], n) for n in range(self.num_spherical)]
@@ -453,6 +467,8 @@ class SphericalBasisLayer(GraphBaseLayer):
         cbf = tf.repeat(cbf, self.num_radial, axis=1)
         out = rbf_env * cbf
 
+        if disjoint:
+            return out
         out = tf.RaggedTensor.from_row_splits(out, angle_part, validate=self.ragged_validate)
         return out
 
@@ -58,7 +58,7 @@ class DMPNNPPoolingEdgesDirected(GraphBaseLayer):
     def __init__(self, **kwargs):
         """Initialize layer."""
         super(DMPNNPPoolingEdgesDirected, self).__init__(**kwargs)
-        self.pool_edge_1 = PoolingLocalEdges(pooling_method="sum")
+        self.pool_edge_1 = PoolingLocalEdges(pooling_method="sum", is_sorted=self.is_sorted)
         self.gather_edges = GatherNodesOutgoing()
         self.gather_pairs = DMPNNGatherEdgesPairs()
         self.subtract_layer = LazySubtract()
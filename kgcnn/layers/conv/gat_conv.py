@@ -66,7 +66,7 @@ class AttentionHeadGAT(GraphBaseLayer):
         self.lay_gather_in = GatherNodesIngoing()
         self.lay_gather_out = GatherNodesOutgoing()
         self.lay_concat = LazyConcatenate(axis=-1)
-        self.lay_pool_attention = PoolingLocalEdgesAttention()
+        self.lay_pool_attention = PoolingLocalEdgesAttention(is_sorted=self.is_sorted)
         if self.use_final_activation:
             self.lay_final_activ = ActivationEmbedding(activation=activation)
 
@@ -177,7 +177,7 @@ class AttentionHeadGATV2(GraphBaseLayer):
         self.lay_gather_in = GatherNodesIngoing()
         self.lay_gather_out = GatherNodesOutgoing()
         self.lay_concat = LazyConcatenate(axis=-1)
-        self.lay_pool_attention = PoolingLocalEdgesAttention()
+        self.lay_pool_attention = PoolingLocalEdgesAttention(is_sorted=self.is_sorted)
         if self.use_final_activation:
             self.lay_final_activ = ActivationEmbedding(activation=activation)
 
@@ -257,7 +257,7 @@ class MultiHeadGATV2Layer(AttentionHeadGATV2):
 
         self.lay_concat_alphas = LazyConcatenate(axis=-2)
         self.lay_concat_embeddings = LazyConcatenate(axis=-2)
-        self.lay_pool_attention = PoolingLocalEdgesAttention()
+        self.lay_pool_attention = PoolingLocalEdgesAttention(is_sorted=self.is_sorted)
         # self.lay_pool = PoolingLocalEdges()
 
         if self.concat_heads:
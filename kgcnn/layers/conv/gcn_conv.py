@@ -3,6 +3,7 @@ import tensorflow as tf
 from kgcnn.layers.base import GraphBaseLayer
 from kgcnn.layers.gather import GatherNodesOutgoing
 from kgcnn.layers.pooling import PoolingWeightedLocalEdges
+from kgcnn.layers.message import GatherMessagePooling
 from kgcnn.layers.modules import ActivationEmbedding, DenseEmbedding
 
 
@@ -25,6 +26,8 @@ class GCN(GraphBaseLayer):
             In this case the edge features are considered weights of dimension (...,1) and are summed for each node.
         activation (str): Activation. Default is {"class_name": "kgcnn>leaky_relu", "config": {"alpha": 0.2}}.
         use_bias (bool): Use bias. Default is True.
+        use_fused (bool): Whether to use the fused :obj:`GatherMessagePooling` for gather, weighting and pooling.
+            Default is False.
         kernel_regularizer: Kernel regularization. Default is None.
         bias_regularizer: Bias regularization. Default is None.
         activity_regularizer: Activity regularization. Default is None.
@@ -40,6 +43,7 @@ class GCN(GraphBaseLayer):
                  normalize_by_weights=False,
                  activation='kgcnn>leaky_relu',
                  use_bias=True,
+                 use_fused=False,
                  kernel_regularizer=None,
                  bias_regularizer=None,
                  activity_regularizer=None,
@@ -53,17 +57,21 @@ class GCN(GraphBaseLayer):
         self.normalize_by_weights = normalize_by_weights
         self.pooling_method = pooling_method
         self.units = units
+        self.use_fused = use_fused
         kernel_args = {"kernel_regularizer": kernel_regularizer, "activity_regularizer": activity_regularizer,
                        "bias_regularizer": bias_regularizer, "kernel_constraint": kernel_constraint,
                        "bias_constraint": bias_constraint, "kernel_initializer": kernel_initializer,
                        "bias_initializer": bias_initializer, "use_bias": use_bias}
-        pool_args = {"pooling_method": pooling_method, "normalize_by_weights": normalize_by_weights}
+        pool_args = {"pooling_method": pooling_method, "normalize_by_weights": normalize_by_weights,
+                     "is_sorted": self.is_sorted}
 
         # Layers
         self.lay_gather = GatherNodesOutgoing()
         self.lay_dense = DenseEmbedding(units=self.units, activation='linear', **kernel_args)
         self.lay_pool = PoolingWeightedLocalEdges(**pool_args)
         self.lay_act = ActivationEmbedding(activation)
+        if self.use_fused:
+            self.lay_fused = GatherMessagePooling(message="multiply", **pool_args)
 
     def build(self, input_shape):
         """Build layer."""
@@ -73,19 +81,24 @@ class GCN(GraphBaseLayer):
         """Forward pass.
 
         Args:
-            inputs: [nodes, edges, edge_index]
+            inputs: [nodes, edges, edge_index] or [nodes, edges, edge_index, disjoint_index]
 
                 - nodes (tf.RaggedTensor): Node embeddings of shape (batch, [N], F)
                 - edges (tf.RaggedTensor): Edge or message embeddings of shape (batch, [M], F)
                 - edge_index (tf.RaggedTensor): Edge indices referring to nodes of shape (batch, [M], 2)
+                - disjoint_index (tf.RaggedTensor): Optional output of :obj:`DisjointEdgeIndices` for
+                  :obj:`use_fused=True` of shape (batch, [M], 2)
 
         Returns:
             tf.RaggedTensor: Node embeddings of shape (batch, [N], F)
         """
-        node, edges, edge_index = inputs
+        node, edges, edge_index = inputs[:3]
         no = self.lay_dense(node, **kwargs)
-        no = self.lay_gather([no, edge_index], **kwargs)
-        nu = self.lay_pool([node, no, edge_index, edges], **kwargs)  # Summing for each node connection
+        if self.use_fused:
+            nu = self.lay_fused([no, edges, edge_index] + list(inputs[3:]), **kwargs)
+        else:
+            no = self.lay_gather([no, edge_index], **kwargs)
+            nu = self.lay_pool([node, no, edge_index, edges], **kwargs)  # Summing for each node connection
         out = self.lay_act(nu, **kwargs)
         return out
 
@@ -93,7 +106,7 @@ class GCN(GraphBaseLayer):
         """Update config."""
         config = super(GCN, self).get_config()
         config.update({"normalize_by_weights": self.normalize_by_weights,
-                       "pooling_method": self.pooling_method, "units": self.units})
+                       "pooling_method": self.pooling_method, "units": self.units, "use_fused": self.use_fused})
         conf_dense = self.lay_dense.get_config()
         for x in ["kernel_regularizer", "activity_regularizer", "bias_regularizer", "kernel_constraint",
                   "bias_constraint", "kernel_initializer", "bias_initializer", "use_bias"]:
@@ -3,6 +3,7 @@ import tensorflow as tf
 from kgcnn.layers.base import GraphBaseLayer
 from kgcnn.layers.gather import GatherNodesOutgoing
 from kgcnn.layers.pooling import PoolingLocalEdges
+from kgcnn.layers.message import GatherMessagePooling
 from kgcnn.layers.modules import LazyAdd, ActivationEmbedding
 
 
@@ -26,21 +27,28 @@ class GIN(GraphBaseLayer):
     def __init__(self,
                  pooling_method='sum',
                  epsilon_learnable=False,
+                 use_fused=False,
                  **kwargs):
         """Initialize layer.
 
         Args:
             epsilon_learnable (bool): If epsilon is learnable or just constant zero. Default is False.
             pooling_method (str): Pooling method for summing edges. Default is 'segment_sum'.
+            use_fused (bool): Whether to use the fused :obj:`GatherMessagePooling` for gather and pooling.
+                Default is False.
         """
         super(GIN, self).__init__(**kwargs)
         self.pooling_method = pooling_method
         self.epsilon_learnable = epsilon_learnable
+        self.use_fused = use_fused
 
         # Layers
         self.lay_gather = GatherNodesOutgoing()
-        self.lay_pool = PoolingLocalEdges(pooling_method=self.pooling_method)
+        self.lay_pool = PoolingLocalEdges(pooling_method=self.pooling_method, is_sorted=self.is_sorted)
         self.lay_add = LazyAdd()
+        if self.use_fused:
+            self.lay_fused = GatherMessagePooling(pooling_method=self.pooling_method, message="nodes",
+                                                  is_sorted=self.is_sorted)
 
         # Epsilon with trainable as optional and default zeros initialized.
         self.eps_k = self.add_weight(name="epsilon_k", trainable=self.epsilon_learnable,
@@ -54,17 +62,22 @@ class GIN(GraphBaseLayer):
         r"""Forward pass.
 
         Args:
-            inputs: [nodes, edge_index]
+            inputs: [nodes, edge_index] or [nodes, edge_index, disjoint_index]
 
                 - nodes (tf.RaggedTensor): Node embeddings of shape `(batch, [N], F)`
                 - edge_index (tf.RaggedTensor): Edge indices referring to nodes of shape `(batch, [M], 2)`
+                - disjoint_index (tf.RaggedTensor): Optional output of :obj:`DisjointEdgeIndices` for
+                  :obj:`use_fused=True` of shape `(batch, [M], 2)`
 
         Returns:
             tf.RaggedTensor: Node embeddings of shape `(batch, [N], F)`
         """
-        node, edge_index = inputs
-        ed = self.lay_gather([node, edge_index], **kwargs)
-        nu = self.lay_pool([node, ed, edge_index], **kwargs)  # Summing for each node connection
+        node, edge_index = inputs[:2]
+        if self.use_fused:
+            nu = self.lay_fused([node, None, edge_index] + list(inputs[2:]), **kwargs)
+        else:
+            ed = self.lay_gather([node, edge_index], **kwargs)
+            nu = self.lay_pool([node, ed, edge_index], **kwargs)  # Summing for each node connection
         no = (1+self.eps_k)*node
         out = self.lay_add([no, nu], **kwargs)
         return out
@@ -73,7 +86,7 @@ class GIN(GraphBaseLayer):
         """Update config."""
         config = super(GIN, self).get_config()
         config.update({"pooling_method": self.pooling_method,
-                       "epsilon_learnable": self.epsilon_learnable})
+                       "epsilon_learnable": self.epsilon_learnable, "use_fused": self.use_fused})
         return config
 
 
@@ -118,7 +131,7 @@ class GINE(GraphBaseLayer):
 
         # Layers
         self.layer_gather = GatherNodesOutgoing()
-        self.layer_pool = PoolingLocalEdges(pooling_method=self.pooling_method)
+        self.layer_pool = PoolingLocalEdges(pooling_method=self.pooling_method, is_sorted=self.is_sorted)
         self.layer_add = LazyAdd()
         self.layer_act = ActivationEmbedding(activation=activation,
                                              activity_regularizer=activity_regularizer)
@@ -478,7 +478,7 @@ class HamNaiveDynMessage(GraphBaseLayer):
         self.dense_attend = DenseEmbedding(units=units, use_bias=use_bias, activation=activation, **kernel_args)
         self.dense_align = DenseEmbedding(1, activation="linear", use_bias=use_bias, **kernel_args)
         self.dense_e = DenseEmbedding(units=units_edge, activation=activation, use_bias=use_bias, **kernel_args)
-        self.pool_attention = PoolingLocalEdgesAttention()
+        self.pool_attention = PoolingLocalEdgesAttention(is_sorted=self.is_sorted)
         self.final_activ = ActivationEmbedding(activation=activation_last,
                                                activity_regularizer=activity_regularizer)
 
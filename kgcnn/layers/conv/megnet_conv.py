@@ -58,7 +58,7 @@ class MEGnetBlock(GraphBaseLayer):
         self.lay_phi_n = DenseEmbedding(units=self.node_embed[0], activation=activation, **kernel_args)
         self.lay_phi_n_1 = DenseEmbedding(units=self.node_embed[1], activation=activation, **kernel_args)
         self.lay_phi_n_2 = DenseEmbedding(units=self.node_embed[2], activation='linear', **kernel_args)
-        self.lay_esum = PoolingLocalEdges(pooling_method=self.pooling_method)
+        self.lay_esum = PoolingLocalEdges(pooling_method=self.pooling_method, is_sorted=self.is_sorted)
         self.lay_gather_un = GatherState()
         self.lay_conc_nu = LazyConcatenate(axis=-1)
         # Edge
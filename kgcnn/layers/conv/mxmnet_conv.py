@@ -26,7 +26,7 @@ class MXMGlobalMP(GraphBaseLayer):
         self.linear = DenseEmbedding(self.dim, use_bias=False, activation="linear")
 
         self.gather = GatherEmbeddingSelection([0, 1])
-        self.pool = PoolingLocalMessages()
+        self.pool = PoolingLocalMessages(is_sorted=self.is_sorted)
         self.cat = LazyConcatenate()
         self.multiply_edge = LazyMultiply()
         self.add = LazyAdd()
@@ -124,7 +124,7 @@ class MXMLocalMP(GraphBaseLayer):
         self.gather_mjj = GatherNodesOutgoing()
         self.pool_mkj = PoolingLocalMessages(pooling_method=pooling_method)
         self.pool_mjj = PoolingLocalMessages(pooling_method=pooling_method)
-        self.pool_h = PoolingLocalMessages(pooling_method=pooling_method)
+        self.pool_h = PoolingLocalMessages(pooling_method=pooling_method, is_sorted=self.is_sorted)
         self.add_mji_1 = LazyAdd()
         self.add_mji_2 = LazyAdd()
 
@@ -56,8 +56,8 @@ class PAiNNconv(GraphBaseLayer):
         self.lay_w = DenseEmbedding(units=self.units * 3, activation='linear', use_bias=self.use_bias, **kernel_args)
 
         self.lay_split = SplitEmbedding(3, axis=-1)
-        self.lay_sum = PoolingLocalEdges(pooling_method=conv_pool)
-        self.lay_sum_v = PoolingLocalEdges(pooling_method=conv_pool)
+        self.lay_sum = PoolingLocalEdges(pooling_method=conv_pool, is_sorted=self.is_sorted)
+        self.lay_sum_v = PoolingLocalEdges(pooling_method=conv_pool, is_sorted=self.is_sorted)
         self.gather_n = GatherNodesOutgoing()
         self.gather_v = GatherNodesOutgoing()
         self.lay_mult = LazyMultiply()
@@ -169,8 +169,9 @@ class PAiNNUpdate(GraphBaseLayer):
         self.lay_lin_v = DenseEmbedding(self.units, activation='linear', use_bias=False, **kernel_args)
         self.lay_a = DenseEmbedding(units=self.units * 3, activation='linear', use_bias=self.use_bias, **kernel_args)
 
-        self.lay_scalar_prod = ScalarProduct(axis=2)
-        self.lay_norm = EuclideanNorm(axis=2)
+        # Negative axis works for ragged tensors and flat tensors of the disjoint representation.
+        self.lay_scalar_prod = ScalarProduct(axis=-2)
+        self.lay_norm = EuclideanNorm(axis=-2)
         self.lay_concat = LazyConcatenate(axis=-1)
         self.lay_split = SplitEmbedding(3, axis=-1)
 
@@ -244,7 +245,7 @@ class EquivariantInitialize(GraphBaseLayer):
     def build(self, input_shape):
         """Build layer."""
         super(EquivariantInitialize, self).build(input_shape)
-        assert len(input_shape) >= 3, "ERROR:kgcnn: Need input shape of form (batch, None, F_dim)."
+        assert len(input_shape) >= 2, "ERROR:kgcnn: Need input shape of form (batch, None, F_dim)."
 
     def call(self, inputs, **kwargs):
         """Forward pass: Calculate edge update.
@@ -252,42 +253,46 @@ class EquivariantInitialize(GraphBaseLayer):
         Args:
             inputs: nodes
 
-                - nodes (tf.RaggedTensor): Node embeddings of shape (batch, [N], F)
+                - nodes (tf.RaggedTensor, tf.Tensor): Node embeddings of shape (batch, [N], F) or flat node embeddings
+                  of the disjoint representation of shape (batch*[N], F)
 
         Returns:
-            tf.RaggedTensor: Equivariant tensor of shape (batch, [N], dim, F)
+            tf.RaggedTensor: Equivariant tensor of shape (batch, [N], dim, F) or (batch*[N], dim, F)
         """
-        inputs = self.assert_ragged_input_rank(inputs)
+        if isinstance(inputs, tf.RaggedTensor):
+            inputs = self.assert_ragged_input_rank(inputs)
+            values = inputs.values
+        else:
+            values = inputs
         if self.method == "zeros":
-            out = tf.zeros_like(inputs.values)
+            out = tf.zeros_like(values)
             out = tf.expand_dims(out, axis=1)
             out = tf.repeat(out, self.dim, axis=1)
         elif self.method == "eps":
-            out = tf.zeros_like(inputs.values) + ks.backend.epsilon()
+            out = tf.zeros_like(values) + ks.backend.epsilon()
             out = tf.expand_dims(out, axis=1)
             out = tf.repeat(out, self.dim, axis=1)
         elif self.method == "ones":
-            out = tf.ones_like(inputs.values)
+            out = tf.ones_like(values)
             out = tf.expand_dims(out, axis=1)
             out = tf.repeat(out, self.dim, axis=1)
         elif self.method == "eye":
-            values = inputs.values
             out = tf.eye(self.dim, num_columns=values.shape[1], batch_shape=tf.shape(values)[:1], dtype=values.dtype)
         elif self.method == "normal":
-            values = inputs.values
             out = tf.expand_dims(tf.random.normal([self.dim, values.shape[1]], stddev=self.stddev), axis=0)
             out = tf.repeat(out, tf.shape(values)[0], axis=0)
         elif self.method == "const":
-            out = tf.ones_like(inputs.values)*self.value
+            out = tf.ones_like(values)*self.value
             out = tf.expand_dims(out, axis=1)
             out = tf.repeat(out, self.dim, axis=1)
         elif self.method == "node":
-            out = tf.expand_dims(inputs.values, axis=1)
+            out = tf.expand_dims(values, axis=1)
             out = tf.repeat(out, self.dim, axis=1)
         else:
             raise ValueError("Unknown initialization method %s" % self.method)
         # Static shape expansion for dim, tf.repeat would be possible too.
-        out = tf.RaggedTensor.from_row_splits(out, inputs.row_splits)
+        if isinstance(inputs, tf.RaggedTensor):
+            out = tf.RaggedTensor.from_row_splits(out, inputs.row_splits)
         return out
 
     def get_config(self):
@@ -321,18 +326,21 @@ class SplitEmbedding(GraphBaseLayer):
         super(SplitEmbedding, self).build(input_shape)
         # If rank is not defined can't call on values if axis does not happen to be positive.
         self.axis = get_positive_axis(self.axis, len(input_shape))
-        if self.axis <= 1:
-            raise ValueError("Can not split tensor at axis <= 1.")
 
     def call(self, inputs, **kwargs):
         r"""Forward pass: Split embeddings across feature dimension e.g. `axis=-1`..
 
         Args:
-            inputs (tf.RaggedTensor): Embeddings of shape (batch, [N], F)
+            inputs (tf.RaggedTensor, tf.Tensor): Embeddings of shape (batch, [N], F) or flat embeddings of the
+                disjoint representation of shape (batch*[N], F)
 
         Returns:
             list: List of tensor splits of shape (batch, [N], F/num)
         """
+        if not isinstance(inputs, tf.RaggedTensor):
+            return tf.split(inputs, self.num_or_size_splits, axis=self.axis, num=self.out_num)
+        if self.axis <= 1:
+            raise ValueError("Can not split tensor at axis <= 1.")
         self.assert_ragged_input_rank(inputs, ragged_rank=1)
         # Axis will be positive and >=1 from built!
         # Axis for values is axis-1.
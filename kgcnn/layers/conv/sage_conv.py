@@ -59,9 +59,10 @@ class GraphSageNodeLayer(GraphBaseLayer):
         self.update_node_from_self_mlp = GraphMLP(units=units, activation=activation, **kernel_args)
         if self.pooling_args['pooling_method'] in ["LSTM", "lstm"]:
             # We do not allow full access to all parameters for the LSTM here for simplification.
-            self.pooling = PoolingLocalEdgesLSTM(pooling_method=pooling_method, units=units)
+            self.pooling = PoolingLocalEdgesLSTM(pooling_method=pooling_method, units=units,
+                                                 is_sorted=self.is_sorted)
         else:
-            self.pooling = PoolingLocalMessages(pooling_method=pooling_method)
+            self.pooling = PoolingLocalMessages(pooling_method=pooling_method, is_sorted=self.is_sorted)
         self.normalize_nodes = GraphLayerNormalization(axis=-1)
 
     def build(self, input_shape):
@@ -3,6 +3,7 @@ from kgcnn.layers.base import GraphBaseLayer
 from kgcnn.layers.modules import LazyMultiply, DenseEmbedding, LazyAdd
 from kgcnn.layers.pooling import PoolingLocalEdges
 from kgcnn.layers.gather import GatherNodesOutgoing
+from kgcnn.layers.message import GatherMessagePooling
 
 
 @tf.keras.utils.register_keras_serializable(package='kgcnn', name='SchNetCFconv')
@@ -15,6 +16,8 @@ class SchNetCFconv(GraphBaseLayer):
         units (int): Units for Dense layer.
         cfconv_pool (str): Pooling method. Default is 'segment_sum'.
         use_bias (bool): Use bias. Default is True.
+        use_fused (bool): Whether to use the fused :obj:`GatherMessagePooling` for gather, multiply and pooling.
+            Default is False.
         activation (str): Activation function. Default is 'kgcnn>shifted_softplus'.
         kernel_regularizer: Kernel regularization. Default is None.
         bias_regularizer: Bias regularization. Default is None.
@@ -28,6 +31,7 @@ class SchNetCFconv(GraphBaseLayer):
     def __init__(self, units,
                  cfconv_pool='segment_sum',
                  use_bias=True,
+                 use_fused=False,
                  activation='kgcnn>shifted_softplus',
                  kernel_regularizer=None,
                  bias_regularizer=None,
@@ -42,6 +46,7 @@ class SchNetCFconv(GraphBaseLayer):
         self.cfconv_pool = cfconv_pool
         self.units = units
         self.use_bias = use_bias
+        self.use_fused = use_fused
         kernel_args = {"kernel_regularizer": kernel_regularizer, "activity_regularizer": activity_regularizer,
                        "bias_regularizer": bias_regularizer, "kernel_constraint": kernel_constraint,
                        "bias_constraint": bias_constraint, "kernel_initializer": kernel_initializer,
@@ -49,9 +54,12 @@ class SchNetCFconv(GraphBaseLayer):
         # Layer
         self.lay_dense1 = DenseEmbedding(units=self.units, activation=activation, use_bias=self.use_bias, **kernel_args)
         self.lay_dense2 = DenseEmbedding(units=self.units, activation='linear', use_bias=self.use_bias, **kernel_args)
-        self.lay_sum = PoolingLocalEdges(pooling_method=cfconv_pool)
+        self.lay_sum = PoolingLocalEdges(pooling_method=cfconv_pool, is_sorted=self.is_sorted)
         self.gather_n = GatherNodesOutgoing()
         self.lay_mult = LazyMultiply()
+        if self.use_fused:
+            self.lay_fused = GatherMessagePooling(pooling_method=cfconv_pool, message="multiply",
+                                                  is_sorted=self.is_sorted)
 
     def build(self, input_shape):
         """Build layer."""
@@ -61,18 +69,22 @@ class SchNetCFconv(GraphBaseLayer):
         """Forward pass. Calculate edge update.
 
         Args:
-            inputs: [nodes, edges, edge_index]
+            inputs: [nodes, edges, edge_index] or [nodes, edges, edge_index, disjoint_index]
 
                 - nodes (tf.RaggedTensor): Node embeddings of shape (batch, [N], F)
                 - edges (tf.RaggedTensor): Edge or message embeddings of shape (batch, [N], F)
                 - edge_index (tf.RaggedTensor): Edge indices referring to nodes of shape (batch, [N], 2)
+                - disjoint_index (tf.RaggedTensor): Optional output of :obj:`DisjointEdgeIndices` for
+                  :obj:`use_fused=True` of shape (batch, [N], 2)
 
         Returns:
             tf.RaggedTensor: Updated node features.
         """
-        node, edge, indexlist = inputs
+        node, edge, indexlist = inputs[:3]
         x = self.lay_dense1(edge, **kwargs)
         x = self.lay_dense2(x, **kwargs)
+        if self.use_fused:
+            return self.lay_fused([node, x, indexlist] + list(inputs[3:]), **kwargs)
         node2exp = self.gather_n([node, indexlist], **kwargs)
         x = self.lay_mult([node2exp, x], **kwargs)
         x = self.lay_sum([node, x, indexlist], **kwargs)
@@ -81,7 +93,7 @@ class SchNetCFconv(GraphBaseLayer):
     def get_config(self):
         """Update layer config."""
         config = super(SchNetCFconv, self).get_config()
-        config.update({"cfconv_pool": self.cfconv_pool, "units": self.units})
+        config.update({"cfconv_pool": self.cfconv_pool, "units": self.units, "use_fused": self.use_fused})
         config_dense = self.lay_dense1.get_config()
         for x in ["kernel_regularizer", "activity_regularizer", "bias_regularizer", "kernel_constraint",
                   "bias_constraint", "kernel_initializer", "bias_initializer", "activation", "use_bias"]:
@@ -98,6 +110,7 @@ class SchNetInteraction(GraphBaseLayer):
         units (int): Dimension of node embedding. Default is 128.
         cfconv_pool (str): Pooling method information for SchNetCFconv layer. Default is'segment_sum'.
         use_bias (bool): Use bias in last layers. Default is True.
+        use_fused (bool): Whether SchNetCFconv layer uses the fused :obj:`GatherMessagePooling`. Default is False.
         activation (str): Activation function. Default is 'kgcnn>shifted_softplus'.
         kernel_regularizer: Kernel regularization. Default is None.
         bias_regularizer: Bias regularization. Default is None.
@@ -112,6 +125,7 @@ class SchNetInteraction(GraphBaseLayer):
                  units=128,
                  cfconv_pool='sum',
                  use_bias=True,
+                 use_fused=False,
                  activation='kgcnn>shifted_softplus',
                  kernel_regularizer=None,
                  bias_regularizer=None,
@@ -125,12 +139,14 @@ class SchNetInteraction(GraphBaseLayer):
         super(SchNetInteraction, self).__init__(**kwargs)
         self.cfconv_pool = cfconv_pool
         self.use_bias = use_bias
+        self.use_fused = use_fused
         self.units = units
         kernel_args = {"kernel_regularizer": kernel_regularizer, "activity_regularizer": activity_regularizer,
                        "bias_regularizer": bias_regularizer, "kernel_constraint": kernel_constraint,
                        "bias_constraint": bias_constraint, "kernel_initializer": kernel_initializer,
                        "bias_initializer": bias_initializer}
-        conv_args = {"units": self.units, "use_bias": use_bias, "activation": activation, "cfconv_pool": cfconv_pool}
+        conv_args = {"units": self.units, "use_bias": use_bias, "activation": activation, "cfconv_pool": cfconv_pool,
+                     "is_sorted": self.is_sorted, "use_fused": use_fused}
 
         # Layers
         self.lay_cfconv = SchNetCFconv(**conv_args, **kernel_args)
@@ -147,18 +163,20 @@ class SchNetInteraction(GraphBaseLayer):
         """Forward pass. Calculate node update.
 
         Args:
-            inputs: [nodes, edges, tensor_index]
+            inputs: [nodes, edges, tensor_index] or [nodes, edges, tensor_index, disjoint_index]
 
                 - nodes (tf.RaggedTensor): Node embeddings of shape (batch, [N], F)
                 - edges (tf.RaggedTensor): Edge or message embeddings of shape (batch, [N], F)
                 - tensor_index (tf.RaggedTensor): Edge indices referring to nodes of shape (batch, [N], 2)
+                - disjoint_index (tf.RaggedTensor): Optional output of :obj:`DisjointEdgeIndices` for
+                  :obj:`use_fused=True` of shape (batch, [N], 2)
 
         Returns:
             tf.RaggedTensor: Updated node embeddings of shape (batch, [N], F).
         """
-        node, edge, indexlist = inputs
+        node, edge, indexlist = inputs[:3]
         x = self.lay_dense1(node, **kwargs)
-        x = self.lay_cfconv([x, edge, indexlist], **kwargs)
+        x = self.lay_cfconv([x, edge, indexlist] + list(inputs[3:]), **kwargs)
         x = self.lay_dense2(x, **kwargs)
         x = self.lay_dense3(x, **kwargs)
         out = self.lay_add([node, x], **kwargs)
@@ -166,7 +184,8 @@ class SchNetInteraction(GraphBaseLayer):
 
     def get_config(self):
         config = super(SchNetInteraction, self).get_config()
-        config.update({"cfconv_pool": self.cfconv_pool, "units": self.units, "use_bias": self.use_bias})
+        config.update({"cfconv_pool": self.cfconv_pool, "units": self.units, "use_bias": self.use_bias,
+                       "use_fused": self.use_fused})
         conf_dense = self.lay_dense2.get_config()
         for x in ["activation", "kernel_regularizer", "bias_regularizer", "activity_regularizer",
                   "kernel_constraint", "bias_constraint", "kernel_initializer", "bias_initializer"]:
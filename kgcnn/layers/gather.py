@@ -89,6 +89,16 @@ class GatherEmbedding(GraphBaseLayer):
                             in range(edge_index.shape[1])]
                 return tf.RaggedTensor.from_row_lengths(out, edge_part, validate=self.ragged_validate)
 
+        # Disjoint representation with flat node embeddings and indices referring to the batch.
+        if self.is_disjoint_index(inputs[1]) and self.axis == 1 and self.concat_axis in [None, 2] and \
+                self.split_axis in [None, 2]:
+            out = tf.gather(inputs[0], inputs[1], axis=0)
+            if self.concat_axis == 2:
+                return tf.concat([out[:, i] for i in range(inputs[1].shape[1])], axis=1)
+            if self.split_axis == 2:
+                return [out[:, i] for i in range(inputs[1].shape[1])]
+            return out
+
         # For arbitrary gather from ragged tensor use tf.gather with batch_dims=1.
         # Works in tf.__version__>=2.4 now!
         out = tf.gather(inputs[0], inputs[1], batch_dims=1, axis=self.axis)
@@ -189,6 +199,10 @@ class GatherEmbeddingSelection(GraphBaseLayer):
                 out = [tf.RaggedTensor.from_row_lengths(x, edge_part, validate=self.ragged_validate) for x in out]
                 return out
 
+        # Disjoint representation with flat node embeddings and indices referring to the batch.
+        if self.is_disjoint_index(inputs[1]) and self.axis == 1 and self.axis_indices == 2:
+            return [tf.gather(inputs[0], inputs[1][:, i], axis=0) for i in self.selection_index]
+
         # For arbitrary gather from ragged tensor use tf.gather with batch_dims=1.
         out = [tf.gather(inputs[0], tf.gather(inputs[1], i, axis=self.axis_indices), batch_dims=1, axis=self.axis) for i
                in self.selection_index]  # Works in tf.__version__>=2.4
@@ -33,6 +33,8 @@ class NodePosition(GraphBaseLayer):
         print(x_in - x_out)
     """
 
+    _compute_in_float32 = True
+
     def __init__(self, selection_index: list = None, **kwargs):
         r"""Initialize layer instance of :obj:`NodePosition`.
 
@@ -44,7 +46,7 @@ class NodePosition(GraphBaseLayer):
         if selection_index is None:
             selection_index = [0, 1]
         self.selection_index = selection_index
-        self.layer_gather = GatherNodesSelection(self.selection_index)
+        self.layer_gather = GatherNodesSelection(self.selection_index, dtype=self.dtype_policy)
 
     def build(self, input_shape):
         """Build layer."""
@@ -87,10 +89,12 @@ class ShiftPeriodicLattice(GraphBaseLayer):
 
     """
 
+    _compute_in_float32 = True
+
     def __init__(self, **kwargs):
         """Initialize layer."""
         super(ShiftPeriodicLattice, self).__init__(**kwargs)
-        self.layer_state = GatherState()
+        self.layer_state = GatherState(dtype=self.dtype_policy)
 
     def build(self, input_shape):
         """Build layer."""
@@ -136,6 +140,8 @@ class EuclideanNorm(GraphBaseLayer):
     with :obj:`invert_norm` layer arguments.
     """
 
+    _compute_in_float32 = True
+
     def __init__(self, axis: int = -1, keepdims: bool = False, invert_norm: bool = False, add_eps: bool = False,
                  no_nan: bool = True, **kwargs):
         """Initialize layer.
@@ -228,6 +234,8 @@ class ScalarProduct(GraphBaseLayer):
         print(out, out.shape)
     """
 
+    _compute_in_float32 = True
+
     def __init__(self, axis=-1, **kwargs):
         """Initialize layer."""
         super(ScalarProduct, self).__init__(**kwargs)
@@ -289,11 +297,14 @@ class NodeDistanceEuclidean(GraphBaseLayer):
 
     """
 
+    _compute_in_float32 = True
+
     def __init__(self, add_eps: bool = False, no_nan: bool = True, **kwargs):
         r"""Initialize layer instance of :obj:`NodeDistanceEuclidean`. """
         super(NodeDistanceEuclidean, self).__init__(**kwargs)
-        self.layer_subtract = LazySubtract()
-        self.layer_euclidean_norm = EuclideanNorm(axis=2, keepdims=True, add_eps=add_eps, no_nan=no_nan)
+        self.layer_subtract = LazySubtract(dtype=self.dtype_policy)
+        self.layer_euclidean_norm = EuclideanNorm(axis=-1, keepdims=True, add_eps=add_eps, no_nan=no_nan,
+                                                  dtype=self.dtype_policy)
 
     def build(self, input_shape):
         """Build layer."""
@@ -335,13 +346,15 @@ class EdgeDirectionNormalized(GraphBaseLayer):
     As the first index defines the incoming edge.
     """
 
+    _compute_in_float32 = True
+
     def __init__(self, add_eps: bool = False, no_nan: bool = True, **kwargs):
         """Initialize layer."""
         super(EdgeDirectionNormalized, self).__init__(**kwargs)
-        self.layer_subtract = LazySubtract()
+        self.layer_subtract = LazySubtract(dtype=self.dtype_policy)
         self.layer_euclidean_norm = EuclideanNorm(
-            axis=2, keepdims=True, invert_norm=True, add_eps=add_eps, no_nan=no_nan)
-        self.layer_multiply = LazyMultiply()
+            axis=-1, keepdims=True, invert_norm=True, add_eps=add_eps, no_nan=no_nan, dtype=self.dtype_policy)
+        self.layer_multiply = LazyMultiply(dtype=self.dtype_policy)
 
     def build(self, input_shape):
         """Build layer."""
@@ -392,6 +405,8 @@ class VectorAngle(GraphBaseLayer):
 
     """
 
+    _compute_in_float32 = True
+
     def __init__(self, **kwargs):
         """Initialize layer."""
         super(VectorAngle, self).__init__(**kwargs)
@@ -457,11 +472,13 @@ class EdgeAngle(GraphBaseLayer):
 
     """
 
+    _compute_in_float32 = True
+
     def __init__(self, vector_scale: list = None, **kwargs):
         """Initialize layer."""
         super(EdgeAngle, self).__init__(**kwargs)
-        self.layer_gather_vectors = GatherNodesSelection([0, 1])
-        self.layer_angle = VectorAngle()
+        self.layer_gather_vectors = GatherNodesSelection([0, 1], dtype=self.dtype_policy)
+        self.layer_angle = VectorAngle(dtype=self.dtype_policy)
         self.vector_scale = vector_scale
         if vector_scale:
             assert len(vector_scale) == 2, "Need scale for both vectors to compute angle."
@@ -520,6 +537,8 @@ class GaussBasisLayer(GraphBaseLayer):
 
     """
 
+    _compute_in_float32 = True
+
     def __init__(self, bins: int = 20, distance: float = 4.0, sigma: float = 0.4, offset: float = 0.0,
                  **kwargs):
         r"""Initialize :obj:`GaussBasisLayer` layer.
@@ -590,6 +609,8 @@ class PositionEncodingBasisLayer(GraphBaseLayer):
 
     """
 
+    _compute_in_float32 = True
+
     def __init__(self, dim_half: int = 8, wave_length: float = 10, include_frequencies: bool = False, **kwargs):
         r"""Initialize :obj:`FourierBasisLayer` layer.
 
@@ -676,6 +697,8 @@ class BesselBasisLayer(GraphBaseLayer):
     where :math:`p \in \mathbb{N}_0` and typically :math:`p=6`.
     """
 
+    _compute_in_float32 = True
+
     def __init__(self, num_radial: int,
                  cutoff: float,
                  envelope_exponent: int = 5,
@@ -705,7 +728,7 @@ class BesselBasisLayer(GraphBaseLayer):
             return tf.constant(np.pi * np.arange(1, shape + 1, dtype=np.float32), dtype=dtype)
 
         self.frequencies = self.add_weight(name="frequencies", shape=self.num_radial,
-                                           dtype=tf.float32, initializer=freq_init, trainable=True)
+                                           dtype=self.dtype, initializer=freq_init, trainable=True)
 
     @tf.function
     def envelope(self, inputs):
@@ -713,11 +736,13 @@ class BesselBasisLayer(GraphBaseLayer):
         a = -(p + 1) * (p + 2) / 2
         b = p * (p + 2)
         c = -p * (p + 1) / 2
-        env_val = 1.0 / inputs + a * inputs ** (p - 1) + b * inputs ** p + c * inputs ** (p + 1)
+        # Zero distance, e.g. of padded edges, gives zero instead of infinity, which would yield NaN gradients.
+        inv_inputs = tf.math.divide_no_nan(tf.ones_like(inputs), inputs)
+        env_val = inv_inputs + a * inputs ** (p - 1) + b * inputs ** p + c * inputs ** (p + 1)
         return tf.where(inputs < 1, env_val, tf.zeros_like(inputs))
 
     def expand_bessel_basis(self, inputs):
-        d_scaled = inputs * self.inv_cutoff
+        d_scaled = inputs * tf.cast(self.inv_cutoff, dtype=inputs.dtype)
         d_cutoff = self.envelope(d_scaled)
         out = d_cutoff * tf.sin(self.frequencies * d_scaled)
         return out
@@ -756,6 +781,8 @@ class CosCutOffEnvelope(GraphBaseLayer):
     This layer only computes the cutoff envelope but does not apply it.
     """
 
+    _compute_in_float32 = True
+
     def __init__(self,
                  cutoff,
                  **kwargs):
@@ -808,6 +835,8 @@ class CosCutOff(GraphBaseLayer):
     This layer computes the cutoff envelope and applies it to the input by simply multiplying with the envelope.
     """
 
+    _compute_in_float32 = True
+
     def __init__(self, cutoff, **kwargs):
         r"""Initialize layer.
 
@@ -851,10 +880,12 @@ class DisplacementVectorsASU(GraphBaseLayer):
 
     """
 
+    _compute_in_float32 = True
+
     def __init__(self, **kwargs):
         """Initialize layer."""
-        self.gather_node_positions = NodePosition()
         super(DisplacementVectorsASU, self).__init__(**kwargs)
+        self.gather_node_positions = NodePosition(dtype=self.dtype_policy)
 
     def build(self, input_shape):
         """Build layer."""
@@ -904,12 +935,14 @@ class DisplacementVectorsUnitCell(GraphBaseLayer):
 
     """
 
+    _compute_in_float32 = True
+
     def __init__(self, **kwargs):
         """Initialize layer."""
-        self.gather_node_positions = NodePosition()
-        self.lazy_add = LazyAdd()
-        self.lazy_sub = LazySubtract()
         super(DisplacementVectorsUnitCell, self).__init__(**kwargs)
+        self.gather_node_positions = NodePosition(dtype=self.dtype_policy)
+        self.lazy_add = LazyAdd(dtype=self.dtype_policy)
+        self.lazy_sub = LazySubtract(dtype=self.dtype_policy)
 
     def build(self, input_shape):
         """Build layer."""
@@ -947,10 +980,12 @@ class FracToRealCoordinates(GraphBaseLayer):
 
     """
 
+    _compute_in_float32 = True
+
     def __init__(self, **kwargs):
         """Initialize layer."""
-        self.gather_state = GatherState()
         super(FracToRealCoordinates, self).__init__(**kwargs)
+        self.gather_state = GatherState(dtype=self.dtype_policy)
 
     def build(self, input_shape):
         """Build layer."""
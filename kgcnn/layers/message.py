@@ -3,6 +3,10 @@ import tensorflow as tf
 from kgcnn.layers.base import GraphBaseLayer
 from kgcnn.layers.gather import GatherEmbeddingSelection
 from kgcnn.layers.pooling import PoolingLocalEdges
+from kgcnn.ops.partition import partition_row_indexing
+from kgcnn.ops.segment import pool_segments_by_name
+
+ks = tf.keras
 
 
 @tf.keras.utils.register_keras_serializable(package='kgcnn', name='MessagePassingBase')
@@ -22,7 +26,7 @@ class MessagePassingBase(GraphBaseLayer):
         super(MessagePassingBase, self).__init__(**kwargs)
         self.pooling_method = pooling_method
         self.lay_gather = GatherEmbeddingSelection([0, 1])
-        self.lay_pool_default = PoolingLocalEdges(pooling_method=self.pooling_method)
+        self.lay_pool_default = PoolingLocalEdges(pooling_method=self.pooling_method, is_sorted=self.is_sorted)
 
     def message_function(self, inputs, **kwargs):
         r"""Defines the message function, i.e. a method the generates a message from node and edge embeddings at a
@@ -99,3 +103,190 @@ class MessagePassingBase(GraphBaseLayer):
         config = super(MessagePassingBase, self).get_config()
         config.update({"pooling_method": self.pooling_method})
         return config
+
+
+@ks.utils.register_keras_serializable(package='kgcnn', name='DisjointEdgeIndices')
+class DisjointEdgeIndices(GraphBaseLayer):
+    r"""Shift edge indices from referring to nodes in each sample to referring to nodes in the whole batch,
+    i.e. the disjoint representation of the batch. The output keeps the ragged partition of the edge indices.
+
+    This is done by every gather and pooling layer internally. The output of this layer can be computed once in a
+    model and passed to all :obj:`GatherMessagePooling` layers of the model instead.
+
+    .. code-block:: python
+
+        import tensorflow as tf
+        from kgcnn.layers.message import DisjointEdgeIndices
+        nodes = tf.ragged.constant([[[0.0], [1.0]], [[2.0], [3.0], [4.0]]], ragged_rank=1)
+        edge_idx = tf.ragged.constant([[[0, 1], [1, 0]], [[0, 2], [1, 2]]], ragged_rank=1)
+        print(DisjointEdgeIndices()([nodes, edge_idx]))
+        # <tf.RaggedTensor [[[0, 1], [1, 0]], [[2, 4], [3, 4]]]>
+    """
+
+    def __init__(self, **kwargs):
+        """Initialize layer."""
+        super(DisjointEdgeIndices, self).__init__(**kwargs)
+
+    def call(self, inputs, **kwargs):
+        r"""Forward pass.
+
+        Args:
+            inputs (list): [nodes, edge_index]
+
+                - nodes (tf.RaggedTensor): Node embeddings of shape `(batch, [N], F)`
+                - edge_index (tf.RaggedTensor): Edge indices referring to nodes of shape `(batch, [M], 2)`
+
+        Returns:
+            tf.RaggedTensor: Edge indices referring to nodes of the batch of shape `(batch, [M], 2)`
+        """
+        self.assert_ragged_input_rank(inputs)
+        node_part = inputs[0].row_splits
+        edge_index, edge_part = inputs[1].values, inputs[1].row_lengths()
+        disjoint_index = partition_row_indexing(edge_index, node_part, edge_part,
+                                                partition_type_target="row_splits",
+                                                partition_type_index="row_length",
+                                                to_indexing='batch',
+                                                from_indexing=self.node_indexing)
+        return tf.RaggedTensor.from_row_splits(disjoint_index, inputs[1].row_splits, validate=self.ragged_validate)
+
+
+@ks.utils.register_keras_serializable(package='kgcnn', name='GatherMessagePooling')
+class GatherMessagePooling(GraphBaseLayer):
+    r"""Fused message passing step, which gathers the sending nodes :math:`j` of each edge :math:`(i, j)`,
+    computes a message with the edge embedding :math:`e_{ij}` and aggregates the messages for the receiving node
+    :math:`i`. This replaces a sequence of :obj:`GatherNodesOutgoing`, e.g. :obj:`LazyMultiply` and
+    :obj:`PoolingLocalEdges` layers.
+
+    All operations work on the flat values of the ragged tensors, so that neither gathered nodes nor messages are
+    wrapped into intermediate ragged tensors. Aggregation uses unsorted segment operations, which do not require to
+    sort the indices, or sorted segment operations for :obj:`is_sorted=True`.
+    The edge indices in disjoint representation of :obj:`DisjointEdgeIndices` can be passed as optional
+    fourth input. Then the index shift is not computed again, which allows to compute it only once for all layers of a
+    model.
+    For the disjoint representation of :obj:`CastRaggedToDisjoint`, nodes, edges and indices are flat tensors and the
+    output is a flat tensor of shape `(N, F)`.
+
+    The message of edge :math:`(i, j)` is chosen by :obj:`message`:
+
+        - 'nodes': :math:`h_j`, edge embeddings are not used and can be `None`.
+        - 'multiply': :math:`h_j \, e_{ij}`.
+        - 'add': :math:`h_j + e_{ij}`.
+        - 'concat': :math:`h_j \, || \, e_{ij}`.
+
+    Alternatively, :obj:`message_function` can be overwritten in a subclass.
+
+    .. code-block:: python
+
+        import tensorflow as tf
+        from kgcnn.layers.message import GatherMessagePooling, DisjointEdgeIndices
+        nodes = tf.ragged.constant([[[0.0], [1.0]], [[2.0], [3.0], [4.0]]], ragged_rank=1)
+        edges = tf.ragged.constant([[[1.0], [2.0]], [[3.0], [4.0]]], ragged_rank=1)
+        edge_idx = tf.ragged.constant([[[0, 1], [1, 0]], [[0, 2], [1, 2]]], ragged_rank=1)
+        disjoint_idx = DisjointEdgeIndices()([nodes, edge_idx])
+        print(GatherMessagePooling(message="multiply")([nodes, edges, edge_idx, disjoint_idx]))
+        # <tf.RaggedTensor [[[1.0], [0.0]], [[12.0], [16.0], [0.0]]]>
+
+    Args:
+        pooling_method (str): Pooling method to use i.e. segment_function. Default is 'sum'.
+        message (str): Type of message between node and edge embeddings. Default is 'multiply'.
+        normalize_by_weights (bool): Normalize the pooled output by the sum of edge embeddings, which are considered
+            weights. Only for :obj:`message='multiply'`. Default is False.
+        pooling_index (int): Index from edge indices to pick ID's for pooling messages. Default is 0.
+        gather_index (int): Index from edge indices to gather node embeddings for messages. Default is 1.
+    """
+
+    _supported_messages = ["nodes", "multiply", "add", "concat"]
+
+    def __init__(self,
+                 pooling_method: str = "sum",
+                 message: str = "multiply",
+                 normalize_by_weights: bool = False,
+                 pooling_index: int = 0,
+                 gather_index: int = 1,
+                 **kwargs):
+        """Initialize layer."""
+        super(GatherMessagePooling, self).__init__(**kwargs)
+        self.pooling_method = pooling_method
+        self.message = message
+        self.normalize_by_weights = normalize_by_weights
+        self.pooling_index = pooling_index
+        self.gather_index = gather_index
+        if self.message not in self._supported_messages:
+            raise ValueError("Unknown message '%s' for %s, choose from %s." % (
+                self.message, self.name, self._supported_messages))
+        if self.normalize_by_weights and self.message != "multiply":
+            raise ValueError("Can only normalize by weights for message 'multiply'.")
+
+    def build(self, input_shape):
+        """Build layer."""
+        super(GatherMessagePooling, self).build(input_shape)
+
+    def message_function(self, inputs, **kwargs):
+        r"""Compute messages from the flat tensors of gathered node and edge embeddings.
+
+        Args:
+            inputs: [nodes_out, edges]
+
+                - nodes_out (tf.Tensor): Sending node embeddings of shape `(M, F)`
+                - edges (tf.Tensor): Edge embeddings of shape `(M, F)` or None.
+
+        Returns:
+            tf.Tensor: Messages for each edge of shape `(M, F)`
+        """
+        nodes_out, edges = inputs
+        if self.message == "nodes":
+            return nodes_out
+        elif self.message == "multiply":
+            return nodes_out * edges
+        elif self.message == "add":
+            return nodes_out + edges
+        return tf.concat([nodes_out, edges], axis=-1)
+
+    def call(self, inputs, **kwargs):
+        r"""Forward pass.
+
+        Args:
+            inputs (list): [nodes, edges, edge_index] or [nodes, edges, edge_index, disjoint_index]
+
+                - nodes (tf.RaggedTensor): Node embeddings of shape `(batch, [N], F)`
+                - edges (tf.RaggedTensor): Edge embeddings of shape `(batch, [M], F)`. Can be None for 'nodes' message.
+                - edge_index (tf.RaggedTensor): Edge indices referring to nodes of shape `(batch, [M], 2)`
+                - disjoint_index (tf.RaggedTensor): Optional output of :obj:`DisjointEdgeIndices` of shape
+                  `(batch, [M], 2)`
+
+        Returns:
+            tf.RaggedTensor: Aggregated messages for each node of shape `(batch, [N], F)`
+        """
+        nodes, edges, edge_index = inputs[0], inputs[1], inputs[2]
+        if self.is_disjoint_index(edge_index):
+            return self._pool_messages(nodes, edges, edge_index, **kwargs)
+        if len(inputs) > 3 and inputs[3] is not None:
+            disjoint_index = inputs[3].values
+        else:
+            disjoint_index = partition_row_indexing(edge_index.values, nodes.row_splits, edge_index.row_lengths(),
+                                                    partition_type_target="row_splits",
+                                                    partition_type_index="row_length",
+                                                    to_indexing='batch',
+                                                    from_indexing=self.node_indexing)
+        out = self._pool_messages(nodes.values, edges.values if edges is not None else None, disjoint_index, **kwargs)
+        return tf.RaggedTensor.from_row_splits(out, nodes.row_splits, validate=self.ragged_validate)
+
+    def _pool_messages(self, nodes, edges, disjoint_index, **kwargs):
+        receive_index = disjoint_index[:, self.pooling_index]
+        msg = self.message_function([tf.gather(nodes, disjoint_index[:, self.gather_index]), edges], **kwargs)
+        num_nodes = tf.shape(nodes)[0]
+        if self.is_sorted:
+            receive_index = self.assert_sorted_index(receive_index)
+        out = pool_segments_by_name(self.pooling_method, msg, receive_index, num_nodes, is_sorted=self.is_sorted)
+        if self.normalize_by_weights:
+            out = tf.math.divide_no_nan(
+                out, pool_segments_by_name("sum", edges, receive_index, num_nodes, is_sorted=self.is_sorted))
+        return out
+
+    def get_config(self):
+        """Update layer config."""
+        config = super(GatherMessagePooling, self).get_config()
+        config.update({"pooling_method": self.pooling_method, "message": self.message,
+                       "normalize_by_weights": self.normalize_by_weights, "pooling_index": self.pooling_index,
+                       "gather_index": self.gather_index})
+        return config
@@ -74,20 +74,20 @@ class GraphLayerNormalization(GraphBaseLayer):
         """Build layer."""
         super(GraphLayerNormalization, self).build(input_shape)
         n_dims = len(input_shape)
+        # Negative axis refers to the same axis for the values of ragged tensors and the flat tensors of the
+        # disjoint representation. Only a positive axis is shifted to remove the batch dimension.
         if isinstance(self.axis, int):
             axis = get_positive_axis(self.axis, n_dims)
             if axis < 1:
                 raise ValueError("The (positive) axis must be > 0.")
-            axis_values = axis - 1
+            axis_values = self.axis if self.axis < 0 else axis - 1
         elif isinstance(self.axis, list):
             axis = [get_positive_axis(x, n_dims) for x in self.axis]
             if any([x < 1 for x in axis]):
                 raise ValueError("All (positive) axis must be > 0.")
-            axis_values = [x - 1 for x in axis]
+            axis_values = [x if x < 0 else y - 1 for x, y in zip(self.axis, axis)]
         else:
             raise TypeError("Expected an int or a list of ints for the axis %s" % self.axis)
-        # Give positive axis to self, after built the axis is always positive
-        self.axis = axis
         # Remove batch dimension as we will call directly on value tensor in call.
         self._layer_norm.axis = axis_values
 
@@ -100,6 +100,9 @@ class GraphLayerNormalization(GraphBaseLayer):
         Returns:
             tf.RaggedTensor: Normalized ragged tensor of identical shape (batch, [M], F, ...)
         """
+        if not isinstance(inputs, tf.RaggedTensor):
+            # Flat embeddings of the disjoint representation of shape (batch*[M], F, ...).
+            return self._layer_norm(inputs, **kwargs)
         inputs = self.assert_ragged_input_rank(inputs, ragged_rank=1)  # Must have ragged_rank = 1.
         return self.call_on_values_tensor_of_ragged(self._layer_norm, inputs, **kwargs)
 
@@ -119,6 +122,10 @@ class GraphBatchNormalization(GraphBaseLayer):
     To this end, the (positive) :obj:`axis` parameter must be strictly > 0 and ideally > 1,
     since first two dimensions are flattened for normalization.
 
+    Flat embeddings of the disjoint representation can be given together with their graph ID, e.g. from
+    :obj:`CastPaddedToDisjoint`. Then embeddings with negative graph ID, like padded nodes, are excluded from the
+    batch statistics.
+
     """
     def __init__(self,
                  axis=-1,
@@ -185,21 +192,23 @@ class GraphBatchNormalization(GraphBaseLayer):
     def build(self, input_shape):
         """Build layer."""
         super(GraphBatchNormalization, self).build(input_shape)
+        if isinstance(input_shape, (list, tuple)) and not isinstance(input_shape[0], (int, type(None))):
+            input_shape = input_shape[0]
         n_dims = len(input_shape)
+        # Negative axis refers to the same axis for the values of ragged tensors and the flat tensors of the
+        # disjoint representation. Only a positive axis is shifted to remove the batch dimension.
         if isinstance(self.axis, int):
             axis = get_positive_axis(self.axis, n_dims)
             if axis < 1:
                 raise ValueError("The (positive) axis must be > 0.")
-            axis_values = axis - 1
+            axis_values = self.axis if self.axis < 0 else axis - 1
         elif isinstance(self.axis, list):
             axis = [get_positive_axis(x, n_dims) for x in self.axis]
             if any([x < 1 for x in axis]):
                 raise ValueError("All (positive) axis must be > 0.")
-            axis_values = [x - 1 for x in axis]
+            axis_values = [x if x < 0 else y - 1 for x, y in zip(self.axis, axis)]
         else:
             raise TypeError("Expected an int or a list of ints for the axis %s" % self.axis)
-        # Give positive axis to self, after built the axis is always positive
-        self.axis = axis
         # Remove batch dimension as we will call directly on value tensor in call.
         self._layer_norm.axis = axis_values
 
@@ -207,11 +216,23 @@ class GraphBatchNormalization(GraphBaseLayer):
         """Forward pass.
 
         Args:
-            inputs (tf.RaggedTensor, tf.Tensor): Embeddings of shape (batch, [M], F, ...)
+            inputs (tf.RaggedTensor, tf.Tensor, list): Embeddings of shape (batch, [M], F, ...) or flat embeddings
+                of shape (batch*[M], F, ...) or a list [embeddings, graph_id] of flat embeddings and their graph ID of
+                shape (batch*[M], ).
 
         Returns:
             tf.RaggedTensor: Normalized ragged tensor of identical shape (batch, [M], F, ...)
         """
+        if isinstance(inputs, (list, tuple)):
+            # Embeddings with negative graph ID are masked in the batch statistics.
+            x, graph_id = inputs
+            mask = tf.reshape(graph_id >= 0, tf.concat([tf.shape(graph_id), tf.ones(x.shape.rank - 2, "int32")], 0))
+            out = self._layer_norm(x, mask=tf.broadcast_to(mask, tf.shape(x)[:-1]), **kwargs)
+            # New tensor without the keras mask of the batch normalization, which is not passed to the next layers.
+            return tf.identity(out)
+        if not isinstance(inputs, tf.RaggedTensor):
+            # Flat embeddings of the disjoint representation of shape (batch*[M], F, ...).
+            return self._layer_norm(inputs, **kwargs)
         inputs = self.assert_ragged_input_rank(inputs, ragged_rank=1)  # Must have ragged_rank = 1.
         return self.call_on_values_tensor_of_ragged(self._layer_norm, inputs, **kwargs)
 
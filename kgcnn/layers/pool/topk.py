@@ -2,6 +2,7 @@ import tensorflow as tf
 import tensorflow.keras as ks
 
 from kgcnn.ops.partition import change_partition_by_name, partition_row_indexing
+from kgcnn.ops.sparse import sparse_edge_matmul
 from kgcnn.layers.base import GraphBaseLayer
 
 
@@ -109,8 +110,6 @@ class PoolingTopK(GraphBaseLayer):
         pooled_id = nids[mask]  # nids should not have changed by final sorting
         pooled_len = nkeep  # shape=(batch,)
         pooled_index = tf.cast(sort12[mask], dtype=index_dtype)  # the index goes from 0 to N*batch
-        removed_index = tf.cast(sort12[tf.math.logical_not(mask)],
-                                dtype=index_dtype)  # the index goes from 0 to N*batch
 
         # Pass through gate
         gated_n = pooled_n * ks.backend.expand_dims(tf.keras.activations.sigmoid(pooled_score), axis=-1)
@@ -129,10 +128,11 @@ class PoolingTopK(GraphBaseLayer):
 
         shiftind = tf.cast(shiftind, dtype=index_dtype)  # already shifted by batch offset (sub-graphs)
 
-        # Remove edges that were from filtered nodes via mask
-        mask_edge = ks.backend.expand_dims(shiftind, axis=-1) == ks.backend.expand_dims(
-            ks.backend.expand_dims(removed_index, axis=0), axis=0)  # this creates large tensor (batch*#edges,2,remove)
-        mask_edge = tf.math.logical_not(ks.backend.any(ks.backend.any(mask_edge, axis=-1), axis=-1))
+        # Remove edges that were from filtered nodes via mask. Look up whether both nodes are kept, which only
+        # requires a node mask of shape (batch*N, ) instead of comparing each edge with all removed nodes.
+        mask_node = tf.scatter_nd(ks.backend.expand_dims(pooled_index, axis=-1),
+                                  tf.ones_like(pooled_index), old_shape) > 0
+        mask_edge = tf.reduce_all(tf.gather(mask_node, shiftind), axis=-1)
         clean_shiftind = shiftind[mask_edge]
         clean_edge_ids = edge_ids[mask_edge]
         # clean_edge_len = tf.math.segment_sum(tf.ones_like(clean_edge_ids), clean_edge_ids)
@@ -294,18 +294,26 @@ class UnPoolingTopK(GraphBaseLayer):
 
 @tf.keras.utils.register_keras_serializable(package='kgcnn', name='AdjacencyPower')
 class AdjacencyPower(GraphBaseLayer):
-    """Computes powers of the adjacency matrix. This implementation is a temporary solution.
+    """Computes powers of the adjacency matrix.
 
-    Note: Layer casts to dense until sparse matmul is supported. This can be very inefficient.
+    The adjacency matrix is kept sparse as edge list of the disjoint graph of the batch. Powers are computed by
+    sparse-sparse products with :obj:`kgcnn.ops.sparse.sparse_edge_matmul`, so that no dense `(batch, N, N)` tensor is
+    created. Only entries larger than :obj:`epsilon` are returned.
 
     Args:
         n (int): Power of the adjacency matrix. Default is 2.
+        epsilon (float): Threshold for entries of the output. Default is None, which uses `ks.backend.epsilon()`.
+        prune_intermediate (bool): Whether to also remove entries below :obj:`epsilon` after each product.
+            This keeps intermediate results small for large powers, but can slightly change the result.
+            Default is False.
     """
 
-    def __init__(self, n=2, **kwargs):
+    def __init__(self, n=2, epsilon: float = None, prune_intermediate: bool = False, **kwargs):
         """Initialize layer."""
         super(AdjacencyPower, self).__init__(**kwargs)
         self.n = n
+        self.epsilon = epsilon
+        self.prune_intermediate = prune_intermediate
 
     def build(self, input_shape):
         """Build layer."""
@@ -331,58 +339,44 @@ class AdjacencyPower(GraphBaseLayer):
         dyn_inputs = inputs
 
         nod, node_len = dyn_inputs[0].values, dyn_inputs[0].row_lengths()
-        edge = dyn_inputs[1].values
+        edge = dyn_inputs[1].values[:, 0:1]
         edge_index, edge_len = dyn_inputs[2].values, dyn_inputs[2].row_lengths()
+        epsilon = self.epsilon if self.epsilon is not None else ks.backend.epsilon()
 
-        # batch-wise indexing
+        # Disjoint indexing of the batch
         edge_index = partition_row_indexing(edge_index,
                                             node_len, edge_len,
                                             partition_type_target="row_length",
                                             partition_type_index="row_length",
                                             from_indexing=self.node_indexing,
-                                            to_indexing="sample")
+                                            to_indexing="batch")
+        edge_index = tf.cast(edge_index, dtype=tf.int64)
+        num_nodes = tf.reduce_sum(node_len)
 
-        ind_batch = tf.cast(tf.expand_dims(tf.repeat(tf.range(tf.shape(edge_len)[0]), edge_len), axis=-1),
-                            dtype=edge_index.dtype)
-        ind_all = tf.concat([ind_batch, edge_index], axis=-1)
-        ind_all = tf.cast(ind_all, dtype=tf.int64)
-
-        max_index = tf.reduce_max(node_len)
-        dense_shape = tf.stack([tf.cast(tf.shape(node_len)[0], dtype=max_index.dtype), max_index, max_index])
-        adj = tf.zeros(dense_shape, dtype=edge.dtype)
-        ind_flat = tf.range(tf.cast(tf.shape(node_len)[0], dtype=max_index.dtype) * max_index * max_index)
-
-        adj = tf.expand_dims(adj, axis=-1)
-        adj = tf.tensor_scatter_nd_update(adj, ind_all, edge[:, 0:1])
-        adj = tf.squeeze(adj, axis=-1)
-
-        out0 = adj
-        out = adj
+        out_index, out = edge_index, edge
         for i in range(self.n - 1):
-            out = tf.linalg.matmul(out, out0)
-
-        # debug_result = out
+            out_index, out = sparse_edge_matmul(out_index, out, edge_index, edge, num_nodes)
+            if self.prune_intermediate and i < self.n - 2:
+                mask = out[:, 0] > epsilon
+                out_index, out = out_index[mask], out[mask]
 
         # Make sparse
-        mask = out > tf.keras.backend.epsilon()
-        mask = tf.reshape(mask, (-1,))
-        out = tf.reshape(out, (-1,))
-
+        mask = out[:, 0] > epsilon
         new_edge = out[mask]
-        new_edge = tf.expand_dims(new_edge, axis=-1)
-        new_indices = tf.unravel_index(ind_flat[mask], dims=dense_shape)
-        new_egde_ids = new_indices[0]
-        new_edge_index = tf.concat([tf.expand_dims(new_indices[1], axis=-1), tf.expand_dims(new_indices[2], axis=-1)],
-                                   axis=-1)
-        new_edge_len = tf.tensor_scatter_nd_add(tf.zeros_like(node_len), tf.expand_dims(new_egde_ids, axis=-1),
-                                                tf.ones_like(new_egde_ids))
+        new_edge_index = out_index[mask]
+
+        # Entries are sorted by disjoint row index and therefore by graph.
+        node_ids = tf.repeat(tf.range(tf.shape(node_len, out_type=tf.int64)[0]), node_len)
+        new_edge_ids = tf.gather(node_ids, new_edge_index[:, 0])
+        new_edge_len = tf.math.unsorted_segment_sum(
+            tf.ones_like(new_edge_ids), new_edge_ids, tf.shape(node_len, out_type=tf.int64)[0])
 
         # batchwise indexing
         new_edge_index = partition_row_indexing(new_edge_index,
                                                 node_len, new_edge_len,
                                                 partition_type_target="row_length",
                                                 partition_type_index="row_length",
-                                                from_indexing="sample",
+                                                from_indexing="batch",
                                                 to_indexing=self.node_indexing)
 
         outlist = [tf.RaggedTensor.from_row_lengths(new_edge, new_edge_len, validate=self.ragged_validate),
@@ -393,5 +387,5 @@ class AdjacencyPower(GraphBaseLayer):
     def get_config(self):
         """Update layer config."""
         config = super(AdjacencyPower, self).get_config()
-        config.update({"n": self.n})
-        return config
\ No newline at end of file
+        config.update({"n": self.n, "epsilon": self.epsilon, "prune_intermediate": self.prune_intermediate})
+        return config
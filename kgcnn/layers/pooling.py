@@ -1,7 +1,7 @@
 import tensorflow as tf
 from kgcnn.layers.base import GraphBaseLayer
 from kgcnn.ops.partition import partition_row_indexing
-from kgcnn.ops.segment import segment_ops_by_name, segment_softmax
+from kgcnn.ops.segment import segment_ops_by_name, segment_softmax, pool_segments_by_name
 
 ks = tf.keras
 
@@ -16,7 +16,8 @@ class PoolingLocalEdges(GraphBaseLayer):
     all connections as :math:`(i, j)`. In the default definition for this layer index :math:`i` is expected ot be the
     receiving or target node (in standard case of directed edges). This can be changed by setting :obj:`pooling_index`.
 
-    Note: index_tensor[:, :, pooling_index] is sorted for the subsequent segment-operation.
+    Note: index_tensor[:, :, pooling_index] is sorted for the subsequent segment-operation, unless :obj:`is_sorted`
+    is set, in which case the indices are expected to be already sorted.
     
     Args:
         pooling_method (str): Pooling method to use i.e. segment_function. Default is 'mean'.
@@ -46,6 +47,13 @@ class PoolingLocalEdges(GraphBaseLayer):
         Returns:
             tf.RaggedTensor: Pooled feature tensor of pooled edge features for each node.
         """
+        if self.is_disjoint_index(inputs[2]):
+            nodind = inputs[2][:, self.pooling_index]
+            if self.is_sorted:
+                nodind = self.assert_sorted_index(nodind)
+            return pool_segments_by_name(self.pooling_method, inputs[1], nodind, tf.shape(inputs[0])[0],
+                                         is_sorted=self.is_sorted)
+
         # Need ragged input but can be generalized in the future.
         self.assert_ragged_input_rank(inputs)
 
@@ -61,7 +69,9 @@ class PoolingLocalEdges(GraphBaseLayer):
 
         nodind = shiftind[:, self.pooling_index]  # Pick index eg. ingoing
         dens = edge
-        if not self.is_sorted:
+        if self.is_sorted:
+            nodind = self.assert_sorted_index(nodind)
+        else:
             node_order = tf.argsort(nodind, axis=0, direction='ASCENDING', stable=True)
             nodind = tf.gather(nodind, node_order, axis=0)
             dens = tf.gather(dens, node_order, axis=0)
@@ -136,6 +146,18 @@ class PoolingWeightedLocalEdges(GraphBaseLayer):
         Returns:
             tf.RaggedTensor: Pooled feature tensor of pooled edge features for each node of shape (batch, [N], F)
         """
+        if self.is_disjoint_index(inputs[2]):
+            nodind = inputs[2][:, self.pooling_index]
+            if self.is_sorted:
+                nodind = self.assert_sorted_index(nodind)
+            num_nodes = tf.shape(inputs[0])[0]
+            out = pool_segments_by_name(self.pooling_method, inputs[1] * inputs[3], nodind, num_nodes,
+                                        is_sorted=self.is_sorted)
+            if self.normalize_by_weights:
+                out = tf.math.divide_no_nan(
+                    out, pool_segments_by_name("sum", inputs[3], nodind, num_nodes, is_sorted=self.is_sorted))
+            return out
+
         self.assert_ragged_input_rank(inputs)
 
         nod, node_part = inputs[0].values, inputs[0].row_splits
@@ -151,7 +173,9 @@ class PoolingWeightedLocalEdges(GraphBaseLayer):
         dens = edge * wval
         nodind = shiftind[:, self.pooling_index]
 
-        if not self.is_sorted:
+        if self.is_sorted:
+            nodind = self.assert_sorted_index(nodind)
+        else:
             node_order = tf.argsort(nodind, axis=0, direction='ASCENDING', stable=True)
             nodind = tf.gather(nodind, node_order, axis=0)
             dens = tf.gather(dens, node_order, axis=0)
@@ -161,7 +185,7 @@ class PoolingWeightedLocalEdges(GraphBaseLayer):
         get = segment_ops_by_name(self.pooling_method, dens, nodind)
 
         if self.normalize_by_weights:
-            get = tf.math.divide_no_nan(get, tf.math.segment_sum(wval, nodind))  # +tf.eps
+            get = tf.math.divide_no_nan(get, segment_ops_by_name("sum", wval, nodind))  # +tf.eps
 
         if self.has_unconnected:
             get = tf.scatter_nd(ks.backend.expand_dims(tf.range(tf.shape(get)[0]), axis=-1), get,
@@ -185,6 +209,10 @@ PoolingWeightedLocalMessages = PoolingWeightedLocalEdges  # For now, they are sy
 class PoolingEmbedding(GraphBaseLayer):
     """Polling all embeddings of edges or nodes per batch to obtain a graph level embedding in form of a
     ::obj`tf.Tensor`.
+
+    For the disjoint representation of e.g. :obj:`kgcnn.layers.casting.CastPaddedToDisjoint`, the input is a list of
+    flat embeddings, the graph ID of each embedding and the count tensor, whose length is the number of graphs.
+    Graph IDs do not have to be sorted and embeddings with a negative graph ID, like padded nodes, are ignored.
     
     Args:
         pooling_method (str): Pooling method to use i.e. segment_function. Default is 'mean'.
@@ -203,11 +231,19 @@ class PoolingEmbedding(GraphBaseLayer):
         """Forward pass.
 
         Args:
-            inputs (tf.RaggedTensor): Embedding tensor of shape (batch, [N], F)
+            inputs (tf.RaggedTensor, list): Embedding tensor of shape (batch, [N], F) or
+                [embeddings, graph_id, count] of the disjoint representation
+
+                - embeddings (tf.Tensor): Flat embeddings of shape (batch*[N], F)
+                - graph_id (tf.Tensor): Graph ID of each embedding of shape (batch*[N], )
+                - count (tf.Tensor): Number of embeddings per graph of shape (batch, )
     
         Returns:
             tf.Tensor: Pooled node features of shape (batch, F)
         """
+        if isinstance(inputs, (list, tuple)):
+            nod, graph_id, count = inputs
+            return pool_segments_by_name(self.pooling_method, nod, graph_id, tf.shape(count)[0])
         # Need ragged input but can be generalized in the future.
         self.assert_ragged_input_rank(inputs)
         # We cast to values here
@@ -421,7 +457,9 @@ class PoolingLocalEdgesLSTM(GraphBaseLayer):
 
         nodind = shiftind[:, self.pooling_index]  # Pick first index eg. ingoing
         dens = edge
-        if not self.is_sorted:
+        if self.is_sorted:
+            nodind = self.assert_sorted_index(nodind)
+        else:
             # Sort edgeindices
             node_order = tf.argsort(nodind, axis=0, direction='ASCENDING', stable=True)
             nodind = tf.gather(nodind, node_order, axis=0)
@@ -517,7 +555,9 @@ class PoolingLocalEdgesAttention(GraphBaseLayer):
         nodind = shiftind[:, self.pooling_index]  # Pick first index eg. ingoing
         dens = edge
         ats = attention
-        if not self.is_sorted:
+        if self.is_sorted:
+            nodind = self.assert_sorted_index(nodind)
+        else:
             # Sort edgeindices
             node_order = tf.argsort(nodind, axis=0, direction='ASCENDING', stable=True)
             nodind = tf.gather(nodind, node_order, axis=0)
@@ -527,7 +567,7 @@ class PoolingLocalEdgesAttention(GraphBaseLayer):
         # Apply segmented softmax
         ats = segment_softmax(ats, nodind)
         get = dens * ats
-        get = tf.math.segment_sum(get, nodind)
+        get = segment_ops_by_name("sum", get, nodind)
 
         if self.has_unconnected:
             # Need to fill tensor since the maximum node may not be also in pooled
@@ -585,7 +625,7 @@ class PoolingEmbeddingAttention(GraphBaseLayer):
 
         ats = segment_softmax(ats, batchi)
         get = nod * ats
-        out = tf.math.segment_sum(get, batchi)
+        out = segment_ops_by_name("sum", get, batchi)
 
         return out
 
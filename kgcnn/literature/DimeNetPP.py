@@ -1,4 +1,5 @@
 import tensorflow as tf
+from kgcnn.layers.casting import CastPaddedToDisjoint
 from kgcnn.layers.conv.dimenet_conv import DimNetInteractionPPBlock, DimNetOutputBlock, EmbeddingDimeBlock, \
     SphericalBasisLayer
 from kgcnn.layers.gather import GatherNodes
@@ -31,7 +32,7 @@ model_default = {
     "cutoff": 5.0, "envelope_exponent": 5,
     "num_before_skip": 1, "num_after_skip": 2, "num_dense_output": 3,
     "num_targets": 64, "extensive": True, "output_init": "zeros",
-    "activation": "swish", "verbose": 10,
+    "activation": "swish", "verbose": 10, "input_tensor_type": "ragged",
     "output_embedding": "graph",
     "use_output_mlp": True,
     "output_mlp": {"use_bias": [True, False],
@@ -62,7 +63,8 @@ def make_model(inputs: list = None,
                name: str = None,
                output_embedding: str = None,
                use_output_mlp: bool = None,
-               output_mlp: dict = None
+               output_mlp: dict = None,
+               input_tensor_type: str = None
                ):
     """Make `DimeNetPP <https://arxiv.org/abs/2011.14115>`_ graph network via functional API.
     Default parameters can be found in :obj:`kgcnn.literature.DimeNetPP.model_default`.
@@ -80,6 +82,11 @@ def make_model(inputs: list = None,
             - bond_indices (tf.RaggedTensor): Index list for edges or bonds of shape `(batch, None, 2)`.
             - angle_indices (tf.RaggedTensor): Index list of angles referring to bonds of shape `(batch, None, 2)`.
 
+        or `[node_attributes, node_coordinates, bond_indices, angle_indices, total_nodes, total_edges, total_angles]`
+        with padded tensors of shape `(batch, N, ...)`, `(batch, M, 2)` and `(batch, K, 2)` if
+        :obj:`input_tensor_type="padded"`, where `total_nodes`, `total_edges` and `total_angles` of shape `(batch, )`
+        are the number of nodes, edges and angles of each graph.
+
     Outputs:
         tf.Tensor: Graph embeddings of shape `(batch, L)` if :obj:`output_embedding="graph"`.
 
@@ -111,6 +118,9 @@ def make_model(inputs: list = None,
             Defines number of model outputs and activation. Note that DimeNetPP originally defines the output dimension
             via `num_targets`. But this can be set to `out_emb_size` and the `output_mlp` be used for more
             specific control.
+        input_tensor_type (str): Either "ragged" or "padded". Padded inputs of static shape are cast into the disjoint
+            representation by :obj:`CastPaddedToDisjoint`, so that the model can be compiled with XLA for each shape.
+            Default is "ragged".
 
     Returns:
         :obj:`tf.keras.models.Model`
@@ -120,6 +130,7 @@ def make_model(inputs: list = None,
     xyz_input = ks.layers.Input(**inputs[1])
     bond_index_input = ks.layers.Input(**inputs[2])
     angle_index_input = ks.layers.Input(**inputs[3])
+    count_input = [ks.layers.Input(**x) for x in inputs[4:7]] if input_tensor_type == "padded" else []
 
     # Atom embedding
     # n = generate_node_embedding(node_input, input_node_shape, input_embedding["nodes"])
@@ -132,6 +143,11 @@ def make_model(inputs: list = None,
     edi = bond_index_input
     adi = angle_index_input
 
+    if input_tensor_type == "padded":
+        # Padded nodes, edges and angles are masked by the graph IDs and a dummy node and edge of the disjoint batch.
+        [n, x], edi, graph_id_node, _, node_count, _, adi, _, _ = CastPaddedToDisjoint()(
+            [[n, x], edi, count_input[0], count_input[1], adi, count_input[2]])
+
     # Calculate distances
     pos1, pos2 = NodePosition()([x, edi])
     d = NodeDistanceEuclidean()([pos1, pos2])
@@ -150,17 +166,19 @@ def make_model(inputs: list = None,
     x = LazyConcatenate(axis=-1)([n_pairs, rbf_emb])
     x = DenseEmbedding(emb_size, use_bias=True, activation=activation, kernel_initializer="kgcnn>glorot_orthogonal")(x)
     ps = DimNetOutputBlock(emb_size, out_emb_size, num_dense_output, num_targets=num_targets,
-                           output_kernel_initializer=output_init)([n, x, rbf, edi])
+                           output_kernel_initializer=output_init, activation=activation)([n, x, rbf, edi])
 
     # Interaction blocks
     add_xp = LazyAdd()
     for i in range(num_blocks):
-        x = DimNetInteractionPPBlock(emb_size, int_emb_size, basis_emb_size, num_before_skip, num_after_skip)(
-            [x, rbf, sbf, adi])
+        x = DimNetInteractionPPBlock(emb_size, int_emb_size, basis_emb_size, num_before_skip, num_after_skip,
+                                     activation=activation)([x, rbf, sbf, adi])
         p_update = DimNetOutputBlock(emb_size, out_emb_size, num_dense_output, num_targets=num_targets,
-                                     output_kernel_initializer=output_init)([n, x, rbf, edi])
+                                     output_kernel_initializer=output_init, activation=activation)([n, x, rbf, edi])
         ps = add_xp([ps, p_update])
 
+    if input_tensor_type == "padded":
+        ps = [ps, graph_id_node, node_count]
     if extensive:
         out = PoolingNodes(pooling_method="sum")(ps)
     else:
@@ -172,7 +190,7 @@ def make_model(inputs: list = None,
     if output_embedding != "graph":
         raise ValueError("Unsupported output embedding for mode `DimeNetPP`.")
 
-    model = ks.models.Model(inputs=[node_input, xyz_input, bond_index_input, angle_index_input],
+    model = ks.models.Model(inputs=[node_input, xyz_input, bond_index_input, angle_index_input] + count_input,
                             outputs=out)
 
     return model
@@ -321,15 +339,15 @@ def make_crystal_model(inputs: list = None,
     x = LazyConcatenate(axis=-1)([n_pairs, rbf_emb])
     x = DenseEmbedding(emb_size, use_bias=True, activation=activation, kernel_initializer="kgcnn>glorot_orthogonal")(x)
     ps = DimNetOutputBlock(emb_size, out_emb_size, num_dense_output, num_targets=num_targets,
-                           output_kernel_initializer=output_init)([n, x, rbf, edi])
+                           output_kernel_initializer=output_init, activation=activation)([n, x, rbf, edi])
 
     # Interaction blocks
     add_xp = LazyAdd()
     for i in range(num_blocks):
-        x = DimNetInteractionPPBlock(emb_size, int_emb_size, basis_emb_size, num_before_skip, num_after_skip)(
-            [x, rbf, sbf, adi])
+        x = DimNetInteractionPPBlock(emb_size, int_emb_size, basis_emb_size, num_before_skip, num_after_skip,
+                                     activation=activation)([x, rbf, sbf, adi])
         p_update = DimNetOutputBlock(emb_size, out_emb_size, num_dense_output, num_targets=num_targets,
-                                     output_kernel_initializer=output_init)([n, x, rbf, edi])
+                                     output_kernel_initializer=output_init, activation=activation)([n, x, rbf, edi])
         ps = add_xp([ps, p_update])
 
     if extensive:
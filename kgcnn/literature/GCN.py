@@ -1,6 +1,7 @@
 import tensorflow as tf
-from kgcnn.layers.casting import ChangeTensorType
+from kgcnn.layers.casting import ChangeTensorType, CastRaggedToDisjoint, CastDisjointToRagged
 from kgcnn.layers.conv.gcn_conv import GCN
+from kgcnn.layers.message import DisjointEdgeIndices
 from kgcnn.layers.modules import DenseEmbedding, OptionalInputEmbedding
 from kgcnn.layers.mlp import GraphMLP, MLP
 from kgcnn.layers.pooling import PoolingNodes, PoolingWeightedNodes
@@ -23,6 +24,7 @@ model_default = {
                         "edge": {"input_dim": 10, "output_dim": 64}},
     "gcn_args": {"units": 100, "use_bias": True, "activation": "relu", "pooling_method": "sum",
                  "is_sorted": False, "has_unconnected": True},
+    "use_disjoint": False,
     "depth": 3, "verbose": 10,
     "output_embedding": "graph", "output_to_tensor": True,
     "output_mlp": {"use_bias": [True, True, False], "units": [25, 10, 1],
@@ -35,6 +37,7 @@ def make_model(inputs: list = None,
                input_embedding: dict = None,
                depth: int = None,
                gcn_args: dict = None,
+               use_disjoint: bool = None,
                name: str = None,
                verbose: int = None,
                output_embedding: str = None,
@@ -61,6 +64,8 @@ def make_model(inputs: list = None,
         input_embedding (dict): Dictionary of embedding arguments for nodes etc. unpacked in :obj:`Embedding` layers.
         depth (int): Number of graph embedding units or depth of the network.
         gcn_args (dict): Dictionary of layer arguments unpacked in :obj:`GCN` convolutional layer.
+        use_disjoint (bool): Whether to cast the batch at input into the disjoint representation of
+            :obj:`CastRaggedToDisjoint`, which is used by all layers of the model instead of ragged tensors.
         name (str): Name of the model.
         verbose (int): Level of print output.
         output_embedding (str): Main embedding task for graph network. Either "node", "edge" or "graph".
@@ -87,10 +92,20 @@ def make_model(inputs: list = None,
                                 use_embedding=len(inputs[1]['shape']) < 2)(edge_input)
     edi = edge_index_input
 
+    if use_disjoint:
+        # Disjoint representation of the batch is computed once and used by all layers of the model.
+        n, edi, _, _, node_count, _ = CastRaggedToDisjoint()([n, edi])
+        ed = ChangeTensorType(output_tensor_type="values")(ed)[0]
+
     # Model
     n = DenseEmbedding(gcn_args["units"], use_bias=True, activation='linear')(n)  # Map to units
+    # Shift of edge indices to disjoint batch is computed once for all fused layers.
+    edi_disjoint = [DisjointEdgeIndices()([n, edi])] if gcn_args.get("use_fused") and not use_disjoint else []
     for i in range(0, depth):
-        n = GCN(**gcn_args)([n, ed, edi])
+        n = GCN(**gcn_args)([n, ed, edi] + edi_disjoint)
+
+    if use_disjoint:
+        n = CastDisjointToRagged()([n, node_count])
 
     # Output embedding choice
     if output_embedding == "graph":
@@ -185,8 +200,10 @@ def make_model_weighted(inputs: list = None,
 
     # Model
     n = DenseEmbedding(gcn_args["units"], use_bias=True, activation='linear')(n)  # Map to units
+    # Shift of edge indices to disjoint batch is computed once for all fused layers.
+    edi_disjoint = [DisjointEdgeIndices()([n, edi])] if gcn_args.get("use_fused") else []
     for i in range(0, depth):
-        n = GCN(**gcn_args)([n, ed, edi])
+        n = GCN(**gcn_args)([n, ed, edi] + edi_disjoint)
 
     # Output embedding choice
     if output_embedding == "graph":
@@ -1,6 +1,7 @@
 import tensorflow as tf
-from kgcnn.layers.casting import ChangeTensorType
+from kgcnn.layers.casting import ChangeTensorType, CastRaggedToDisjoint, CastDisjointToRagged
 from kgcnn.layers.conv.gin_conv import GIN, GINE
+from kgcnn.layers.message import DisjointEdgeIndices
 from kgcnn.layers.modules import DenseEmbedding, OptionalInputEmbedding
 from kgcnn.layers.mlp import GraphMLP, MLP
 from kgcnn.layers.pooling import PoolingNodes
@@ -21,6 +22,7 @@ model_default = {
     "gin_mlp": {"units": [64, 64], "use_bias": True, "activation": ["relu", "linear"],
                 "use_normalization": True, "normalization_technique": "graph_batch"},
     "gin_args": {},
+    "use_disjoint": False,
     "depth": 3, "dropout": 0.0, "verbose": 10,
     "last_mlp": {"use_bias": [True, True, True], "units": [64, 64, 64],
                  "activation": ["relu", "relu", "linear"]},
@@ -35,6 +37,7 @@ def make_model(inputs: list = None,
                input_embedding: dict = None,
                depth: int = None,
                gin_args: dict = None,
+               use_disjoint: bool = None,
                gin_mlp: dict = None,
                last_mlp: dict = None,
                dropout: float = None,
@@ -62,6 +65,8 @@ def make_model(inputs: list = None,
         input_embedding (dict): Dictionary of embedding arguments for nodes etc. unpacked in :obj:`Embedding` layers.
         depth (int): Number of graph embedding units or depth of the network.
         gin_args (dict): Dictionary of layer arguments unpacked in :obj:`GIN` convolutional layer.
+        use_disjoint (bool): Whether to cast the batch at input into the disjoint representation of
+            :obj:`CastRaggedToDisjoint`, which is used by all layers of the model instead of ragged tensors.
         gin_mlp (dict): Dictionary of layer arguments unpacked in :obj:`MLP` for convolutional layer.
         last_mlp (dict): Dictionary of layer arguments unpacked in last :obj:`MLP` layer before output or pooling.
         dropout (float): Dropout to use.
@@ -85,16 +90,26 @@ def make_model(inputs: list = None,
                                use_embedding=len(inputs[0]['shape']) < 2)(node_input)
     edi = edge_index_input
 
+    if use_disjoint:
+        # Disjoint representation of the batch is computed once and used by all layers of the model.
+        n, edi, _, _, node_count, _ = CastRaggedToDisjoint()([n, edi])
+
     # Model
     # Map to the required number of units.
     n_units = gin_mlp["units"][-1] if isinstance(gin_mlp["units"], list) else int(gin_mlp["units"])
     n = DenseEmbedding(n_units, use_bias=True, activation='linear')(n)
     list_embeddings = [n]
+    # Shift of edge indices to disjoint batch is computed once for all fused layers.
+    edi_disjoint = [DisjointEdgeIndices()([n, edi])] if gin_args.get("use_fused") and not use_disjoint else []
     for i in range(0, depth):
-        n = GIN(**gin_args)([n, edi])
+        n = GIN(**gin_args)([n, edi] + edi_disjoint)
         n = GraphMLP(**gin_mlp)(n)
         list_embeddings.append(n)
 
+    if use_disjoint:
+        list_embeddings = [CastDisjointToRagged()([x, node_count]) for x in list_embeddings]
+        n = list_embeddings[-1]
+
     # Output embedding choice
     if output_embedding == "graph":
         out = [PoolingNodes()(x) for x in list_embeddings]  # will return tensor
@@ -1,5 +1,5 @@
 import tensorflow as tf
-from kgcnn.layers.casting import ChangeTensorType
+from kgcnn.layers.casting import ChangeTensorType, CastPaddedToDisjoint
 from kgcnn.layers.conv.painn_conv import PAiNNUpdate, EquivariantInitialize
 from kgcnn.layers.conv.painn_conv import PAiNNconv
 from kgcnn.layers.geom import NodeDistanceEuclidean, BesselBasisLayer, EdgeDirectionNormalized, CosCutOffEnvelope, \
@@ -31,7 +31,7 @@ model_default = {
     "conv_args": {"units": 128, "cutoff": None, "conv_pool": "sum"},
     "update_args": {"units": 128},
     "equiv_normalization": False, "node_normalization": False,
-    "depth": 3,
+    "depth": 3, "input_tensor_type": "ragged",
     "verbose": 10,
     "output_embedding": "graph", "output_to_tensor": True,
     "output_mlp": {"use_bias": [True, True], "units": [128, 1], "activation": ["swish", "linear"]}
@@ -49,6 +49,7 @@ def make_model(inputs: list = None,
                update_args: dict = None,
                equiv_normalization: bool = None,
                node_normalization: bool = None,
+               input_tensor_type: str = None,
                name: str = None,
                verbose: int = None,
                output_embedding: str = None,
@@ -69,6 +70,11 @@ def make_model(inputs: list = None,
             - bond_indices (tf.RaggedTensor): Index list for edges or bonds of shape `(batch, None, 2)`.
             - equiv_initial (tf.RaggedTensor): Equivariant initialization `(batch, None, 3, F)`. Optional.
 
+        or `[node_attributes, node_coordinates, bond_indices, total_nodes, total_edges]` with optional
+        `equiv_initial` at the end, with padded tensors of shape `(batch, N, ...)` and `(batch, M, 2)` if
+        :obj:`input_tensor_type="padded"`, where `total_nodes` and `total_edges` of shape `(batch, )` are the number
+        of nodes and edges of each graph. Padded inputs require :obj:`output_embedding="graph"`.
+
     Outputs:
         tf.Tensor: Graph embeddings of shape `(batch, L)` if :obj:`output_embedding="graph"`.
 
@@ -83,6 +89,10 @@ def make_model(inputs: list = None,
         update_args (dict): Dictionary of layer arguments unpacked in :obj:`PAiNNUpdate` layer.
         equiv_normalization (bool): Whether to apply :obj:`GraphLayerNormalization` to equivariant tensor update.
         node_normalization (bool): Whether to apply :obj:`GraphBatchNormalization` to node tensor update.
+            For padded inputs, padded nodes are masked in the batch statistics.
+        input_tensor_type (str): Either "ragged" or "padded". Padded inputs of static shape are cast into the disjoint
+            representation by :obj:`CastPaddedToDisjoint`, so that the model can be compiled with XLA for each shape.
+            Default is "ragged".
         verbose (int): Level of verbosity.
         name (str): Name of the model.
         output_embedding (str): Main embedding task for graph network. Either "node", "edge" or "graph".
@@ -97,17 +107,28 @@ def make_model(inputs: list = None,
     node_input = ks.layers.Input(**inputs[0])
     xyz_input = ks.layers.Input(**inputs[1])
     bond_index_input = ks.layers.Input(**inputs[2])
+    count_input = [ks.layers.Input(**x) for x in inputs[3:5]] if input_tensor_type == "padded" else []
+    num_inputs = 3 + len(count_input)
     z = OptionalInputEmbedding(**input_embedding['node'],
                                use_embedding=len(inputs[0]['shape']) < 2)(node_input)
 
-    if len(inputs) > 3:
-        equiv_input = ks.layers.Input(**inputs[3])
-    else:
-        equiv_input = EquivariantInitialize(**equiv_initialize_kwargs)(z)
-
     edi = bond_index_input
     x = xyz_input
-    v = equiv_input
+    equiv_input = ks.layers.Input(**inputs[num_inputs]) if len(inputs) > num_inputs else None
+
+    if input_tensor_type == "padded":
+        if output_embedding != "graph":
+            raise ValueError("Padded input of `PAiNN` requires graph output embedding.")
+        # Padded nodes and edges are masked by the graph IDs and a dummy node of the disjoint representation.
+        node_list = [z, x] + ([equiv_input] if equiv_input is not None else [])
+        node_list, edi, graph_id_node, _, node_count, _ = CastPaddedToDisjoint()([node_list, edi] + count_input)
+        z, x = node_list[:2]
+        v = node_list[2] if equiv_input is not None else None
+    else:
+        v = equiv_input
+
+    if v is None:
+        v = EquivariantInitialize(**equiv_initialize_kwargs)(z)
 
     pos1, pos2 = NodePosition()([x, edi])
     rij = EdgeDirectionNormalized()([pos1, pos2])
@@ -126,14 +147,14 @@ def make_model(inputs: list = None,
         v = LazyAdd()([v, dv])
 
         if equiv_normalization:
-            v = GraphLayerNormalization(axis=2)(v)
+            v = GraphLayerNormalization(axis=-2)(v)
         if node_normalization:
-            z = GraphBatchNormalization(axis=-1)(z)
+            z = GraphBatchNormalization(axis=-1)(z if input_tensor_type != "padded" else [z, graph_id_node])
 
     n = z
     # Output embedding choice
     if output_embedding == "graph":
-        out = PoolingNodes(**pooling_args)(n)
+        out = PoolingNodes(**pooling_args)(n if input_tensor_type != "padded" else [n, graph_id_node, node_count])
         out = MLP(**output_mlp)(out)
     elif output_embedding == "node":
         out = GraphMLP(**output_mlp)(n)
@@ -142,10 +163,10 @@ def make_model(inputs: list = None,
     else:
         raise ValueError("Unsupported output embedding for mode `PAiNN`")
 
-    if len(inputs) > 3:
-        model = ks.models.Model(inputs=[node_input, xyz_input, bond_index_input, equiv_input], outputs=out)
-    else:
-        model = ks.models.Model(inputs=[node_input, xyz_input, bond_index_input], outputs=out)
+    model_inputs = [node_input, xyz_input, bond_index_input] + count_input
+    if equiv_input is not None:
+        model_inputs.append(equiv_input)
+    model = ks.models.Model(inputs=model_inputs, outputs=out)
     return model
 
 
@@ -268,7 +289,7 @@ def make_crystal_model(inputs: list = None,
         if equiv_normalization:
             v = GraphLayerNormalization(axis=2)(v)
         if node_normalization:
-            z = GraphBatchNormalization(axis=-1)(z)
+            z = GraphBatchNormalization(axis=-1)(z if input_tensor_type != "padded" else [z, graph_id_node])
 
     n = z
     # Output embedding choice
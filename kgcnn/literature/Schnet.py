@@ -1,6 +1,7 @@
 import tensorflow as tf
-from kgcnn.layers.casting import ChangeTensorType
+from kgcnn.layers.casting import ChangeTensorType, CastRaggedToDisjoint, CastDisjointToRagged, CastPaddedToDisjoint
 from kgcnn.layers.conv.schnet_conv import SchNetInteraction
+from kgcnn.layers.message import DisjointEdgeIndices
 from kgcnn.layers.geom import NodeDistanceEuclidean, GaussBasisLayer, NodePosition, ShiftPeriodicLattice
 from kgcnn.layers.modules import DenseEmbedding, OptionalInputEmbedding
 from kgcnn.layers.mlp import GraphMLP, MLP
@@ -26,6 +27,7 @@ model_default = {
     "make_distance": True, "expand_distance": True,
     "interaction_args": {"units": 128, "use_bias": True,
                          "activation": "kgcnn>shifted_softplus", "cfconv_pool": "sum"},
+    "use_disjoint": False, "input_tensor_type": "ragged",
     "node_pooling_args": {"pooling_method": "sum"},
     "depth": 4,
     "gauss_args": {"bins": 20, "distance": 4, "offset": 0.0, "sigma": 0.4},
@@ -46,6 +48,8 @@ def make_model(inputs: list = None,
                expand_distance: bool = None,
                gauss_args: dict = None,
                interaction_args: dict = None,
+               use_disjoint: bool = None,
+               input_tensor_type: str = None,
                node_pooling_args: dict = None,
                depth: int = None,
                name: str = None,
@@ -72,6 +76,11 @@ def make_model(inputs: list = None,
             - edge_indices (tf.RaggedTensor): Index list for edges of shape `(batch, None, 2)`.
             - node_coordinates (tf.RaggedTensor): Node (atomic) coordinates of shape `(batch, None, 3)`.
 
+        or `[node_attributes, node_coordinates, edge_indices, total_nodes, total_edges]` with padded tensors
+        of shape `(batch, N, ...)` and `(batch, M, 2)` if :obj:`input_tensor_type="padded"`, where
+        `total_nodes` and `total_edges` of shape `(batch, )` are the number of nodes and edges of each graph.
+        Padded inputs require :obj:`make_distance=True` and :obj:`output_embedding="graph"`.
+
     Outputs:
         tf.Tensor: Graph embeddings of shape `(batch, L)` if :obj:`output_embedding="graph"`.
 
@@ -84,6 +93,11 @@ def make_model(inputs: list = None,
         gauss_args (dict): Dictionary of layer arguments unpacked in :obj:`GaussBasisLayer` layer.
         depth (int): Number of graph embedding units or depth of the network.
         interaction_args (dict): Dictionary of layer arguments unpacked in final :obj:`SchNetInteraction` layers.
+        use_disjoint (bool): Whether to cast the batch at input into the disjoint representation of
+            :obj:`CastRaggedToDisjoint`, which is used by all layers of the model instead of ragged tensors.
+        input_tensor_type (str): Either "ragged" or "padded". Padded inputs of static shape are cast into the disjoint
+            representation by :obj:`CastPaddedToDisjoint`, so that the model can be compiled with XLA for each shape.
+            Default is "ragged".
         node_pooling_args (dict): Dictionary of layer arguments unpacked in :obj:`PoolingNodes` layers.
         verbose (int): Level of verbosity.
         name (str): Name of the model.
@@ -101,32 +115,48 @@ def make_model(inputs: list = None,
     node_input = ks.layers.Input(**inputs[0])
     xyz_input = ks.layers.Input(**inputs[1])
     edge_index_input = ks.layers.Input(**inputs[2])
+    count_input = [ks.layers.Input(**x) for x in inputs[3:5]] if input_tensor_type == "padded" else []
 
     # embedding, if no feature dimension
     n = OptionalInputEmbedding(**input_embedding['node'],
                                use_embedding=len(inputs[0]['shape']) < 2)(node_input)
     edi = edge_index_input
+    x = xyz_input
+
+    if use_disjoint:
+        # Disjoint representation of the batch is computed once and used by all layers of the model.
+        n, edi, _, _, node_count, _ = CastRaggedToDisjoint()([n, edi])
+        x = ChangeTensorType(output_tensor_type="values")(x)[0]
+    elif input_tensor_type == "padded":
+        if not make_distance or output_embedding != "graph":
+            raise ValueError("Padded input of `SchNet` requires `make_distance` and graph output embedding.")
+        # Padded nodes and edges are masked by the graph IDs and a dummy node of the disjoint representation.
+        [n, x], edi, graph_id_node, _, node_count, _ = CastPaddedToDisjoint()([[n, x], edi] + count_input)
 
     if make_distance:
-        x = xyz_input
         pos1, pos2 = NodePosition()([x, edi])
         ed = NodeDistanceEuclidean()([pos1, pos2])
     else:
-        ed = xyz_input
+        ed = x
 
     if expand_distance:
         ed = GaussBasisLayer(**gauss_args)(ed)
 
     # Model
     n = DenseEmbedding(interaction_args["units"], activation='linear')(n)
+    # Shift of edge indices to disjoint batch is computed once for all fused layers.
+    edi_disjoint = [DisjointEdgeIndices()([n, edi])] if interaction_args.get("use_fused") and not (
+        use_disjoint or input_tensor_type == "padded") else []
     for i in range(0, depth):
-        n = SchNetInteraction(**interaction_args)([n, ed, edi])
+        n = SchNetInteraction(**interaction_args)([n, ed, edi] + edi_disjoint)
 
     n = GraphMLP(**last_mlp)(n)
+    if use_disjoint:
+        n = CastDisjointToRagged()([n, node_count])
 
     # Output embedding choice
     if output_embedding == 'graph':
-        out = PoolingNodes(**node_pooling_args)(n)
+        out = PoolingNodes(**node_pooling_args)(n if input_tensor_type != "padded" else [n, graph_id_node, node_count])
         if use_output_mlp:
             out = MLP(**output_mlp)(out)
     elif output_embedding == 'node':
@@ -138,7 +168,7 @@ def make_model(inputs: list = None,
     else:
         raise ValueError("Unsupported output embedding for mode `SchNet`")
 
-    model = ks.models.Model(inputs=[node_input, xyz_input, edge_index_input], outputs=out)
+    model = ks.models.Model(inputs=[node_input, xyz_input, edge_index_input] + count_input, outputs=out)
     return model
 
 
@@ -165,7 +195,7 @@ model_crystal_default = {
 }
 
 
-@update_model_kwargs(model_default)
+@update_model_kwargs(model_crystal_default)
 def make_crystal_model(inputs: list = None,
                        input_embedding: dict = None,
                        make_distance: bool = None,
@@ -251,8 +281,10 @@ def make_crystal_model(inputs: list = None,
 
     # Model
     n = DenseEmbedding(interaction_args["units"], activation='linear')(n)
+    # Shift of edge indices to disjoint batch is computed once for all fused layers.
+    edi_disjoint = [DisjointEdgeIndices()([n, edi])] if interaction_args.get("use_fused") else []
     for i in range(0, depth):
-        n = SchNetInteraction(**interaction_args)([n, ed, edi])
+        n = SchNetInteraction(**interaction_args)([n, ed, edi] + edi_disjoint)
 
     n = GraphMLP(**last_mlp)(n)
 
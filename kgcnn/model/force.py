@@ -6,10 +6,57 @@ ks = tf.keras
 
 
 class EnergyForceModel(ks.models.Model):
+    r"""Model that predicts energy and its gradient with respect to coordinates, i.e. negative forces, for an energy
+    model of :obj:`module_name` and :obj:`class_name` with coordinates at input :obj:`coordinate_input`.
+
+    The gradient is computed by :obj:`tf.GradientTape.gradient` of the energy summed over the batch with respect to
+    the flat values of the ragged coordinates, which requires one backward pass per energy state. Since graphs in a
+    batch are independent, this gives the gradient for each graph without padding the coordinates. The gradient has
+    shape `(batch, [N], 3, states)`, with states as last axis like the forces of
+    :obj:`kgcnn.scaler.force.EnergyForceExtensiveScaler`. With :obj:`use_batch_jacobian` the gradient is computed
+    by :obj:`tf.GradientTape.batch_jacobian` on padded coordinates instead, which was the previous implementation.
+
+    With :obj:`stress_mode`, the model also returns the derivative of the energy with respect to a homogeneous strain
+    :math:`\epsilon` of the coordinates :math:`x \rightarrow x (1 + \epsilon)` at :math:`\epsilon = 0`, i.e. the
+    virial :math:`\sum_i x_i \otimes \partial E / \partial x_i` for "virial" of shape `(batch, 3, 3, states)`.
+    For "stress", the lattice at input :obj:`lattice_input` is strained as well and the derivative is divided by
+    the volume of the cell.
+
+    .. code-block:: python
+
+        from kgcnn.model.force import EnergyForceModel
+        model = EnergyForceModel(module_name="kgcnn.literature.Schnet", class_name="make_model",
+                                 config={"name": "Schnet", "output_embedding": "graph"}, coordinate_input=1,
+                                 output_to_tensor=False, output_squeeze_states=True)
+        energy, gradient = model(x)
+
+    """
+
     def __init__(self, module_name, class_name, config, coordinate_input: Union[int, str] = 1,
                  output_as_dict: bool = False, ragged_validate: bool = False, output_to_tensor: bool = True,
-                 output_squeeze_states: bool = False, **kwargs):
+                 output_squeeze_states: bool = False, use_batch_jacobian: bool = False, stress_mode: str = None,
+                 lattice_input: Union[int, str] = None, **kwargs):
+        r"""Initialize model.
+
+        Args:
+            module_name (str): Module of the energy model, e.g. "kgcnn.literature.Schnet".
+            class_name (str): Class or function to make the energy model, e.g. "make_model".
+            config (dict): Config for the energy model.
+            coordinate_input (int, str): Index or key of the (ragged) coordinates of shape `(batch, [N], 3)`.
+            output_as_dict (bool): Whether to return a dictionary with keys 'energy', 'force' and 'stress' or
+                'virial' instead of a tuple. Default is False.
+            ragged_validate (bool): Whether to validate ragged tensors. Default is False.
+            output_to_tensor (bool): Whether to return the gradient as padded tensor. Default is True.
+            output_squeeze_states (bool): Whether to squeeze the states axis of the gradient. Default is False.
+            use_batch_jacobian (bool): Whether to compute the gradient with :obj:`batch_jacobian` on padded
+                coordinates. Default is False.
+            stress_mode (str): Either None, "virial" or "stress". Default is None.
+            lattice_input (int, str): Index or key of the lattice of shape `(batch, 3, 3)` for "stress".
+                Default is None.
+        """
         super(EnergyForceModel, self).__init__(self, **kwargs)
+        self.module_name = module_name
+        self.class_name = class_name
         self.model_config = config
         self.ragged_validate = ragged_validate
         self.energy_model_class = get_model_class(module_name, class_name)
@@ -19,8 +66,66 @@ class EnergyForceModel(ks.models.Model):
         self.output_as_dict = output_as_dict
         self.output_to_tensor = output_to_tensor
         self.output_squeeze_states = output_squeeze_states
+        self.use_batch_jacobian = use_batch_jacobian
+        self.stress_mode = stress_mode
+        self.lattice_input = lattice_input
+        if self.stress_mode not in [None, "virial", "stress"]:
+            raise ValueError("Unknown stress mode '%s' for `EnergyForceModel`." % self.stress_mode)
+        if self.stress_mode == "stress" and self.lattice_input is None:
+            raise ValueError("`EnergyForceModel` requires `lattice_input` for stress.")
+        if self.stress_mode is not None and self.use_batch_jacobian:
+            raise ValueError("`EnergyForceModel` can not compute stress with `use_batch_jacobian`.")
 
     def call(self, inputs, training=False, **kwargs):
+        if self.use_batch_jacobian:
+            eng, e_grad = self._call_batch_jacobian(inputs, training=training, **kwargs)
+            return self._make_output(eng, e_grad)
+
+        x = inputs[self.coordinate_input]
+        inputs_energy = [i for i in inputs] if not isinstance(inputs, dict) else {
+            key: value for key, value in inputs.items()}
+        # x is ragged tensor of shape (batch, [N], 3) with cartesian coordinates.
+        x_values, x_row_splits = x.values, x.row_splits
+        with tf.GradientTape(persistent=True) as tape:
+            tape.watch(x_values)
+            if self.stress_mode is not None:
+                # Homogeneous strain of each graph at zero.
+                strain = tf.zeros([tf.shape(x_row_splits)[0] - 1, 3, 3], dtype=x_values.dtype)
+                tape.watch(strain)
+                strain_per_atom = tf.gather(strain, x.value_rowids())
+                x_values_strained = x_values + tf.einsum("ij,ijk->ik", x_values, strain_per_atom)
+                inputs_energy[self.coordinate_input] = tf.RaggedTensor.from_row_splits(
+                    x_values_strained, x_row_splits, validate=self.ragged_validate)
+                if self.stress_mode == "stress":
+                    lattice = inputs[self.lattice_input]
+                    inputs_energy[self.lattice_input] = lattice + tf.einsum("bij,bjk->bik", lattice, strain)
+            else:
+                inputs_energy[self.coordinate_input] = tf.RaggedTensor.from_row_splits(
+                    x_values, x_row_splits, validate=self.ragged_validate)
+            # Predict energy.
+            # Energy must be tensor of shape (batch, states)
+            eng = self.energy_model(inputs_energy, training=training, **kwargs)
+            # Graphs in batch are independent, so that the gradient of the sum gives the gradient for each graph.
+            eng_sum = tf.unstack(tf.reduce_sum(eng, axis=0), num=eng.shape[-1])
+        e_grad = tf.stack([tape.gradient(e, x_values) for e in eng_sum], axis=-1)  # (batch*[N], 3, states)
+        e_strain = None
+        if self.stress_mode is not None:
+            e_strain = tf.stack([tape.gradient(e, strain) for e in eng_sum], axis=-1)  # (batch, 3, 3, states)
+            if self.stress_mode == "stress":
+                volume = tf.abs(tf.linalg.det(inputs[self.lattice_input]))
+                e_strain = e_strain / tf.reshape(volume, [-1, 1, 1, 1])
+        del tape
+
+        if self.output_squeeze_states:
+            e_grad = tf.squeeze(e_grad, axis=-1)
+            if e_strain is not None:
+                e_strain = tf.squeeze(e_strain, axis=-1)
+        e_grad = tf.RaggedTensor.from_row_splits(e_grad, x_row_splits, validate=self.ragged_validate)
+        if self.output_to_tensor:
+            e_grad = e_grad.to_tensor()
+        return self._make_output(eng, e_grad, e_strain)
+
+    def _call_batch_jacobian(self, inputs, training=False, **kwargs):
         x = inputs[self.coordinate_input]
         inputs_energy = [i for i in inputs]
         # x is ragged tensor of shape (batch, [N], 3) with cartesian coordinates.
@@ -43,7 +148,16 @@ class EnergyForceModel(ks.models.Model):
             e_grad = tf.squeeze(e_grad, axis=-1)
         if not self.output_to_tensor:
             e_grad = self._cast_coordinates_pad_to_ragged(e_grad, x_mask, self.ragged_validate)
+        return eng, e_grad
 
+    def _make_output(self, eng, e_grad, e_strain=None):
+        if self.output_as_dict:
+            out = {"energy": eng, "force": e_grad}
+            if e_strain is not None:
+                out.update({self.stress_mode: e_strain})
+            return out
+        if e_strain is not None:
+            return eng, e_grad, e_strain
         return eng, e_grad
 
     # Temporary solution.
@@ -57,7 +171,20 @@ class EnergyForceModel(ks.models.Model):
         return tf.RaggedTensor.from_row_lengths(x_values, x_row_length, validate=validate)
 
     def get_config(self):
+        """Get config of the model, i.e. the arguments of the constructor."""
         # conf = super(EnergyForceModel, self).get_config()
-        conf = {}
-        conf.update({})
+        conf = {"name": self.name}
+        conf.update({
+            "module_name": self.module_name,
+            "class_name": self.class_name,
+            "config": self.model_config,
+            "coordinate_input": self.coordinate_input,
+            "output_as_dict": self.output_as_dict,
+            "ragged_validate": self.ragged_validate,
+            "output_to_tensor": self.output_to_tensor,
+            "output_squeeze_states": self.output_squeeze_states,
+            "use_batch_jacobian": self.use_batch_jacobian,
+            "stress_mode": self.stress_mode,
+            "lattice_input": self.lattice_input
+        })
         return conf
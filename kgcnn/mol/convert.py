@@ -1,9 +1,14 @@
 import os
+import json
+import time
+import hashlib
 import logging
+import multiprocessing
+from multiprocessing.connection import wait
 from typing import Callable
 from kgcnn.mol.io import read_mol_list_from_sdf_file, read_xyz_file, read_smiles_file, write_mol_block_list_to_sdf, \
-    parse_list_to_xyz_str
-from concurrent.futures import ThreadPoolExecutor  # , ProcessPoolExecutor
+    parse_list_to_xyz_str, append_mol_block_list_to_sdf, _FAILED_MOL_BLOCK
+from concurrent.futures import ThreadPoolExecutor
 from kgcnn.mol.external.ballloon import BalloonInterface
 
 logging.basicConfig()  # Module logger
@@ -135,6 +140,104 @@ except ImportError:
     openbabel_smile_to_mol, openbabel_xyz_to_mol = None, None
 
 
+def _conversion_worker(connection, conversion_method: Callable, args: tuple):
+    """Worker process that converts smiles received from connection until it receives `None`."""
+    while True:
+        task = connection.recv()
+        if task is None:
+            break
+        index, smile = task
+        try:
+            mol = conversion_method(smile, *args)
+        except Exception:
+            mol = None
+        connection.send((index, mol))
+    connection.close()
+
+
+def _convert_process_pool(conversion_method: Callable, smile_list: list, num_workers: int, args: tuple,
+                          timeout: float = None):
+    r"""Convert smiles in worker processes with a timeout per molecule.
+
+    Each worker has its own pipe and processes one smile at a time. A worker that exceeds the timeout or crashes is
+    killed and replaced by a new process. The molecule is then `None`. Killing a worker can not leave shared queues
+    in a broken state, since no queues are shared between workers.
+
+    Args:
+        conversion_method (Callable): Picklable function that takes a smile and `args` and returns a mol block.
+        smile_list (list): List of smiles.
+        num_workers (int): Number of worker processes.
+        args (tuple): Further arguments for the conversion method.
+        timeout (float): Timeout in seconds for converting a single smile. Default is None.
+
+    Returns:
+        list: List of mol blocks in order of `smile_list`.
+    """
+    context = multiprocessing.get_context()
+    mol_list = [None] * len(smile_list)
+    tasks = iter(enumerate(smile_list))
+    workers = []
+
+    def start_worker():
+        parent_connection, child_connection = context.Pipe()
+        process = context.Process(target=_conversion_worker, args=(child_connection, conversion_method, args),
+                                  daemon=True)
+        process.start()
+        child_connection.close()
+        return {"process": process, "connection": parent_connection, "task": None, "start": None}
+
+    def restart_worker(worker):
+        worker["process"].kill()
+        worker["process"].join()
+        worker["connection"].close()
+        worker.update(start_worker())
+
+    def assign_task(worker):
+        worker["task"] = next(tasks, None)
+        if worker["task"] is not None:
+            worker["connection"].send(worker["task"])
+            worker["start"] = time.monotonic()
+
+    try:
+        for _ in range(min(num_workers, len(smile_list))):
+            workers.append(start_worker())
+            assign_task(workers[-1])
+        while True:
+            busy = [w for w in workers if w["task"] is not None]
+            if len(busy) == 0:
+                break
+            wait_time = None
+            if timeout is not None:
+                wait_time = max(min([w["start"] for w in busy]) + timeout - time.monotonic(), 0.0)
+            ready = wait([w["connection"] for w in busy], timeout=wait_time)
+            for w in busy:
+                if w["connection"] in ready:
+                    try:
+                        index, mol = w["connection"].recv()
+                        mol_list[index] = mol
+                    except EOFError:
+                        module_logger.warning("Conversion process crashed for smile '%s'." % w["task"][1])
+                        restart_worker(w)
+                    assign_task(w)
+                elif timeout is not None and time.monotonic() - w["start"] > timeout:
+                    module_logger.warning("Conversion timed out after %s s for smile '%s'." % (timeout, w["task"][1]))
+                    restart_worker(w)
+                    assign_task(w)
+    finally:
+        for w in workers:
+            try:
+                w["connection"].send(None)
+            except (OSError, ValueError):
+                pass
+        for w in workers:
+            w["process"].join(timeout=1.0)
+            if w["process"].is_alive():
+                w["process"].kill()
+                w["process"].join()
+            w["connection"].close()
+    return mol_list
+
+
 class MolConverter:
 
     def __init__(self, base_path: str = None):
@@ -158,7 +261,9 @@ class MolConverter:
     def _convert_parallel(conversion_method: Callable,
                           smile_list: list,
                           num_workers: int,
-                          *args
+                          *args,
+                          parallel_backend: str = "thread",
+                          timeout: float = None
                           ):
         if num_workers is None:
             num_workers = os.cpu_count()
@@ -166,15 +271,23 @@ class MolConverter:
         if rdkit_smile_to_mol is None and openbabel_smile_to_mol is None:
             raise ModuleNotFoundError("Can not convert smiles. Missing `RDkit` or `OpenBabel` packages.")
 
-        if num_workers == 1:
-            mol_list = [conversion_method(x, *args) for x in smile_list]
-            return mol_list
-        else:
+        if parallel_backend == "process":
+            if num_workers == 1 and timeout is None:
+                return [conversion_method(x, *args) for x in smile_list]
+            return _convert_process_pool(conversion_method, smile_list, num_workers, args, timeout=timeout)
+        elif parallel_backend == "thread":
+            if timeout is not None:
+                module_logger.warning("Timeout is only supported for `parallel_backend='process'`.")
+            if num_workers == 1:
+                mol_list = [conversion_method(x, *args) for x in smile_list]
+                return mol_list
             arg_list = [(x,) + args for x in smile_list]
             with ThreadPoolExecutor(max_workers=num_workers) as executor:
                 result = executor.map(conversion_method, *zip(*arg_list))
             mol_list = list(result)
             return mol_list
+        else:
+            raise ValueError("Unknown parallel backend '%s'. Use 'process' or 'thread'." % parallel_backend)
 
     @staticmethod
     def _single_smile_to_mol(smile: str,
@@ -207,41 +320,86 @@ class MolConverter:
                      make_conformers: bool = True,
                      optimize_conformer: bool = True,
                      logger=None,
-                     batch_size: int = 5000):
+                     batch_size: int = 5000,
+                     parallel_backend: str = "thread",
+                     timeout: float = None,
+                     resume: bool = True,
+                     return_mol_list: bool = True):
         """Convert a smiles file to SDF structure file.
 
+        Smiles are converted in batches of :obj:`batch_size`, which are appended to a temporary SDF file
+        `sdf_path + '.part'` after each batch. The number of finished molecules is recorded in a checkpoint file
+        `sdf_path + '.checkpoint.json'`. If the conversion is interrupted, a new call with :obj:`resume` continues
+        after the last completed batch, if the smiles and conversion options are the same. When finished, the
+        temporary file is moved to :obj:`sdf_path`.
+
         Args:
-            smiles_path:
-            sdf_path:
-            external_program:
-            num_workers:
-            sanitize:
-            add_hydrogen:
-            make_conformers:
-            optimize_conformer:
-            logger:
-            batch_size:
+            smiles_path (str): File path of the smiles file.
+            sdf_path (str): File path of the output SDF file. If None, no file is written.
+            external_program (dict): External program for conversion. Default is None.
+            num_workers (int): Number of parallel workers. Default is None, which uses the number of CPUs.
+            sanitize (bool): Whether to sanitize molecule. Default is True.
+            add_hydrogen (bool): Whether to add hydrogen. Default is True.
+            make_conformers (bool): Whether to make conformers. Default is True.
+            optimize_conformer (bool): Whether to optimize conformer via force field. Default is True.
+            logger: Logger to report progress. Default is None.
+            batch_size (int): Number of smiles per batch, after which results are written to file. Default is 5000.
+            parallel_backend (str): Either 'thread' or 'process'. RDKit holds the GIL for most of conformer
+                generation, so that only processes run in parallel. Default is 'thread'.
+            timeout (float): Timeout in seconds for converting a single smile. Molecules that exceed the timeout
+                are `None`. Requires `parallel_backend='process'`. Default is None.
+            resume (bool): Whether to resume an interrupted conversion from its checkpoint. Default is True.
+            return_mol_list (bool): Whether to keep and return all mol-strings. Default is True.
 
         Returns:
-            list: List of mol-strings.
+            list: List of mol-strings or None if not :obj:`return_mol_list`.
         """
         # Default via python packages RDkit and OpenBabel.
         if external_program is None:
             smiles_list = read_smiles_file(smiles_path)
-            mol_list = []
-            for i in range(0, len(smiles_list), batch_size):
+            conversion_args = (sanitize, add_hydrogen, make_conformers, optimize_conformer)
+            mol_list = [] if return_mol_list else None
+            start, num_converted = 0, 0
+            temp_path = sdf_path + ".part" if sdf_path is not None else None
+            checkpoint_path = sdf_path + ".checkpoint.json" if sdf_path is not None else None
+            fingerprint = hashlib.sha256(json.dumps([smiles_list, conversion_args]).encode("utf-8")).hexdigest()
+
+            if sdf_path is not None:
+                checkpoint = self._read_checkpoint(checkpoint_path) if resume else None
+                if checkpoint is not None and checkpoint["fingerprint"] == fingerprint and os.path.exists(temp_path):
+                    # Drop results of a batch that was not completed.
+                    with open(temp_path, "r+") as f:
+                        f.truncate(checkpoint["file_size"])
+                    start = num_converted = checkpoint["num_converted"]
+                    if return_mol_list:
+                        mol_list = [x if x != _FAILED_MOL_BLOCK else None for x in read_mol_list_from_sdf_file(
+                            temp_path)]
+                    if logger is not None:
+                        logger.info("Resume conversion of molecules from %s." % start)
+                else:
+                    open(temp_path, "w").close()
+
+            for i in range(start, len(smiles_list), batch_size):
                 mg = self._convert_parallel(
                     self._single_smile_to_mol, smiles_list[i:i + batch_size], num_workers,
                     # All args for _single_smile_to_mol.
-                    sanitize, add_hydrogen, make_conformers, optimize_conformer
+                    *conversion_args,
+                    parallel_backend=parallel_backend, timeout=timeout
                 )
-                mol_list = mol_list + mg
+                num_converted += len(mg)
+                if mol_list is not None:
+                    mol_list.extend(mg)
+                if sdf_path is not None:
+                    file_size = append_mol_block_list_to_sdf(mg, temp_path)
+                    self._write_checkpoint(checkpoint_path, {
+                        "fingerprint": fingerprint, "num_converted": num_converted, "file_size": file_size})
                 if logger is not None:
                     logger.info(" ... converted molecules {0} from {1}".format(i + len(mg), len(smiles_list)))
             # Check success
-            self._check_is_same_length(smiles_list, mol_list)
+            self._check_is_same_length(smiles_list, range(num_converted))
             if sdf_path is not None:
-                write_mol_block_list_to_sdf(mol_list, sdf_path)
+                os.replace(temp_path, sdf_path)
+                os.remove(checkpoint_path)
             return mol_list
 
         # External programs
@@ -257,6 +415,24 @@ class MolConverter:
         self._check_is_same_length(smiles_list, mol_list)
         return mol_list
 
+    @staticmethod
+    def _read_checkpoint(checkpoint_path: str):
+        if not os.path.exists(checkpoint_path):
+            return None
+        try:
+            with open(checkpoint_path, "r") as f:
+                return json.load(f)
+        except ValueError:
+            module_logger.warning("Can not read checkpoint '%s', starting conversion from beginning." % checkpoint_path)
+            return None
+
+    @staticmethod
+    def _write_checkpoint(checkpoint_path: str, checkpoint: dict):
+        # Write to temporary file first, so that the checkpoint is never incomplete.
+        with open(checkpoint_path + ".tmp", "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(checkpoint_path + ".tmp", checkpoint_path)
+
     def xyz_to_mol(self, xyz_path: str, sdf_path: str):
         """Convert xyz info to structure file.
 
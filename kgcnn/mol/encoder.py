@@ -1,4 +1,5 @@
 import logging
+import numpy as np
 
 # Module logger
 logging.basicConfig()
@@ -13,6 +14,8 @@ class OneHotEncoder:
     The translated values must support :obj:``__eq__`` operator.
     The list of possible values must be set beforehand. Is used as a basic encoder example for
     :obj:``MolecularGraphRDKit``. There can not be different dtypes in categories.
+    Each distinct value is compared to the categories only once and lists of values can be encoded into an array
+    with :obj:`encode_array`.
     """
 
     _dtype_translate = {"int": int, "float": float, "str": str, "bool": bool}
@@ -33,6 +36,40 @@ class OneHotEncoder:
         self.categories = [self.dtype(x) for x in categories]
         self.found_values = []
         self.add_unknown = add_unknown
+        # Encoded rows and the index of the row for each value that has been encoded before.
+        self._rows = []
+        self._row_index = {}
+        self._table = np.zeros((0, len(self.categories) + int(self.add_unknown)), dtype="float32")
+
+    def _encode_value(self, value) -> list:
+        encoded_list = [1 if x == self.dtype(value) else 0 for x in self.categories]
+        if self.add_unknown:
+            if value not in self.categories:
+                encoded_list += [1]
+            else:
+                encoded_list += [0]
+        return encoded_list
+
+    def _get_row_index(self, value) -> int:
+        # Values are keyed together with their type, since e.g. `True` and `1` are equal but can be cast differently.
+        try:
+            key = (value.__class__, value)
+            return self._row_index[key]
+        except KeyError:
+            pass
+        except TypeError:
+            key = None
+        if value not in self.found_values:
+            self.found_values += [value]
+        encoded_list = self._encode_value(value)
+        if encoded_list in self._rows:
+            index = self._rows.index(encoded_list)
+        else:
+            index = len(self._rows)
+            self._rows.append(encoded_list)
+        if key is not None:
+            self._row_index[key] = index
+        return index
 
     def __call__(self, value):
         r"""Encode a single feature or value, mapping it to a one-hot python list. E.g. `[0, 0, 1, 0]`
@@ -43,15 +80,25 @@ class OneHotEncoder:
         Returns:
             list: Python List with 1 at value match. E.g. `[0, 0, 1, 0]`
         """
-        encoded_list = [1 if x == self.dtype(value) else 0 for x in self.categories]
-        if self.add_unknown:
-            if value not in self.categories:
-                encoded_list += [1]
-            else:
-                encoded_list += [0]
-        if value not in self.found_values:
-            self.found_values += [value]
-        return encoded_list
+        return list(self._rows[self._get_row_index(value)])
+
+    def encode_array(self, values: list) -> np.ndarray:
+        r"""Encode a list of values at once. Each distinct value is compared to the categories only once and
+        encoded values are taken from a lookup table of the one-hot rows.
+
+        Args:
+            values (list): List of values that can be compared to items in ``self.categories``.
+
+        Returns:
+            np.ndarray: Float32 array of shape `(len(values), num_categories)` with the encoded values.
+        """
+        try:
+            indices = [self._row_index[(x.__class__, x)] for x in values]
+        except (KeyError, TypeError):
+            indices = [self._get_row_index(x) for x in values]
+        if len(self._table) != len(self._rows):
+            self._table = np.array(self._rows, dtype="float32").reshape((len(self._rows), self._table.shape[1]))
+        return self._table[np.array(indices, dtype="int64")]
 
     def get_config(self):
         config = {"categories": self.categories, "add_unknown": self.add_unknown, "dtype": self.dtype_identifier}
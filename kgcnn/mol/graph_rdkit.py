@@ -18,6 +18,73 @@ module_logger = logging.getLogger(__name__)
 module_logger.setLevel(logging.INFO)
 
 
+class AttributeTable:
+    r"""Featurization plan for atoms or bonds, which resolves the properties and encoders once for all molecules.
+
+    Properties are extracted as lists of raw values for all atoms or bonds of a molecule at once. Encoders with a
+    method :obj:`encode_array`, like :obj:`OneHotEncoder`, encode the list of values by a lookup table in numpy.
+    Other encoders and callable properties are applied to each atom or bond. The attributes of a molecule are
+    returned as float32 array of shape `(N, F)`, which is the same as :obj:`node_attributes` or
+    :obj:`edge_attributes` of :obj:`MolecularGraphRDKit` cast to float32.
+
+    .. code-block:: python
+
+        from kgcnn.mol.graph_rdkit import MolecularGraphRDKit
+        from kgcnn.mol.encoder import OneHotEncoder
+        table = MolecularGraphRDKit.node_attribute_table(
+            ["Symbol", "TotalDegree"], {"Symbol": OneHotEncoder(["C", "O"], dtype="str")})
+        mg = MolecularGraphRDKit().from_smiles("CCO")
+        mg.node_attributes_array(table)
+
+    """
+
+    def __init__(self, properties: list, encoder: dict, fun_dict: dict, attribute_name: str):
+        r"""Initialize :obj:`AttributeTable`.
+
+        Args:
+            properties (list): List of string identifiers of properties in :obj:`fun_dict` or callable objects that
+                receive an `RDkit` atom or bond and return list or value.
+            encoder (dict): A dictionary of optional encoders for each string identifier.
+            fun_dict (dict): Dictionary of functions for each string identifier.
+            attribute_name (str): A name for the properties, e.g. "Atom" or "Bond".
+        """
+        properties = MolGraphInterface._check_properties_list(properties, sorted(fun_dict.keys()), attribute_name)
+        encoder = MolGraphInterface._check_encoder(encoder, sorted(fun_dict.keys()))
+        # List of (property function, encoder, whether the encoder takes a list of values).
+        self._columns = []
+        for k in properties:
+            if isinstance(k, str):
+                enc = encoder.get(k, None)
+                self._columns.append((fun_dict[k], enc, hasattr(enc, "encode_array")))
+            else:
+                self._columns.append((k, None, False))
+
+    def __call__(self, items: list) -> np.ndarray:
+        r"""Compute attributes for a list of atoms or bonds.
+
+        Args:
+            items (list): List of `RDkit` atoms or bonds.
+
+        Returns:
+            np.ndarray: Attributes of shape `(N, F)`.
+        """
+        num_items = len(items)
+        if num_items == 0:
+            return np.array([], dtype="float32")
+        columns = []
+        for fun, enc, is_array_encoder in self._columns:
+            values = list(map(fun, items))
+            if is_array_encoder:
+                columns.append(enc.encode_array(values))
+                continue
+            if enc is not None:
+                values = [enc(x) for x in values]
+            columns.append(np.array(values, dtype="float32").reshape((num_items, -1)))
+        if len(columns) == 0:
+            return np.zeros((num_items, 0), dtype="float32")
+        return np.concatenate(columns, axis=-1)
+
+
 class MolecularGraphRDKit(MolGraphInterface):
     r"""A graph object representing a strict molecular graph, e.g. only chemical bonds using a mol-object from
     :obj:`rdkit` chemical informatics package.
@@ -405,6 +472,71 @@ class MolecularGraphRDKit(MolGraphInterface):
             atom_info.append(attr)
         return atom_info
 
+    @classmethod
+    def node_attribute_table(cls, properties: list, encoder: dict) -> AttributeTable:
+        r"""Make an :obj:`AttributeTable` for :obj:`node_attributes_array`, which can be reused for all molecules.
+
+        Args:
+            properties (list): List of string identifiers for properties to retrieve from atoms, or
+                a callable object that receives `RDkit` atom class and returns list or value.
+            encoder (dict): A dictionary of optional encoders for each string identifier.
+
+        Returns:
+            AttributeTable: Featurization plan for atoms.
+        """
+        return AttributeTable(properties, encoder, cls.atom_fun_dict, "Atom")
+
+    @classmethod
+    def edge_attribute_table(cls, properties: list, encoder: dict) -> AttributeTable:
+        r"""Make an :obj:`AttributeTable` for :obj:`edge_attributes_array`, which can be reused for all molecules.
+
+        Args:
+            properties (list): List of identifiers for properties to retrieve from bonds, or
+                a callable object that receives `RDkit` bond class and returns list or value.
+            encoder (dict): A dictionary of optional encoders for each string identifier.
+
+        Returns:
+            AttributeTable: Featurization plan for bonds.
+        """
+        return AttributeTable(properties, encoder, cls.bond_fun_dict, "Bond")
+
+    def node_attributes_array(self, table: AttributeTable) -> np.ndarray:
+        r"""Return node or atom attributes as array like :obj:`node_attributes` but with a precompiled
+        :obj:`AttributeTable` from :obj:`node_attribute_table`.
+
+        Args:
+            table (AttributeTable): Featurization plan for atoms.
+
+        Returns:
+            np.ndarray: Float32 array of atomic properties.
+        """
+        m = self.mol
+        return table([m.GetAtomWithIdx(i) for i in range(m.GetNumAtoms())])
+
+    def edge_attributes_array(self, table: AttributeTable) -> tuple:
+        r"""Return edge or bond attributes together with bond indices like :obj:`edge_attributes` but as arrays and
+        with a precompiled :obj:`AttributeTable` from :obj:`edge_attribute_table`.
+
+        Args:
+            table (AttributeTable): Featurization plan for bonds.
+
+        Returns:
+            tuple: Indices, Attributes.
+        """
+        m = self.mol
+        bonds = [m.GetBondWithIdx(i) for i in range(m.GetNumBonds())]
+        bond_info = table(bonds)
+        bond_idx = np.array([[x.GetEndAtomIdx(), x.GetBeginAtomIdx()] for x in bonds], dtype="int64")
+        if len(bonds) == 0:
+            return bond_idx, bond_info
+        if not self._make_directed:
+            # Add a bond with opposite direction but same properties after each bond.
+            bond_idx = np.stack([bond_idx, bond_idx[:, ::-1]], axis=1).reshape((-1, 2))
+            bond_info = np.repeat(bond_info, 2, axis=0)
+        # Sort directed bonds, same as stable sort by second and then by first index in `_sort_bonds`.
+        order = np.lexsort((bond_idx[:, 1], bond_idx[:, 0]))
+        return bond_idx[order], bond_info[order]
+
     def graph_attributes(self, properties: list, encoder: dict):
         r"""Return graph or molecular attributes.
 
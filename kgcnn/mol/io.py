@@ -1,4 +1,9 @@
+import os
+import re
+import mmap
 import logging
+import numpy as np
+from collections.abc import Sequence
 
 
 def parse_list_to_xyz_str(mol: list, comment: str = ""):
@@ -99,7 +104,7 @@ def parse_mol_str(mol_str: str):
     return [title, program, comment, counts, atoms, bonds, properties]
 
 
-def read_xyz_file(file_path, delimiter: str = None, line_by_line=False):
+def read_xyz_file(file_path, delimiter: str = None, line_by_line=False, lazy: bool = False):
     """Simple python script to read xyz-file and parse into a nested python list. Always returns a list with
     the geometries in xyz file.
 
@@ -107,19 +112,27 @@ def read_xyz_file(file_path, delimiter: str = None, line_by_line=False):
         file_path (str): Full path to xyz-file.
         delimiter (str): Delimiter for xyz separation. Default is ' '.
         line_by_line (bool): Whether to read XYZ file line by line.
+        lazy (bool): Whether to return an :obj:`IndexedMolFile` that parses geometries on access instead of a list.
+            Default is False.
 
     Returns:
         list: Nested coordinates from xyz-file.
     """
-    mol_list = []
-    comment_list = []
+    if lazy:
+        return IndexedMolFile(file_path, file_format="xyz", delimiter=delimiter)
     # open file
-    infile = open(file_path, "r")
-    if line_by_line:
-        lines = infile  # File object
-    else:
-        lines = infile.readlines()  # list of lines
+    with open(file_path, "r") as infile:
+        if line_by_line:
+            lines = infile  # File object
+        else:
+            lines = infile.readlines()  # list of lines
+        return _parse_xyz_lines(lines, delimiter=delimiter)
 
+
+def _parse_xyz_lines(lines, delimiter: str = None) -> list:
+    """Parse lines of a xyz-file into a list of `[atoms, coordinates]` for each geometry."""
+    mol_list = []
+    comment_list = []
     num = 0
     comment = 0
     atoms = []
@@ -151,11 +164,12 @@ def read_xyz_file(file_path, delimiter: str = None, line_by_line=False):
                 num = num - 1
         else:
             logging.warning("Empty line in xyz file for mismatch in atom count found.")
-    # close file
-    infile.close()
     return mol_list
 
 
+_FAILED_MOL_BLOCK = "".join(["\n", "     FAIL\n", "\n", "  0  0  0  0  0  0  0  0  0  0 V2000\n", "M  END\n"])
+
+
 def write_mol_block_list_to_sdf(mol_block_list, filepath):
     """Write a list of mol blocks as string into a SDF file.
 
@@ -173,25 +187,45 @@ def write_mol_block_list_to_sdf(mol_block_list, filepath):
                 if i < len(mol_block_list) - 1:
                     file.write("$$$$\n")
             else:
-                file.write("".join(["\n",
-                                    "     FAIL\n",
-                                    "\n",
-                                    "  0  0  0  0  0  0  0  0  0  0 V2000\n",
-                                    "M  END\n"]))
+                file.write(_FAILED_MOL_BLOCK)
                 if i < len(mol_block_list) - 1:
                     file.write("$$$$\n")
 
 
-def read_mol_list_from_sdf_file(filepath, line_by_line=False):
+def append_mol_block_list_to_sdf(mol_block_list, filepath):
+    """Append a list of mol blocks as string to a SDF file. Each mol block is terminated by '$$$$' so that the
+    file can be extended in batches. Failed mol blocks given as `None` are written as empty molecule.
+
+    Args:
+        mol_block_list (list): List of mol blocks as string.
+        filepath (str): File path for SDF file.
+
+    Returns:
+        int: Size of the file in bytes after writing.
+    """
+    with open(filepath, "a") as file:
+        for mol_block in mol_block_list:
+            file.write(mol_block if mol_block is not None else _FAILED_MOL_BLOCK)
+            file.write("$$$$\n")
+        file.flush()
+        os.fsync(file.fileno())
+        return file.tell()
+
+
+def read_mol_list_from_sdf_file(filepath, line_by_line=False, lazy: bool = False):
     """Simple loader to load a SDF file by only splitting.
 
     Args:
         filepath (str): File path for SDF file.
         line_by_line (bool): Whether to read SDF file line by line.
+        lazy (bool): Whether to return an :obj:`IndexedMolFile` that reads mol blocks on access instead of a list.
+            Default is False.
 
     Returns:
         list: List of mol blocks as string.
     """
+    if lazy:
+        return IndexedMolFile(filepath, file_format="sdf")
     mol_list = []
     with open(filepath, "r") as f:
         if not line_by_line:
@@ -244,3 +278,158 @@ def write_smiles_file(file_path, smile_list):
                 f.write(x)
             else:
                 f.write(x + "\n")
+
+
+class IndexedMolFile(Sequence):
+    r"""Read-only list of the mol blocks of a SDF file or the geometries of a XYZ file, which are read on access.
+
+    The byte offsets of all molecules are found once by streaming through the file and are saved next to the file as
+    '.index.npz', which is reused as long as size and modification time of the file do not change. Molecules are then
+    read from a memory-map of the file, so that iterating or indexing does not need to keep the file content in
+    memory. Items are the same as for :obj:`read_mol_list_from_sdf_file` or :obj:`read_xyz_file`.
+
+    .. code-block:: python
+
+        from kgcnn.mol.io import IndexedMolFile
+        mol_list = IndexedMolFile("molecules.sdf")
+        print(len(mol_list), mol_list[10])
+        for mol_block in mol_list[100:200]:
+            pass
+
+    """
+
+    _sdf_separator = re.compile(rb"\$\$\$\$\r?\n")
+
+    def __init__(self, file_path: str, file_format: str = None, index_path: str = None, delimiter: str = None,
+                 overwrite_index: bool = False):
+        r"""Initialize with file and load or build its index.
+
+        Args:
+            file_path (str): File path of SDF or XYZ file.
+            file_format (str): Either 'sdf' or 'xyz'. Default is None, which takes the file extension.
+            index_path (str): File path of the index. Default is None, which appends '.index.npz' to file path.
+            delimiter (str): Delimiter for xyz separation. Default is None.
+            overwrite_index (bool): Whether to build the index again. Default is False.
+        """
+        self._file = None
+        self._mmap = None
+        self.file_path = file_path
+        self.file_format = file_format if file_format is not None else os.path.splitext(file_path)[1][1:].lower()
+        if self.file_format not in ["sdf", "xyz"]:
+            raise ValueError("Unsupported format '%s' for `IndexedMolFile`. Use 'sdf' or 'xyz'." % self.file_format)
+        self.index_path = index_path if index_path is not None else file_path + ".index.npz"
+        self.delimiter = delimiter
+        self.blocks = None if overwrite_index else self._load_index()
+        if self.blocks is None:
+            self.blocks = self._build_index()
+            self._save_index()
+
+    def _file_stat(self):
+        stat = os.stat(self.file_path)
+        return np.array([stat.st_size, stat.st_mtime_ns], dtype="int64")
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return None
+        try:
+            with np.load(self.index_path) as index:
+                if np.array_equal(index["file_stat"], self._file_stat()):
+                    return index["blocks"]
+        except (OSError, KeyError, ValueError):
+            logging.warning("Can not read index file '%s'. Build index again." % self.index_path)
+        return None
+
+    def _save_index(self):
+        try:
+            with open(self.index_path, "wb") as f:
+                np.savez(f, blocks=self.blocks, file_stat=self._file_stat())
+        except OSError:
+            logging.warning("Can not save index file '%s'. Index is kept in memory only." % self.index_path)
+
+    def _build_index(self) -> np.ndarray:
+        """Find start and end byte offsets of all molecules in the file of shape `(M, 2)`."""
+        if self.file_format == "sdf":
+            blocks = self._build_sdf_index()
+        else:
+            blocks = self._build_xyz_index()
+        return np.array(blocks, dtype="int64").reshape((-1, 2))
+
+    def _build_sdf_index(self) -> list:
+        file_size = os.path.getsize(self.file_path)
+        if file_size == 0:
+            return []
+        blocks = []
+        start = 0
+        with open(self.file_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for match in self._sdf_separator.finditer(mm):
+                    blocks.append([start, match.start()])
+                    start = match.end()
+        # Like splitting the file content, text after the last '$$$$' is a mol block if not empty.
+        if start < file_size:
+            blocks.append([start, file_size])
+        return blocks
+
+    def _build_xyz_index(self) -> list:
+        # Same state machine as `_parse_xyz_lines` but only keeping track of the position of geometries.
+        blocks = []
+        position, start, num, comment = 0, 0, 0, 0
+        with open(self.file_path, "rb") as f:
+            for line in f:
+                line_list = [x for x in line.strip().split(
+                    self.delimiter.encode() if self.delimiter is not None else None) if x != b""]
+                if len(line_list) == 1 and num == 0 and comment == 0:
+                    num = int(line_list[0])
+                    comment = 1
+                    start = position
+                elif comment > 0:
+                    comment = 0
+                elif num > 0:
+                    num = num - 1
+                    if num == 0:
+                        blocks.append([start, position + len(line)])
+                position += len(line)
+        return blocks
+
+    def _get_mmap(self):
+        if self._mmap is None:
+            self._file = open(self.file_path, "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def _read_block(self, index: int):
+        start, end = self.blocks[index]
+        text = self._get_mmap()[start:end].decode("utf-8")
+        # Same as reading with universal newlines.
+        text = text.replace("\r\n", "\n")
+        if self.file_format == "sdf":
+            return text
+        return _parse_xyz_lines(text.splitlines(keepends=True), delimiter=self.delimiter)[0]
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._read_block(i) for i in range(*item.indices(len(self)))]
+        return self._read_block(item)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._read_block(i)
+
+    def close(self):
+        """Close memory-map and file."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+        self._mmap, self._file = None, None
+
+    def __getstate__(self):
+        # Memory-map is opened again on access, for example in worker processes.
+        state = self.__dict__.copy()
+        state.update({"_mmap": None, "_file": None})
+        return state
+
+    def __del__(self):
+        self.close()
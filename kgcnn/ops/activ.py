@@ -12,7 +12,7 @@ def shifted_softplus(x):
     Returns:
         tf.Tensor: Output tensor computed as :math:`\log(e^{x}+1) - \log(2)`.
     """
-    return ks.activations.softplus(x) - ks.backend.log(2.0)
+    return ks.activations.softplus(x) - tf.cast(tf.math.log(2.0), dtype=x.dtype)
 
 
 @tf.keras.utils.register_keras_serializable(package='kgcnn', name='softplus2')
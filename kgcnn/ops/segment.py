@@ -1,9 +1,25 @@
 import tensorflow as tf
 
 
+def cast_to_accumulation_dtype(data):
+    """Cast half precision data to float32, in which sums over segments are accumulated for mixed precision.
+    Other data types are not changed.
+
+    Args:
+        data (tf.Tensor): Data tensor.
+
+    Returns:
+        tf.Tensor: Data tensor of dtype float32 if data was float16 or bfloat16.
+    """
+    if data.dtype in [tf.float16, tf.bfloat16]:
+        return tf.cast(data, dtype=tf.float32)
+    return data
+
+
 @tf.function
 def segment_softmax(data, segment_ids, normalize: bool = True):
     """Segment softmax similar to segment_max but with a softmax function.
+    Half precision data is computed in float32.
 
     Args:
         data (tf.Tensor): Data tensor that has sorted segments.
@@ -13,6 +29,8 @@ def segment_softmax(data, segment_ids, normalize: bool = True):
     Returns:
         tf.Tensor: reduced segment data with a softmax function.
     """
+    dtype = data.dtype
+    data = cast_to_accumulation_dtype(data)
     if normalize:
         data_segment_max = tf.math.segment_max(data, segment_ids)
         data_max = tf.gather(data_segment_max, segment_ids)
@@ -21,12 +39,12 @@ def segment_softmax(data, segment_ids, normalize: bool = True):
     data_exp = tf.math.exp(data)
     data_exp_segment_sum = tf.math.segment_sum(data_exp, segment_ids)
     data_exp_sum = tf.gather(data_exp_segment_sum, segment_ids)
-    return data_exp / data_exp_sum
+    return tf.cast(data_exp / data_exp_sum, dtype=dtype)
 
 
 @tf.function
 def segment_ops_by_name(segment_name: str, data, segment_ids):
-    """Segment operation chosen by string identifier.
+    """Segment operation chosen by string identifier. Sum and mean of half precision data are accumulated in float32.
 
     Args:
         segment_name (str): Name of the segment operation.
@@ -37,9 +55,9 @@ def segment_ops_by_name(segment_name: str, data, segment_ids):
         tf.Tensor: reduced segment data with method by segment_name.
     """
     if segment_name in ["segment_mean", "mean", "reduce_mean"]:
-        pool = tf.math.segment_mean(data, segment_ids)
+        pool = tf.cast(tf.math.segment_mean(cast_to_accumulation_dtype(data), segment_ids), dtype=data.dtype)
     elif segment_name in ["segment_sum", "sum", "reduce_sum"]:
-        pool = tf.math.segment_sum(data, segment_ids)
+        pool = tf.cast(tf.math.segment_sum(cast_to_accumulation_dtype(data), segment_ids), dtype=data.dtype)
     elif segment_name in ["segment_max", "max", "reduce_max"]:
         pool = tf.math.segment_max(data, segment_ids)
     elif segment_name in ["segment_min", "min", "reduce_min"]:
@@ -50,3 +68,62 @@ def segment_ops_by_name(segment_name: str, data, segment_ids):
     else:
         raise TypeError("Unknown segment operation, choose: 'segment_mean', 'segment_sum', ...")
     return pool
+
+
+@tf.function
+def unsorted_segment_ops_by_name(segment_name: str, data, segment_ids, num_segments):
+    """Unsorted segment operation chosen by string identifier. Segment IDs do not have to be sorted and the output
+    always has :obj:`num_segments` entries. Empty segments are filled with zeros like for sorted segment operations.
+    Sum and mean of half precision data are accumulated in float32.
+
+    Args:
+        segment_name (str): Name of the segment operation.
+        data (tf.Tensor): Data tensor.
+        segment_ids (tf.Tensor): IDs of the segments, not necessarily sorted.
+        num_segments: Number of segments.
+
+    Returns:
+        tf.Tensor: reduced segment data with method by segment_name.
+    """
+    if segment_name in ["segment_mean", "mean", "reduce_mean"]:
+        pool = tf.cast(tf.math.unsorted_segment_mean(cast_to_accumulation_dtype(data), segment_ids, num_segments),
+                       dtype=data.dtype)
+    elif segment_name in ["segment_sum", "sum", "reduce_sum"]:
+        pool = tf.cast(tf.math.unsorted_segment_sum(cast_to_accumulation_dtype(data), segment_ids, num_segments),
+                       dtype=data.dtype)
+    elif segment_name in ["segment_max", "max", "reduce_max", "segment_min", "min", "reduce_min"]:
+        if segment_name in ["segment_max", "max", "reduce_max"]:
+            pool = tf.math.unsorted_segment_max(data, segment_ids, num_segments)
+        else:
+            pool = tf.math.unsorted_segment_min(data, segment_ids, num_segments)
+        # Unsorted max or min fill empty segments with lowest or highest value of dtype.
+        is_filled = tf.math.unsorted_segment_max(tf.ones_like(segment_ids), segment_ids, num_segments) > 0
+        is_filled = tf.reshape(is_filled, tf.concat([tf.shape(is_filled), tf.ones_like(tf.shape(pool)[1:])], axis=0))
+        pool = tf.where(is_filled, pool, tf.zeros_like(pool))
+    else:
+        raise TypeError("Unknown segment operation, choose: 'segment_mean', 'segment_sum', ...")
+    return pool
+
+
+def pool_segments_by_name(segment_name: str, data, segment_ids, num_segments, is_sorted: bool = False):
+    """Segment operation chosen by string identifier with an output of :obj:`num_segments` entries.
+    Uses sorted segment operations if :obj:`is_sorted` and unsorted segment operations otherwise.
+    Segments that have no data are filled with zeros.
+
+    Args:
+        segment_name (str): Name of the segment operation.
+        data (tf.Tensor): Data tensor.
+        segment_ids (tf.Tensor): IDs of the segments. Must be sorted if :obj:`is_sorted`.
+        num_segments: Number of segments.
+        is_sorted (bool): Whether segment IDs are sorted. Default is False.
+
+    Returns:
+        tf.Tensor: reduced segment data with method by segment_name.
+    """
+    if not is_sorted:
+        return unsorted_segment_ops_by_name(segment_name, data, segment_ids, num_segments)
+    pool = segment_ops_by_name(segment_name, data, segment_ids)
+    # Segments after the last segment ID are empty.
+    padding = tf.concat([[[0, num_segments - tf.shape(pool)[0]]], tf.zeros([tf.rank(pool) - 1, 2], dtype="int32")],
+                        axis=0)
+    return tf.pad(pool, padding)
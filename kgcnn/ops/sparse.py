@@ -0,0 +1,65 @@
+import tensorflow as tf
+
+
+def sparse_edge_matmul(indices_a, values_a, indices_b, values_b, num_nodes):
+    r"""Product :math:`C = A B` of two sparse square matrices given as edge lists, with
+    :math:`C_{ik} = \sum_j A_{ij} B_{jk}`.
+
+    Entries of :math:`A` with column :math:`j` are joined with the entries of :math:`B` in row :math:`j`, which are
+    contiguous after sorting :math:`B` by row. Products that fall on the same entry of :math:`C` are summed up.
+    Memory scales with the number of paths :math:`i \rightarrow j \rightarrow k` and never with :math:`N^2`.
+    The operation is differentiable with respect to the values.
+
+    .. code-block:: python
+
+        import tensorflow as tf
+        from kgcnn.ops.sparse import sparse_edge_matmul
+        indices = tf.constant([[0, 1], [1, 0], [1, 2], [2, 1]], dtype="int64")
+        values = tf.ones((4, 1))
+        print(sparse_edge_matmul(indices, values, indices, values, 3))
+        # indices [[0, 0], [0, 2], [1, 1], [2, 0], [2, 2]] and values [[1.], [1.], [2.], [1.], [1.]]
+
+    Args:
+        indices_a (tf.Tensor): Indices of entries of :math:`A` of shape `(M, 2)`.
+        values_a (tf.Tensor): Values of entries of :math:`A` of shape `(M, ...)`.
+        indices_b (tf.Tensor): Indices of entries of :math:`B` of shape `(L, 2)`.
+        values_b (tf.Tensor): Values of entries of :math:`B` of shape `(L, ...)`.
+        num_nodes: Number of rows of the square matrices :math:`N`.
+
+    Returns:
+        tuple: [indices, values]
+
+            - indices (tf.Tensor): Indices of entries of :math:`C` of shape `(K, 2)` sorted by row then column.
+            - values (tf.Tensor): Values of entries of :math:`C` of shape `(K, ...)`.
+    """
+    indices_a = tf.cast(indices_a, dtype="int64")
+    indices_b = tf.cast(indices_b, dtype="int64")
+    num_nodes = tf.cast(num_nodes, dtype="int64")
+
+    # Sort B by row and compute row splits.
+    order_b = tf.argsort(indices_b[:, 0], stable=True)
+    indices_b = tf.gather(indices_b, order_b)
+    values_b = tf.gather(values_b, order_b)
+    row_lengths_b = tf.math.unsorted_segment_sum(tf.ones_like(indices_b[:, 0]), indices_b[:, 0], num_nodes)
+    row_splits_b = tf.pad(tf.cumsum(row_lengths_b), [[1, 0]])
+
+    # Expand each entry of A with column j by the entries of row j of B.
+    starts = tf.gather(row_splits_b, indices_a[:, 1])
+    counts = tf.gather(row_lengths_b, indices_a[:, 1])
+    pos_a = tf.repeat(tf.range(tf.shape(indices_a, out_type="int64")[0]), counts)
+    offsets = tf.repeat(tf.cumsum(counts, exclusive=True) - starts, counts)
+    pos_b = tf.range(tf.reduce_sum(counts), dtype="int64") - offsets
+
+    rows = tf.gather(indices_a[:, 0], pos_a)
+    cols = tf.gather(indices_b[:, 1], pos_b)
+    products = tf.gather(values_a, pos_a) * tf.gather(values_b, pos_b)
+
+    # Sum up products for the same entry. Keys are sorted to have entries ordered by row then column.
+    keys = rows * num_nodes + cols
+    order = tf.argsort(keys, stable=True)
+    keys = tf.gather(keys, order)
+    products = tf.gather(products, order)
+    unique_keys, segment_ids = tf.unique(keys, out_idx="int64")
+    values = tf.math.segment_sum(products, segment_ids)
+    indices = tf.stack([unique_keys // num_nodes, unique_keys % num_nodes], axis=-1)
+    return indices, values
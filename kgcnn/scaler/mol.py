@@ -1,18 +1,76 @@
 import matplotlib.pyplot as plt
 import numpy as np
+import scipy.sparse as sp
 import os
+import hashlib
 from typing import Union
 from sklearn.linear_model import Ridge
 from kgcnn.scaler.scaler import StandardScaler
 from kgcnn.data.utils import save_json_file, load_json_file
 
 
+def _concatenate_atomic_number(atomic_number: list) -> tuple:
+    """Number of atoms of each molecule and the concatenated atomic numbers of all molecules."""
+    num_atoms = np.fromiter(map(len, atomic_number), dtype="int64", count=len(atomic_number))
+    if np.sum(num_atoms) > 0:
+        atoms = np.concatenate(atomic_number, axis=0).astype("int64")
+    else:
+        atoms = np.zeros(0, dtype="int64")
+    return num_atoms, atoms
+
+
+def _composition_from_atoms(num_atoms: np.ndarray, atoms: np.ndarray, max_atomic_number: int) -> sp.csr_matrix:
+    mol_id = np.repeat(np.arange(len(num_atoms)), num_atoms)
+    # Duplicate entries are summed on conversion to CSR.
+    return sp.coo_matrix((np.ones(len(atoms)), (mol_id, atoms)),
+                         shape=(len(num_atoms), max_atomic_number)).tocsr()
+
+
+def get_atomic_number_composition(atomic_number: list, max_atomic_number: int = 95) -> sp.csr_matrix:
+    r"""Get the number of atoms of each element for a list of molecules as sparse matrix.
+
+    The matrix is built at once from the concatenated atomic numbers and the index of the molecule of each atom.
+
+    Args:
+        atomic_number (list): List of arrays of atomic numbers. Example [np.array([7,1,1,1]), ...].
+        max_atomic_number (int): Number of columns of the matrix, which must be larger than all atomic numbers.
+
+    Returns:
+        sp.csr_matrix: Element counts of shape `(n_samples, max_atomic_number)`.
+    """
+    num_atoms, atoms = _concatenate_atomic_number(atomic_number)
+    return _composition_from_atoms(num_atoms, atoms, max_atomic_number)
+
+
+def _get_cached_composition(scaler, atomic_number, max_atomic_number: int = 95) -> sp.csr_matrix:
+    # Composition of the last list of atomic numbers is kept in the scaler, since the same list is usually passed to
+    # `fit`, `transform` and `inverse_transform`. It is keyed by the content of the list, which is hashed from the
+    # concatenated atomic numbers, so that a modified list is never matched. A precomputed sparse matrix is used
+    # directly.
+    if sp.issparse(atomic_number):
+        return atomic_number.tocsr()
+    num_atoms, atoms = _concatenate_atomic_number(atomic_number)
+    content_hash = hashlib.sha256(num_atoms.tobytes())
+    content_hash.update(atoms.tobytes())
+    key = (len(num_atoms), max_atomic_number, content_hash.hexdigest())
+    cache = getattr(scaler, "_composition_cache", None)
+    if cache is not None and cache[0] == key:
+        return cache[1]
+    composition = _composition_from_atoms(num_atoms, atoms, max_atomic_number)
+    scaler._composition_cache = (key, composition)
+    return composition
+
+
 class ExtensiveMolecularScaler:
     r"""Scaler for extensive properties like energy to remove a simple linear behaviour with additive atom
     contributions. Interface is designed after scikit-learn standard scaler. Internally Ridge regression ist used.
     Only the atomic number is used as extensive scaler. This could be further improved by also taking bonds and
     interactions into account, e.g. as energy contribution.
 
+    The element counts of the molecules are computed as sparse matrix by :obj:`get_atomic_number_composition`,
+    which is kept for the content of the last list of atomic numbers and reused by :obj:`fit`, :obj:`transform` and
+    :obj:`inverse_transform`. The matrix can also be passed directly as :obj:`atomic_number`.
+
     .. code-block:: python
 
         import numpy as np
@@ -52,6 +110,7 @@ class ExtensiveMolecularScaler:
         self._fit_atom_selection_mask = None
         self._fit_atom_selection = None
         self.scale_ = None
+        self._composition_cache = None
 
     def fit(self, X, *, y: Union[None, np.ndarray] = None, sample_weight=None, atomic_number=None):
         r"""Fit atomic number to the molecular properties.
@@ -66,29 +125,24 @@ class ExtensiveMolecularScaler:
             self
         """
         molecular_property = X
-        if atomic_number is None or not isinstance(atomic_number, (list, tuple, np.ndarray)):
+        if atomic_number is None or not (isinstance(atomic_number, (list, tuple, np.ndarray)) or sp.issparse(
+                atomic_number)):
             raise ValueError("Please specify kwarg 'atomic_number' for calling fit. Got '%s'." % atomic_number)
-        if len(atomic_number) != len(molecular_property):
+        composition = _get_cached_composition(self, atomic_number, self.max_atomic_number)
+        if composition.shape[0] != len(molecular_property):
             raise ValueError(
                 "`ExtensiveMolecularScaler` different input shape '{0}' vs. '{1}'.".format(
-                    len(atomic_number), len(molecular_property))
+                    composition.shape[0], len(molecular_property))
             )
 
-        unique_number = [np.unique(x, return_counts=True) for x in atomic_number]
-        all_unique = np.unique(np.concatenate([x[0] for x in unique_number], axis=0))
+        all_unique = np.flatnonzero(composition.getnnz(axis=0))
         self._fit_atom_selection = all_unique
         atom_mask = np.zeros(self.max_atomic_number, dtype="bool")
         atom_mask[all_unique] = True
         self._fit_atom_selection_mask = atom_mask
-        total_number = []
-        for unique_per_mol, num_unique in unique_number:
-            array_atoms = np.zeros(self.max_atomic_number)
-            array_atoms[unique_per_mol] = num_unique
-            positives = array_atoms[atom_mask]
-            total_number.append(positives)
-        total_number = np.array(total_number)
+        total_number = composition[:, atom_mask].toarray()
         self.ridge.fit(total_number, molecular_property, sample_weight=sample_weight)
-        diff = molecular_property - self.ridge.predict(total_number)
+        diff = molecular_property - np.reshape(self.ridge.predict(total_number), np.shape(molecular_property))
         self.scale_ = np.std(diff, axis=0)
         return self
 
@@ -103,16 +157,11 @@ class ExtensiveMolecularScaler:
         """
         if self._fit_atom_selection_mask is None:
             raise ValueError("`ExtensiveMolecularScaler` has not been fitted yet. Can not predict.")
-        unique_number = [np.unique(x, return_counts=True) for x in atomic_number]
-        total_number = []
-        for unique_per_mol, num_unique in unique_number:
-            array_atoms = np.zeros(self.max_atomic_number)
-            array_atoms[unique_per_mol] = num_unique
-            positives = array_atoms[self._fit_atom_selection_mask]
-            if np.sum(positives) != np.sum(num_unique):
-                print("`ExtensiveMolecularScaler` got unknown atom species in transform.")
-            total_number.append(positives)
-        total_number = np.array(total_number)
+        composition = _get_cached_composition(self, atomic_number, self.max_atomic_number)
+        total_number = composition[:, np.asarray(self._fit_atom_selection_mask, dtype="bool")].toarray()
+        num_unknown = np.sum(np.asarray(composition.sum(axis=1)).reshape(-1) != np.sum(total_number, axis=-1))
+        if num_unknown > 0:
+            print("`ExtensiveMolecularScaler` got unknown atom species in transform for %s molecules." % num_unknown)
         offset = self.ridge.predict(total_number)
         return offset
 
@@ -147,7 +196,7 @@ class ExtensiveMolecularScaler:
         Returns:
             np.ndarray: Transformed atomic properties fitted. Shape is `(n_samples, n_properties)`.
         """
-        return (X - self.predict(atomic_number)) / np.expand_dims(self.scale_, axis=0)
+        return (X - np.reshape(self.predict(atomic_number), np.shape(X))) / np.expand_dims(self.scale_, axis=0)
 
     def fit_transform(self, X, *, y=None, copy=None, sample_weight=None, atomic_number=None):
         """Combine fit and transform methods in one call.
@@ -164,6 +213,7 @@ class ExtensiveMolecularScaler:
         """
         if atomic_number is None:
             raise ValueError("`ExtensiveMolecularScaler` requires 'atomic_number' argument.")
+        atomic_number = _get_cached_composition(self, atomic_number, self.max_atomic_number)
         self.fit(X=X, y=y, atomic_number=atomic_number, sample_weight=sample_weight)
         return self.transform(X=X, copy=copy, atomic_number=atomic_number)
 
@@ -178,7 +228,7 @@ class ExtensiveMolecularScaler:
         Returns:
             np.ndarray: Original atomic properties. Shape is `(n_samples, n_properties)`.
         """
-        return X * np.expand_dims(self.scale_, axis=0) + self.predict(atomic_number)
+        return X * np.expand_dims(self.scale_, axis=0) + np.reshape(self.predict(atomic_number), np.shape(X))
 
     def get_config(self):
         """Get configuration for scaler."""
@@ -267,7 +317,8 @@ class QMGraphLabelScaler:
     could to be standardized differently.
 
     The class is simply a list of separate scaler and scales each target of shape [N_samples, target] with a scaler
-    from its list. This is like a scaler list class.
+    from its list. This is like a scaler list class. The element counts of the molecules are computed once by
+    :obj:`get_atomic_number_composition` and passed to all scaler.
 
     .. code-block:: python
 
@@ -315,6 +366,7 @@ class QMGraphLabelScaler:
                 self.scaler_list.append(ExtensiveMolecularScaler(**x["config"]))
             else:
                 raise ValueError("Unsupported scaler %s" % x["name"])
+        self._composition_cache = None
 
     def fit_transform(self, X, *, y=None, copy=None, sample_weight=None, atomic_number=None):
         r"""Fit and transform all target labels for QM9.
@@ -329,6 +381,7 @@ class QMGraphLabelScaler:
         Returns:
             np.ndarray: Transformed labels of shape `(N, 15)`.
         """
+        atomic_number = self._get_composition(atomic_number)
         self.fit(X=X, y=y, atomic_number=atomic_number, sample_weight=sample_weight)
         return self.transform(X=X, copy=copy, atomic_number=atomic_number)
 
@@ -344,6 +397,7 @@ class QMGraphLabelScaler:
             np.ndarray: Transformed labels of shape `(N, #labels)`.
         """
         self._check_input(atomic_number, X)
+        atomic_number = self._get_composition(atomic_number)
 
         out_labels = []
         for i, x in enumerate(self.scaler_list):
@@ -366,6 +420,7 @@ class QMGraphLabelScaler:
             self
         """
         self._check_input(atomic_number, X)
+        atomic_number = self._get_composition(atomic_number)
 
         for i, x in enumerate(self.scaler_list):
             labels = X[:, i:i + 1]
@@ -385,6 +440,7 @@ class QMGraphLabelScaler:
             np.ndarray: Back-transformed labels of shape `(N, 15)`.
         """
         self._check_input(atomic_number, X)
+        atomic_number = self._get_composition(atomic_number)
 
         out_labels = []
         for i, x in enumerate(self.scaler_list):
@@ -394,8 +450,14 @@ class QMGraphLabelScaler:
         out_labels = np.concatenate(out_labels, axis=-1)
         return out_labels
 
+    def _get_composition(self, atomic_number):
+        if not any([isinstance(x, ExtensiveMolecularScaler) for x in self.scaler_list]) or atomic_number is None:
+            return atomic_number
+        return _get_cached_composition(self, atomic_number, ExtensiveMolecularScaler.max_atomic_number)
+
     def _check_input(self, node_number, graph_labels):
-        assert len(node_number) == len(graph_labels), "`QMGraphLabelScaler` input length does not match."
+        num_samples = node_number.shape[0] if sp.issparse(node_number) else len(node_number)
+        assert num_samples == len(graph_labels), "`QMGraphLabelScaler` input length does not match."
         assert graph_labels.shape[-1] == len(self.scaler_list), "`QMGraphLabelScaler` got wrong number of labels."
 
     @property
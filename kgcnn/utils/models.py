@@ -117,6 +117,26 @@ def update_model_kwargs_logic(default_kwargs: dict = None, user_kwargs: dict = N
     return _nested_update(out, user_kwargs, update_recursive, 0)
 
 
+def cast_model_outputs_to_float32(model):
+    r"""Cast half precision outputs of a functional model to float32, which is the case for a mixed precision policy
+    of :obj:`tf.keras.mixed_precision`. Then losses and metrics are computed in float32. Models with float32 output or
+    subclassed models are returned unchanged.
+
+    Args:
+        model (tf.keras.models.Model): Keras model.
+
+    Returns:
+        :obj:`tf.keras.models.Model`
+    """
+    outputs = getattr(model, "outputs", None)
+    if not outputs or all([x.dtype not in [tf.float16, tf.bfloat16] for x in outputs]):
+        return model
+    outputs = [ks.layers.Activation("linear", dtype="float32")(x) if x.dtype in [tf.float16, tf.bfloat16] else x
+               for x in outputs]
+    return ks.models.Model(inputs=model.inputs, outputs=outputs[0] if len(outputs) == 1 else outputs,
+                           name=model.name)
+
+
 def update_model_kwargs(model_default, update_recursive=inf):
     """Decorating function for update_model_kwargs_logic() ."""
     def model_update_decorator(func):
@@ -135,7 +155,7 @@ def update_model_kwargs(model_default, update_recursive=inf):
             if len(args) > 0:
                 module_logger.error("Can only update kwargs, not %s" % args)
 
-            return func(*args, **updated_kwargs)
+            return cast_model_outputs_to_float32(func(*args, **updated_kwargs))
 
         return update_wrapper
 
@@ -2,7 +2,7 @@ import numpy as np
 import unittest
 
 from kgcnn.graph.adj import add_edges_reverse_indices, add_self_loops_to_edge_indices
-from kgcnn.graph.adj import get_angle_indices, get_angle, get_angle_between_edges
+from kgcnn.graph.adj import get_angle_indices, get_angle, get_angle_between_edges, get_angle_indices_batch
 
 
 class ReverseEdges(unittest.TestCase):
@@ -68,6 +68,19 @@ class TestFindAnglePairs(unittest.TestCase):
             np.all(np.concatenate([edi_new[ind_nm[:, 0]][:, :2], edi_new[ind_nm[:, 1]][:, 1:]], axis=-1) == ind_ijk))
 
 
+class TestAngleIndicesBatch(unittest.TestCase):
+
+    def test_batch_matches_single(self):
+        edge_indices = [np.array([[0, 1], [1, 0], [1, 2], [2, 1]]), np.array([[0, 1]]),
+                        np.array([[0, 1], [0, 2], [1, 0], [1, 2], [2, 0], [2, 1]])]
+        _, batch_ijk, batch_ij_k = get_angle_indices_batch(edge_indices, edge_pairing="kj")
+        for x, ijk, ij_k in zip(edge_indices, batch_ijk, batch_ij_k):
+            _, expected_ijk, expected_ij_k = get_angle_indices(x, edge_pairing="kj")
+            self.assertEqual(ijk.shape, expected_ijk.shape)
+            self.assertTrue(np.all(ijk == expected_ijk))
+            self.assertTrue(np.all(ij_k == expected_ij_k))
+
+
 class TestAngleCompute(unittest.TestCase):
 
     def test_get_angle(self):
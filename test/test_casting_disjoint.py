@@ -0,0 +1,140 @@
+import unittest
+
+import numpy as np
+import tensorflow as tf
+
+from kgcnn.layers.casting import CastRaggedToDisjoint, CastDisjointToRagged, CastPaddedToDisjoint
+from kgcnn.literature.Schnet import make_model as make_schnet
+from kgcnn.literature.GIN import make_model as make_gin
+from kgcnn.literature.PAiNN import make_model as make_painn
+from kgcnn.literature.DimeNetPP import make_model as make_dimenet
+from kgcnn.graph.adj import get_angle_indices
+
+
+class TestCastRaggedToDisjoint(unittest.TestCase):
+
+    def _make_graphs(self, num_graphs=4, seed=0):
+        rng = np.random.default_rng(seed)
+        nodes, coordinates, indices = [], [], []
+        for _ in range(num_graphs):
+            n = int(rng.integers(3, 8))
+            m = int(rng.integers(1, 3 * n))
+            nodes.append(rng.integers(1, 10, size=n).astype("float32"))
+            coordinates.append(rng.normal(size=(n, 3)).astype("float32"))
+            indices.append(rng.integers(0, n, size=(m, 2)))
+        return [tf.RaggedTensor.from_row_lengths(np.concatenate(x, axis=0), [len(y) for y in x])
+                for x in [nodes, coordinates, indices]]
+
+    def test_cast_to_disjoint(self):
+        nodes = tf.ragged.constant([[[0.0], [1.0]], [[2.0], [3.0], [4.0]]], ragged_rank=1)
+        edge_idx = tf.ragged.constant([[[0, 1], [1, 0]], [[0, 2], [1, 2]]], ragged_rank=1, dtype="int64")
+        n, idx, graph_id_node, graph_id_edge, node_count, edge_count = CastRaggedToDisjoint()([nodes, edge_idx])
+        self.assertTrue(np.array_equal(idx.numpy(), np.array([[0, 1], [1, 0], [2, 4], [3, 4]])))
+        self.assertTrue(np.array_equal(graph_id_node.numpy(), np.array([0, 0, 1, 1, 1])))
+        self.assertTrue(np.array_equal(graph_id_edge.numpy(), np.array([0, 0, 1, 1])))
+        self.assertTrue(np.array_equal(node_count.numpy(), np.array([2, 3])))
+        self.assertTrue(np.array_equal(edge_count.numpy(), np.array([2, 2])))
+        out = CastDisjointToRagged()([n, node_count])
+        self.assertTrue(np.array_equal(out.values.numpy(), nodes.values.numpy()))
+        self.assertTrue(np.array_equal(out.row_splits.numpy(), nodes.row_splits.numpy()))
+
+    def test_models_match_ragged(self):
+        x = self._make_graphs()
+        for make, kwargs, inputs in [
+                (make_schnet, {"interaction_args": {"units": 16, "use_bias": True,
+                                                    "activation": "kgcnn>shifted_softplus", "cfconv_pool": "sum"}},
+                 x),
+                (make_gin, {"gin_mlp": {"units": [16, 16], "use_bias": True, "activation": ["relu", "linear"],
+                                        "use_normalization": True, "normalization_technique": "graph_batch"},
+                            "output_mlp": {"use_bias": True, "units": 1, "activation": "linear"}},
+                 [x[0], x[2]])]:
+            model = make(use_disjoint=False, verbose=0, **kwargs)
+            model_disjoint = make(use_disjoint=True, verbose=0, **kwargs)
+            model_disjoint.set_weights(model.get_weights())
+            self.assertTrue(np.allclose(model_disjoint.predict(inputs, verbose=0), model.predict(inputs, verbose=0),
+                                        atol=1e-5))
+
+
+class TestCastPaddedToDisjoint(unittest.TestCase):
+
+    padded_inputs = [{"shape": (None,), "name": "node_attributes", "dtype": "float32"},
+                     {"shape": (None, 3), "name": "node_coordinates", "dtype": "float32"},
+                     {"shape": (None, 2), "name": "edge_indices", "dtype": "int64"},
+                     {"shape": (), "name": "total_nodes", "dtype": "int64"},
+                     {"shape": (), "name": "total_edges", "dtype": "int64"}]
+
+    def test_cast_to_disjoint(self):
+        nodes = tf.constant([[[0.0], [1.0], [0.0]], [[2.0], [3.0], [4.0]]])
+        edge_idx = tf.constant([[[0, 1], [1, 0]], [[0, 2], [0, 0]]], dtype="int64")
+        n, idx, graph_id_node, graph_id_edge, node_count, edge_count = CastPaddedToDisjoint()(
+            [nodes, edge_idx, tf.constant([2, 3], dtype="int64"), tf.constant([2, 1], dtype="int64")])
+        self.assertTrue(np.array_equal(n.numpy()[:, 0], np.array([0.0, 1.0, 0.0, 2.0, 3.0, 4.0, 0.0])))
+        # Padded edge is redirected to the dummy node at the end.
+        self.assertTrue(np.array_equal(idx.numpy(), np.array([[0, 1], [1, 0], [3, 5], [6, 6]])))
+        self.assertTrue(np.array_equal(graph_id_node.numpy(), np.array([0, 0, -1, 1, 1, 1, -1])))
+        self.assertTrue(np.array_equal(graph_id_edge.numpy(), np.array([0, 0, 1, -1])))
+
+    def test_cast_angles_to_disjoint(self):
+        nodes = tf.constant([[[0.0], [1.0], [0.0]], [[2.0], [3.0], [4.0]]])
+        edge_idx = tf.constant([[[0, 1], [1, 0]], [[0, 2], [0, 0]]], dtype="int64")
+        angle_idx = tf.constant([[[0, 1], [1, 0]], [[0, 0], [0, 0]]], dtype="int64")
+        out = CastPaddedToDisjoint()([nodes, edge_idx, tf.constant([2, 3], dtype="int64"),
+                                      tf.constant([2, 1], dtype="int64"), angle_idx, tf.constant([2, 0], "int64")])
+        # Dummy edge between the dummy node is appended, which receives all padded angles.
+        self.assertTrue(np.array_equal(out[1].numpy(), np.array([[0, 1], [1, 0], [3, 5], [6, 6], [6, 6]])))
+        self.assertTrue(np.array_equal(out[3].numpy(), np.array([0, 0, 1, -1, -1])))
+        self.assertTrue(np.array_equal(out[6].numpy(), np.array([[0, 1], [1, 0], [4, 4], [4, 4]])))
+        self.assertTrue(np.array_equal(out[7].numpy(), np.array([0, 0, -1, -1])))
+
+    def test_models_match_ragged(self):
+        x = TestCastRaggedToDisjoint()._make_graphs()
+        num_nodes, num_edges = x[0].row_lengths().numpy(), x[2].row_lengths().numpy()
+        x_padded = [x[0].to_tensor(), x[1].to_tensor(), x[2].to_tensor(), num_nodes, num_edges]
+        for make, kwargs in [
+                (make_schnet, {"interaction_args": {"units": 16, "use_bias": True,
+                                                    "activation": "kgcnn>shifted_softplus", "cfconv_pool": "sum"}}),
+                (make_painn, {"conv_args": {"units": 16, "cutoff": None}, "update_args": {"units": 16},
+                              "input_embedding": {"node": {"input_dim": 95, "output_dim": 16}}, "depth": 2,
+                              "equiv_normalization": True, "node_normalization": True})]:
+            model = make(verbose=0, **kwargs)
+            model_padded = make(inputs=self.padded_inputs, input_tensor_type="padded", verbose=0, **kwargs)
+            model_padded.set_weights(model.get_weights())
+            self.assertTrue(np.allclose(model_padded.predict(x_padded, verbose=0), model.predict(x, verbose=0),
+                                        atol=1e-5))
+            # Padded nodes are masked in the statistics of batch normalization.
+            self.assertTrue(np.allclose(model_padded(x_padded, training=True), model(x, training=True), atol=1e-5))
+            # Padded inputs of static shape can be compiled with XLA.
+            model_padded.compile(loss="mean_absolute_error", optimizer="adam", jit_compile=True)
+            history = model_padded.fit(x_padded, np.ones((len(num_nodes), 1)), epochs=2, verbose=0)
+            self.assertTrue(np.all(np.isfinite(history.history["loss"])))
+
+    def test_dimenet_match_ragged(self):
+        rng = np.random.default_rng(0)
+        nodes, coordinates, indices, angles = [], [], [], []
+        for n in [4, 6, 5]:
+            nodes.append(rng.integers(1, 10, size=n).astype("float32"))
+            coordinates.append(rng.uniform(0.0, 3.0, size=(n, 3)).astype("float32"))
+            edge_idx = np.array([[i, j] for i in range(n) for j in range(n) if i != j])
+            indices.append(edge_idx)
+            angles.append(get_angle_indices(edge_idx)[2])
+        x = [tf.RaggedTensor.from_row_lengths(np.concatenate(y, axis=0), [len(z) for z in y])
+             for y in [nodes, coordinates, indices, angles]]
+        x_padded = [y.to_tensor() for y in x] + [y.row_lengths().numpy() for y in [x[0], x[2], x[3]]]
+        inputs = self.padded_inputs[:3] + [{"shape": (None, 2), "name": "angle_indices", "dtype": "int64"}] + \
+            self.padded_inputs[3:] + [{"shape": (), "name": "total_angles", "dtype": "int64"}]
+        kwargs = {"emb_size": 16, "out_emb_size": 16, "int_emb_size": 8, "basis_emb_size": 4, "num_blocks": 1,
+                  "num_spherical": 3, "num_radial": 4,
+                  "input_embedding": {"node": {"input_dim": 95, "output_dim": 16}}, "output_init": "glorot_uniform",
+                  "output_mlp": {"use_bias": [True, False], "units": [16, 1], "activation": ["swish", "linear"]}}
+        model = make_dimenet(verbose=0, **kwargs)
+        model_padded = make_dimenet(inputs=inputs, input_tensor_type="padded", verbose=0, **kwargs)
+        model_padded.set_weights(model.get_weights())
+        self.assertTrue(np.allclose(model_padded.predict(x_padded, verbose=0), model.predict(x, verbose=0),
+                                    rtol=1e-4, atol=1e-4))
+        model_padded.compile(loss="mean_absolute_error", optimizer="adam", jit_compile=True)
+        history = model_padded.fit(x_padded, np.ones((3, 1)), epochs=2, verbose=0)
+        self.assertTrue(np.all(np.isfinite(history.history["loss"])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+import numpy as np
+from networkx import MultiDiGraph
+from pymatgen.core.structure import Structure, Lattice
+from pymatgen.optimization.neighbors import find_points_in_spheres
+
+from kgcnn.crystal.array_graph_builder import structure_to_arrays, radius_edges, knn_edges, arrays_to_graph_dict
+from kgcnn.graph.base import GraphDict
+
+try:
+    from kgcnn.crystal.preprocessor import RadiusUnitCell, KNNUnitCell, ArrayRadiusUnitCell, ArrayKNNUnitCell
+    has_preprocessor = True
+except ImportError:
+    has_preprocessor = False
+
+
+def make_random_structures(num_atoms: list, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return [Structure(Lattice(np.diag(rng.uniform(3.0, 6.0, 3)) + rng.normal(size=(3, 3)) * 0.5),
+                      rng.integers(1, 30, n).tolist(), rng.uniform(-0.2, 1.2, (n, 3))) for n in num_atoms]
+
+
+def make_lattice_nodes(seed: int = 0):
+    # Node arrays of cubic, bcc, fcc, hexagonal and random cells with many ties in neighbour distances.
+    rng = np.random.default_rng(seed)
+    cells = [
+        (np.eye(3) * 3.0, [[0.0, 0.0, 0.0]]),
+        (np.eye(3) * 3.0, [[0.0, 0.0, 0.0], [0.5, 0.5, 0.5]]),
+        (np.eye(3) * 4.0, [[0.0, 0.0, 0.0], [0.5, 0.5, 0.0], [0.5, 0.0, 0.5], [0.0, 0.5, 0.5]]),
+        (np.array([[2.5, 0.0, 0.0], [-1.25, 2.5 * np.sqrt(3) / 2, 0.0], [0.0, 0.0, 4.0]]),
+         [[1 / 3, 2 / 3, 0.25], [2 / 3, 1 / 3, 0.75]]),
+    ]
+    for n in [1, 3, 6, 10]:
+        cells.append((np.diag(rng.uniform(3.0, 6.0, 3)) + rng.normal(size=(3, 3)) * 0.5, rng.uniform(0, 1, (n, 3))))
+    nodes = []
+    for lattice, frac_coords in cells:
+        frac_coords = np.array(frac_coords, dtype="float")
+        nodes.append({"atomic_number": np.arange(1, len(frac_coords) + 1), "frac_coords": frac_coords,
+                      "coords": frac_coords @ lattice, "lattice_matrix": lattice})
+    return nodes
+
+
+def networkx_knn_graph(nodes: dict, k: int, max_radius: float = 10.) -> GraphDict:
+    # Reference of `KNNUnitCell` with `add_knn_bonds` and `add_edge_information` of `kgcnn.crystal.graph_builder`,
+    # which can not be imported without pyxtal.
+    lattice, frac_coords = nodes["lattice_matrix"], nodes["frac_coords"]
+    graph = MultiDiGraph()
+    for i in range(len(frac_coords)):
+        graph.add_node(i, atomic_number=nodes["atomic_number"][i], frac_coords=frac_coords[i],
+                       coords=nodes["coords"][i])
+    index1, index2, offset_vectors, distances = find_points_in_spheres(
+        frac_coords @ lattice, frac_coords @ lattice, r=max_radius, pbc=np.array([True] * 3, dtype=int),
+        lattice=lattice, tol=1e-8)
+    no_self_loops = np.argwhere(~np.isclose(distances, 0)).reshape(-1)
+    index1, index2 = index1[no_self_loops], index2[no_self_loops]
+    offset_vectors, distances = offset_vectors[no_self_loops], distances[no_self_loops]
+    for node_idx in range(len(frac_coords)):
+        idxs = np.argwhere(index1 == node_idx)[:, 0]
+        sorted_idxs = idxs[np.argsort(distances[idxs])][:k]
+        assert len(sorted_idxs) == k
+        for edge_idx in sorted_idxs:
+            graph.add_edge(index2[edge_idx], index1[edge_idx], cell_translation=offset_vectors[edge_idx],
+                           distance=distances[edge_idx])
+    for source, target, data in graph.edges(data=True):
+        data["offset"] = (frac_coords[target] - (frac_coords[source] + data["cell_translation"])) @ lattice
+        data["distance"] = np.linalg.norm(data["offset"])
+    return GraphDict().from_networkx(graph, node_attributes=["atomic_number", "frac_coords", "coords"],
+                                     edge_attributes=["cell_translation", "distance", "offset"])
+
+
+class TestArrayGraphBuilder(unittest.TestCase):
+
+    structures = make_random_structures([1, 2, 5, 8])
+
+    @staticmethod
+    def _brute_force_distances(frac_coords, lattice, size=4):
+        # Distances to all images in a supercell of (2*size+1)^3 cells, shape (N, N*(2*size+1)^3).
+        images = np.stack(np.meshgrid(*[np.arange(-size, size + 1)] * 3, indexing="ij"), axis=-1).reshape(-1, 3)
+        points = (frac_coords[None, :, :] + images[:, None, :]).reshape(-1, 3) @ lattice
+        dist = np.linalg.norm((frac_coords @ lattice)[:, None, :] - points[None, :, :], axis=-1)
+        return np.sort(dist[dist > 1e-8].reshape(len(frac_coords), -1), axis=-1)
+
+    def test_radius_edges(self):
+        for s in self.structures:
+            nodes = structure_to_arrays(s)
+            edge_indices, cell_translation, distance = radius_edges(nodes["frac_coords"], nodes["lattice_matrix"],
+                                                                    radius=4.0)
+            graph = arrays_to_graph_dict(nodes, edge_indices, cell_translation)
+            self.assertTrue(np.allclose(graph["distance"], distance))
+            self.assertTrue(np.all(np.diff(edge_indices[:, 0]) >= 0))
+            reference = self._brute_force_distances(nodes["frac_coords"], nodes["lattice_matrix"])
+            for i in range(len(s)):
+                expected = reference[i][reference[i] <= 4.0]
+                self.assertTrue(np.allclose(np.sort(distance[edge_indices[:, 1] == i]), expected))
+
+    def test_knn_edges(self):
+        for s in self.structures:
+            nodes = structure_to_arrays(s)
+            for k in [1, 6, 24]:
+                edge_indices, cell_translation, distance = knn_edges(nodes["frac_coords"], nodes["lattice_matrix"],
+                                                                     k=k, max_radius=2.0)
+                self.assertEqual(len(edge_indices), len(s) * k)
+                reference = self._brute_force_distances(nodes["frac_coords"], nodes["lattice_matrix"])
+                for i in range(len(s)):
+                    self.assertTrue(np.allclose(np.sort(distance[edge_indices[:, 1] == i]), reference[i][:k]))
+
+    def test_knn_same_as_networkx(self):
+        for nodes in make_lattice_nodes():
+            for k in [1, 6, 12, 19]:
+                expected = networkx_knn_graph(nodes, k)
+                edge_indices, cell_translation, _ = knn_edges(nodes["frac_coords"], nodes["lattice_matrix"], k=k)
+                result = arrays_to_graph_dict(nodes, edge_indices, cell_translation)
+                for key in ["node_number", "edge_indices", "atomic_number", "frac_coords", "coords",
+                            "cell_translation", "distance", "offset"]:
+                    self.assertEqual(expected[key].shape, result[key].shape)
+                    self.assertTrue(np.allclose(expected[key], result[key]), key)
+
+    @unittest.skipIf(not has_preprocessor, "Requires pyxtal for `kgcnn.crystal.preprocessor`.")
+    def test_same_as_networkx_preprocessor(self):
+        for s in self.structures:
+            for ref, new in [(RadiusUnitCell(4.0), ArrayRadiusUnitCell(4.0)), (KNNUnitCell(6), ArrayKNNUnitCell(6))]:
+                expected = GraphDict().from_networkx(ref(s), node_attributes=ref.node_attributes,
+                                                     edge_attributes=ref.edge_attributes)
+                result = new(s)
+                for key in ["node_number", "edge_indices", "atomic_number", "frac_coords", "coords",
+                            "cell_translation", "distance", "offset"]:
+                    self.assertEqual(expected[key].shape, result[key].shape)
+                    self.assertTrue(np.allclose(expected[key], result[key]), key)
+
+
+if __name__ == '__main__':
+    unittest.main()
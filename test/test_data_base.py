@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from kgcnn.data.base import MemoryGraphList, MemoryGraphDataset
+from kgcnn.data.cache import GraphPropertyCache
+
+
+def _add_num_edges(graph):
+    graph["num_edges"] = np.array(len(graph["edge_indices"]))
+
+
+class TestMapList(unittest.TestCase):
+
+    def _make_graph_list(self, num_graphs: int = 30):
+        rng = np.random.default_rng(0)
+        data = MemoryGraphList()
+        data.set("edge_indices", [rng.integers(0, 6, (rng.integers(2, 20), 2)) for _ in range(num_graphs)])
+        return data
+
+    def test_parallel_preprocessor_matches_serial(self):
+        data = self._make_graph_list()
+        data_parallel = MemoryGraphList([dict(x) for x in data])
+        data.map_list("set_angle", range_indices="edge_indices", compute_angles=False)
+        data_parallel.map_list("set_angle", range_indices="edge_indices", compute_angles=False,
+                               num_workers=2, chunk_size=7)
+        for g, g_parallel in zip(data, data_parallel):
+            self.assertEqual(set(g.keys()), set(g_parallel.keys()))
+            for key in g.keys():
+                self.assertTrue(np.all(g[key] == g_parallel[key]))
+
+    def test_parallel_callable(self):
+        data = self._make_graph_list()
+        data.map_list(_add_num_edges, num_workers=2)
+        self.assertEqual([int(x) for x in data.get("num_edges")], [len(x) for x in data.get("edge_indices")])
+
+    def test_has_sorted_indices(self):
+        data = self._make_graph_list()
+        self.assertFalse(data.has_sorted_indices("edge_indices"))
+        data.map_list("sort_edge_indices")
+        self.assertTrue(data.has_sorted_indices("edge_indices"))
+
+
+class TestSetMethodsCache(unittest.TestCase):
+
+    methods = [{"map_list": {"method": "set_angle", "range_indices": "edge_indices", "compute_angles": False}}]
+
+    def _make_dataset(self, data_directory):
+        dataset = MemoryGraphDataset(data_directory=data_directory, dataset_name="Test")
+        dataset.set("edge_indices", [np.array([[0, 1], [1, 0], [1, 2], [2, 1]]), np.array([[0, 1], [1, 0]])])
+        return dataset
+
+    def test_cached_properties_match(self):
+        with tempfile.TemporaryDirectory() as data_directory:
+            cache = GraphPropertyCache(os.path.join(data_directory, "cache"))
+            dataset = self._make_dataset(data_directory)
+            dataset.set_methods(self.methods, cache=cache)
+            self.assertEqual(len(cache.keys()), 1)
+            dataset_cached = self._make_dataset(data_directory)
+            dataset_cached.set_methods(self.methods, cache=cache)
+            self.assertEqual(len(cache.keys()), 1)
+            for g, g_cached in zip(dataset, dataset_cached):
+                self.assertEqual(set(g.keys()), set(g_cached.keys()))
+                self.assertTrue(np.all(g["angle_indices"] == g_cached["angle_indices"]))
+            del dataset_cached
+
+    def test_changed_content_is_not_loaded(self):
+        with tempfile.TemporaryDirectory() as data_directory:
+            cache = GraphPropertyCache(os.path.join(data_directory, "cache"))
+            self._make_dataset(data_directory).set_methods(self.methods, cache=cache)
+            dataset = self._make_dataset(data_directory)
+            dataset[1]["edge_indices"] = np.array([[0, 1], [1, 0], [1, 2], [2, 1]])
+            dataset.set_methods(self.methods, cache=cache)
+            self.assertEqual(len(cache.keys()), 2)
+            self.assertEqual(len(dataset[1]["angle_indices"]), len(dataset[0]["angle_indices"]))
+
+    def test_cached_properties_are_writable(self):
+        with tempfile.TemporaryDirectory() as data_directory:
+            cache = GraphPropertyCache(os.path.join(data_directory, "cache"))
+            self._make_dataset(data_directory).set_methods(self.methods, cache=cache)
+            dataset_cached = self._make_dataset(data_directory)
+            dataset_cached.set_methods(self.methods, cache=cache)
+            self.assertNotIsInstance(dataset_cached[0]["angle_indices"].base, np.memmap)
+            dataset_cached[0]["angle_indices"][0] = 0
+
+    def test_evict_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as cache_directory:
+            cache = GraphPropertyCache(cache_directory)
+            cache.save("a", [{"x": np.zeros(100)}])
+            cache.save("b", [{"x": np.zeros(100)}])
+            cache.load("a")
+            os.utime(os.path.join(cache_directory, "b", "last_access"), (0, 0))
+            self.assertEqual(cache.evict(max_size=1), ["b"])
+            self.assertEqual(cache.keys(), ["a"])
+
+
+if __name__ == '__main__':
+    unittest.main()
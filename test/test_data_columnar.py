@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from kgcnn.data.base import MemoryGraphDataset
+
+
+class TestColumnarDataset(unittest.TestCase):
+
+    def _make_dataset(self, data_directory):
+        dataset = MemoryGraphDataset(data_directory=data_directory, dataset_name="Test")
+        dataset.set("edge_indices", [np.array([[0, 1], [1, 0]]), np.array([[0, 0]]), np.array([[1, 2], [2, 1]])])
+        dataset.set("node_symbol", [np.array(["C", "O"]), np.array(["C"]), np.array(["N", "H", "H"])])
+        dataset.set("graph_labels", [np.array(1.0), np.array(2.0), np.array(3.0)])
+        dataset[1].set("node_coordinates", np.array([[0.0, 0.0, 1.0]]))
+        return dataset
+
+    def test_save_load_columnar(self):
+        with tempfile.TemporaryDirectory() as data_directory:
+            dataset = self._make_dataset(data_directory)
+            dataset.save(file_format="columnar")
+            self.assertTrue(os.path.exists(os.path.join(data_directory, "Test.kgcnn.columns")))
+            loaded = MemoryGraphDataset(data_directory=data_directory, dataset_name="Test")
+            loaded.load(file_format="columnar")
+            self.assertEqual(len(loaded), len(dataset))
+            for g_expected, g_loaded in zip(dataset, loaded):
+                self.assertEqual(set(g_expected.keys()), set(g_loaded.keys()))
+                for key, value in g_expected.items():
+                    self.assertEqual(value.shape, g_loaded[key].shape)
+                    self.assertTrue(np.all(value == g_loaded[key]))
+            del loaded
+
+    def test_object_properties_fallback(self):
+        with tempfile.TemporaryDirectory() as data_directory:
+            dataset = self._make_dataset(data_directory)
+            dataset.set("mixed", [np.array([1, "a"], dtype="object"), None, None])
+            dataset.save(file_format="columnar")
+            loaded = MemoryGraphDataset(data_directory=data_directory, dataset_name="Test")
+            loaded.load(file_format="columnar", mmap_mode=None)
+            self.assertEqual(loaded[0]["mixed"].tolist(), [1, "a"])
+            self.assertFalse("mixed" in loaded[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from pymatgen.core.structure import Structure, Lattice
+
+from kgcnn.crystal.base import CrystalPreprocessor
+from kgcnn.crystal import array_graph_builder
+from kgcnn.data.crystal import CrystalDataset
+from kgcnn.data.cache import GraphPropertyCache
+
+
+class CountingRadiusUnitCell(CrystalPreprocessor):
+    node_attributes = ['atomic_number', 'frac_coords', 'coords']
+    edge_attributes = ['cell_translation', 'distance', 'offset']
+    graph_attributes = ['lattice_matrix']
+    num_calls = 0
+
+    def __init__(self, radius=3.0):
+        self.radius = radius
+
+    def __call__(self, structure):
+        CountingRadiusUnitCell.num_calls += 1
+        nodes = array_graph_builder.structure_to_arrays(structure)
+        edge_indices, cell_translation, _ = array_graph_builder.radius_edges(
+            nodes["frac_coords"], nodes["lattice_matrix"], radius=self.radius)
+        return array_graph_builder.arrays_to_graph_dict(nodes, edge_indices, cell_translation)
+
+
+class TestSetRepresentation(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.structures = [
+            Structure(Lattice(np.diag(rng.uniform(3.0, 5.0, 3))), rng.integers(1, 30, n).tolist(),
+                      rng.uniform(0.0, 1.0, (n, 3))) for n in rng.integers(1, 6, 20)]
+        self.dataset = CrystalDataset(data_directory=self.temp_dir.name, dataset_name="TestCrystal",
+                                      file_name="data.csv", verbose=50)
+        self.dataset.save_structures_to_json_file(self.structures)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_kgcnn_property_names(self):
+        self.dataset.set_representation(CountingRadiusUnitCell(3.0))
+        self.assertEqual(len(self.dataset), len(self.structures))
+        for g, s in zip(self.dataset, self.structures):
+            self.assertTrue(np.array_equal(g["node_number"], s.atomic_numbers))
+            self.assertTrue(np.allclose(g["graph_lattice"], s.lattice.matrix))
+            self.assertEqual(g["edge_image"].dtype, np.int64)
+            self.assertEqual(g["edge_distance"].shape, (len(g["edge_indices"]), 1))
+            # Receiving node first, sending node in periodic image second.
+            xyz = g["node_frac_coordinates"] @ g["graph_lattice"]
+            shifted = xyz[g["edge_indices"][:, 1]] + g["edge_image"] @ g["graph_lattice"]
+            distance = np.linalg.norm(xyz[g["edge_indices"][:, 0]] - shifted, axis=-1)
+            self.assertTrue(np.allclose(distance, g["edge_distance"][:, 0]))
+
+    def test_parallel_and_cache(self):
+        self.dataset.set_representation(CountingRadiusUnitCell(3.0))
+        expected = [dict(g) for g in self.dataset]
+        with tempfile.TemporaryDirectory() as cache_directory:
+            dataset = CrystalDataset(data_directory=self.temp_dir.name, dataset_name="TestCrystal",
+                                     file_name="data.csv", verbose=50)
+            dataset.set_representation(CountingRadiusUnitCell(3.0), num_workers=2, chunk_size=3,
+                                       cache={"directory": cache_directory})
+            self.assertEqual(len(GraphPropertyCache(cache_directory).keys()), 1)
+            num_calls = CountingRadiusUnitCell.num_calls
+            dataset.set_representation(CountingRadiusUnitCell(3.0), reset_graphs=True,
+                                       cache={"directory": cache_directory})
+            self.assertEqual(CountingRadiusUnitCell.num_calls, num_calls)
+            for g, g_expected in zip(dataset, expected):
+                self.assertEqual(set(g.keys()), set(g_expected.keys()))
+                for key in g.keys():
+                    self.assertTrue(np.allclose(g[key], g_expected[key]))
+            dataset[0]["edge_distance"][0] = 0.0
+
+    def test_read_in_memory_labels(self):
+        labels = pd.DataFrame({"energy": np.arange(len(self.structures)) * 0.5,
+                               "band_gap": np.arange(len(self.structures)) * 2.0})
+        labels.to_csv(os.path.join(self.temp_dir.name, "data.csv"), index=False)
+        self.dataset.read_in_memory(label_column_name="energy", additional_callbacks={
+            "band_gap": lambda st, ds: ds["band_gap"], "labels": ["energy", "band_gap"]})
+        for g, s, (_, row) in zip(self.dataset, self.structures, labels.iterrows()):
+            self.assertEqual(g["graph_labels"], row["energy"])
+            self.assertEqual(g["band_gap"], row["band_gap"])
+            self.assertTrue(np.array_equal(g["labels"], row.to_numpy()))
+            self.assertTrue(np.array_equal(g["node_number"], s.atomic_numbers))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -236,3 +236,49 @@ class TestMoleculeNetDataset(unittest.TestCase):
         self.assertEqual(len(molecule['graph_labels']), 2)
         # Testing if it is the correct value as well
         self.assertEqual(molecule['graph_labels'][1], 'Propanolol')
+
+    def test_parallel_callbacks_match_serial(self):
+        # Invalid smiles are included to check that failed molecules are also kept in order as None.
+        self.write_string(SIMPLE_SMILES_CSV + "5,invalid,0,C1CCX\n" + FAULTY_SMILES_CSV.split("\n", 2)[2])
+        molnet = MoleculeNetDataset(data_directory=self.temp_path, file_name=self.file_name, dataset_name='test')
+        molnet.prepare_data(overwrite=False, smiles_column_name='smiles')
+        mol_list = molnet.get_mol_blocks_from_sdf_file()
+        data = molnet.read_in_table_file().data_frame
+        callbacks = {
+            'name': lambda mg, dd: np.array(dd['name'], dtype='str'),
+            'node_number': lambda mg, dd: mg.node_number,
+            'edge_indices': lambda mg, dd: mg.edge_number[0],
+        }
+        kwargs = {"callbacks": callbacks, "mol_interface_class": molnet._mol_graph_interface}
+
+        serial = map_molecule_callbacks(mol_list, data, **kwargs)
+        parallel = map_molecule_callbacks(mol_list, data, num_workers=2, chunk_size=2, **kwargs)
+
+        self.assertEqual(set(serial.keys()), set(parallel.keys()))
+        for key in serial.keys():
+            self.assertEqual(len(serial[key]), len(mol_list))
+            self.assertEqual(len(parallel[key]), len(mol_list))
+            for x, y in zip(serial[key], parallel[key]):
+                if x is None:
+                    self.assertIsNone(y)
+                else:
+                    self.assertTrue(np.array_equal(x, y))
+        self.assertIn(None, serial["name"])
+
+        # Callbacks that only pick a column give the same values as functions of the table row.
+        columns = map_molecule_callbacks(mol_list, data, callbacks={'name': 'name', 'labels': ['label', 'name']},
+                                         mol_interface_class=molnet._mol_graph_interface)
+        self.assertEqual(columns['name'], [None if x is None else str(x) for x in serial['name']])
+        for x, y in zip(serial['name'], columns['labels']):
+            self.assertEqual(x is None, y is None)
+        self.assertEqual(list(columns['labels'][0]), list(data.loc[0, ['label', 'name']]))
+
+        # Molecules that are read on access from the indexed SDF file give the same values.
+        lazy = map_molecule_callbacks(molnet.get_mol_blocks_from_sdf_file(lazy=True), data, num_workers=2,
+                                      chunk_size=2, **kwargs)
+        for key in serial.keys():
+            for x, y in zip(serial[key], lazy[key]):
+                if x is None:
+                    self.assertIsNone(y)
+                else:
+                    self.assertTrue(np.array_equal(x, y))
@@ -0,0 +1,38 @@
+import pickle
+import unittest
+import numpy as np
+import pandas as pd
+
+from kgcnn.data.table import TableColumns
+
+
+class TestTableColumns(unittest.TestCase):
+
+    data = pd.DataFrame({"label": [0, 1, 2], "name": ["a", "b", "c"], "value": [0.5, 1.5, 2.5]}, index=[3, 4, 5])
+
+    def test_rows_same_as_pandas(self):
+        table = TableColumns(self.data)
+        self.assertEqual(len(table), 3)
+        for i in range(len(self.data)):
+            row, expected = table[i], self.data.iloc[i]
+            self.assertEqual(row.name, expected.name)
+            self.assertEqual(list(row.keys()), list(expected.keys()))
+            self.assertEqual(row.to_dict(), expected.to_dict())
+            self.assertEqual(row["label"], expected["label"])
+            self.assertTrue(np.array_equal(row[["name", "label"]], expected[["name", "label"]].to_numpy()))
+            self.assertTrue(np.array_equal(row[["label", "value"]], expected[["label", "value"]].to_numpy()))
+
+    def test_get_values(self):
+        table = pickle.loads(pickle.dumps(TableColumns(self.data)))
+        self.assertTrue(np.array_equal(table.get_values("value"), self.data["value"].to_numpy()))
+        self.assertEqual(table.get_values(["label", "value"]).dtype, np.float64)
+        self.assertEqual(table.get_values(["label", "name"]).dtype, object)
+        self.assertEqual(table.get_values(["label", "label"]).shape, (3, 2))
+
+    def test_series(self):
+        table = TableColumns(self.data["name"])
+        self.assertEqual(table[1], "b")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from kgcnn.data.tudataset import GraphTUDataset
+
+
+class TestGraphTUDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        # Random graphs with isolated nodes and graphs without edges.
+        self.graphs, edges, graph_indicator, offset = [], [], [], 0
+        for i in range(25):
+            num_nodes = int(rng.integers(1, 8))
+            edge_indices = rng.integers(0, num_nodes, (int(rng.integers(0, 2 * num_nodes)), 2))
+            edge_indices = edge_indices[np.lexsort((edge_indices[:, 1], edge_indices[:, 0]))]
+            self.graphs.append({
+                "edge_indices": edge_indices[:, ::-1],
+                "node_attributes": rng.normal(size=(num_nodes, 2)),
+                "node_labels": rng.integers(0, 3, (num_nodes, 1)).astype("float"),
+                "edge_labels": rng.integers(0, 3, (len(edge_indices), 1)).astype("float"),
+                "graph_labels": np.array([i % 2], dtype="float"),
+                "node_degree": np.bincount(edge_indices[:, 1], minlength=num_nodes)
+            })
+            edges.append(edge_indices + offset + 1)
+            graph_indicator += [i + 1] * num_nodes
+            offset += num_nodes
+        path = os.path.join(self.temp_dir.name, "DS")
+        np.savetxt(path + "_A.txt", np.concatenate(edges), fmt="%d", delimiter=", ")
+        np.savetxt(path + "_graph_indicator.txt", graph_indicator, fmt="%d")
+        for key in ["node_attributes", "node_labels", "edge_labels", "graph_labels"]:
+            np.savetxt(path + "_%s.txt" % key, np.concatenate([g[key] for g in self.graphs]), delimiter=",")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_read_in_memory(self):
+        dataset = GraphTUDataset(data_directory=self.temp_dir.name, dataset_name="DS", verbose=50).read_in_memory()
+        self.assertEqual(len(dataset), len(self.graphs))
+        for graph, expected in zip(dataset, self.graphs):
+            self.assertIsNone(graph.get("edge_attributes"))
+            for key, value in expected.items():
+                self.assertEqual(graph[key].shape, value.shape)
+                self.assertTrue(np.array_equal(graph[key], value))
+
+
+if __name__ == '__main__':
+    unittest.main()
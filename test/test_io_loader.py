@@ -0,0 +1,194 @@
+import unittest
+from unittest import mock
+import numpy as np
+import tensorflow as tf
+
+from kgcnn.data.base import MemoryGraphList
+from kgcnn.hyper.hyper import HyperParameter
+from kgcnn.io.loader import GraphBatchLoader, tf_dataset_from_graph_list, make_budget_batches, \
+    tf_padded_dataset_from_graph_list
+
+
+def _make_graph_list(num_graphs: int = 50, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    data = MemoryGraphList()
+    data.set("node_attributes", [rng.random((rng.integers(1, 10), 3)).astype("float32") for _ in range(num_graphs)])
+    data.set("edge_indices", [rng.integers(0, 5, (rng.integers(1, 20), 2)) for _ in range(num_graphs)])
+    data.set("graph_labels", [rng.random(2) for _ in range(num_graphs)])
+    return data
+
+
+class TestGraphBatchLoader(unittest.TestCase):
+
+    inputs = [{"name": "node_attributes", "ragged": True}, {"name": "edge_indices", "ragged": True}]
+    outputs = {"name": "graph_labels", "ragged": False}
+
+    def _assert_equal_tensors(self, a, b):
+        if isinstance(a, tf.RaggedTensor):
+            self.assertTrue(np.all(a.values.numpy() == b.values.numpy()))
+            self.assertTrue(np.all(a.row_splits.numpy() == b.row_splits.numpy()))
+        else:
+            self.assertEqual(a.shape, b.shape)
+            self.assertTrue(np.all(a.numpy() == b.numpy()))
+
+    def test_pre_concatenate_matches_default(self):
+        data = _make_graph_list()
+        for shuffle in [False, True]:
+            loader = GraphBatchLoader(data, self.inputs, self.outputs, batch_size=8, shuffle=shuffle)
+            loader_buffered = GraphBatchLoader(data, self.inputs, self.outputs, batch_size=8, shuffle=shuffle,
+                                               pre_concatenate=True)
+            loader_buffered.indices = loader.indices
+            self.assertEqual(len(loader), len(loader_buffered))
+            for i in range(len(loader)):
+                x, y = loader[i]
+                x_buffered, y_buffered = loader_buffered[i]
+                for a, b in zip(x + [y], x_buffered + [y_buffered]):
+                    self._assert_equal_tensors(a, b)
+
+    def test_batch_budget(self):
+        data = _make_graph_list()
+        budget = {"node_attributes": 20, "edge_indices": 40}
+        labels = np.arange(len(data))
+        for pre_concatenate in [False, True]:
+            loader = GraphBatchLoader(data, self.inputs, labels, batch_size=8, shuffle=True, seed=0,
+                                      pre_concatenate=pre_concatenate, batch_budget=budget, num_buckets=2)
+            seen = []
+            for i in range(len(loader)):
+                x, y = loader[i]
+                self.assertLessEqual(int(y.shape[0]), 8)
+                if int(y.shape[0]) > 1:
+                    self.assertLessEqual(int(tf.reduce_sum(x[0].row_lengths())), 20)
+                    self.assertLessEqual(int(tf.reduce_sum(x[1].row_lengths())), 40)
+                seen.extend(y.numpy().tolist())
+            self.assertEqual(sorted(seen), labels.tolist())
+
+    def test_hyper_fit_batch_budget(self):
+        data, labels = _make_graph_list(), np.arange(50)
+        training = {"fit": {"batch_size": 8, "epochs": 2}}
+        hyper = HyperParameter({"model": {"config": {"inputs": self.inputs}}, "training": training,
+                                "data": {"dataset": {}}}, model_class=None)
+        hyper_fit = hyper.fit(x=data[:40], y=labels[:40], validation_data=(data[40:], labels[40:]))
+        self.assertEqual(hyper_fit["batch_size"], 8)
+        self.assertEqual(hyper_fit["x"][0].shape[0], 40)
+        self.assertEqual(hyper_fit["validation_data"][0][1].shape[0], 10)
+
+        training.update({"batch_budget": {"edge_indices": 40}, "num_buckets": 2})
+        hyper = HyperParameter({"model": {"config": {"inputs": self.inputs}}, "training": training,
+                                "data": {"dataset": {}}}, model_class=None)
+        hyper_fit = hyper.fit(x=data[:40], y=labels[:40], validation_data=(data[40:], labels[40:]))
+        self.assertNotIn("batch_size", hyper_fit)
+        self.assertIsInstance(hyper_fit["x"], GraphBatchLoader)
+        self.assertIsInstance(hyper_fit["validation_data"], GraphBatchLoader)
+        self.assertTrue(hyper_fit["x"].shuffle)
+        self.assertFalse(hyper_fit["validation_data"].shuffle)
+        seen = [y for i in range(len(hyper_fit["validation_data"]))
+                for y in hyper_fit["validation_data"][i][1].numpy().tolist()]
+        self.assertEqual(sorted(seen), list(range(40, 50)))
+
+
+class TestMakeBudgetBatches(unittest.TestCase):
+
+    def test_packing(self):
+        sizes = {"nodes": np.array([3, 5, 2, 8, 12, 1]), "edges": np.array([1, 1, 1, 1, 1, 9])}
+        batches = make_budget_batches(sizes, {"nodes": 10, "edges": 5})
+        self.assertEqual([b.tolist() for b in batches], [[0, 1, 2], [3], [4], [5]])
+        batches = make_budget_batches(sizes, {"nodes": 10}, batch_size=2)
+        self.assertEqual([b.tolist() for b in batches], [[0, 1], [2, 3], [4], [5]])
+
+    def test_buckets(self):
+        sizes = {"nodes": np.array([1, 9, 2, 8, 3, 7])}
+        batches = make_budget_batches(sizes, {"nodes": 100}, num_buckets=2)
+        self.assertEqual([sorted(b.tolist()) for b in batches], [[0, 2, 4], [1, 3, 5]])
+
+
+class TestTFDatasetFromGraphList(unittest.TestCase):
+
+    def test_bucketing_covers_all_graphs(self):
+        data = _make_graph_list(num_graphs=60)
+        labels = np.arange(len(data))
+        ds = tf_dataset_from_graph_list(data, inputs=[{"name": "edge_indices", "ragged": True}], outputs=labels,
+                                        batch_size=8, shuffle=True, seed=1, bucket_by="edge_indices",
+                                        num_buckets=3)
+        seen = []
+        for x, y in ds:
+            self.assertLessEqual(int(y.shape[0]), 8)
+            for i, edges in zip(y.numpy(), x[0]):
+                self.assertTrue(np.all(edges.numpy() == data[int(i)]["edge_indices"]))
+            seen.extend(y.numpy().tolist())
+        self.assertEqual(sorted(seen), labels.tolist())
+
+    def test_batch_budget(self):
+        data = _make_graph_list(num_graphs=60)
+        labels = np.arange(len(data))
+        ds = tf_dataset_from_graph_list(data, inputs=[{"name": "edge_indices", "ragged": True}], outputs=labels,
+                                        batch_size=8, shuffle=True, seed=1, batch_budget={"edge_indices": 50})
+        seen = []
+        for x, y in ds:
+            if int(y.shape[0]) > 1:
+                self.assertLessEqual(int(tf.reduce_sum(x[0].row_lengths())), 50)
+            seen.extend(y.numpy().tolist())
+        self.assertEqual(sorted(seen), labels.tolist())
+
+    def test_interleaved_shards(self):
+        data = _make_graph_list(num_graphs=60)
+        labels = np.arange(len(data))
+        for kwargs in [{}, {"bucket_by": "edge_indices", "num_buckets": 2}, {"batch_budget": {"edge_indices": 50}}]:
+            kwargs.update({"inputs": [{"name": "edge_indices", "ragged": True}], "outputs": labels, "batch_size": 8,
+                           "shuffle": True, "seed": 1, "num_shards": 3})
+            ds = tf_dataset_from_graph_list(data, **kwargs)
+            epochs = []
+            for _ in range(2):
+                seen = []
+                for x, y in ds:
+                    self.assertLessEqual(int(y.shape[0]), 8)
+                    if "batch_budget" not in kwargs:
+                        # Graphs of a batch are from the same strided shard.
+                        self.assertEqual(len(np.unique(y.numpy() % 3)), 1)
+                    for i, edges in zip(y.numpy(), x[0]):
+                        self.assertTrue(np.all(edges.numpy() == data[int(i)]["edge_indices"]))
+                    seen.extend(y.numpy().tolist())
+                self.assertEqual(sorted(seen), labels.tolist())
+                epochs.append(seen)
+            self.assertNotEqual(epochs[0], epochs[1])
+            # Same order for the same seed.
+            ds = tf_dataset_from_graph_list(data, **kwargs)
+            self.assertEqual([i for _, y in ds for i in y.numpy().tolist()], epochs[0])
+
+    def test_shards_without_random_dataset(self):
+        # Older tensorflow versions have no `rerandomize_each_iteration` argument of `tf.data.Dataset.random`.
+        data = _make_graph_list(num_graphs=30)
+        labels = np.arange(len(data))
+        with mock.patch.object(tf.data.Dataset, "random", side_effect=TypeError):
+            for shuffle in [False, True]:
+                ds = tf_dataset_from_graph_list(data, inputs=[{"name": "edge_indices", "ragged": True}],
+                                                outputs=labels, batch_size=8, shuffle=shuffle, seed=1, num_shards=3)
+                seen = [i for _, y in ds for i in y.numpy().tolist()]
+                self.assertEqual(sorted(seen), labels.tolist())
+
+
+class TestTFPaddedDatasetFromGraphList(unittest.TestCase):
+
+    def test_buckets_cover_all_graphs(self):
+        data = _make_graph_list(num_graphs=60)
+        labels = np.arange(len(data))
+        padded_sizes = [{"node_attributes": 9, "edge_indices": 10}, {"node_attributes": 9, "edge_indices": 19}]
+        ds = tf_padded_dataset_from_graph_list(
+            data, inputs=[{"name": "edge_indices"}, {"name": "total_edges"}], outputs=labels,
+            padded_sizes=padded_sizes, padded_counts={"total_edges": "edge_indices"}, batch_size=8, shuffle=True,
+            seed=1)
+        seen = []
+        for x, y, w in ds:
+            self.assertEqual(int(y.shape[0]), 8)
+            self.assertIn(int(x[0].shape[1]), [10, 19])
+            for i, edges, count, weight in zip(y.numpy(), x[0].numpy(), x[1].numpy(), w.numpy()):
+                if weight == 0:
+                    self.assertEqual(count, 0)
+                    continue
+                self.assertTrue(np.all(edges[:count] == data[int(i)]["edge_indices"]))
+                self.assertTrue(np.all(edges[count:] == 0))
+                seen.append(int(i))
+        self.assertEqual(sorted(seen), labels.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import importlib
+
+import numpy as np
+import tensorflow as tf
+
+from kgcnn.layers.geom import NodePosition, NodeDistanceEuclidean
+from kgcnn.ops.segment import segment_ops_by_name, unsorted_segment_ops_by_name
+
+# Models of `kgcnn.literature` that build with default arguments, with fewer layers for the larger models.
+# Models that do not build in float32 are missing here: AttentiveFP, GAT, GATv2, HamNet and MXMNet with activation
+# classes like 'kgcnn>leaky_relu' as activation argument of keras layers and MEGAN with a required `units` argument.
+literature_models = [
+    ("CGCNN", "make_crystal_model", {}), ("CMPNN", "make_model", {}), ("DimeNetPP", "make_model", {"num_blocks": 1}),
+    ("DMPNN", "make_model", {}), ("EGNN", "make_model", {}), ("GCN", "make_model", {}),
+    ("GCN", "make_model_weighted", {}), ("GIN", "make_model", {}), ("GIN", "make_model_edge", {}),
+    ("GraphSAGE", "make_model", {}), ("INorp", "make_model", {}), ("MAT", "make_model", {"depth": 1}),
+    ("Megnet", "make_model", {"nblocks": 1}), ("Megnet", "make_crystal_model", {"nblocks": 1}),
+    ("NMPN", "make_model", {"depth": 1}), ("PAiNN", "make_model", {"depth": 1}),
+    ("PAiNN", "make_crystal_model", {"depth": 1}), ("Schnet", "make_model", {}), ("Schnet", "make_crystal_model", {}),
+    ("Unet", "make_model", {})
+]
+
+
+def make_model_inputs(model, num_graphs: int = 3, seed: int = 0):
+    """Random graphs for the inputs of a model, which are identified by the name of the keras input layer."""
+    rng = np.random.default_rng(seed)
+    num_nodes = rng.integers(4, 8, size=num_graphs)
+    num_edges = rng.integers(4, 12, size=num_graphs)
+    num_angles = rng.integers(2, 6, size=num_graphs)
+    out = []
+    for x in model.inputs:
+        name, dtype, shape = x.name, x.dtype.as_numpy_dtype, tuple(x.shape[1:])
+        if not isinstance(x.type_spec, tf.RaggedTensorSpec):
+            if "lattice" in name:
+                values = np.tile(np.eye(3) * 5.0, (num_graphs, 1, 1))
+            elif len(shape) == 0:
+                values = rng.integers(1, 4, size=(num_graphs,))
+            else:
+                values = rng.normal(size=(num_graphs,) + shape)
+            out.append(tf.constant(values.astype(dtype)))
+            continue
+        lengths = num_nodes if name.startswith("node") else (num_angles if name.startswith("angle") else num_edges)
+        values = []
+        for i, n in enumerate(lengths):
+            if name.startswith("angle") and "indices" in name or "reverse" in name:
+                v = rng.integers(0, num_edges[i], size=(n,) + shape[1:])
+            elif "indices" in name:
+                # No self-loops, which have zero distance.
+                v = rng.integers(0, num_nodes[i], size=(n, 1))
+                v = np.concatenate([v, (v + rng.integers(1, num_nodes[i], size=(n, 1))) % num_nodes[i]], axis=-1)
+            elif "image" in name or "translation" in name:
+                v = rng.integers(-1, 2, size=(n,) + shape[1:])
+            elif len(shape) == 1:
+                v = rng.integers(1, 4, size=(n,))
+            else:
+                v = rng.normal(size=(n,) + shape[1:])
+            values.append(v.astype(dtype))
+        out.append(tf.RaggedTensor.from_row_lengths(np.concatenate(values, axis=0), lengths))
+    return out
+
+
+class TestMixedPrecision(unittest.TestCase):
+
+    def setUp(self):
+        tf.keras.mixed_precision.set_global_policy("mixed_bfloat16")
+
+    def tearDown(self):
+        tf.keras.mixed_precision.set_global_policy("float32")
+
+    def test_segment_accumulation(self):
+        data = tf.constant(np.full((1024, 1), 1.0 + 2**-6), dtype="bfloat16")
+        ids = tf.zeros(1024, dtype="int32")
+        out = segment_ops_by_name("sum", data, ids)
+        out_unsorted = unsorted_segment_ops_by_name("sum", data, ids, 1)
+        self.assertEqual(out.dtype, tf.bfloat16)
+        self.assertAlmostEqual(float(out[0, 0]), 1040.0)
+        self.assertAlmostEqual(float(out_unsorted[0, 0]), 1040.0)
+
+    def test_geometry_in_float32(self):
+        xyz = tf.ragged.constant([[[0.0, 0.0, 0.0], [100.0, 0.0, 0.01]]], ragged_rank=1, dtype="float32")
+        idx = tf.ragged.constant([[[0, 1]]], ragged_rank=1, dtype="int64")
+        d = NodeDistanceEuclidean()(NodePosition()([xyz, idx]))
+        self.assertEqual(d.dtype, tf.float32)
+        self.assertAlmostEqual(float(d.values[0, 0]), np.sqrt(100.0**2 + 0.01**2), places=4)
+
+    def test_models_build_and_train(self):
+        for module_name, make_function, model_kwargs in literature_models:
+            make_model = getattr(importlib.import_module("kgcnn.literature.%s" % module_name), make_function)
+            model = make_model(verbose=0, **model_kwargs)
+            x = make_model_inputs(model)
+            self.assertEqual(model.outputs[0].dtype, tf.float32, "%s.%s" % (module_name, make_function))
+            # Eager execution, since tracing the large models takes longer than a step on a few small graphs.
+            y = model(x)
+            model.compile(loss="mean_squared_error", optimizer="adam", run_eagerly=True)
+            loss = model.train_on_batch(x, np.zeros(y.shape))
+            self.assertTrue(np.isfinite(loss), "%s.%s" % (module_name, make_function))
+
+
+if __name__ == '__main__':
+    unittest.main()
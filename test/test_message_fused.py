@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+import tensorflow as tf
+
+from kgcnn.layers.message import GatherMessagePooling, DisjointEdgeIndices
+from kgcnn.layers.gather import GatherNodesOutgoing
+from kgcnn.layers.pooling import PoolingLocalEdges
+from kgcnn.layers.conv.gcn_conv import GCN
+from kgcnn.layers.conv.gin_conv import GIN
+from kgcnn.layers.conv.schnet_conv import SchNetInteraction
+
+
+class TestGatherMessagePooling(unittest.TestCase):
+
+    def _make_graphs(self, num_graphs=4, seed=0):
+        rng = np.random.default_rng(seed)
+        nodes, edges, indices = [], [], []
+        for _ in range(num_graphs):
+            n = int(rng.integers(3, 10))
+            m = int(rng.integers(1, 3 * n))
+            nodes.append(rng.normal(size=(n, 5)))
+            edges.append(rng.normal(size=(m, 5)))
+            indices.append(rng.integers(0, n, size=(m, 2)))
+        return (tf.ragged.constant(nodes, ragged_rank=1, inner_shape=(5,), dtype="float32"),
+                tf.ragged.constant(edges, ragged_rank=1, inner_shape=(5,), dtype="float32"),
+                tf.ragged.constant(indices, ragged_rank=1, inner_shape=(2,), dtype="int64"))
+
+    def test_matches_unfused(self):
+        nodes, edges, edge_index = self._make_graphs()
+        disjoint_index = DisjointEdgeIndices()([nodes, edge_index])
+        gathered = GatherNodesOutgoing()([nodes, edge_index])
+        for method in ["sum", "mean", "max", "min"]:
+            expected = PoolingLocalEdges(pooling_method=method)([nodes, gathered * edges, edge_index])
+            out = GatherMessagePooling(pooling_method=method, message="multiply")([nodes, edges, edge_index])
+            out_disjoint = GatherMessagePooling(pooling_method=method, message="multiply")(
+                [nodes, edges, edge_index, disjoint_index])
+            self.assertTrue(np.allclose(out.values.numpy(), expected.values.numpy(), atol=1e-5))
+            self.assertTrue(np.allclose(out_disjoint.values.numpy(), expected.values.numpy(), atol=1e-5))
+
+    def test_conv_layers_fused(self):
+        nodes, edges, edge_index = self._make_graphs()
+        disjoint_index = DisjointEdgeIndices()([nodes, edge_index])
+        for layer_class, args, inputs in [
+                (GCN, {"units": 5, "normalize_by_weights": True, "activation": "relu"},
+                 [nodes, edges[:, :, :1], edge_index]),
+                (GIN, {}, [nodes, edge_index]),
+                (SchNetInteraction, {"units": 5}, [nodes, edges, edge_index])]:
+            layer = layer_class(**args)
+            layer_fused = layer_class(use_fused=True, **args)
+            expected = layer(inputs)
+            layer_fused(inputs + [disjoint_index])
+            layer_fused.set_weights(layer.get_weights())
+            out = layer_fused(inputs + [disjoint_index])
+            self.assertTrue(np.allclose(out.values.numpy(), expected.values.numpy(), atol=1e-5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+
+import numpy as np
+import tensorflow as tf
+
+from kgcnn.model.force import EnergyForceModel
+
+
+class TestEnergyForceModel(unittest.TestCase):
+
+    config = {"name": "Schnet", "output_embedding": "graph", "depth": 2,
+              "interaction_args": {"units": 16, "use_bias": True, "activation": "kgcnn>shifted_softplus",
+                                   "cfconv_pool": "sum"},
+              "output_mlp": {"use_bias": [True, True], "units": [16, 2],
+                             "activation": ["kgcnn>shifted_softplus", "linear"]}}
+
+    def _make_graphs(self, num_graphs=3, seed=0):
+        rng = np.random.default_rng(seed)
+        nodes, coordinates, indices = [], [], []
+        for _ in range(num_graphs):
+            n = int(rng.integers(3, 8))
+            nodes.append(rng.integers(1, 10, size=n).astype("float32"))
+            coordinates.append(rng.normal(size=(n, 3)).astype("float32"))
+            indices.append(np.array([[i, j] for i in range(n) for j in range(n) if i != j], dtype="int64"))
+        return [tf.RaggedTensor.from_row_lengths(np.concatenate(x, axis=0), [len(y) for y in x])
+                for x in [nodes, coordinates, indices]]
+
+    def _make_model(self, **kwargs):
+        return EnergyForceModel(module_name="kgcnn.literature.Schnet", class_name="make_model",
+                                config=self.config, coordinate_input=1, **kwargs)
+
+    def test_gradient_matches_batch_jacobian(self):
+        x = self._make_graphs()
+        model = self._make_model(output_to_tensor=True)
+        model_jacobian = self._make_model(output_to_tensor=True, use_batch_jacobian=True)
+        model(x)
+        model_jacobian(x)
+        model_jacobian.set_weights(model.get_weights())
+        eng, grad = model(x)
+        eng_jacobian, grad_jacobian = model_jacobian(x)
+        self.assertEqual(grad.shape, grad_jacobian.shape)
+        self.assertTrue(np.allclose(grad.numpy(), grad_jacobian.numpy(), atol=1e-5))
+        _, grad_ragged = self._make_model(output_to_tensor=False)(x)
+        self.assertTrue(np.array_equal(grad_ragged.row_splits.numpy(), x[1].row_splits.numpy()))
+
+    def test_virial(self):
+        x = self._make_graphs()
+        model = self._make_model(output_to_tensor=False, stress_mode="virial", output_as_dict=True)
+        out = model(x)
+        self.assertEqual(out["virial"].shape, (3, 3, 3, 2))
+        # Virial of homogeneous strain is the sum of outer products of coordinates and gradient.
+        virial = tf.math.segment_sum(tf.einsum("ij,ikl->ijkl", x[1].values, out["force"].values),
+                                     x[1].value_rowids())
+        self.assertTrue(np.allclose(out["virial"].numpy(), virial.numpy(), atol=1e-4))
+
+    def test_get_config(self):
+        model = self._make_model(output_to_tensor=False, stress_mode="virial", output_as_dict=True, name="force")
+        config = model.get_config()
+        self.assertEqual(config["config"], self.config)
+        self.assertEqual(config["stress_mode"], "virial")
+        self.assertFalse(config["use_batch_jacobian"])
+        self.assertIsNone(config["lattice_input"])
+        model_from_config = EnergyForceModel(**config)
+        self.assertEqual(model_from_config.get_config(), config)
+        x = self._make_graphs()
+        model(x)
+        model_from_config(x)
+        model_from_config.set_weights(model.get_weights())
+        self.assertTrue(np.allclose(model(x)["virial"].numpy(), model_from_config(x)["virial"].numpy()))
+
+    def test_stress_finite_difference(self):
+        rng = np.random.default_rng(1)
+        lattice = (np.eye(3) * 2.5 + rng.normal(size=(3, 3)) * 0.2)[None].astype("float32")
+        coordinates = (rng.uniform(size=(4, 3)) @ lattice[0]).astype("float32")
+        images = np.array([x for x in np.ndindex(3, 3, 3)]) - 1
+        indices = np.array([[i, j] for i in range(4) for j in range(4) for _ in images], dtype="int64")
+        images = np.tile(images, (16, 1))
+        keep = (indices[:, 0] != indices[:, 1]) | np.any(images != 0, axis=-1)
+        indices, images = indices[keep], images[keep]
+        nodes = tf.RaggedTensor.from_row_lengths(rng.integers(1, 10, size=4).astype("float32"), [4])
+        edges = [tf.RaggedTensor.from_row_lengths(x, [len(x)]) for x in [indices, images]]
+
+        config = {"name": "Schnet", "depth": 1, "interaction_args": {"units": 16, "activation": "kgcnn>shifted_softplus",
+                                                                    "use_bias": True, "cfconv_pool": "sum"},
+                  "output_mlp": {"use_bias": [True, True], "units": [16, 1],
+                                 "activation": ["kgcnn>shifted_softplus", "linear"]}}
+        model = EnergyForceModel(module_name="kgcnn.literature.Schnet", class_name="make_crystal_model",
+                                 config=config, coordinate_input=1, stress_mode="stress", lattice_input=4,
+                                 output_as_dict=True, output_squeeze_states=True)
+
+        def energy(strain):
+            x = coordinates + coordinates @ strain
+            inputs = [nodes, tf.RaggedTensor.from_row_lengths(x.astype("float32"), [4])] + edges + [
+                (lattice + lattice @ strain).astype("float32")]
+            return float(model.energy_model(inputs)[0, 0])
+
+        out = model([nodes, tf.RaggedTensor.from_row_lengths(coordinates, [4])] + edges + [lattice])
+        self.assertEqual(out["stress"].shape, (1, 3, 3))
+        step = 1e-2
+        stress = np.zeros((3, 3))
+        for i, j in np.ndindex(3, 3):
+            strain = np.zeros((3, 3))
+            strain[i, j] = step
+            stress[i, j] = (energy(strain) - energy(-strain)) / (2 * step) / abs(np.linalg.det(lattice[0]))
+        self.assertTrue(np.allclose(out["stress"].numpy()[0], stress, atol=2e-5, rtol=1e-2))
+
+
+if __name__ == '__main__':
+    unittest.main()
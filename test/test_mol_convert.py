@@ -0,0 +1,100 @@
+import os
+import time
+import unittest
+import tempfile
+from rdkit import RDLogger
+RDLogger.DisableLog('rdApp.*')
+
+from kgcnn.mol.convert import MolConverter, _convert_process_pool
+from kgcnn.mol.io import write_smiles_file, read_mol_list_from_sdf_file, write_mol_block_list_to_sdf
+
+SMILES = ["CCO", "C1CCX", "c1ccccc1", "CC(=O)O", "CCN", "C1CC1", "CCCl"]
+
+
+def _slow_conversion(smile):
+    if smile == "slow":
+        time.sleep(60)
+    return smile.upper()
+
+
+class FailingMolConverter(MolConverter):
+    """Converter that fails after a number of batches to simulate an interrupted run."""
+
+    def __init__(self, fail_after: int, **kwargs):
+        super(FailingMolConverter, self).__init__(**kwargs)
+        self.fail_after = fail_after
+        self.num_calls = 0
+
+    def _convert_parallel(self, *args, **kwargs):
+        if self.num_calls >= self.fail_after:
+            raise KeyboardInterrupt("Interrupted conversion.")
+        self.num_calls += 1
+        return MolConverter._convert_parallel(*args, **kwargs)
+
+
+class TestMolConverter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.smiles_path = os.path.join(self.temp_dir.name, "test.SMILES")
+        self.sdf_path = os.path.join(self.temp_dir.name, "test.sdf")
+        write_smiles_file(self.smiles_path, SMILES)
+        self.kwargs = {"make_conformers": False, "optimize_conformer": False}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_process_matches_thread(self):
+        mol_thread = MolConverter().smile_to_mol(self.smiles_path, None, num_workers=2, parallel_backend="thread",
+                                                 **self.kwargs)
+        mol_process = MolConverter().smile_to_mol(self.smiles_path, self.sdf_path, num_workers=2,
+                                                  parallel_backend="process", batch_size=3, **self.kwargs)
+        self.assertEqual(mol_thread, mol_process)
+        self.assertIsNone(mol_process[1])
+        self.assertEqual(len(read_mol_list_from_sdf_file(self.sdf_path)), len(SMILES))
+        self.assertFalse(os.path.exists(self.sdf_path + ".part"))
+        self.assertFalse(os.path.exists(self.sdf_path + ".checkpoint.json"))
+
+    def test_sdf_blocks_are_terminated(self):
+        # Every mol block is followed by '$$$$', including the last, unlike `write_mol_block_list_to_sdf`.
+        mol_list = MolConverter().smile_to_mol(self.smiles_path, self.sdf_path, num_workers=1, batch_size=3,
+                                               **self.kwargs)
+        with open(self.sdf_path, "r") as f:
+            lines = f.read().split("\n")
+        self.assertEqual(lines[-2:], ["$$$$", ""])
+        self.assertEqual(lines.count("$$$$"), len(SMILES))
+        reference_path = os.path.join(self.temp_dir.name, "reference.sdf")
+        write_mol_block_list_to_sdf(mol_list, reference_path)
+        for lazy in [False, True]:
+            self.assertEqual(list(read_mol_list_from_sdf_file(self.sdf_path, lazy=lazy)),
+                             list(read_mol_list_from_sdf_file(reference_path, lazy=lazy)))
+
+    def test_thread_is_default(self):
+        with self.assertLogs("kgcnn.mol.convert", level="WARNING") as logs:
+            mol_list = MolConverter().smile_to_mol(self.smiles_path, None, num_workers=2, timeout=1.0, **self.kwargs)
+        self.assertIn("parallel_backend='process'", logs.output[0])
+        self.assertEqual(len(mol_list), len(SMILES))
+
+    def test_timeout(self):
+        mol_list = _convert_process_pool(_slow_conversion, ["a", "slow", "b", "c"], 2, (), timeout=1.0)
+        self.assertEqual(mol_list, ["A", None, "B", "C"])
+
+    def test_resume(self):
+        expected = MolConverter().smile_to_mol(self.smiles_path, None, num_workers=1, **self.kwargs)
+        converter = FailingMolConverter(fail_after=2)
+        with self.assertRaises(KeyboardInterrupt):
+            converter.smile_to_mol(self.smiles_path, self.sdf_path, num_workers=2, batch_size=2, **self.kwargs)
+        self.assertFalse(os.path.exists(self.sdf_path))
+        self.assertTrue(os.path.exists(self.sdf_path + ".checkpoint.json"))
+
+        converter = FailingMolConverter(fail_after=10)
+        mol_list = converter.smile_to_mol(self.smiles_path, self.sdf_path, num_workers=2, batch_size=2,
+                                          **self.kwargs)
+        # Only the remaining two batches are converted.
+        self.assertEqual(converter.num_calls, 2)
+        self.assertEqual(mol_list, expected)
+        self.assertEqual(len(read_mol_list_from_sdf_file(self.sdf_path)), len(SMILES))
+
+
+if __name__ == '__main__':
+    unittest.main()
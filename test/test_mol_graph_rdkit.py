@@ -0,0 +1,44 @@
+import unittest
+import numpy as np
+
+from kgcnn.mol.encoder import OneHotEncoder
+from kgcnn.mol.graph_rdkit import MolecularGraphRDKit
+from kgcnn.data.moleculenet import MoleculeNetDataset
+
+
+class TestAttributeTable(unittest.TestCase):
+
+    smiles = ["CCO", "c1ccccc1C(=O)[O-]", "C[C@H](N)C(=O)O", "F/C=C/Cl", "[Na+].[Cl-]", "O", "C#N"]
+
+    def test_same_as_attribute_lists(self):
+        nodes = MoleculeNetDataset._default_node_attributes + ["AtomicNum", lambda atom: [atom.GetMass(), 1.0]]
+        edges = MoleculeNetDataset._default_edge_attributes
+        for make_directed in [False, True]:
+            encoder_nodes = {key: OneHotEncoder(**value.get_config())
+                             for key, value in MoleculeNetDataset._default_node_encoders.items()}
+            encoder_nodes.update({"TotalNumHs": int})
+            encoder_edges = {key: OneHotEncoder(**value.get_config())
+                             for key, value in MoleculeNetDataset._default_edge_encoders.items()}
+            node_table = MolecularGraphRDKit.node_attribute_table(nodes, encoder_nodes)
+            edge_table = MolecularGraphRDKit.edge_attribute_table(edges, encoder_edges)
+            for smile in self.smiles:
+                mg = MolecularGraphRDKit(make_directed=make_directed).from_smiles(smile).add_hs()
+                expected = np.array(mg.node_attributes(nodes, encoder_nodes), dtype="float32")
+                result = mg.node_attributes_array(node_table)
+                self.assertEqual(result.dtype, np.float32)
+                self.assertTrue(np.array_equal(expected, result))
+                expected_idx, expected_attr = mg.edge_attributes(edges, encoder_edges)
+                result_idx, result_attr = mg.edge_attributes_array(edge_table)
+                self.assertTrue(np.array_equal(expected_idx, result_idx))
+                self.assertTrue(np.array_equal(np.array(expected_attr, dtype="float32"), result_attr))
+            self.assertEqual(encoder_nodes["Symbol"].found_values, ["C", "O", "H", "N", "F", "Cl", "Na"])
+
+    def test_empty_bonds(self):
+        mg = MolecularGraphRDKit().from_smiles("[Na+].[Cl-]")
+        idx, attr = mg.edge_attributes_array(MolecularGraphRDKit.edge_attribute_table(["BondType"], {}))
+        self.assertEqual(idx.shape, (0, ))
+        self.assertEqual(attr.shape, (0, ))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from kgcnn.mol.io import IndexedMolFile, read_mol_list_from_sdf_file, read_xyz_file, write_list_to_xyz_file, \
+    write_mol_block_list_to_sdf
+
+MOL_BLOCK = "mol_%s\n     RDKit          3D\n\n  0  0  0  0  0  0  0  0  0  0 V2000\nM  END\n"
+
+
+class TestIndexedMolFile(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_sdf_matches_read_list(self):
+        file_path = os.path.join(self.temp_dir.name, "molecules.sdf")
+        write_mol_block_list_to_sdf([MOL_BLOCK % i for i in range(7)] + [None, MOL_BLOCK % 8], file_path)
+        expected = read_mol_list_from_sdf_file(file_path)
+        mol_list = read_mol_list_from_sdf_file(file_path, lazy=True)
+        self.assertEqual(len(mol_list), len(expected))
+        self.assertEqual(list(mol_list), expected)
+        self.assertEqual(mol_list[2:5], expected[2:5])
+        self.assertEqual(mol_list[-1], expected[-1])
+        self.assertTrue(os.path.exists(file_path + ".index.npz"))
+        # Index is loaded from file and can be pickled for worker processes.
+        self.assertEqual(list(pickle.loads(pickle.dumps(IndexedMolFile(file_path)))), expected)
+
+    def test_sdf_index_is_rebuilt_for_changed_file(self):
+        file_path = os.path.join(self.temp_dir.name, "molecules.sdf")
+        write_mol_block_list_to_sdf([MOL_BLOCK % i for i in range(3)], file_path)
+        self.assertEqual(len(IndexedMolFile(file_path)), 3)
+        write_mol_block_list_to_sdf([MOL_BLOCK % i for i in range(5)], file_path)
+        os.utime(file_path, ns=(0, 0))
+        self.assertEqual(len(IndexedMolFile(file_path)), 5)
+
+    def test_xyz_matches_read_list(self):
+        file_path = os.path.join(self.temp_dir.name, "molecules.xyz")
+        geometries = [[["C", "H"], [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]]], [["O"], [[0.0, 1.0, 0.5]]]] * 3
+        write_list_to_xyz_file(file_path, geometries)
+        mol_list = read_xyz_file(file_path, lazy=True)
+        self.assertEqual(list(mol_list), read_xyz_file(file_path))
+        self.assertEqual(mol_list[3], read_xyz_file(file_path)[3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@ import unittest
 import numpy as np
 import tensorflow as tf
 
-from kgcnn.layers.pooling import PoolingLocalEdgesLSTM
+from kgcnn.layers.pooling import PoolingLocalEdgesLSTM, PoolingLocalEdges
 from kgcnn.layers.gather import GatherNodes
 from kgcnn.layers.modules import LazyConcatenate
 
@@ -39,6 +39,25 @@ class TestPoolingLocalEdgesLSTM(unittest.TestCase):
         self.assertTrue(np.all(np.array(out[0].shape) == np.array([8,3])))
 
 
+class TestPoolingLocalEdgesSorted(unittest.TestCase):
+
+    def test_sorted_matches_unsorted(self):
+        n = tf.ragged.constant(TestPoolingLocalEdgesLSTM.n1, ragged_rank=1, inner_shape=(1,))
+        edi = tf.ragged.constant(TestPoolingLocalEdgesLSTM.ei1, ragged_rank=1, inner_shape=(2,))
+        ed = tf.ragged.constant(TestPoolingLocalEdgesLSTM.e1, ragged_rank=1, inner_shape=(1,))
+        for method in ["sum", "mean", "max"]:
+            out = PoolingLocalEdges(pooling_method=method)([n, ed, edi])
+            out_sorted = PoolingLocalEdges(pooling_method=method, is_sorted=True, ragged_validate=True)([n, ed, edi])
+            self.assertTrue(np.allclose(out.values.numpy(), out_sorted.values.numpy()))
+
+    def test_assert_unsorted(self):
+        n = tf.ragged.constant(TestPoolingLocalEdgesLSTM.n1, ragged_rank=1, inner_shape=(1,))
+        edi = tf.ragged.constant([x[::-1] for x in TestPoolingLocalEdgesLSTM.ei1], ragged_rank=1, inner_shape=(2,))
+        ed = tf.ragged.constant(TestPoolingLocalEdgesLSTM.e1, ragged_rank=1, inner_shape=(1,))
+        with self.assertRaises(tf.errors.InvalidArgumentError):
+            PoolingLocalEdges(pooling_method="sum", is_sorted=True, ragged_validate=True)([n, ed, edi])
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,38 @@
+import unittest
+import itertools
+import numpy as np
+
+from kgcnn.graph.geom import range_neighbour
+from kgcnn.graph.base import GraphDict
+from kgcnn.graph.preprocessor import SetRange
+
+
+class TestRangeNeighbour(unittest.TestCase):
+
+    def test_kdtree_matches_dense(self):
+        rng = np.random.default_rng(1)
+        for num_nodes in [1, 2, 30, 250]:
+            coordinates = rng.uniform(0.0, 8.0, size=(num_nodes, 3))
+            for max_distance, max_neighbours, exclusive, self_loops in itertools.product(
+                    [None, 3.0], [None, 0, 5, 1000], [True, False], [True, False]):
+                indices_dense, dist_dense = range_neighbour(
+                    coordinates, max_distance=max_distance, max_neighbours=max_neighbours, exclusive=exclusive,
+                    self_loops=self_loops, method="dense")
+                indices_tree, dist_tree = range_neighbour(
+                    coordinates, max_distance=max_distance, max_neighbours=max_neighbours, exclusive=exclusive,
+                    self_loops=self_loops, method="kdtree")
+                self.assertTrue(np.array_equal(indices_dense, indices_tree))
+                self.assertTrue(np.array_equal(dist_dense, dist_tree))
+
+    def test_set_range_method(self):
+        coordinates = np.random.default_rng(2).uniform(0.0, 10.0, size=(150, 3))
+        graph = GraphDict({"node_coordinates": coordinates})
+        out_dense = SetRange(method="dense", max_distance=3.0, max_neighbours=8)(graph)
+        out_auto = SetRange(max_distance=3.0, max_neighbours=8)(graph)
+        self.assertEqual(out_auto["range_attributes"].shape[-1], 1)
+        for key in ["range_indices", "range_attributes"]:
+            self.assertTrue(np.array_equal(out_dense[key], out_auto[key]))
+
+
+if __name__ == '__main__':
+    unittest.main()
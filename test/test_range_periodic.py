@@ -64,6 +64,30 @@ class TestRangePeriodic(unittest.TestCase):
         self.assertTrue(all(_test(self.artificial_atoms, self.artificial_lattice, [484, 1072, 16736, 133816])))
         self.assertTrue(all(_test(self.real_atoms, self.real_lattice, [8, 8, 24, 320])))
 
+    def test_kdtree_matches_dense(self):
+        rng = np.random.default_rng(0)
+        cases = [(self.artificial_atoms, self.artificial_lattice), (self.real_atoms, self.real_lattice)]
+        for n in [1, 3, 20]:
+            lattice = np.diag(rng.uniform(3.0, 8.0, 3)) + rng.normal(size=(3, 3))
+            cases.append((rng.uniform(0.0, 1.0, (n, 3)) @ lattice, lattice))
+        settings = [{"max_distance": 4.0, "max_neighbours": None},
+                    {"max_distance": None, "max_neighbours": 12},
+                    {"max_distance": 4.0, "max_neighbours": 12, "exclusive": True},
+                    {"max_distance": 4.0, "max_neighbours": 40, "exclusive": False},
+                    {"max_distance": 4.0, "max_neighbours": None, "self_loops": True}]
+        for atoms, lattice in cases:
+            for kwargs in settings:
+                dense = range_neighbour_lattice(atoms, lattice, method="dense", **kwargs)
+                kdtree = range_neighbour_lattice(atoms, lattice, method="kdtree", **kwargs)
+                self.assertEqual(len(dense[0]), len(kdtree[0]))
+                # Neighbours of equal distance can be chosen differently for max_neighbours.
+                for i in range(len(atoms)):
+                    self.assertTrue(np.allclose(np.sort(dense[2][dense[0][:, 0] == i]),
+                                                np.sort(kdtree[2][kdtree[0][:, 0] == i])))
+                if kwargs["max_neighbours"] is None:
+                    for x, y in zip(self.full_sort(*dense), self.full_sort(*kdtree)):
+                        self.assertTrue(np.allclose(x, y))
+
     # def test_dist_all_correct(self):
     #     indices, images, dist = range_neighbour_lattice(self.artificial_atoms,
     #                                                     self.artificial_lattice, max_distance=5.0,
@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+
+from kgcnn.scaler.mol import ExtensiveMolecularScaler, QMGraphLabelScaler, get_atomic_number_composition
+from kgcnn.scaler.scaler import StandardScaler
+
+
+def make_random_molecules(num_molecules: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    atomic_number = [rng.choice([1, 6, 7, 8], size=rng.integers(2, 12)) for _ in range(num_molecules)]
+    counts = np.array([[np.sum(x == z) for z in [1, 6, 7, 8]] for x in atomic_number])
+    return atomic_number, counts, rng.normal(size=(num_molecules, 2)) * 0.01
+
+
+class TestExtensiveMolecularScaler(unittest.TestCase):
+
+    atomic_number, counts, noise = make_random_molecules(50)
+    # Properties of atom contributions plus some noise.
+    contribution = np.array([[-0.5, 1.0], [-38.0, 2.0], [-54.5, 3.0], [-75.0, 4.0]])
+    properties = counts @ contribution + noise
+
+    def test_composition(self):
+        composition = get_atomic_number_composition(self.atomic_number).toarray()
+        self.assertEqual(composition.shape, (50, 95))
+        self.assertTrue(np.array_equal(composition[:, [1, 6, 7, 8]], self.counts))
+        self.assertEqual(np.sum(composition), np.sum(self.counts))
+
+    def test_fit_transform(self):
+        scaler = ExtensiveMolecularScaler()
+        scaled = scaler.fit_transform(self.properties, atomic_number=self.atomic_number)
+        composition = scaler._composition_cache[1]
+        self.assertTrue(np.array_equal(scaler._fit_atom_selection, [1, 6, 7, 8]))
+        self.assertTrue(np.allclose(np.std(scaled, axis=0), 1.0))
+        self.assertTrue(np.allclose(scaler.predict(self.atomic_number), self.counts @ self.contribution, atol=0.05))
+        self.assertTrue(np.allclose(
+            scaler.inverse_transform(scaled, atomic_number=self.atomic_number), self.properties))
+        # Composition is only computed once for the same list of atomic numbers.
+        self.assertIs(scaler._composition_cache[1], composition)
+        self.assertTrue(np.allclose(scaler.transform(self.properties, atomic_number=composition), scaled))
+
+    def test_modified_atomic_number(self):
+        scaler = ExtensiveMolecularScaler()
+        atomic_number = [np.array(x) for x in self.atomic_number]
+        offset = scaler.fit(self.properties, atomic_number=atomic_number).predict(atomic_number)
+        # Changes in place must not return the composition of the previous call.
+        atomic_number[0][:] = 1
+        modified = scaler.predict(atomic_number)
+        expected = scaler.predict(get_atomic_number_composition(atomic_number))
+        self.assertTrue(np.allclose(modified, expected))
+        self.assertFalse(np.allclose(modified[0], offset[0]))
+
+    def test_qm_graph_label_scaler(self):
+        scaler = QMGraphLabelScaler([ExtensiveMolecularScaler(), StandardScaler()])
+        scaled = scaler.fit_transform(self.properties, atomic_number=self.atomic_number)
+        expected_first = ExtensiveMolecularScaler().fit_transform(
+            self.properties[:, :1], atomic_number=self.atomic_number)
+        self.assertTrue(np.allclose(scaled[:, :1], expected_first))
+        self.assertTrue(np.allclose(
+            scaler.inverse_transform(scaled, atomic_number=self.atomic_number), self.properties))
+
+
+if __name__ == '__main__':
+    unittest.main()
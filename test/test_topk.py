@@ -3,7 +3,7 @@ import unittest
 import numpy as np
 import tensorflow as tf
 
-from kgcnn.layers.pool.topk import PoolingTopK, UnPoolingTopK
+from kgcnn.layers.pool.topk import PoolingTopK, UnPoolingTopK, AdjacencyPower
 
 
 class TestTopKLayerRagged(unittest.TestCase):
@@ -63,5 +63,29 @@ class TestTopKLayerRagged(unittest.TestCase):
         # print(out1[0])
 
 
+class TestAdjacencyPower(unittest.TestCase):
+
+    @staticmethod
+    def _dense_power(edges, edge_indices, num_nodes, n):
+        adj = np.zeros((num_nodes, num_nodes))
+        adj[edge_indices[:, 0], edge_indices[:, 1]] = edges[:, 0]
+        out = np.linalg.matrix_power(adj, n)
+        indices = np.argwhere(out > tf.keras.backend.epsilon())
+        return out[indices[:, 0], indices[:, 1]], indices
+
+    def test_matches_dense_power(self):
+        node = tf.ragged.constant(TestTopKLayerRagged.n1, ragged_rank=1, inner_shape=(1,))
+        edge_indices = tf.ragged.constant(TestTopKLayerRagged.ei1, ragged_rank=1, inner_shape=(2,), dtype=tf.int64)
+        edges = tf.ragged.constant(TestTopKLayerRagged.e1, ragged_rank=1, inner_shape=(1,))
+        for n in [2, 3]:
+            out_edges, out_indices = AdjacencyPower(n=n, ragged_validate=True)([node, edges, edge_indices])
+            for i in range(2):
+                expected_edges, expected_indices = self._dense_power(
+                    np.array(TestTopKLayerRagged.e1[i]), np.array(TestTopKLayerRagged.ei1[i]),
+                    len(TestTopKLayerRagged.n1[i]), n)
+                self.assertTrue(np.array_equal(out_indices[i].numpy(), expected_indices))
+                self.assertTrue(np.allclose(out_edges[i].numpy()[:, 0], expected_edges, atol=1e-6))
+
+
 if __name__ == '__main__':
     unittest.main()
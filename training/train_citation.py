@@ -46,6 +46,10 @@ set_devices_gpu(gpu_to_use)
 # The hyperparameter are stored as a dictionary with section 'model', 'data' and 'training'.
 hyper = HyperParameter(hyper_path, model_name=model_name, model_class=make_function, dataset_name=dataset_name)
 
+# Optional mixed precision policy from 'training' section, e.g. 'mixed_float16', which must be set before the
+# model is created. Loss scaling for float16 is added to the optimizer in `hyper.compile()`.
+hyper.set_mixed_precision()
+
 # With `ModelSelection` a model definition from a module in kgcnn.literature can be loaded.
 # At the moment there is a `make_model()` function in each module that sets up a keras model within the functional API
 # of tensorflow-keras.
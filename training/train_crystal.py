@@ -50,6 +50,10 @@ set_devices_gpu(gpu_to_use)
 # HyperParameter is used to store and verify hyperparameter.
 hyper = HyperParameter(hyper_path, model_name=model_name, model_class=make_function, dataset_name=dataset_name)
 
+# Optional mixed precision policy from 'training' section, e.g. 'mixed_float16', which must be set before the
+# model is created. Loss scaling for float16 is added to the optimizer in `hyper.compile()`.
+hyper.set_mixed_precision()
+
 # Model Selection to load a model definition from a module in kgcnn.literature
 make_model = get_model_class(model_name, make_function)
 
@@ -116,11 +120,10 @@ for i, (train_index, test_index) in enumerate(kf.split(X=np.zeros((data_length,
     # They are always updated on top of the models default kwargs.
     model = make_model(**hyper["model"]["config"])
 
-    # First select training and test graphs from indices, then convert them into tensorflow tensor
-    # representation. Which property of the dataset and whether the tensor will be ragged is retrieved from the
-    # kwargs of the keras `Input` layers ('name' and 'ragged').
-    x_train, y_train = dataset[train_index].tensor(hyper["model"]["config"]["inputs"]), labels[train_index]
-    x_test, y_test = dataset[test_index].tensor(hyper["model"]["config"]["inputs"]), labels[test_index]
+    # First select training and test labels from indices. The graphs are converted into tensorflow tensor
+    # representation or a batch loader by `hyper.fit()`. Which property of the dataset and whether the tensor will be
+    # ragged is retrieved from the kwargs of the keras `Input` layers ('name' and 'ragged').
+    y_train, y_test = labels[train_index], labels[test_index]
     # Also keep the same information for atomic numbers of the structures.
     atoms_test = [atoms[i] for i in test_index]
     atoms_train = [atoms[i] for i in train_index]
@@ -155,9 +158,8 @@ for i, (train_index, test_index) in enumerate(kf.split(X=np.zeros((data_length,
 
     # Start and time training
     start = time.process_time()
-    hist = model.fit(x_train, y_train,
-                     validation_data=(x_test, y_test),
-                     **hyper.fit())
+    hist = model.fit(**hyper.fit(x=dataset[train_index], y=y_train,
+                                 validation_data=(dataset[test_index], y_test)))
     stop = time.process_time()
     print("Print Time for training: ", str(timedelta(seconds=stop - start)))
 
@@ -177,6 +179,7 @@ plot_train_test_loss(history_list, loss_name=None, val_loss_name=None,
                      filepath=filepath, file_name=f"loss{postfix_file}.png")
 
 # Plot prediction
+x_test = dataset[test_indices_list[-1][1]].tensor(hyper["model"]["config"]["inputs"])
 predicted_y = model.predict(x_test)
 true_y = y_test
 
@@ -47,6 +47,10 @@ set_devices_gpu(gpu_to_use)
 # The hyperparameter, a dictionary with section 'model', 'data' and 'training'.
 hyper = HyperParameter(hyper_path, model_name=model_name, model_class=make_function, dataset_name=dataset_name)
 
+# Optional mixed precision policy from 'training' section, e.g. 'mixed_float16', which must be set before the
+# model is created. Loss scaling for float16 is added to the optimizer in `hyper.compile()`.
+hyper.set_mixed_precision()
+
 # With `ModelSelection` a model definition from a module in kgcnn.literature can be loaded.
 # At the moment there is a `make_model()` function in each module that sets up a keras model within the functional API
 # of tensorflow-keras.
@@ -80,11 +84,10 @@ kf = KFold(**hyper["training"]["cross_validation"]["config"])
 history_list, test_indices_list, model, hist, x_test, y_test, scaler = [], [], None, None, None, None, None
 for train_index, test_index in kf.split(X=np.arange(data_length)[:, None]):
 
-    # First select training and test graphs from indices, then convert them into tensorflow tensor
-    # representation. Which property of the dataset and whether the tensor will be ragged is retrieved from the
-    # kwargs of the keras `Input` layers ('name' and 'ragged').
-    x_train, y_train = dataset[train_index].tensor(hyper["model"]["config"]["inputs"]), labels[train_index]
-    x_test, y_test = dataset[test_index].tensor(hyper["model"]["config"]["inputs"]), labels[test_index]
+    # First select training and test labels from indices. The graphs are converted into tensorflow tensor
+    # representation or a batch loader by `hyper.fit()`. Which property of the dataset and whether the tensor will be
+    # ragged is retrieved from the kwargs of the keras `Input` layers ('name' and 'ragged').
+    y_train, y_test = labels[train_index], labels[test_index]
 
     # Normalize training and test targets via a sklearn `StandardScaler`. No other scalers are used at the moment.
     # Scaler is applied to target if 'scaler' appears in hyperparameter. Only use for regression.
@@ -117,9 +120,8 @@ for train_index, test_index in kf.split(X=np.arange(data_length)[:, None]):
 
     # Run keras model-fit and take time for training.
     start = time.process_time()
-    hist = model.fit(x_train, y_train,
-                     validation_data=(x_test, y_test),
-                     **hyper.fit())
+    hist = model.fit(**hyper.fit(x=dataset[train_index], y=y_train,
+                                 validation_data=(dataset[test_index], y_test)))
     stop = time.process_time()
     print("Print Time for training: ", str(timedelta(seconds=stop - start)))
 
@@ -138,6 +140,7 @@ plot_train_test_loss(history_list, loss_name=None, val_loss_name=None,
                      filepath=filepath, file_name=f"loss{postfix_file}.png")
 
 # Plot prediction for the last split.
+x_test = dataset[test_indices_list[-1][1]].tensor(hyper["model"]["config"]["inputs"])
 predicted_y = model.predict(x_test)
 true_y = y_test
 